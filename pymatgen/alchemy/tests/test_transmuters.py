@@ -6,7 +6,13 @@
 import warnings
 import unittest
 import os
-from pymatgen.alchemy.transmuters import CifTransmuter, PoscarTransmuter
+import tempfile
+import shutil
+from monty.serialization import loadfn
+from pymatgen.alchemy.transmuters import CifTransmuter, PoscarTransmuter, \
+    StreamingTransmuter
+from pymatgen.alchemy.materials import TransformedStructure
+from pymatgen.io.vasp.inputs import Poscar
 from pymatgen.alchemy.filters import ContainsSpecieFilter
 from pymatgen.transformations.standard_transformations import \
     SubstitutionTransformation, RemoveSpeciesTransformation, \
@@ -110,6 +116,84 @@ class PoscarTransmuterTest(unittest.TestCase):
                          .as_dict()['other_parameters']['tags'],
                          ["world", "universe"])
 
+class StreamingTransmuterTest(unittest.TestCase):
+
+    def setUp(self):
+        structure = Poscar.from_file(os.path.join(test_dir, "POSCAR"),
+                                     check_for_POTCAR=False).structure
+        self.structures = [structure, structure.copy()]
+        self.trans = [
+            RemoveSpeciesTransformation('O'),
+            SubstitutionTransformation({"Fe": {"Fe2+": 0.25, "Mn3+": .75},
+                                        "P": "P5+"})]
+
+    def get_transmuter(self, ncores=None):
+        tsc = StreamingTransmuter.from_structures(
+            (s for s in self.structures), self.trans, ncores=ncores)
+        tsc.append_transformation(OrderDisorderedStructureTransformation(),
+                                  extend_collection=50)
+        t = SuperTransformation([SubstitutionTransformation({"Fe2+": "Mg2+"}),
+                                 SubstitutionTransformation({"Fe2+": "Zn2+"}),
+                                 SubstitutionTransformation({"Fe2+": "Be2+"})])
+        tsc.append_transformation(t, extend_collection=True)
+        tsc.apply_filter(ContainsSpecieFilter(['Zn2+', 'Be2+', 'Mn4+'],
+                                              strict_compare=True, AND=False))
+        return tsc
+
+    def test_iter(self):
+        tsc = self.get_transmuter()
+        # nothing is evaluated before iteration
+        self.assertEqual(len(tsc.stages), 5)
+        tstructs = list(tsc)
+        self.assertEqual(len(tstructs), 16)
+        for x in tstructs:
+            self.assertEqual(len(x), 5)
+            self.assertEqual(x.as_dict()['history'][-1]['@class'],
+                             'ContainsSpecieFilter')
+
+        tstructs = list(self.get_transmuter(ncores=2))
+        self.assertEqual(len(tstructs), 16)
+
+    def test_lazy_input(self):
+        consumed = []
+
+        def inputs():
+            for i in range(6):
+                consumed.append(i)
+                yield self.structures[0].copy()
+
+        for ncores in [None, 2]:
+            del consumed[:]
+            tsc = StreamingTransmuter.from_structures(
+                inputs(), [RemoveSpeciesTransformation('O')], ncores=ncores)
+            tstructs = iter(tsc)
+            next(tstructs)
+            # with ncores, the pool reads up to ncores structures ahead
+            self.assertLessEqual(len(consumed), ncores or 1)
+            self.assertGreaterEqual(len(consumed), 1)
+            self.assertEqual(len(list(tstructs)), 5)
+            self.assertEqual(len(consumed), 6)
+
+    def test_list_input(self):
+        tstructs = [TransformedStructure(s, []) for s in self.structures]
+        for ncores in [None, 2]:
+            tsc = StreamingTransmuter(tstructs, self.trans, ncores=ncores)
+            self.assertEqual(len(list(tsc)), 2)
+            self.assertEqual(len(list(tsc)), 2)
+            for ts, s in zip(tstructs, self.structures):
+                self.assertEqual(len(ts), 0)
+                self.assertEqual(ts.final_structure, s)
+
+    def test_write_json(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            fnames = self.get_transmuter().write_json(tmp_dir, batch_size=5)
+            self.assertEqual(len(fnames), 4)
+            self.assertEqual(sum(len(loadfn(f)) for f in fnames), 16)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
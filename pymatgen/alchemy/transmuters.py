@@ -9,6 +9,10 @@ Transmuters are essentially classes that generate TransformedStructures from
 various data sources. They enable the high-throughput generation of new
 structures and input files.
 
+The StreamingTransmuter evaluates a chain of transformations and filters
+lazily and depth-first, for chains of one-to-many transformations whose
+intermediate results would not fit in memory.
+
 It also includes the helper function, batch_write_vasp_input to generate an
 entire directory of vasp input files for running.
 """
@@ -24,10 +28,16 @@ __date__ = "Mar 4, 2012"
 
 import os
 import re
+import copy
+import itertools
+import threading
 
 from multiprocessing import Pool
+from monty.serialization import dumpfn
 from pymatgen.alchemy.materials import TransformedStructure
+from pymatgen.alchemy.filters import AbstractStructureFilter
 from pymatgen.io.vasp.sets import MPRelaxSet
+from pymatgen.util.parallel import SharedArgsPool
 
 
 class StandardTransmuter:
@@ -347,6 +357,171 @@ class PoscarTransmuter(StandardTransmuter):
                                   extend_collection=extend_collection)
 
 
+class StreamingTransmuter:
+    """
+    A transmuter that composes transformations and structure filters into a
+    pipeline which is evaluated lazily and depth-first. Each input structure
+    is pushed through the entire chain before the next one is read, so only
+    the alternatives along the current branch are held in memory, and
+    filters are applied as soon as a structure reaches them rather than
+    after a one-to-many transformation has been applied to every structure.
+
+    Iterating over the transmuter yields the final TransformedStructures.
+    The input TransformedStructures are not modified, so the transmuter can
+    be iterated over several times, unless it was initialized with a
+    generator.
+
+    With ncores, the input structures are distributed over a single process
+    pool that is kept for the whole iteration, and each chain runs entirely
+    in one worker. No more than ncores input structures are read ahead of
+    the results, and results are yielded in input order as soon as they are
+    available. A worker returns the final structures of a chain together, so
+    these, but not the intermediate ones, are held in memory for each input.
+    The stages are sent once to each worker, so filters that accumulate
+    state, such as the RemoveDuplicatesFilter, see the structures of all the
+    chains processed by their own worker, but not those of the other
+    workers.
+    """
+
+    def __init__(self, transformed_structures, transformations=None,
+                 extend_collection=0, ncores=None):
+        """
+        Args:
+            transformed_structures: Iterable of input TransformedStructures.
+                Can be a generator.
+            transformations ([Transformations]): Transformations to be
+                applied to all structures.
+            extend_collection (int): Whether to use more than one output
+                structure from one-to-many transformations. extend_collection
+                can be an int, which determines the maximum branching for each
+                transformation.
+            ncores (int): Number of processes over which input structures are
+                distributed. Default is None, which implies serial.
+        """
+        self.transformed_structures = transformed_structures
+        self.ncores = ncores
+        self.stages = []
+        if transformations is not None:
+            for trans in transformations:
+                self.append_transformation(trans,
+                                           extend_collection=extend_collection)
+
+    def append_transformation(self, transformation, extend_collection=False):
+        """
+        Appends a transformation stage to the pipeline. Nothing is evaluated
+        until the transmuter is iterated over.
+
+        Args:
+            transformation: Transformation to append
+            extend_collection: Whether to use more than one output structure
+                from one-to-many transformations. extend_collection can be a
+                number, which determines the maximum branching for each
+                transformation.
+        """
+        self.stages.append((transformation, extend_collection))
+
+    def extend_transformations(self, transformations):
+        """
+        Extends a sequence of transformation stages to the pipeline.
+
+        Args:
+            transformations: Sequence of Transformations
+        """
+        for t in transformations:
+            self.append_transformation(t)
+
+    def apply_filter(self, structure_filter):
+        """
+        Appends a filter stage to the pipeline. Structures failing the filter
+        are not passed on to subsequent stages.
+
+        Args:
+            structure_filter: StructureFilter to apply.
+        """
+        self.stages.append((structure_filter, None))
+
+    def __iter__(self):
+        if self.ncores:
+            # Pool.imap would read the whole input up front, so the input is
+            # throttled to ncores structures in flight
+            window = threading.Semaphore(self.ncores)
+            stop = threading.Event()
+
+            def inputs():
+                for ts in self.transformed_structures:
+                    window.acquire()
+                    if stop.is_set():
+                        return
+                    yield ts
+
+            with SharedArgsPool(self.ncores, _apply_stages,
+                                (self.stages,)) as p:
+                try:
+                    for tstructs in p.imap(inputs()):
+                        for ts in tstructs:
+                            yield ts
+                        window.release()
+                finally:
+                    # unblock the input thread of the pool if the iteration
+                    # is stopped early
+                    stop.set()
+                    window.release()
+        else:
+            for ts in self.transformed_structures:
+                for new in _iter_stages(copy.deepcopy(ts), self.stages):
+                    yield new
+
+    def write_json(self, output_dir=".", batch_size=1000,
+                   prefix="transformed_structures"):
+        """
+        Evaluates the pipeline and writes the final TransformedStructures to
+        disk in batches, so that at most batch_size of them are held in
+        memory. Files are named output_dir/{prefix}_{batch number}.json.
+
+        Args:
+            output_dir (str): Directory to write to. Created if not present.
+            batch_size (int): Number of TransformedStructures per file.
+            prefix (str): Prefix of the filenames.
+
+        Returns:
+            List of filenames written.
+        """
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        filenames = []
+        tstructs = iter(self)
+        while True:
+            batch = list(itertools.islice(tstructs, batch_size))
+            if not batch:
+                break
+            fname = os.path.join(output_dir, "{}_{}.json".format(
+                prefix, len(filenames)))
+            dumpfn(batch, fname)
+            filenames.append(fname)
+        return filenames
+
+    @staticmethod
+    def from_structures(structures, transformations=None, extend_collection=0,
+                        ncores=None):
+        """
+        Alternative constructor from structures rather than
+        TransformedStructures.
+
+        Args:
+            structures: Iterable of structures. Can be a generator.
+            transformations: New transformations to be applied to all
+                structures
+            extend_collection: Same meaning as in __init__.
+            ncores: Same meaning as in __init__.
+
+        Returns:
+            StreamingTransmuter
+        """
+        tstructs = (TransformedStructure(s, []) for s in structures)
+        return StreamingTransmuter(tstructs, transformations,
+                                   extend_collection, ncores=ncores)
+
+
 def batch_write_vasp_input(transformed_structures, vasp_input_set=MPRelaxSet,
                            output_dir=".", create_directory=True,
                            subfolder=None,
@@ -408,3 +583,45 @@ def _apply_transformation(inputs):
     if new:
         o.extend(new)
     return o
+
+
+def _iter_stages(ts, stages):
+    """
+    Depth-first generator over the TransformedStructures obtained by applying
+    a sequence of transformation and filter stages to a TransformedStructure.
+
+    Args:
+        ts: Input TransformedStructure. It is modified in place.
+        stages: List of (transformation, extend_collection) or
+            (structure_filter, None) tuples.
+    """
+    if not stages:
+        yield ts
+        return
+    stage, extend_collection = stages[0]
+    if isinstance(stage, AbstractStructureFilter):
+        if stage.test(ts.final_structure):
+            ts.append_filter(stage)
+            for new in _iter_stages(ts, stages[1:]):
+                yield new
+        return
+    alts = ts.append_transformation(stage, extend_collection)
+    for x in itertools.chain([ts], alts or []):
+        for new in _iter_stages(x, stages[1:]):
+            yield new
+
+
+def _apply_stages(ts, stages):
+    """
+    Helper method for multiprocessing in the StreamingTransmuter. Must not be
+    in the class so that it can be pickled.
+
+    Args:
+        ts: Input TransformedStructure.
+        stages: Stages of the StreamingTransmuter, shared by all the inputs
+            processed by a worker.
+
+    Returns:
+        List of final TransformedStructures.
+    """
+    return list(_iter_stages(ts, stages))
@@ -265,40 +265,34 @@ class AdsorbateSiteFinder:
             sop = get_rot(self.slab)
             dt = Delaunay([sop.operate(m.coords)[:2] for m in mesh])
             # TODO: refactor below to properly account for >3-fold
-            for v in dt.simplices:
-                if -1 not in v:
-                    dots = []
-                    for i_corner, i_opp in zip(range(3), ((1, 2), (0, 2), (0, 1))):
-                        corner, opp = v[i_corner], [v[o] for o in i_opp]
-                        vecs = [mesh[d].coords - mesh[corner].coords for d in opp]
-                        vecs = [vec / np.linalg.norm(vec) for vec in vecs]
-                        dots.append(np.dot(*vecs))
-                        # Add bridge sites at midpoints of edges of D. Tri
-                        if 'bridge' in positions:
-                            ads_sites["bridge"].append(
-                                self.ensemble_center(mesh, opp))
-                    # Prevent addition of hollow sites in obtuse triangles
-                    obtuse = no_obtuse_hollow and (np.array(dots) < 1e-5).any()
-                    # Add hollow sites at centers of D. Tri faces
-                    if 'hollow' in positions and not obtuse:
-                        ads_sites['hollow'].append(
-                            self.ensemble_center(mesh, v))
+            simplices = dt.simplices[np.all(dt.simplices != -1, axis=1)]
+            corners = mesh.cart_coords[simplices]
+            # For each corner of each triangle, the two opposite corners
+            opp = corners[:, [(1, 2), (0, 2), (0, 1)]]
+            vecs = opp - corners[:, :, None]
+            vecs /= np.linalg.norm(vecs, axis=-1)[..., None]
+            dots = np.sum(vecs[:, :, 0] * vecs[:, :, 1], axis=-1)
+            # Add bridge sites at midpoints of edges of D. Tri
+            if 'bridge' in positions:
+                ads_sites['bridge'] = list(np.average(opp, axis=2).reshape(-1, 3))
+            # Prevent addition of hollow sites in obtuse triangles
+            obtuse = no_obtuse_hollow & np.any(dots < 1e-5, axis=1)
+            # Add hollow sites at centers of D. Tri faces
+            if 'hollow' in positions:
+                ads_sites['hollow'] = list(np.average(corners, axis=1)[~obtuse])
         ads_sites['all'] = sum(ads_sites.values(), [])
+        lattice = self.slab.lattice
         for key, sites in ads_sites.items():
             # Pare off outer sites for bridge/hollow
             if key in ['bridge', 'hollow']:
-                frac_coords = [self.slab.lattice.get_fractional_coords(ads_site)
-                               for ads_site in sites]
-                frac_coords = [frac_coord for frac_coord in frac_coords
-                               if (frac_coord[0] > 1 and frac_coord[0] < 4
-                                   and frac_coord[1] > 1 and frac_coord[1] < 4)]
-                sites = [self.slab.lattice.get_cartesian_coords(frac_coord)
-                         for frac_coord in frac_coords]
+                frac_coords = lattice.get_fractional_coords(np.reshape(sites, (-1, 3)))
+                inside = np.all((frac_coords[:, :2] > 1) & (frac_coords[:, :2] < 4), axis=1)
+                sites = list(lattice.get_cartesian_coords(frac_coords[inside]))
             if near_reduce:
                 sites = self.near_reduce(sites, threshold=near_reduce)
             if put_inside:
-                sites = [put_coord_inside(self.slab.lattice, coord)
-                         for coord in sites]
+                frac_coords = lattice.get_fractional_coords(np.reshape(sites, (-1, 3)))
+                sites = list(lattice.get_cartesian_coords(frac_coords - np.floor(frac_coords)))
             if symm_reduce:
                 sites = self.symm_reduce(sites, threshold=symm_reduce)
             sites = [site + distance * self.mvec for site in sites]
@@ -318,22 +312,16 @@ class AdsorbateSiteFinder:
         """
         surf_sg = SpacegroupAnalyzer(self.slab, 0.1)
         symm_ops = surf_sg.get_symmetry_operations()
-        unique_coords = []
         # Convert to fractional
-        coords_set = [self.slab.lattice.get_fractional_coords(coords)
-                      for coords in coords_set]
-        for coords in coords_set:
-            incoord = False
-            for op in symm_ops:
-                if in_coord_list_pbc(unique_coords, op.operate(coords),
-                                     atol=threshold):
-                    incoord = True
-                    break
-            if not incoord:
-                unique_coords += [coords]
+        coords_set = self.slab.lattice.get_fractional_coords(
+            np.reshape(coords_set, (-1, 3)))
+        # Images of every coordinate under every symmetry operation
+        rotations = np.array([op.rotation_matrix for op in symm_ops])
+        translations = np.array([op.translation_vector for op in symm_ops])
+        images = np.einsum("oij,nj->noi", rotations, coords_set) + translations
+        unique = _get_unique_indices(images, coords_set, threshold)
         # convert back to cartesian
-        return [self.slab.lattice.get_cartesian_coords(coords)
-                for coords in unique_coords]
+        return list(self.slab.lattice.get_cartesian_coords(coords_set[unique]))
 
     def near_reduce(self, coords_set, threshold=1e-4):
         """
@@ -344,14 +332,10 @@ class AdsorbateSiteFinder:
             coords_set (Nx3 array-like): list or array of coordinates
             threshold (float): threshold value for distance
         """
-        unique_coords = []
-        coords_set = [self.slab.lattice.get_fractional_coords(coords)
-                      for coords in coords_set]
-        for coord in coords_set:
-            if not in_coord_list_pbc(unique_coords, coord, threshold):
-                unique_coords += [coord]
-        return [self.slab.lattice.get_cartesian_coords(coords)
-                for coords in unique_coords]
+        coords_set = self.slab.lattice.get_fractional_coords(
+            np.reshape(coords_set, (-1, 3)))
+        unique = _get_unique_indices(coords_set[:, None], coords_set, threshold)
+        return list(self.slab.lattice.get_cartesian_coords(coords_set[unique]))
 
     def ensemble_center(self, site_list, indices, cartesian=True):
         """
@@ -438,9 +422,7 @@ class AdsorbateSiteFinder:
                 call to self.find_adsorption_sites, e.g. {"distance":2.0}
         """
         if repeat is None:
-            xrep = np.ceil(min_lw / np.linalg.norm(self.slab.lattice.matrix[0]))
-            yrep = np.ceil(min_lw / np.linalg.norm(self.slab.lattice.matrix[1]))
-            repeat = [xrep, yrep, 1]
+            repeat = self._get_repeat(min_lw)
         structs = []
 
         for coords in self.find_adsorption_sites(**find_args)['all']:
@@ -448,6 +430,72 @@ class AdsorbateSiteFinder:
                 molecule, coords, repeat=repeat, reorient=reorient))
         return structs
 
+    def iter_adsorption_structures(self, molecules, repeats=None, min_lw=5.0,
+                                   reorient=True, find_args={}):
+        """
+        Lazily generates the adsorption structures for several molecular
+        adsorbates and coverages. The adsorption sites are found once for
+        all adsorbates, each supercell is built once per repeat and each
+        adsorbate is reoriented once. The input molecules are not modified.
+
+        Args:
+            molecules (list of Molecules): molecules corresponding to
+                the adsorbates
+            repeats (list of 3-tuples or lists): repeat arguments for
+                supercell generation, one per coverage
+            min_lw (float): minimum length and width of the slab, only used
+                if repeats is None
+            reorient (bool): flag on whether or not to reorient adsorbates
+                along the miller index
+            find_args (dict): dictionary of arguments to be passed to the
+                call to self.find_adsorption_sites, e.g. {"distance":2.0}
+
+        Yields:
+            (index of the molecule, repeat, adsorption site coordinates,
+            adsorption structure), looping over repeats, then molecules,
+            then adsorption sites.
+        """
+        if repeats is None:
+            repeats = [self._get_repeat(min_lw)]
+        ads_coords = self.find_adsorption_sites(**find_args)['all']
+
+        sop = get_rot(self.slab)
+        site_props = self.slab.site_properties
+        ads_molecules = []
+        for molecule in molecules:
+            molecule = molecule.copy()
+            if reorient:
+                # Reorient the molecule along slab m_index
+                molecule.apply_operation(sop.inverse)
+            if 'surface_properties' in site_props:
+                molecule.add_site_property("surface_properties",
+                                           ["adsorbate"] * molecule.num_sites)
+            if 'selective_dynamics' in site_props:
+                molecule.add_site_property("selective_dynamics",
+                                           [[True, True, True]] * molecule.num_sites)
+            ads_molecules.append(molecule)
+
+        for repeat in repeats:
+            supercell = self.slab.copy()
+            supercell.make_supercell(repeat)
+            for n, molecule in enumerate(ads_molecules):
+                for coords in ads_coords:
+                    struct = supercell.copy()
+                    for site in molecule:
+                        struct.append(site.specie, coords + site.coords,
+                                      coords_are_cartesian=True,
+                                      properties=site.properties)
+                    yield n, repeat, coords, struct
+
+    def _get_repeat(self, min_lw):
+        """
+        Gets the repeat of the slab along a and b for a minimum
+        length and width of min_lw
+        """
+        xrep = np.ceil(min_lw / np.linalg.norm(self.slab.lattice.matrix[0]))
+        yrep = np.ceil(min_lw / np.linalg.norm(self.slab.lattice.matrix[1]))
+        return [xrep, yrep, 1]
+
     def adsorb_both_surfaces(self, molecule, repeat=None, min_lw=5.0,
                              reorient=True, find_args={}):
         """
@@ -564,6 +612,32 @@ class AdsorbateSiteFinder:
         return [s[0] for s in matcher.group_structures(substituted_slabs)]
 
 
+def _get_unique_indices(images, fcoords, atol):
+    """
+    Greedily selects coordinates, keeping a coordinate only if none of
+    its images lies within atol of a previously kept coordinate. Distances
+    are compared per fractional component with periodic boundary conditions,
+    as in in_coord_list_pbc.
+
+    Args:
+        images (NxMx3 array): M images of each of the N fractional coordinates
+        fcoords (Nx3 array): fractional coordinates
+        atol (float): tolerance
+
+    Returns:
+        list of the indices of the kept coordinates
+    """
+    unique = []
+    for i, image in enumerate(images):
+        if unique:
+            fdist = fcoords[unique][None, :] - image[:, None]
+            fdist -= np.round(fdist)
+            if np.any(np.all(np.abs(fdist) < atol, axis=-1)):
+                continue
+        unique.append(i)
+    return unique
+
+
 def get_mi_vec(slab):
     """
     Convenience function which returns the unit vector aligned
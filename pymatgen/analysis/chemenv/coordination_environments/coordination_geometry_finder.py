@@ -33,6 +33,7 @@ from pymatgen.core.structure import Structure
 from pymatgen.core.lattice import Lattice
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 from pymatgen.analysis.bond_valence import BVAnalyzer
+from pymatgen.util.parallel import SharedArgsPool
 import numpy as np
 
 from random import shuffle
@@ -210,6 +211,15 @@ class AbstractGeometry:
             return self._points_wocs_ctwcc
         return self._points_wocs_ctwcc.take(permutation, axis=0)
 
+    def stacked_points_wcs_ctwcc(self, permutations):
+        """
+        Returns the points (with the central site) of all the given permutations stacked in an array of shape
+        (number of permutations, number of points, 3), i.e. the stacked equivalent of points_wcs_ctwcc.
+        """
+        permutations = np.array(permutations, np.int)
+        centres = np.broadcast_to(self._points_wcs_ctwcc[0:1], (len(permutations), 1, 3))
+        return np.concatenate((centres, self._points_wocs_ctwcc.take(permutations, axis=0)), axis=1)
+
     def points_wcs_ctwocc(self, permutation=None):
         if permutation is None:
             return self._points_wcs_ctwocc
@@ -288,6 +298,39 @@ def find_scaling_factor(points_distorted, points_perfect, rot):
     return num / denom, rotated_coords, points_perfect
 
 
+def batched_symmetry_measure(points_distorted, points_perfect):
+    """
+    Computes the continuous symmetry measures of a stack of (distorted) sets of points, e.g., all the permutations
+    of a given local environment, with respect to the (perfect) set of points "points_perfect". The rotations and
+    scaling factors of all the sets of points are obtained at once with a single batched singular value
+    decomposition, giving the same results as calling symmetry_measure on each set of points.
+    :param points_distorted: Array of shape (P, N, 3) of the P (distorted) sets of N points.
+    :param points_perfect: Array of shape (N, 3) of the "perfect" points describing a given model polyhedron.
+    :return: Dictionary with the continuous symmetry measures (shape (P,)), the scaling factors (shape (P,)) and the
+             rotation matrices (shape (P, 3, 3)) of the P sets of points
+    """
+    points_distorted = np.asarray(points_distorted, dtype=np.float)
+    points_perfect = np.asarray(points_perfect, dtype=np.float)
+    nperms, npoints = points_distorted.shape[:2]
+    # When there is only one point, the symmetry measure is 0.0 by definition
+    if npoints == 1:
+        return {'symmetry_measure': np.zeros(nperms), 'scaling_factor': np.array([None] * nperms),
+                'rotation_matrix': np.array([None] * nperms)}
+    # Kabsch rotations aligning each set of distorted points to the perfect points (see find_rotation)
+    H = np.einsum('pni,nj->pij', points_distorted, points_perfect)
+    U, S, Vt = np.linalg.svd(H)
+    rot = np.matmul(np.transpose(Vt, (0, 2, 1)), np.transpose(U, (0, 2, 1)))
+    # Scaling factors (see find_scaling_factor)
+    rotated_coords = np.einsum('pij,pnj->pni', rot, points_distorted)
+    scaling_factor = np.einsum('pni,ni->p', rotated_coords, points_perfect) / \
+        np.einsum('pni,pni->p', rotated_coords, rotated_coords)
+    # Continuous symmetry measures [see Eq. 1 in Pinsky et al., Inorganic Chemistry 37, 5575 (1998)]
+    diff = points_perfect - scaling_factor[:, None, None] * rotated_coords
+    num = np.einsum('pni,pni->p', diff, diff)
+    denom = np.tensordot(points_perfect, points_perfect)
+    return {'symmetry_measure': num / denom * 100.0, 'scaling_factor': scaling_factor, 'rotation_matrix': rot}
+
+
 class LocalGeometryFinder:
     """
     Main class used to find the local environments in a structure
@@ -471,7 +514,8 @@ class LocalGeometryFinder:
                                        voronoi_normalized_angle_tolerance=PRESETS['DEFAULT']
                                        ['voronoi_normalized_angle_tolerance'],
                                        recompute=None,
-                                       optimization=PRESETS['DEFAULT']['optimization']):
+                                       optimization=PRESETS['DEFAULT']['optimization'],
+                                       ncores=None):
         """
         Computes and returns the StructureEnvironments object containing all the information about the coordination
         environments in the structure
@@ -501,6 +545,9 @@ class LocalGeometryFinder:
         :param recompute: whether to recompute the sites already computed (when initial_structure_environments
                           is not None)
         :param optimization: optimization algorithm
+        :param ncores: If not set to None, the sites are distributed over a pool of ncores processes. The results
+                       are merged in the order of the sites, the time spent on each site being stored in the
+                       "sites_info" of the StructureEnvironments info.
         :return: The StructureEnvironments object containing all the information about the coordination
         environments in the structure
         """
@@ -615,6 +662,17 @@ class LocalGeometryFinder:
             self.detailed_voronoi.local_planes = [None]*len(self.structure)
             self.detailed_voronoi.separations = [None]*len(self.structure)
 
+        site_kwargs = {'all_cns': all_cns, 'recompute': do_recompute,
+                       'additional_conditions': additional_conditions, 'valences': valences,
+                       'get_from_hints': get_from_hints, 'min_cn': min_cn, 'max_cn': max_cn,
+                       'optimization': optimization}
+        if ncores and len(sites_indices) > 1:
+            self._compute_sites_environments_parallel(se=se, sites_indices=sites_indices, site_kwargs=site_kwargs,
+                                                      ncores=ncores, timelimit=timelimit, time_init=time_init)
+            time_end = time.clock()
+            logging.info('    ... compute_structure_environments ended in {:.2f} seconds'.format(time_end-time_init))
+            return se
+
         # Loop on all the sites
         for isite in range(len(self.structure)):
             if isite not in sites_indices:
@@ -629,101 +687,147 @@ class LocalGeometryFinder:
                 continue
             logging.info(' ... in site #{:d}/{:d} ({})'.format(isite, len(self.structure),
                                                                self.structure[isite].species_string))
-            t1 = time.clock()
-            if optimization > 0:
-                self.detailed_voronoi.local_planes[isite] = OrderedDict()
-                self.detailed_voronoi.separations[isite] = {}
-            se.init_neighbors_sets(isite=isite, additional_conditions=additional_conditions, valences=valences)
-
-            to_add_from_hints = []
-            nb_sets_info = {}
-
-            for cn, nb_sets in se.neighbors_sets[isite].items():
-                if cn not in all_cns:
-                    continue
-                for inb_set, nb_set in enumerate(nb_sets):
-                    logging.debug('    ... getting environments for nb_set ({:d}, {:d})'.format(cn, inb_set))
-                    tnbset1 = time.clock()
-                    ce = self.update_nb_set_environments(se=se, isite=isite, cn=cn, inb_set=inb_set, nb_set=nb_set,
-                                                         recompute=do_recompute, optimization=optimization)
-                    tnbset2 = time.clock()
-                    if cn not in nb_sets_info:
-                        nb_sets_info[cn] = {}
-                    nb_sets_info[cn][inb_set] = {'time': tnbset2 - tnbset1}
-                    if get_from_hints:
-                        for cg_symbol, cg_dict in ce:
-                            cg = self.allcg[cg_symbol]
-                            # Get possibly missing neighbors sets
-                            if cg.neighbors_sets_hints is None:
-                                continue
-                            logging.debug('       ... getting hints from cg with mp_symbol "{}" ...'.format(cg_symbol))
-                            hints_info = {'csm': cg_dict['symmetry_measure'],
-                                          'nb_set': nb_set,
-                                          'permutation': cg_dict['permutation']}
-                            for nb_sets_hints in cg.neighbors_sets_hints:
-                                suggested_nb_set_voronoi_indices = nb_sets_hints.hints(hints_info)
-                                for inew, new_nb_set_voronoi_indices in enumerate(suggested_nb_set_voronoi_indices):
-                                    logging.debug('           hint # {:d}'.format(inew))
-                                    new_nb_set = se.NeighborsSet(structure=se.structure, isite=isite,
-                                                                 detailed_voronoi=se.voronoi,
-                                                                 site_voronoi_indices=new_nb_set_voronoi_indices,
-                                                                 sources={'origin': 'nb_set_hints',
-                                                                          'hints_type': nb_sets_hints.hints_type,
-                                                                          'suggestion_index': inew,
-                                                                          'cn_map_source': [cn, inb_set],
-                                                                          'cg_source_symbol': cg_symbol})
-                                    cn_new_nb_set = len(new_nb_set)
-                                    if max_cn is not None and cn_new_nb_set > max_cn:
-                                        continue
-                                    if min_cn is not None and cn_new_nb_set < min_cn:
-                                        continue
-                                    if new_nb_set in [ta['new_nb_set'] for ta in to_add_from_hints]:
-                                        has_nb_set = True
-                                    elif not cn_new_nb_set in se.neighbors_sets[isite]:
-                                        has_nb_set = False
-                                    else:
-                                        has_nb_set = new_nb_set in se.neighbors_sets[isite][cn_new_nb_set]
-                                    if not has_nb_set:
-                                        to_add_from_hints.append({'isite': isite,
-                                                                  'new_nb_set': new_nb_set,
-                                                                  'cn_new_nb_set': cn_new_nb_set})
-                                        logging.debug('              => to be computed'.format(inew))
-                                    else:
-                                        logging.debug('              => already present'.format(inew))
-            logging.debug('    ... getting environments for nb_sets added from hints')
-            for missing_nb_set_to_add in to_add_from_hints:
-                se.add_neighbors_set(isite=isite, nb_set=missing_nb_set_to_add['new_nb_set'])
-            for missing_nb_set_to_add in to_add_from_hints:
-                isite_new_nb_set = missing_nb_set_to_add['isite']
-                cn_new_nb_set = missing_nb_set_to_add['cn_new_nb_set']
-                new_nb_set = missing_nb_set_to_add['new_nb_set']
-                inew_nb_set = se.neighbors_sets[isite_new_nb_set][cn_new_nb_set].index(new_nb_set)
-                logging.debug('    ... getting environments for nb_set ({:d}, {:d}) - '
-                              'from hints'.format(cn_new_nb_set, inew_nb_set))
-                tnbset1 = time.clock()
-                self.update_nb_set_environments(se=se,
-                                                isite=isite_new_nb_set,
-                                                cn=cn_new_nb_set,
-                                                inb_set=inew_nb_set,
-                                                nb_set=new_nb_set,
-                                                optimization=optimization)
-                tnbset2 = time.clock()
-                if cn not in nb_sets_info:
-                    nb_sets_info[cn] = {}
-                nb_sets_info[cn][inew_nb_set] = {'time': tnbset2 - tnbset1}
-            t2 = time.clock()
-            se.update_site_info(isite=isite, info_dict={'time': t2 - t1, 'nb_sets_info': nb_sets_info})
+            time_site = self._compute_site_environments(se=se, isite=isite, **site_kwargs)
             if timelimit is not None:
-                time_elapsed = t2 - time_init
+                time_elapsed = time.clock() - time_init
                 time_left = timelimit - time_elapsed
                 if time_left < 2.0 * max_time_one_site:
                     breakit = True
-            max_time_one_site = max(max_time_one_site, t2 - t1)
-            logging.info('    ... computed in {:.2f} seconds'.format(t2 - t1))
+            max_time_one_site = max(max_time_one_site, time_site)
+            logging.info('    ... computed in {:.2f} seconds'.format(time_site))
         time_end = time.clock()
         logging.info('    ... compute_structure_environments ended in {:.2f} seconds'.format(time_end-time_init))
         return se
 
+    def _compute_site_environments(self, se, isite, all_cns, recompute, additional_conditions, valences,
+                                   get_from_hints, min_cn, max_cn, optimization):
+        """
+        Computes the coordination environments of all the neighbors sets of site isite and stores them in the
+        StructureEnvironments object se. The DetailedVoronoiContainer has to be set up before.
+        :return: The time spent on this site
+        """
+        t1 = time.clock()
+        if optimization > 0:
+            self.detailed_voronoi.local_planes[isite] = OrderedDict()
+            self.detailed_voronoi.separations[isite] = {}
+        se.init_neighbors_sets(isite=isite, additional_conditions=additional_conditions, valences=valences)
+
+        to_add_from_hints = []
+        nb_sets_info = {}
+
+        for cn, nb_sets in se.neighbors_sets[isite].items():
+            if cn not in all_cns:
+                continue
+            for inb_set, nb_set in enumerate(nb_sets):
+                logging.debug('    ... getting environments for nb_set ({:d}, {:d})'.format(cn, inb_set))
+                tnbset1 = time.clock()
+                ce = self.update_nb_set_environments(se=se, isite=isite, cn=cn, inb_set=inb_set, nb_set=nb_set,
+                                                     recompute=recompute, optimization=optimization)
+                tnbset2 = time.clock()
+                if cn not in nb_sets_info:
+                    nb_sets_info[cn] = {}
+                nb_sets_info[cn][inb_set] = {'time': tnbset2 - tnbset1}
+                if get_from_hints:
+                    for cg_symbol, cg_dict in ce:
+                        cg = self.allcg[cg_symbol]
+                        # Get possibly missing neighbors sets
+                        if cg.neighbors_sets_hints is None:
+                            continue
+                        logging.debug('       ... getting hints from cg with mp_symbol "{}" ...'.format(cg_symbol))
+                        hints_info = {'csm': cg_dict['symmetry_measure'],
+                                      'nb_set': nb_set,
+                                      'permutation': cg_dict['permutation']}
+                        for nb_sets_hints in cg.neighbors_sets_hints:
+                            suggested_nb_set_voronoi_indices = nb_sets_hints.hints(hints_info)
+                            for inew, new_nb_set_voronoi_indices in enumerate(suggested_nb_set_voronoi_indices):
+                                logging.debug('           hint # {:d}'.format(inew))
+                                new_nb_set = se.NeighborsSet(structure=se.structure, isite=isite,
+                                                             detailed_voronoi=se.voronoi,
+                                                             site_voronoi_indices=new_nb_set_voronoi_indices,
+                                                             sources={'origin': 'nb_set_hints',
+                                                                      'hints_type': nb_sets_hints.hints_type,
+                                                                      'suggestion_index': inew,
+                                                                      'cn_map_source': [cn, inb_set],
+                                                                      'cg_source_symbol': cg_symbol})
+                                cn_new_nb_set = len(new_nb_set)
+                                if max_cn is not None and cn_new_nb_set > max_cn:
+                                    continue
+                                if min_cn is not None and cn_new_nb_set < min_cn:
+                                    continue
+                                if new_nb_set in [ta['new_nb_set'] for ta in to_add_from_hints]:
+                                    has_nb_set = True
+                                elif not cn_new_nb_set in se.neighbors_sets[isite]:
+                                    has_nb_set = False
+                                else:
+                                    has_nb_set = new_nb_set in se.neighbors_sets[isite][cn_new_nb_set]
+                                if not has_nb_set:
+                                    to_add_from_hints.append({'isite': isite,
+                                                              'new_nb_set': new_nb_set,
+                                                              'cn_new_nb_set': cn_new_nb_set})
+                                    logging.debug('              => to be computed'.format(inew))
+                                else:
+                                    logging.debug('              => already present'.format(inew))
+        logging.debug('    ... getting environments for nb_sets added from hints')
+        for missing_nb_set_to_add in to_add_from_hints:
+            se.add_neighbors_set(isite=isite, nb_set=missing_nb_set_to_add['new_nb_set'])
+        for missing_nb_set_to_add in to_add_from_hints:
+            isite_new_nb_set = missing_nb_set_to_add['isite']
+            cn_new_nb_set = missing_nb_set_to_add['cn_new_nb_set']
+            new_nb_set = missing_nb_set_to_add['new_nb_set']
+            inew_nb_set = se.neighbors_sets[isite_new_nb_set][cn_new_nb_set].index(new_nb_set)
+            logging.debug('    ... getting environments for nb_set ({:d}, {:d}) - '
+                          'from hints'.format(cn_new_nb_set, inew_nb_set))
+            tnbset1 = time.clock()
+            self.update_nb_set_environments(se=se,
+                                            isite=isite_new_nb_set,
+                                            cn=cn_new_nb_set,
+                                            inb_set=inew_nb_set,
+                                            nb_set=new_nb_set,
+                                            optimization=optimization)
+            tnbset2 = time.clock()
+            if cn not in nb_sets_info:
+                nb_sets_info[cn] = {}
+            nb_sets_info[cn][inew_nb_set] = {'time': tnbset2 - tnbset1}
+        t2 = time.clock()
+        se.update_site_info(isite=isite, info_dict={'time': t2 - t1, 'nb_sets_info': nb_sets_info})
+        return t2 - t1
+
+    def _compute_sites_environments_parallel(self, se, sites_indices, site_kwargs, ncores, timelimit=None,
+                                             time_init=None):
+        """
+        Computes the coordination environments of the sites in sites_indices over a pool of ncores processes.
+        Each process computes whole sites on its own copy of the LocalGeometryFinder and of the
+        StructureEnvironments object. The results are merged back into se in the order of the site indices so that
+        the final StructureEnvironments object does not depend on the scheduling of the sites. When the timelimit is
+        about to be reached, the remaining sites are skipped as in the serial loop.
+        """
+        max_time_one_site = 0.0
+        if timelimit is not None:
+            # The sites are computed in other processes, the wall time is used to check the timelimit
+            time_spent = time.clock() - time_init
+            walltime_init = time.time()
+        with SharedArgsPool(ncores, _compute_site_environments_worker, (self, se, site_kwargs)) as p:
+            for isite, neighbors_sets, ce_list, site_info, voronoi_info in p.imap(sites_indices):
+                if neighbors_sets is not None:
+                    se.neighbors_sets[isite] = {cn: [se.NeighborsSet.from_dict(nb_set_dict,
+                                                                               structure=se.structure,
+                                                                               detailed_voronoi=se.voronoi)
+                                                     for nb_set_dict in nb_sets_dicts]
+                                                for cn, nb_sets_dicts in neighbors_sets.items()}
+                se.ce_list[isite] = ce_list
+                se.update_site_info(isite=isite, info_dict=site_info)
+                if voronoi_info is not None:
+                    self.detailed_voronoi.local_planes[isite], self.detailed_voronoi.separations[isite] = voronoi_info
+                logging.info(' ... site #{:d}/{:d} ({}) computed in {:.2f} seconds'
+                             ''.format(isite, len(self.structure), self.structure[isite].species_string,
+                                       site_info['time']))
+                if timelimit is not None:
+                    time_left = timelimit - time_spent - (time.time() - walltime_init)
+                    max_time_one_site = max(max_time_one_site, site_info['time'])
+                    if time_left < 2.0 * max_time_one_site:
+                        logging.info(' ... remaining sites skipped (timelimit)')
+                        break
+
     def update_nb_set_environments(self, se, isite, cn, inb_set, nb_set, recompute=False, optimization=None):
         ce = se.get_coordination_environments(isite=isite, cn=cn, nb_set=nb_set)
         if ce is not None and not recompute:
@@ -982,7 +1086,8 @@ class LocalGeometryFinder:
             points_perfect = self.perfect_geometry.points_wcs_ctwcc()
             cgsm = self.coordination_geometry_symmetry_measures(geometry,
                                                                 points_perfect=points_perfect,
-                                                                optimization=optimization)
+                                                                optimization=optimization,
+                                                                only_minimum=only_minimum)
             result, permutations, algos, local2perfect_maps, perfect2local_maps = cgsm
             if only_minimum:
                 if len(result) > 0:
@@ -1147,12 +1252,15 @@ class LocalGeometryFinder:
     def coordination_geometry_symmetry_measures(self, coordination_geometry,
                                                 tested_permutations=False,
                                                 points_perfect=None,
-                                                optimization=None):
+                                                optimization=None,
+                                                only_minimum=False):
         """
         Returns the symmetry measures of a given coordination_geometry for a set of permutations depending on
         the permutation setup. Depending on the parameters of the LocalGeometryFinder and on the coordination
          geometry, different methods are called.
         :param coordination_geometry: Coordination geometry for which the symmetry measures are looked for
+        :param only_minimum: If True, explicit permutations only return the permutation with the minimum symmetry
+                             measure
         :return: the symmetry measures of a given coordination_geometry for a set of permutations
         :raise: NotImplementedError if the permutation_setup does not exists
         """
@@ -1170,7 +1278,8 @@ class LocalGeometryFinder:
                 return self.coordination_geometry_symmetry_measures_standard(
                     coordination_geometry, algo,
                     points_perfect=points_perfect,
-                    optimization=optimization)
+                    optimization=optimization,
+                    only_minimum=only_minimum)
             if algo.algorithm_type == SEPARATION_PLANE:
                 cgsm = self.coordination_geometry_symmetry_measures_separation_plane(
                     coordination_geometry,
@@ -1223,71 +1332,50 @@ class LocalGeometryFinder:
                                                          coordination_geometry,
                                                          algo,
                                                          points_perfect=None,
-                                                         optimization=None):
+                                                         optimization=None,
+                                                         only_minimum=False):
         """
         Returns the symmetry measures for a set of permutations (whose setup depends on the coordination geometry)
         for the coordination geometry "coordination_geometry". Standard implementation looking for the symmetry
-        measures of each permutation
+        measures of each permutation. The symmetry measures of all the permutations are computed at once using
+        batched_symmetry_measure.
 
         :param coordination_geometry: The coordination geometry to be investigated
+        :param only_minimum: If True, only the permutation with the minimum symmetry measure is returned, which
+                             avoids setting up the result dictionaries and maps of all the other permutations
         :return: The symmetry measures for the given coordination geometry for each permutation investigated
         """
-        # permutations_symmetry_measures = np.zeros(len(algo.permutations),
-        #                                           np.float)
-        if optimization == 2:
-            permutations_symmetry_measures = [None] * len(algo.permutations)
-            permutations = list()
-            algos = list()
-            local2perfect_maps = list()
-            perfect2local_maps = list()
-            for iperm, perm in enumerate(algo.permutations):
-
-                local2perfect_map = {}
-                perfect2local_map = {}
-                permutations.append(perm)
-                for iperfect, ii in enumerate(perm):
-                    perfect2local_map[iperfect] = ii
-                    local2perfect_map[ii] = iperfect
-                local2perfect_maps.append(local2perfect_map)
-                perfect2local_maps.append(perfect2local_map)
-
-                points_distorted = self.local_geometry.points_wcs_ctwcc(
-                    permutation=perm)
-
-                sm_info = symmetry_measure(points_distorted=points_distorted,
-                                              points_perfect=points_perfect)
-                sm_info['translation_vector'] = self.local_geometry.centroid_with_centre
-
-                permutations_symmetry_measures[iperm] = sm_info
-                algos.append(str(algo))
-            return permutations_symmetry_measures, permutations, algos, local2perfect_maps, perfect2local_maps
+        perms = algo.permutations
+        sm_infos = batched_symmetry_measure(points_distorted=self.local_geometry.stacked_points_wcs_ctwcc(perms),
+                                            points_perfect=points_perfect)
+
+        if only_minimum:
+            iperms = [int(np.argmin(sm_infos['symmetry_measure']))]
         else:
-            permutations_symmetry_measures = [None] * len(algo.permutations)
-            permutations = list()
-            algos = list()
-            local2perfect_maps = list()
-            perfect2local_maps = list()
-            for iperm, perm in enumerate(algo.permutations):
-
-                local2perfect_map = {}
-                perfect2local_map = {}
-                permutations.append(perm)
-                for iperfect, ii in enumerate(perm):
-                    perfect2local_map[iperfect] = ii
-                    local2perfect_map[ii] = iperfect
-                local2perfect_maps.append(local2perfect_map)
-                perfect2local_maps.append(perfect2local_map)
-
-                points_distorted = self.local_geometry.points_wcs_ctwcc(
-                    permutation=perm)
-
-                sm_info = symmetry_measure(points_distorted=points_distorted,
-                                           points_perfect=points_perfect)
-                sm_info['translation_vector'] = self.local_geometry.centroid_with_centre
-
-                permutations_symmetry_measures[iperm] = sm_info
-                algos.append(str(algo))
-            return permutations_symmetry_measures, permutations, algos, local2perfect_maps, perfect2local_maps
+            iperms = range(len(perms))
+        permutations_symmetry_measures = list()
+        permutations = list()
+        algos = list()
+        local2perfect_maps = list()
+        perfect2local_maps = list()
+        for iperm in iperms:
+            perm = algo.permutations[iperm]
+            local2perfect_map = {}
+            perfect2local_map = {}
+            permutations.append(perm)
+            for iperfect, ii in enumerate(perm):
+                perfect2local_map[iperfect] = ii
+                local2perfect_map[ii] = iperfect
+            local2perfect_maps.append(local2perfect_map)
+            perfect2local_maps.append(perfect2local_map)
+
+            sm_info = {key: sm_infos[key][iperm]
+                       for key in ['symmetry_measure', 'scaling_factor', 'rotation_matrix']}
+            sm_info['translation_vector'] = self.local_geometry.centroid_with_centre
+
+            permutations_symmetry_measures.append(sm_info)
+            algos.append(str(algo))
+        return permutations_symmetry_measures, permutations, algos, local2perfect_maps, perfect2local_maps
 
     def coordination_geometry_symmetry_measures_separation_plane(self,
                                                                  coordination_geometry,
@@ -1594,14 +1682,15 @@ class LocalGeometryFinder:
                 if testing:
                     separation_permutations.append(sep_perm)
 
-                points_distorted = self.local_geometry.points_wcs_ctwcc(
-                    permutation=pp)
-
-                sm_info = symmetry_measure(points_distorted=points_distorted,
-                                           points_perfect=points_perfect)
-                sm_info['translation_vector'] = self.local_geometry.centroid_with_centre
-
-                permutations_symmetry_measures.append(sm_info)
+            if len(permutations) > 0:
+                sm_infos = batched_symmetry_measure(
+                    points_distorted=self.local_geometry.stacked_points_wcs_ctwcc(permutations),
+                    points_perfect=points_perfect)
+                for iperm in range(len(permutations)):
+                    sm_info = {key: sm_infos[key][iperm]
+                               for key in ['symmetry_measure', 'scaling_factor', 'rotation_matrix']}
+                    sm_info['translation_vector'] = self.local_geometry.centroid_with_centre
+                    permutations_symmetry_measures.append(sm_info)
             if plane_found:
                 break
         if len(permutations_symmetry_measures) > 0:
@@ -1795,3 +1884,24 @@ class LocalGeometryFinder:
             permutations_symmetry_measures[iperm] = sm_info
             algos.append('APPROXIMATE_FALLBACK')
         return permutations_symmetry_measures, permutations, algos, local2perfect_maps, perfect2local_maps
+
+
+def _compute_site_environments_worker(isite, lgf, se, site_kwargs):
+    """
+    Computes the environments of site isite in a worker process and returns what has to be merged back in the
+    StructureEnvironments object of the parent process. The LocalGeometryFinder and the StructureEnvironments object
+    are only sent once to each process. The neighbors sets are returned as dicts since they refer to the structure and
+    to the DetailedVoronoiContainer. With optimization, the local planes and separations of the site in the
+    DetailedVoronoiContainer of the process are returned as well.
+    """
+    lgf._compute_site_environments(se=se, isite=isite, **site_kwargs)
+    if se.neighbors_sets[isite] is None:
+        neighbors_sets = None
+    else:
+        neighbors_sets = {cn: [nb_set.as_dict() for nb_set in nb_sets]
+                          for cn, nb_sets in se.neighbors_sets[isite].items()}
+    if site_kwargs['optimization'] > 0:
+        voronoi_info = (lgf.detailed_voronoi.local_planes[isite], lgf.detailed_voronoi.separations[isite])
+    else:
+        voronoi_info = None
+    return isite, neighbors_sets, se.ce_list[isite], se.info['sites_info'][isite], voronoi_info
@@ -12,6 +12,7 @@ from pymatgen.analysis.chemenv.coordination_environments.coordination_geometry_f
 from pymatgen.analysis.chemenv.coordination_environments.coordination_geometries import AllCoordinationGeometries
 from pymatgen.analysis.chemenv.coordination_environments.coordination_geometry_finder import AbstractGeometry
 from pymatgen.analysis.chemenv.coordination_environments.coordination_geometry_finder import symmetry_measure
+from pymatgen.analysis.chemenv.coordination_environments.coordination_geometry_finder import batched_symmetry_measure
 
 
 json_files_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "..",
@@ -208,6 +209,52 @@ class CoordinationGeometryFinderTest(PymatgenTest):
         self.assertAlmostEqual(se_hints.ce_list[0][13][0], se_nohints.ce_list[0][13][0])
         self.assertTrue(set(se_nohints.ce_list[0].keys()).issubset(set(se_hints.ce_list[0].keys())))
 
+    def test_batched_symmetry_measure(self):
+        np.random.seed(42)
+        points_perfect = np.random.random((7, 3))
+        points_distorted = np.random.random((5, 7, 3))
+        batched = batched_symmetry_measure(points_distorted, points_perfect)
+        for ipoints, pdist in enumerate(points_distorted):
+            sm_info = symmetry_measure(pdist, points_perfect)
+            self.assertAlmostEqual(batched['symmetry_measure'][ipoints], sm_info['symmetry_measure'])
+            self.assertAlmostEqual(batched['scaling_factor'][ipoints], sm_info['scaling_factor'])
+            self.assertArrayAlmostEqual(batched['rotation_matrix'][ipoints], sm_info['rotation_matrix'])
+        batched = batched_symmetry_measure(np.random.random((3, 1, 3)), [[1.1, 2.2, 3.3]])
+        self.assertArrayAlmostEqual(batched['symmetry_measure'], [0.0, 0.0, 0.0])
+
+        self.lgf.setup_test_perfect_environment('T:5', randomness=True, max_random_dist=0.05)
+        all_csms = self.lgf.get_coordination_symmetry_measures(only_minimum=False)
+        min_csms = self.lgf.get_coordination_symmetry_measures(only_minimum=True)
+        for mp_symbol, csm in min_csms.items():
+            self.assertAlmostEqual(csm['csm'], min([rr['symmetry_measure'] for rr in all_csms[mp_symbol]['csm']]))
+
+    def test_parallel_structure_environments(self):
+        struct = self.get_structure('LiFePO4')
+        self.lgf.setup_structure(struct)
+        se_serial = self.lgf.compute_structure_environments(only_indices=[0, 4, 8], maximum_distance_factor=1.41)
+        self.lgf.setup_structure(struct)
+        se_parallel = self.lgf.compute_structure_environments(only_indices=[0, 4, 8], maximum_distance_factor=1.41,
+                                                              ncores=2)
+        for isite in range(len(struct)):
+            if isite not in [0, 4, 8]:
+                self.assertIsNone(se_parallel.ce_list[isite])
+                continue
+            self.assertEqual(sorted(se_parallel.neighbors_sets[isite].keys()),
+                             sorted(se_serial.neighbors_sets[isite].keys()))
+            for cn, nb_sets in se_serial.neighbors_sets[isite].items():
+                self.assertEqual(se_parallel.neighbors_sets[isite][cn], nb_sets)
+                for nb_set in se_parallel.neighbors_sets[isite][cn]:
+                    self.assertIs(nb_set.structure, se_parallel.structure)
+                    self.assertIs(nb_set.detailed_voronoi, se_parallel.voronoi)
+            self.assertIn('time', se_parallel.info['sites_info'][isite])
+            self.assertEqual(se_parallel.voronoi.local_planes[isite], se_serial.voronoi.local_planes[isite])
+            self.assertEqual(se_parallel.voronoi.separations[isite], se_serial.voronoi.separations[isite])
+        self.assertEqual(se_parallel.voronoi, se_serial.voronoi)
+        self.assertAlmostEqual(se_parallel.get_csm(4, 'O:6')['symmetry_measure'],
+                               se_serial.get_csm(4, 'O:6')['symmetry_measure'], places=4)
+        self.assertAlmostEqual(se_parallel.get_csm(8, 'T:4')['symmetry_measure'],
+                               se_serial.get_csm(8, 'T:4')['symmetry_measure'])
+
 
 if __name__ == "__main__":
     unittest.main()
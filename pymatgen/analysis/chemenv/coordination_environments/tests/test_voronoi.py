@@ -7,6 +7,7 @@ import unittest
 
 from monty.tempfile import ScratchDir
 from pymatgen.analysis.chemenv.coordination_environments.voronoi import DetailedVoronoiContainer
+from pymatgen.analysis.local_env import VoronoiTessellation
 from pymatgen.core.structure import Structure
 from pymatgen.core.lattice import Lattice
 import os
@@ -148,6 +149,30 @@ class VoronoiContainerTest(PymatgenTest):
             other_detailed_voronoi_container = DetailedVoronoiContainer.from_dict(detailed_voronoi_container.as_dict())
             self.assertTrue(detailed_voronoi_container, other_detailed_voronoi_container)
 
+    def test_voronoi_from_tessellation(self):
+        structure = self.get_structure('LiFePO4')
+        structure.translate_sites([0], [1.0, -1.0, 0.0], frac_coords=True, to_unit_cell=False)
+        tessellation = VoronoiTessellation(structure, cutoff=10.0)
+        detailed_voronoi_container = DetailedVoronoiContainer(structure=structure, tessellation=tessellation)
+        ref_detailed_voronoi_container = DetailedVoronoiContainer(structure=structure, voronoi_cutoff=10.0)
+        for voro, ref_voro in zip(detailed_voronoi_container.voronoi_list2,
+                                  ref_detailed_voronoi_container.voronoi_list2):
+            self.assertEqual(len(voro), len(ref_voro))
+            # the neighbours from the tessellation are sorted by distance
+            distances = [dd['distance'] for dd in voro]
+            self.assertEqual(distances, sorted(distances))
+            for dd in voro:
+                ref_dd = [rr for rr in ref_voro if rr['site'] == dd['site']]
+                self.assertEqual(len(ref_dd), 1)
+                self.assertEqual(dd['index'], ref_dd[0]['index'])
+                self.assertAlmostEqual(dd['angle'], ref_dd[0]['angle'])
+                self.assertAlmostEqual(dd['distance'], ref_dd[0]['distance'])
+                self.assertAlmostEqual(dd['normalized_angle'], ref_dd[0]['normalized_angle'])
+                self.assertAlmostEqual(dd['normalized_distance'], ref_dd[0]['normalized_distance'])
+        self.assertTrue(detailed_voronoi_container.is_close_to(ref_detailed_voronoi_container))
+        self.assertRaises(ValueError, DetailedVoronoiContainer, structure=structure, tessellation=tessellation,
+                          voronoi_cutoff=12.0)
+
     def test_get_vertices_dist_ang_indices(self):
         with ScratchDir("."):
             cubic_lattice = Lattice.cubic(10.0)
@@ -88,7 +88,7 @@ class DetailedVoronoiContainer(MSONable):
                  normalized_distance_tolerance=default_normalized_distance_tolerance,
                  normalized_angle_tolerance=default_normalized_angle_tolerance,
                  additional_conditions=None, valences=None,
-                 maximum_distance_factor=None, minimum_angle_factor=None):
+                 maximum_distance_factor=None, minimum_angle_factor=None, tessellation=None):
         """
         Constructor for the VoronoiContainer object. Either a structure is given, in which case the Voronoi is
         computed, or the different components of the VoronoiContainer are given (used in the from_dict method)
@@ -96,8 +96,12 @@ class DetailedVoronoiContainer(MSONable):
         :param voronoi_list: List of voronoi polyhedrons for each site
         :param voronoi_cutoff: cutoff used for the voronoi
         :param isites: indices of sites for which the Voronoi has to be computed
+        :param tessellation: VoronoiTessellation of the structure (see pymatgen.analysis.local_env) from which the
+                             Voronoi list is set up instead of calling qhull for each site
         :raise: RuntimeError if the Voronoi cannot be constructed
         """
+        if structure is None and tessellation is not None:
+            structure = tessellation.structure
         self.normalized_distance_tolerance = normalized_distance_tolerance
         self.normalized_angle_tolerance = normalized_angle_tolerance
         if additional_conditions is None:
@@ -115,6 +119,9 @@ class DetailedVoronoiContainer(MSONable):
         logging.info('Setting Voronoi list')
         if voronoi_list2 is not None:
             self.voronoi_list2 = voronoi_list2
+        elif tessellation is not None:
+            self.setup_voronoi_list_from_tessellation(indices=indices, tessellation=tessellation,
+                                                      voronoi_cutoff=voronoi_cutoff)
         else:
             self.setup_voronoi_list(indices=indices, voronoi_cutoff=voronoi_cutoff)
         logging.info('Setting neighbors distances and angles')
@@ -181,6 +188,63 @@ class DetailedVoronoiContainer(MSONable):
         t2 = time.clock()
         logging.info('Voronoi list set up in {:.2f} seconds'.format(t2-t1))
 
+    def setup_voronoi_list_from_tessellation(self, indices, tessellation, voronoi_cutoff=default_voronoi_cutoff):
+        """
+        Set up of the voronoi list of neighbours from the faces of an existing Voronoi tessellation of the structure.
+        As in setup_voronoi_list, only the neighbours within voronoi_cutoff of the site are considered. Unlike in
+        setup_voronoi_list, where the neighbours are in the order of the ridges found by qhull for each site, the
+        neighbours of each site are sorted by increasing distance (ties keep the order of the faces of the
+        tessellation), so that the indices of the neighbours in the voronoi list do not depend on qhull.
+        :param indices: indices of the sites for which the Voronoi is needed
+        :param tessellation: VoronoiTessellation of the structure
+        :param voronoi_cutoff: Voronoi cutoff for the search of neighbours
+        :raise RuntimeError: If an infinite vertex is found in the voronoi construction
+        :raise ValueError: If the tessellation is not a tessellation of the structure or if its cutoff is smaller
+                           than voronoi_cutoff
+        """
+        if len(tessellation.structure) != len(self.structure):
+            raise ValueError('The tessellation does not correspond to the structure')
+        if tessellation.cutoff < voronoi_cutoff:
+            raise ValueError('The cutoff of the tessellation is smaller than the Voronoi cutoff')
+        self.voronoi_list2 = [None] * len(self.structure)
+        self.voronoi_list_coords = [None] * len(self.structure)
+        # Translations from the sites of the tessellation (in the unit cell) to the sites of the structure
+        shifts = np.round(self.structure.frac_coords - tessellation.structure.frac_coords).astype(int)
+        t1 = time.clock()
+        logging.info('Setting up Voronoi list from tessellation')
+
+        for isite in indices:
+            faces = tessellation.get_faces(isite)
+            faces = np.arange(faces.start, faces.stop)[2.0 * tessellation.face_dist[faces] <= voronoi_cutoff]
+            if np.any(tessellation.infinite[faces]):
+                raise RuntimeError("This structure is pathological,"
+                                   " infinite vertex in the voronoi "
+                                   "construction")
+            points = tessellation.face_points[faces]
+            distances = 2.0 * tessellation.face_dist[faces]
+            angles = tessellation.solid_angle[faces]
+            order = np.argsort(distances, kind='mergesort')
+            maxangle = angles.max()
+            mindist = distances.min()
+
+            results2 = []
+            for ii in order:
+                index = int(tessellation.site_indices[points[ii], 0])
+                struct_site = self.structure[index]
+                image = tessellation.site_indices[points[ii], 1:] + shifts[isite] - shifts[index]
+                periodic_site = PeriodicSite(struct_site._species, struct_site.frac_coords + image,
+                                             struct_site._lattice, properties=struct_site._properties)
+                results2.append({'site': periodic_site,
+                                 'angle': float(angles[ii]),
+                                 'distance': float(distances[ii]),
+                                 'index': index,
+                                 'normalized_angle': float(angles[ii] / maxangle),
+                                 'normalized_distance': float(distances[ii] / mindist)})
+            self.voronoi_list2[isite] = results2
+            self.voronoi_list_coords[isite] = np.array([dd['site'].coords for dd in results2])
+        t2 = time.clock()
+        logging.info('Voronoi list set up in {:.2f} seconds'.format(t2-t1))
+
     def setup_neighbors_distances_and_angles(self, indices):
         """
         Initializes the angle and distance separations
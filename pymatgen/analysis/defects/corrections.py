@@ -3,12 +3,14 @@
 # Distributed under the terms of the MIT License.
 
 import logging
+from functools import lru_cache
+
 import numpy as np
 import scipy
 from scipy import stats
 from pymatgen.analysis.defects.core import DefectCorrection
 from pymatgen.analysis.defects.utils import ang_to_bohr, hart_to_ev, eV_to_k, \
-    generate_reciprocal_vectors_squared, QModel, converge
+    ReciprocalGrid, QModel, converge
 
 import matplotlib.pyplot as plt
 
@@ -23,6 +25,44 @@ __date__ = "Mar 15, 2018"
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _get_es_energies(matrix, q, q_model_cls, beta, expnorm, gamma, madetol, energy_cutoff, step):
+    """
+    Converged isolated and periodic electrostatic energies (in hartree)
+    of the model charge q in the lattice with the given matrix. These do
+    not depend on the dielectric constant, so FreysoldtCorrection shares
+    them between corrections through this bounded cache.
+    """
+    q_model = q_model_cls(beta=beta, expnorm=expnorm, gamma=gamma)
+    [a1, a2, a3] = ang_to_bohr * np.array(matrix)
+    logging.debug("In atomic units, lat consts are (in bohr):" + str([a1, a2, a3]))
+    vol = np.dot(a1, np.cross(a2, a3))  # vol in bohr^3
+
+    def e_iso(encut):
+        gcut = eV_to_k(encut)  # gcut is in units of 1/A
+        return scipy.integrate.quad(lambda g: q_model.rho_rec(g * g)**2, step, gcut)[0] * (q**2) / np.pi
+
+    recip_grid = ReciprocalGrid(a1, a2, a3)
+
+    def e_per(encut):
+        g2 = recip_grid.get_g2(encut)
+        eper = np.sum(q_model.rho_rec(g2)**2 / g2)
+        eper *= (q**2) * 2 * round(np.pi, 6) / vol
+        eper += (q**2) * 4 * round(np.pi, 6) \
+            * q_model.rho_rec_limit0 / vol
+        return eper
+
+    eiso = converge(e_iso, 5, madetol, energy_cutoff)
+    logger.debug("Eisolated : %f", round(eiso, 5))
+
+    eper = converge(e_per, 5, madetol, energy_cutoff)
+
+    logger.info("Eperiodic : %f hartree", round(eper, 5))
+    logger.info("difference (periodic-iso) is %f hartree", round(eper - eiso, 6))
+    logger.info("difference in (eV) is %f", round((eper - eiso) * hart_to_ev, 4))
+    return eiso, eper
+
+
 class FreysoldtCorrection(DefectCorrection):
     """
     A class for FreysoldtCorrection class. Largely adapated from PyCDT code
@@ -127,31 +167,9 @@ class FreysoldtCorrection(DefectCorrection):
         logger.info("Running Freysoldt 2011 PC calculation (should be " "equivalent to sxdefectalign)")
         logger.debug("defect lattice constants are (in angstroms)" + str(lattice.abc))
 
-        [a1, a2, a3] = ang_to_bohr * np.array(lattice.get_cartesian_coords(1))
-        logging.debug("In atomic units, lat consts are (in bohr):" + str([a1, a2, a3]))
-        vol = np.dot(a1, np.cross(a2, a3))  # vol in bohr^3
-
-        def e_iso(encut):
-            gcut = eV_to_k(encut)  # gcut is in units of 1/A
-            return scipy.integrate.quad(lambda g: self.q_model.rho_rec(g * g)**2, step, gcut)[0] * (q**2) / np.pi
-
-        def e_per(encut):
-            eper = 0
-            for g2 in generate_reciprocal_vectors_squared(a1, a2, a3, encut):
-                eper += (self.q_model.rho_rec(g2)**2) / g2
-            eper *= (q**2) * 2 * round(np.pi, 6) / vol
-            eper += (q**2) * 4 * round(np.pi, 6) \
-                * self.q_model.rho_rec_limit0 / vol
-            return eper
-
-        eiso = converge(e_iso, 5, self.madetol, self.energy_cutoff)
-        logger.debug("Eisolated : %f", round(eiso, 5))
-
-        eper = converge(e_per, 5, self.madetol, self.energy_cutoff)
-
-        logger.info("Eperiodic : %f hartree", round(eper, 5))
-        logger.info("difference (periodic-iso) is %f hartree", round(eper - eiso, 6))
-        logger.info("difference in (eV) is %f", round((eper - eiso) * hart_to_ev, 4))
+        eiso, eper = _get_es_energies(
+            tuple(map(tuple, lattice.matrix)), q, type(self.q_model), self.q_model.beta,
+            self.q_model.expnorm, self.q_model.gamma, self.madetol, self.energy_cutoff, step)
 
         es_corr = round((eiso - eper) / self.dielectric * hart_to_ev, 6)
         logger.info("Defect Correction without alignment %f (eV): ", es_corr)
@@ -185,9 +203,8 @@ class FreysoldtCorrection(DefectCorrection):
             axbulkval -= lattice.abc[axis]
 
         if axbulkval:
-            for i in range(nx):
-                if axbulkval < axis_grid[i]:
-                    break
+            above = np.nonzero(axbulkval < np.asarray(axis_grid))[0]
+            i = above[0] if len(above) else nx - 1
             rollind = len(axis_grid) - i
             pureavg = np.roll(pureavg, rollind)
             defavg = np.roll(defavg, rollind)
@@ -219,14 +236,14 @@ class FreysoldtCorrection(DefectCorrection):
         checkdis = int((widthsample / 2) / (axis_grid[1] - axis_grid[0]))
         mid = int(len(short) / 2)
 
-        tmppot = [short[i] for i in range(mid - checkdis, mid + checkdis + 1)]
+        tmppot = short[mid - checkdis:mid + checkdis + 1]
         logger.debug("shifted defect position on axis (%s) to origin", repr(axbulkval))
         logger.debug("means sampling region is (%f,%f)", axis_grid[mid - checkdis], axis_grid[mid + checkdis])
 
         C = -np.mean(tmppot)
         logger.debug("C = %f", C)
-        final_shift = [short[j] + C for j in range(len(v_R))]
-        v_R = [elmnt - C for elmnt in v_R]
+        final_shift = list(short + C)
+        v_R = list(v_R - C)
 
         logger.info("C value is averaged to be %f eV ", C)
         logger.info("Potentital alignment energy correction (-q*delta V):  %f (eV)", -q * C)
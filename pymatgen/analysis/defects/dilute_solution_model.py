@@ -2,7 +2,6 @@
 # Copyright (c) Pymatgen Development Team.
 # Distributed under the terms of the MIT License.
 
-import math
 import copy
 import numpy as np
 
@@ -41,6 +40,104 @@ def check_input(def_list):
     return flag
 
 
+def _get_boltzmann_sum(terms, size, m, kT):
+    """
+    Vectorized evaluation of sums of Boltzmann terms
+    coeff * exp(-(energy - mu_coeffs . mu) / kT), which make up the defect
+    concentrations and the grand potential of the dilute solution model.
+
+    Args:
+        terms: List of (output index, coeff, energy, mu_coeffs) tuples.
+        size: Number of outputs the terms are summed into.
+        m: Number of chemical potentials.
+        kT: Thermal energy in eV.
+
+    Returns:
+        Function mapping an (N, m) array of chemical potentials to the
+        (N, size) sums and their (N, size, m) derivatives w.r.t. the
+        chemical potentials.
+    """
+    coeffs = np.array([term[1] for term in terms], dtype=np.float64)
+    energies = np.array([term[2] for term in terms], dtype=np.float64)
+    mu_coeffs = np.array([term[3] for term in terms],
+                         dtype=np.float64).reshape(len(terms), m)
+    proj = np.zeros((len(terms), size))
+    proj[np.arange(len(terms)), [term[0] for term in terms]] = 1
+
+    def func(mu_vals):
+        vals = coeffs * np.exp((np.dot(mu_vals, mu_coeffs.T) - energies) / kT)
+        dvals = np.einsum('kt,ts,tl->ksl', vals / kT, proj, mu_coeffs)
+        return np.dot(vals, proj), dvals
+
+    return func
+
+
+def _solve_mu(func, mu0, maxsteps=10, tol=2.0**-62):
+    """
+    Damped Newton solver for a batch of chemical potential equations. The
+    iteration follows the multidimensional mpmath findroot used by sympy's
+    nsolve: steps are halved until the max norm of the residual decreases,
+    at most maxsteps steps are taken and a solution is accepted if the
+    squared max norm of its residual is below tol.
+
+    Args:
+        func: Function mapping an (N, m) array of chemical potentials to the
+            (N, m) residuals and their (N, m, m) Jacobians.
+        mu0: (N, m) array of trial chemical potentials.
+        maxsteps: Maximum number of Newton steps.
+        tol: Tolerance on the squared max norm of the residual.
+
+    Returns:
+        (N, m) array of chemical potentials and a boolean array flagging
+        the converged solutions.
+    """
+    mu = np.array(mu0, dtype=np.float64, ndmin=2)
+    with np.errstate(all='ignore'):
+        f, jac = func(mu)
+        fnorm = np.max(np.abs(f), axis=1)
+        active = np.isfinite(fnorm) & (fnorm > 0)
+        singular = np.zeros(len(mu), dtype=bool)
+        for _ in range(maxsteps):
+            inds = np.nonzero(active)[0]
+            if not len(inds):
+                break
+            step = np.full((len(inds), mu.shape[1]), np.nan)
+            try:
+                step = np.linalg.solve(jac[inds], -f[inds])
+            except np.linalg.LinAlgError:
+                for k, ind in enumerate(inds):
+                    try:
+                        step[k] = np.linalg.solve(jac[ind], -f[ind])
+                    except np.linalg.LinAlgError:
+                        pass
+            bad = ~np.all(np.isfinite(step), axis=1)
+            singular[inds[bad]] = True
+            active[inds[bad]] = False
+            inds, step = inds[~bad], step[~bad]
+
+            # Halve the steps until the residuals decrease
+            lam = np.ones(len(inds))
+            pending = np.ones(len(inds), dtype=bool)
+            while pending.any():
+                rows = inds[pending]
+                mu1 = mu[rows] + lam[pending, None] * step[pending]
+                cancel = np.all(mu1 == mu[rows], axis=1)
+                f1, jac1 = func(mu1)
+                fnorm1 = np.max(np.abs(f1), axis=1)
+                accept = ~cancel & (fnorm1 < fnorm[rows])
+                mu[rows[accept]] = mu1[accept]
+                f[rows[accept]] = f1[accept]
+                jac[rows[accept]] = jac1[accept]
+                fnorm[rows[accept]] = fnorm1[accept]
+                active[rows[cancel]] = False
+                pending[np.nonzero(pending)[0][accept | cancel]] = False
+                lam[pending] /= 2
+            done = fnorm < tol * np.maximum(1, np.max(np.abs(mu), axis=1))
+            active &= ~done
+        converged = ~singular & np.isfinite(fnorm) & (fnorm**2 <= tol)
+    return mu, converged
+
+
 @deprecated(message="Refactoring of the defects module will eventualy remove this function")
 def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_pot=None, generate='plot'):
     """
@@ -99,11 +196,10 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
     comm_div = gcd(*tuple(multiplicity))
     multiplicity = [val / comm_div for val in multiplicity]
     e0 = e0 / comm_div
-    T = Float(T)
+    kT = k_B * T
 
     #c0 = np.diag(multiplicity)
     c0 = np.diag(np.ones(n))
-    mu = [Symbol('mu' + i.__str__()) for i in range(m)]
 
     # Generate maps for hashing
     # Generate specie->mu map and use it for site->mu map
@@ -197,44 +293,79 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
 
     # Initialization for concentrations
     # c(i,p) == presence of ith type atom on pth type site
-    c = Matrix(n, n, [0] * n**2)
+    # Both c and the grand potential Omega are sums of Boltzmann terms
+    # coeff * exp(-(dE - sum_mu) / kT) that are evaluated as arrays
+    def get_mu_coeffs(epi, p):
+        mu_coeffs = np.zeros(m)
+        for j in range(n):
+            mu_coeffs[site_mu_map[j]] += dC[j, epi, p]
+        return tuple(mu_coeffs)
+
+    c_terms = []
     for i in range(n):
         for p in range(n):
-            c[i, p] = Integer(c0[i, p])
             site_flip_contribs = []
             for epi in range(n):
-                sum_mu = sum([mu[site_mu_map[j]] * Integer(dC[j, epi, p]) for j in range(n)])
-                flip = Integer(dC[i, epi, p]) * \
-                    exp(-(dE[epi, p] - sum_mu) / (k_B * T))
+                if not dC[i, epi, p]:
+                    continue
+                flip = (dC[i, epi, p], dE[epi, p], get_mu_coeffs(epi, p))
                 if flip not in site_flip_contribs:
                     site_flip_contribs.append(flip)
-                    c[i, p] += flip
-
-    total_c = []
-    for ind in specie_site_index_map:
-        val = 0
-        for i in range(*ind):
-            sum_i = sum([c[i, j] * multiplicity[j] for j in range(n)])
-            val += sum_i
-        total_c.append(val)
-
-    c_ratio = [total_c[-1] / total_c[i] for i in range(m)]
+                    c_terms.append((i * n + p,) + flip)
+    get_c_flips = _get_boltzmann_sum(c_terms, n * n, m, kT)
+
+    # specie_matrix[s, i] == 1 if site i belongs to specie s
+    specie_matrix = np.zeros((m, n))
+    for s, ind in enumerate(specie_site_index_map):
+        specie_matrix[s, ind[0]:ind[1]] = 1
+    mult = np.array(multiplicity, dtype=np.float64)
+
+    def get_c(mu_vals):
+        flips, dflips = get_c_flips(mu_vals)
+        return c0 + flips.reshape(-1, n, n), dflips.reshape(-1, n, n, m)
+
+    def get_c_ratio(mu_vals):
+        c_val, dc_val = get_c(mu_vals)
+        total_c = np.einsum('si,kij,j->ks', specie_matrix, c_val, mult)
+        dtotal_c = np.einsum('si,kijl,j->ksl', specie_matrix, dc_val, mult)
+        c_ratio = total_c[:, -1:] / total_c
+        dc_ratio = (dtotal_c[:, -1:] * total_c[:, :, None] -
+                    total_c[:, -1:, None] * dtotal_c) / total_c[:, :, None]**2
+        return c_ratio, dc_ratio
 
     # Expression for Omega, the Grand Potential
-    omega1 = e0 - sum([mu[site_mu_map[i]] * sum(c0[i, :]) * multiplicity[i] for i in range(n)])
-    omega2 = []
-    fm_en_eff = []
+    omega1_coeffs = np.zeros(m)
+    for i in range(n):
+        omega1_coeffs[site_mu_map[i]] += sum(c0[i, :]) * multiplicity[i]
+    omega2_terms = []
     used_dEs = []
     for p_r in range(n):
         for epi in range(n):
-            sum_mu = sum([mu[site_mu_map[j]] * dC[j, epi, p_r] for j in range(n)])
             if p_r != epi and site_mu_map[p_r] == site_mu_map[epi]:
                 continue
             if dE[epi, p_r] not in used_dEs:
-                omega2.append(k_B * T * multiplicity[p_r] * exp(-(dE[epi, p_r] - sum_mu) / (k_B * T)))
-                fm_en_eff.append(dE[epi, p_r] - sum_mu)
+                omega2_terms.append((0, -kT * multiplicity[p_r], dE[epi, p_r],
+                                     get_mu_coeffs(epi, p_r)))
                 used_dEs.append(dE[epi, p_r])
-    omega = omega1 - sum(omega2)
+    get_omega2 = _get_boltzmann_sum(omega2_terms, 1, m, kT)
+
+    def get_omega(mu_vals):
+        omega2, domega2 = get_omega2(mu_vals)
+        return e0 - np.dot(mu_vals, omega1_coeffs) + omega2[:, 0], \
+            domega2[:, 0] - omega1_coeffs
+
+    def get_equations(y_vals):
+        # Residuals y_vals[i] - c_ratio[i] together with Omega
+        k = len(y_vals)
+
+        def func(mu_vals):
+            c_ratio, dc_ratio = get_c_ratio(mu_vals)
+            omega, domega = get_omega(mu_vals)
+            f = np.column_stack([y_vals - c_ratio[:, :k], omega])
+            jac = np.concatenate([-dc_ratio[:, :k], domega[:, None]], axis=1)
+            return f, jac
+
+        return func
 
     # Compute composition range
     li = specie_site_index_map[0][0]
@@ -248,52 +379,33 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
         y = comp2 / comp1
         yvals.append(y)
 
-    def reduce_mu():
-        omega = [e0 - sum([mu[site_mu_map[i]] * sum(c0[i, :]) for i in range(n)])]
-        x = solve(omega)
-        return x
-
     def compute_mus_by_search():
-        # Compute trial mu
-        mu_red = reduce_mu()
+        # Compute trial mu from Omega of the undefected system
+        site_counts = np.dot(specie_matrix, np.sum(c0, axis=1))
 
         mult = multiplicity
         specie_concen = [sum(mult[ind[0]:ind[1]]) for ind in specie_site_index_map]
         y_vect = [specie_concen[-1] / specie_concen[i] for i in range(m)]
-        vector_func = [y_vect[i] - c_ratio[i] for i in range(m - 1)]
-        vector_func.append(omega)
-        min_diff = 1e10
-        mu_vals = None
-        c_val = None
         m1_min = -20.0
         if e0 > 0:
             m1_max = 10  # Search space needs to be modified
         else:
             m1_max = 0
-        for m1 in np.arange(m1_min, m1_max, 0.01):
-            m0 = mu_red[mu[0]].subs(mu[-1], m1)
-
-            try:
-                x = nsolve(vector_func, mu, [m0, m1], module="numpy")
-            except:
-                continue
-
-            c_val = c.subs(dict(zip(mu, x)))
-            # if all(x >= 0 for x in c_val):
-            specie_concen = []
-            for ind in specie_site_index_map:
-                specie_concen.append(sum([sum(c_val[i, :]) for i in range(*ind)]))
-            y_comp = [specie_concen[-1] / specie_concen[i] for i in range(m)]
-            diff = math.sqrt(sum([pow(abs(y_comp[i] - y_vect[i]), 2) for i in range(m)]))
-            if diff < min_diff:
-                min_diff = diff
-                mu_vals = x
-
-        if mu_vals:
-            mu_vals = [float(mu_val) for mu_val in mu_vals]
-        else:
+        # Solve from all the trial mus at once
+        m1 = np.arange(m1_min, m1_max, 0.01)
+        m0 = (e0 - np.sum(site_counts[1:]) * m1) / site_counts[0]
+        trial_mus = np.column_stack([m0] + [m1] * (m - 1))
+        x, converged = _solve_mu(get_equations(y_vect[:m - 1]), trial_mus)
+
+        c_val = get_c(x)[0]
+        specie_concen = np.einsum('si,kij->ks', specie_matrix, c_val)
+        y_comp = specie_concen[:, -1:] / specie_concen
+        with np.errstate(invalid='ignore'):
+            diff = np.sqrt(np.sum((y_comp - y_vect)**2, axis=1))
+            valid = converged & (diff < 1e10)
+        if not valid.any():
             raise ValueError()
-        return mu_vals
+        return x[valid][np.argmin(diff[valid])].tolist()
 
     def compute_def_formation_energies():
         i = 0
@@ -343,7 +455,7 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
             try:
                 mu_vals = [trial_chem_pot[element] for element in specie_order]
             except:
-                mu_vals = compute_mus()
+                mu_vals = compute_mus_by_search()
 
         formation_energies = compute_def_formation_energies()
         mu_dict = dict(zip(specie_order, mu_vals))
@@ -363,38 +475,25 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
         ln_def_conc = 4.60517
         for i in range(li, hi):
             vac_flip_en = vac_defs[i]['energy']
-            mu_vals = [ln_def_conc * k_B * T - vac_flip_en]
+            mu_vals = [ln_def_conc * kT - vac_flip_en]
             mu_vals.append((e0 - spec_mult[0] * mu_vals[0]) / spec_mult[1])
             comp_ratio = yvals[0]
 
             # Test if the trial mus are good
-            vector_func = [comp_ratio - c_ratio[0]]
-            vector_func.append(omega)
-            try:
-                mu_vals = nsolve(vector_func, mu, mu_vals)
-                if mu_vals:
-                    mu_vals = [float(mu_val) for mu_val in mu_vals]
+            x, converged = _solve_mu(get_equations([comp_ratio]), [mu_vals])
+            if converged[0]:
+                mu_vals = x[0].tolist()
                 break
-            except:  # Go for antisite as dominant defect
-                mu_gs = [Symbol('mu_gs' + j.__str__()) for j in range(m)]
-
-                eqs = [mu_gs[0] - mu_gs[1] - (ln_def_conc * k_B * T - antisite_defs[i]['energy'])]
-                eqs.append(spec_mult[0] * mu_gs[0] + spec_mult[1] * mu_gs[1] - e0)
-                x = solve(eqs, mu_gs)
-                #mu_names = sorted([key.name for key in x.keys()])
-                mu_vals = []
-                for key in sorted(x.keys(), key=lambda inp: inp.name):
-                    mu_vals.append(x[key])
-                vector_func = [comp_ratio - c_ratio[0]]
-                vector_func.append(omega)
 
-                try:
-                    mu_vals = nsolve(vector_func, mu, mu_vals)
-                    if mu_vals:
-                        mu_vals = [float(mu_val) for mu_val in mu_vals]
-                    break
-                except:  # Go to the default option (search the space)
-                    pass
+            # Go for antisite as dominant defect
+            mu_vals = np.linalg.solve(
+                [[1, -1], spec_mult],
+                [ln_def_conc * kT - antisite_defs[i]['energy'], e0])
+            x, converged = _solve_mu(get_equations([comp_ratio]), [mu_vals])
+            if converged[0]:
+                mu_vals = x[0].tolist()
+                break
+            # Go to the default option (search the space)
         else:
             mu_vals = compute_mus_by_search()
 
@@ -407,52 +506,29 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
     # Compile mu's for all composition ratios in the range
     #+/- 1% from the stoichiometry
     result = {}
-    i = 0
-    len_y = len(yvals)
-    failed_y, failed_i = [], []
-    for y in yvals:
-        vector_func = [y - c_ratio[0]]
-        vector_func.append(omega)
-        try:
-            x = nsolve(vector_func, mu, mu_vals, module="numpy")
-            if x:
-                mu_vals = [float(mu_val) for mu_val in x]
-        except:
-            failed_y.append(y)
+    failed_i = []
+    for i, y in enumerate(yvals):
+        x, converged = _solve_mu(get_equations([y]), [mu_vals])
+        if not converged[0]:
             failed_i.append(i)
             continue
+        mu_vals = x[0].tolist()
         result[y] = list(mu_vals)
-        x = None
-        i += 1
 
     def get_next_mu_val(i):
-        if i >= len(yvals):
-            return None
-
-        y = yvals[i + 1]
-        x = result.get(y, None)
-        if x:
-            mu_vals = [float(mu_val) for mu_val in x]
-            return mu_vals
-        else:
-            return get_next_mu_val(i + 1)
+        for y in yvals[i + 1:]:
+            if y in result:
+                return result[y]
+        return None
 
     def get_prev_mu_val(i):
-        if i <= 0:
-            return None
-
-        y = yvals[i - 1]
-        x = result.get(y, None)
-        if x:
-            mu_vals = [float(mu_val) for mu_val in x]
-            return mu_vals
-        else:
-            return get_next_mu_val(i - 1)
+        for y in yvals[i - 1::-1] if i > 0 else []:
+            if y in result:
+                return result[y]
+        return None
 
     # Try to get better trial mus for failed cases
-    for j in range(len(failed_y)):
-        i = failed_i[j]
-
+    for i in failed_i:
         prev_mu_val = get_prev_mu_val(i)
         if not prev_mu_val:
             continue
@@ -460,84 +536,39 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
         if not next_mu_val:
             continue
 
-        y = failed_y[j]
-        vector_func = [y - c_ratio[0]]
-        vector_func.append(omega)
+        y = yvals[i]
         trial_mu = list(map(lambda x: float(sum(x)) / len(x), zip(prev_mu_val, next_mu_val)))
-        try:
-            x = nsolve(vector_func, mu, trial_mu, module="numpy")
-            if x:
-                mu_vals = [float(mu_val) for mu_val in x]
-        except:
+        x, converged = _solve_mu(get_equations([y]), [trial_mu])
+        if not converged[0]:
             continue
-        result[y] = mu_vals
-        x = None
-
-    # Alternate way of calculating trial mus for failed cases
-    # by taking average of trial mus at extremes.
-    # for j in range(len(failed_y)):
-    #    y = yvals[0]
-    #    prev_mu_val = result[y]
-    #    y = yvals[-1]
-    #    next_mu_val = result[y]
-    #
-    #    trial_mu = list(map(lambda x: float(sum(x))/len(x),  \
-    #            zip(prev_mu_val,next_mu_val)))
-    #    y = failed_y[j]
-    #    vector_func = [y-c_ratio[0]]
-    #    vector_func.append(omega)
-    #    try:
-    #        x = nsolve(vector_func,mu,trial_mu,module="numpy")
-    #        if x:
-    #            mu_vals = [float(mu_val) for mu_val in x]
-    #    except:
-    #        continue
-    #    result[y] = list(mu_vals)
+        result[y] = x[0].tolist()
 
     if len(result.keys()) < len(yvals) / 2:
         raise ValueError('Not sufficient data')
 
-    res = []
-    new_mu_dict = {}
-    # Compute the concentrations for all the compositions
-    for key in sorted(result.keys()):
-        mu_val = result[key]
-        total_c_val = [total_c[i].subs(dict(zip(mu, mu_val))) for i in range(len(total_c))]
-        c_val = c.subs(dict(zip(mu, mu_val)))
-        res1 = []
-        # Concentration of first element/over total concen
-        res1.append(float(total_c_val[0] / sum(total_c_val)))
-        new_mu_dict[res1[0]] = mu_val
-        sum_c0 = sum([c0[i, i] for i in range(n)])
-        for i in range(n):
-            for j in range(n):
-                if i == j:  # Vacancy
-                    vac_conc = float(exp(-(mu_val[site_mu_map[i]] + dE[i, i]) / (k_B * T)))
-                    res1.append(vac_conc)
-                else:  # Antisite
-                    res1.append(float(c_val[i, j] / c0[j, j]))
-        res.append(res1)
-
-    res = np.array(res)
-    dtype = [(str('x'), np.float64)] + [(str('y%d%d' % (i, j)), np.float64) for i in range(n) for j in range(n)]
-    res1 = np.sort(res.view(dtype), order=[str('x')], axis=0)
+    # Compute the concentrations for all the compositions at once
+    mu_arr = np.array([result[key] for key in sorted(result.keys())])
+    c_val = get_c(mu_arr)[0]
+    total_c_val = np.einsum('si,kij,j->ks', specie_matrix, c_val, mult)
+    # Concentration of first element/over total concen
+    x_vals = total_c_val[:, 0] / np.sum(total_c_val, axis=1)
+    # Antisites
+    conc_arr = c_val / np.diag(c0)
+    # Vacancies
+    conc_arr[:, range(n), range(n)] = np.exp(
+        -(mu_arr[:, site_mu_map] + np.diag(dE)) / kT)
+
+    order = np.argsort(x_vals, kind='mergesort')
+    x_vals, mu_arr, conc_arr = x_vals[order], mu_arr[order], conc_arr[order]
 
     conc_data = {}
     """Because all the plots have identical x-points storing it in a
     single array"""
-    conc_data['x'] = [dat[0][0] for dat in res1]  # x-axis data
+    conc_data['x'] = x_vals.tolist()  # x-axis data
     # Element whose composition is varied. For x-label
     conc_data['x_label'] = els[0] + " mole fraction"
     conc_data['y_label'] = "Point defect concentration"
-    conc = []
-    for i in range(n):
-        conc.append([])
-        for j in range(n):
-            conc[i].append([])
-    for i in range(n):
-        for j in range(n):
-            y1 = [dat[0][i * n + j + 1] for dat in res1]
-            conc[i][j] = y1
+    conc = [[conc_arr[:, i, j].tolist() for j in range(n)] for i in range(n)]
 
     y_data = []
     for i in range(n):
@@ -578,30 +609,15 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
     conc_data['y'] = y_data
 
     # Compute the  formation energies
-    def compute_vac_formation_energies(mu_vals):
-        en = []
-        for vac_def in vac_defs:
-            site_specie = vac_def['site_specie']
-            ind = specie_order.index(site_specie)
-            uncor_energy = vac_def['energy']
-            formation_energy = uncor_energy + mu_vals[ind]
-            en.append(float(formation_energy))
-        return en
-
-    en_res = []
-    for key in sorted(new_mu_dict.keys()):
-        mu_val = new_mu_dict[key]
-        en_res.append(compute_vac_formation_energies(mu_val))
-
     en_data = {'x_label': els[0] + ' mole fraction', 'x': []}
-    en_data['x'] = [dat[0][0] for dat in res1]  # x-axis data
+    en_data['x'] = x_vals.tolist()  # x-axis data
 
     i = 0
     y_data = []
     for vac_def in vac_defs:
-        data = [data[i] for data in en_res]
         site_specie = vac_def['site_specie']
         ind = specie_order.index(site_specie)
+        data = (vac_def['energy'] + mu_arr[:, ind]).tolist()
         specie_ind = site_mu_map[i]
         indices = specie_site_index_map[specie_ind]
         specie_ind_del = indices[1] - indices[0]
@@ -614,29 +630,13 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
         y_data.append({'data': data, 'name': label})
         i += 1
 
-    def compute_as_formation_energies(mu_vals):
-        en = []
-        for as_def in antisite_defs:
-            site_specie = as_def['site_specie']
-            sub_specie = as_def['substitution_specie']
-            ind1 = specie_order.index(site_specie)
-            ind2 = specie_order.index(sub_specie)
-            uncor_energy = as_def['energy']
-            form_en = uncor_energy + mu_vals[ind1] - mu_vals[ind2]
-            en.append(form_en)
-        return en
-
-    en_res = []
-    for key in sorted(new_mu_dict.keys()):
-        mu_val = new_mu_dict[key]
-        en_res.append(compute_as_formation_energies(mu_val))
     i = 0
     for as_def in antisite_defs:
-        data = [data[i] for data in en_res]
         site_specie = as_def['site_specie']
         sub_specie = as_def['substitution_specie']
         ind1 = specie_order.index(site_specie)
         ind2 = specie_order.index(sub_specie)
+        data = (as_def['energy'] + mu_arr[:, ind1] - mu_arr[:, ind2]).tolist()
         specie_ind = site_mu_map[i]
         indices = specie_site_index_map[specie_ind]
         specie_ind_del = indices[1] - indices[0]
@@ -652,13 +652,12 @@ def dilute_solution_model(structure, e0, vac_defs, antisite_defs, T, trial_chem_
 
     # Return chem potential as well
     mu_data = {'x_label': els[0] + ' mole fraction', 'x': []}
-    mu_data['x'] = [dat[0][0] for dat in res1]  # x-axis data
+    mu_data['x'] = x_vals.tolist()  # x-axis data
 
     y_data = []
     for j in range(m):
         specie = specie_order[j]
-        mus = [new_mu_dict[key][j] for key in sorted(new_mu_dict.keys())]
-        y_data.append({'data': mus, 'name': specie})
+        y_data.append({'data': mu_arr[:, j].tolist(), 'name': specie})
     mu_data['y'] = y_data
 
     return conc_data, en_data, mu_data
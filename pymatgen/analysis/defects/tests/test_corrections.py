@@ -11,7 +11,8 @@ from pymatgen.util.testing import PymatgenTest
 from pymatgen.io.vasp import Vasprun
 from pymatgen.analysis.defects.core import DefectEntry, Vacancy
 from pymatgen.analysis.defects.corrections import FreysoldtCorrection,\
-            BandFillingCorrection, BandEdgeShiftingCorrection
+            BandFillingCorrection, BandEdgeShiftingCorrection, _get_es_energies
+from pymatgen.analysis.defects.utils import QModel
 
 test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", 'test_files')
 
@@ -40,6 +41,13 @@ class DefectsCorrectionsTest(PymatgenTest):
         pot_corr = fc.perform_pot_corr(axisdata[0], bldata[0], dldata[0], struc.lattice, -3, vac.site.coords, 0)
         self.assertAlmostEqual(pot_corr, 2.836369987722345)
 
+        #test that converged lattice sums are reused across dielectric constants
+        nmisses = _get_es_energies.cache_info().misses
+        self.assertAlmostEqual(FreysoldtCorrection(7.5).perform_es_corr(struc.lattice, -3), 2 * 0.975893, 5)
+        self.assertEqual(_get_es_energies.cache_info().misses, nmisses)
+        FreysoldtCorrection(15, q_model=QModel(beta=2.)).perform_es_corr(struc.lattice, -3)
+        self.assertEqual(_get_es_energies.cache_info().misses, nmisses + 1)
+
         #test entry full correction method
         de = DefectEntry(vac, 0., corrections={}, parameters=params, entry_id=None)
         val = fc.get_correction(de)
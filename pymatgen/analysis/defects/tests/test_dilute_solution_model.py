@@ -0,0 +1,107 @@
+# coding: utf-8
+# Copyright (c) Pymatgen Development Team.
+# Distributed under the terms of the MIT License.
+
+
+import json
+import os
+import unittest
+import warnings
+
+import numpy as np
+
+from pymatgen.core.structure import Structure
+from pymatgen.analysis.defects.dilute_solution_model import \
+    dilute_solution_model, compute_defect_density
+
+test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..",
+                        'test_files')
+
+
+class DiluteSolutionModelTest(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(test_dir, 'mp1048_raw_defect_energies.json')) as fp:
+            raw_energy_dict = json.load(fp)
+        with open(os.path.join(test_dir, 'mp1048_defect_formation_energies.json')) as fp:
+            self.formation_energy_dict = json.load(fp)
+        self.e0 = raw_energy_dict['bulk_energy']
+        self.asites = raw_energy_dict['antisites']
+        self.vac = raw_energy_dict['vacancies']
+        self.struct = Structure.from_dict(raw_energy_dict['structure'])
+        self.T = 800
+        self.trial_mu = self.formation_energy_dict[str(self.T)]['chemical_potential']
+        warnings.simplefilter("ignore")
+
+    def tearDown(self):
+        warnings.simplefilter("default")
+
+    def test_formation_energies_without_chem_pot(self):
+        energies, chem_pot = dilute_solution_model(
+            self.struct, self.e0, self.vac, self.asites, self.T,
+            generate='energy')
+        ref = self.formation_energy_dict[str(self.T)]
+        for el, mu in ref['chemical_potential'].items():
+            self.assertAlmostEqual(chem_pot[el], mu, 6)
+        for def_type in ['vacancies', 'antisites']:
+            for en, ref_en in zip(energies[def_type],
+                                  ref['formation_enthalpies'][def_type]):
+                self.assertEqual(en['label'], ref_en['label'])
+                self.assertAlmostEqual(en['formation_energy'],
+                                       ref_en['formation_energy'], 6)
+
+    def test_formation_energies_with_chem_pot(self):
+        energies, chem_pot = dilute_solution_model(
+            self.struct, self.e0, self.vac, self.asites, self.T,
+            trial_chem_pot=self.trial_mu, generate='energy')
+        self.assertEqual(chem_pot, self.trial_mu)
+        self.assertAlmostEqual(energies['vacancies'][0]['formation_energy'],
+                               self.vac[0]['energy'] + self.trial_mu['Ti'])
+
+    def test_plot_data(self):
+        for trial_mu in [None, self.trial_mu]:
+            conc_data, en_data, mu_data = dilute_solution_model(
+                self.struct, self.e0, self.vac, self.asites, self.T,
+                trial_chem_pot=trial_mu)
+            x = conc_data['x']
+            self.assertEqual(len(x), 121)
+            self.assertTrue(np.all(np.diff(x) > 0))
+            self.assertAlmostEqual(x[0], 0.49, 3)
+            self.assertAlmostEqual(x[-1], 0.51, 3)
+            self.assertEqual([y['name'] for y in conc_data['y']],
+                             ['$Vac_{Ti}$', '$Vac_{Ni}$', '$Ni_{Ti}$',
+                              '$Ti_{Ni}$'])
+            for y in conc_data['y']:
+                self.assertEqual(len(y['data']), len(x))
+                self.assertTrue(all(0 < val < 1 for val in y['data']))
+            # Ti antisites on the Ni sites increase with the Ti content
+            ti_ni = conc_data['y'][3]['data']
+            self.assertLess(ti_ni[0], ti_ni[-1])
+
+            self.assertEqual(en_data['x'], x)
+            self.assertEqual(mu_data['x'], x)
+            self.assertEqual([y['name'] for y in mu_data['y']], ['Ti', 'Ni'])
+            # Omega = 0 fixes the sum of the chemical potentials
+            mu_sum = np.array(mu_data['y'][0]['data']) + mu_data['y'][1]['data']
+            self.assertTrue(np.allclose(mu_sum, self.e0 / 2, atol=0.01))
+            # The formation energies follow from the chemical potentials
+            np.testing.assert_array_almost_equal(
+                en_data['y'][0]['data'],
+                self.vac[0]['energy'] + np.array(mu_data['y'][0]['data']))
+
+    def test_compute_defect_density(self):
+        hgh_chrt_data = compute_defect_density(
+            self.struct, self.e0, self.vac, self.asites, self.T,
+            trial_chem_pot=self.trial_mu)
+        self.assertEqual(hgh_chrt_data['xAxis'], 'Ti mole fraction')
+        self.assertEqual([s['name'] for s in hgh_chrt_data['series']],
+                         ['Vac<sub>Ti</sub>', 'Vac<sub>Ni</sub>',
+                          'Ni<sub>Ti</sub>', 'Ti<sub>Ni</sub>'])
+        conc_rows, en_rows, mu_rows = compute_defect_density(
+            self.struct, self.e0, self.vac, self.asites, self.T,
+            trial_chem_pot=self.trial_mu, plot_style='gnuplot')
+        self.assertEqual(len(conc_rows), 122)
+        self.assertEqual(mu_rows[0], '#Ti mole fraction\tTi\tNi')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,14 +3,20 @@
 # Distributed under the terms of the MIT License.
 
 
+import json
 import os
 import unittest
 
 from monty.serialization import loadfn
+from scipy.optimize import bisect
 
+from pymatgen.core.periodic_table import Element
 from pymatgen.analysis.defects.thermodynamics import DefectPhaseDiagram
+from pymatgen.electronic_structure.dos import CompleteDos, FermiDos
 from pymatgen.util.testing import PymatgenTest
 
+test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", 'test_files')
+
 
 class DefectsThermodynamicsTest(PymatgenTest):
     def setUp(self):
@@ -48,6 +54,39 @@ class DefectsThermodynamicsTest(PymatgenTest):
         self.assertEqual(len(pd.defect_types), 6)
         self.assertEqual(len(all_stable_entries), sum([len(v) for v in pd.stable_charges.values()]))
 
+    def test_get_formation_energies(self):
+        pd = DefectPhaseDiagram(self.entries, 2.6682, 2.0)
+        facets = [{Element("Ga"): -3.6, Element("As"): -4.7}, {Element("Ga"): -3.0}]
+        fermi_levels = [0., 0.7, 1.5]
+        entries = list(pd.all_stable_entries)
+        formation_energies = pd.get_formation_energies(facets, fermi_levels, entries)
+        self.assertEqual(formation_energies.shape, (2, len(entries), 3))
+        for i, mu in enumerate(facets):
+            for j, entry in enumerate(entries):
+                for k, ef in enumerate(fermi_levels):
+                    self.assertAlmostEqual(formation_energies[i, j, k], entry.formation_energy(mu, ef))
+
+    def test_solve_for_fermi_energies(self):
+        pd = DefectPhaseDiagram(self.entries, 2.6682, 2.0)
+        with open(os.path.join(test_dir, "complete_dos.json"), "r") as f:
+            bulk_dos = CompleteDos.from_dict(json.load(f))
+        facets = [{Element("Ga"): -3.6, Element("As"): -4.7}, {Element("Ga"): -4.2, Element("As"): -4.1}]
+        temperatures = [300, 900]
+        fermi_energies = pd.solve_for_fermi_energies(temperatures, facets, bulk_dos)
+        self.assertEqual(fermi_energies.shape, (2, 2))
+
+        fdos = FermiDos(bulk_dos, bandgap=pd.band_gap)
+        for i, mu in enumerate(facets):
+            for j, T in enumerate(temperatures):
+
+                def _get_total_q(ef):
+                    qd_tot = sum(d['charge'] * d['conc'] for d in pd.defect_concentrations(mu, T, ef))
+                    return qd_tot + fdos.get_doping(fermi=ef + pd.vbm, T=T)
+
+                ef = bisect(_get_total_q, -1., pd.band_gap + 1.)
+                self.assertAlmostEqual(fermi_energies[i, j], ef)
+                self.assertAlmostEqual(pd.solve_for_fermi_energy(T, mu, bulk_dos), ef)
+
 
 if __name__ == "__main__":
     unittest.main()
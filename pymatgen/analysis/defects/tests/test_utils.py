@@ -9,7 +9,7 @@ import numpy as np
 import random
 
 from pymatgen.analysis.defects.utils import QModel, eV_to_k, \
-    generate_reciprocal_vectors_squared, \
+    generate_reciprocal_vectors_squared, ReciprocalGrid, \
     closestsites, StructureMotifInterstitial, TopographyAnalyzer, \
     ChargeDensityAnalyzer, converge, calculate_vol
 from pymatgen.util.testing import PymatgenTest
@@ -83,6 +83,19 @@ class DefectsUtilsTest(PymatgenTest):
                                                      lattvectors[2], 30.)),
             brecip)
 
+    def test_reciprocal_grid(self):
+        for lattvectors in [np.eye(3) * 6., np.diag([6., 3., 18.]),
+                            [[1.5, 0.2, 0.3], [0.3, 1.2, .2], [0.5, 0.4, 1.3]],
+                            [[7., 0., 0.], [3.5, 6., 0.], [3.5, 2., 5.7]]]:
+            grid = ReciprocalGrid(*lattvectors)
+            for encut in [0., 1., 30., 12., 100.]:
+                g2 = list(generate_reciprocal_vectors_squared(lattvectors[0],
+                                                              lattvectors[1],
+                                                              lattvectors[2],
+                                                              encut))
+                self.assertArrayAlmostEqual(np.sort(grid.get_g2(encut)),
+                                            np.sort(g2))
+
     def test_closest_sites(self):
         struct = PymatgenTest.get_structure("VO2")
 
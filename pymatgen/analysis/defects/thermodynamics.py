@@ -5,10 +5,10 @@
 import numpy as np
 from monty.json import MSONable
 from scipy.spatial import HalfspaceIntersection
-from scipy.optimize import bisect
 from itertools import groupby, chain
 
 from pymatgen.electronic_structure.dos import FermiDos
+from pymatgen.analysis.defects.utils import kb
 
 __author__ = "Danny Broberg, Shyam Dwaraknath"
 __copyright__ = "Copyright 2018, The Materials Project"
@@ -46,6 +46,8 @@ class DefectPhaseDiagram(MSONable):
         else:
             self.entries = entries
 
+        self._fermi_dos = None
+
         self.find_stable_charges()
 
     def find_stable_charges(self):
@@ -231,6 +233,76 @@ class DefectPhaseDiagram(MSONable):
 
         return recommendations
 
+    def get_formation_energies(self, chemical_potentials, fermi_levels, entries=None):
+        """
+        Formation energies of defect entries for a set of chemical potential
+        facets and Fermi levels, evaluated as a single array
+        Args:
+            chemical_potentials: list of {Element: number} dictionaries of
+                chemical potentials, e.g. one for each facet of a phase diagram
+            fermi_levels: array of Fermi levels relative to the VBM
+            entries: list of DefectEntry objects. Defaults to all the stable
+                entries of the DefectPhaseDiagram.
+        Returns:
+            (facet, entry, Fermi level) array of formation energies
+        """
+        entries = list(self.all_stable_entries) if entries is None else list(entries)
+        elements = list(dict.fromkeys(chain.from_iterable(chemical_potentials)))
+
+        mu_vals = np.array([[mu.get(el, 0.) for el in elements] for mu in chemical_potentials])
+        mu_vals = mu_vals.reshape(len(chemical_potentials), len(elements))
+        stoichiometry = np.array([[
+            entry.bulk_structure.composition[el] - entry.defect.defect_composition[el] for el in elements
+        ] for entry in entries]).reshape(len(entries), len(elements))
+        charges = np.array([entry.charge for entry in entries], dtype=float)
+        energies = np.array([entry.energy for entry in entries], dtype=float)
+        energies += charges * [entry.parameters.get("vbm", 0.) for entry in entries]
+
+        formation_energies = energies + np.dot(mu_vals, stoichiometry.T)
+        return formation_energies[:, :, None] + charges[:, None] * np.array(fermi_levels, ndmin=1)
+
+    def _get_fermi_dos(self, bulk_dos):
+        """
+        FermiDos for the bulk dos, built once and reused by the Fermi level
+        solvers as long as the same bulk dos is supplied
+        """
+        if self._fermi_dos is None or self._fermi_dos[0] is not bulk_dos:
+            self._fermi_dos = (bulk_dos, FermiDos(bulk_dos, bandgap=self.band_gap))
+        return self._fermi_dos[1]
+
+    def solve_for_fermi_energies(self, temperatures, chemical_potentials, bulk_dos):
+        """
+        Solve for the self-consistent Fermi energies over a grid of
+        temperatures and chemical potential facets at once. Charge neutrality
+        between the stable defects and the free carriers of the bulk dos is
+        solved by a bisection over all grid points simultaneously.
+        Args:
+            temperatures: array of temperatures in K
+            chemical_potentials: list of {Element: number} dictionaries of
+                chemical potentials, e.g. one for each facet of a phase diagram
+            bulk_dos: bulk system dos (pymatgen Dos object)
+        Returns:
+            (facet, temperature) array of Fermi energies relative to the VBM
+        """
+        temperatures = np.array(temperatures, dtype=float, ndmin=1)
+        entries = list(self.all_stable_entries)
+        formation_energies = self.get_formation_energies(chemical_potentials, 0., entries)
+        charges = np.array([entry.charge for entry in entries], dtype=float)[:, None]
+        site_densities = np.array([entry.multiplicity * 1e24 / entry.defect.bulk_structure.volume
+                                   for entry in entries])[:, None]
+        fdos = self._get_fermi_dos(bulk_dos)
+
+        def _get_total_q(ef):
+            # ef is a (facet, temperature) array
+            conc = site_densities * np.exp(-1.0 * (formation_energies + charges * ef[:, None, :]) /
+                                           (kb * temperatures))
+            qd_tot = np.sum(charges * conc, axis=1)
+            qd_tot += fdos.get_doping(fermi=ef + self.vbm, T=temperatures)
+            return qd_tot
+
+        shape = (len(chemical_potentials), len(temperatures))
+        return _bisect(_get_total_q, np.full(shape, -1.), np.full(shape, self.band_gap + 1.))
+
     def solve_for_fermi_energy(self, temperature, chemical_potentials, bulk_dos):
         """
         Solve for the Fermi energy self-consistently as a function of T
@@ -245,16 +317,38 @@ class DefectPhaseDiagram(MSONable):
             Fermi energy
         """
 
-        fdos = FermiDos(bulk_dos, bandgap=self.band_gap)
+        return self.solve_for_fermi_energies([temperature], [chemical_potentials], bulk_dos)[0, 0]
 
-        def _get_total_q(ef):
-
-            qd_tot = sum([
-                d['charge'] * d['conc']
-                for d in self.defect_concentrations(
-                    chemical_potentials=chemical_potentials, temperature=temperature, fermi_level=ef)
-            ])
-            qd_tot += fdos.get_doping(fermi=ef + self.vbm, T=temperature)
-            return qd_tot
 
-        return bisect(_get_total_q, -1., self.band_gap + 1.)
+def _bisect(f, a, b, xtol=2e-12, rtol=8.881784197001252e-16, maxiter=100):
+    """
+    Element-wise bisection for the roots of a vectorized function, taking
+    the same steps as scipy.optimize.bisect for each element
+    Args:
+        f: function of an array returning an array of the same shape
+        a, b: arrays of the brackets of the roots
+        xtol, rtol, maxiter: convergence criteria as in scipy.optimize.bisect
+    Returns:
+        array of the roots
+    """
+    a, b = np.array(a, dtype=float), np.array(b, dtype=float)
+    fa, fb = f(a), f(b)
+    if np.any(fa * fb > 0):
+        raise ValueError("f(a) and f(b) must have different signs")
+    root = np.where(fb == 0, b, np.nan)
+    root = np.where(fa == 0, a, root)
+    active = np.isnan(root)
+    dm = b - a
+    for _ in range(maxiter):
+        if not active.any():
+            return root
+        dm *= 0.5
+        xm = a + dm
+        fm = f(xm)
+        a = np.where(active & (fm * fa >= 0), xm, a)
+        done = active & ((fm == 0) | (np.abs(dm) < xtol + rtol * np.abs(xm)))
+        root[done] = xm[done]
+        active &= ~done
+    if active.any():
+        raise RuntimeError("Failed to converge after %d iterations" % maxiter)
+    return root
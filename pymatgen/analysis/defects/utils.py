@@ -182,6 +182,73 @@ def generate_reciprocal_vectors_squared(a1, a2, a3, encut):
         yield np.dot(vec, vec)
 
 
+class ReciprocalGrid:
+    """
+    Array form of generate_reciprocal_vectors_squared for a sequence of
+    energy cutoffs (e.g. inside converge). The integer reciprocal vectors
+    are generated once for the largest cutoff requested so far and the
+    vectors within any lower cutoff are selected with a mask which
+    reproduces the index ranges and radius test of genrecip.
+    """
+
+    def __init__(self, a1, a2, a3):
+        """
+        Args:
+            a1: Lattice vector a (in Bohrs)
+            a2: Lattice vector b (in Bohrs)
+            a3: Lattice vector c (in Bohrs)
+        """
+        vol = np.dot(a1, np.cross(a2, a3))
+        self.recip_vectors = np.array([(2 * np.pi / vol) * np.cross(a2, a3),
+                                       (2 * np.pi / vol) * np.cross(a3, a1),
+                                       (2 * np.pi / vol) * np.cross(a1, a2)])
+        self.recip_norms = [norm(b) for b in self.recip_vectors]
+        self.encut = None
+        self._indices = None
+        self._g2 = None
+        self._radii = None
+
+    def get_index_max(self, encut):
+        """
+        Args:
+            encut: Reciprocal vector energy cutoff
+
+        Returns:
+            (3,) int array of the index bounds searched by genrecip along
+            each reciprocal lattice vector.
+        """
+        G_cut = eV_to_k(encut)
+        return np.array([int(math.ceil(G_cut / n)) for n in self.recip_norms])
+
+    def _build(self, encut):
+        index_max = self.get_index_max(encut)
+        ranges = [np.arange(-m, m) for m in index_max]
+        self._indices = np.array(np.meshgrid(*ranges)).T.reshape(-1, 3)
+        vecs = np.dot(self._indices, self.recip_vectors)
+        self._g2 = np.einsum('ij,ij->i', vecs, vecs)
+        self._radii = np.sqrt(self._g2)
+        self.encut = encut
+
+    def get_g2(self, encut):
+        """
+        Args:
+            encut: Reciprocal vector energy cutoff
+
+        Returns:
+            Array of the squared reciprocal vectors (1/Bohr)^2 yielded by
+            generate_reciprocal_vectors_squared for the same cutoff.
+        """
+        if self.encut is None or encut > self.encut:
+            # grow geometrically so that increasing cutoffs rebuild rarely
+            self._build(encut if self.encut is None
+                        else max(encut, 2 * self.encut))
+        index_max = self.get_index_max(encut)
+        mask = (self._radii < eV_to_k(encut)) & (self._radii != 0)
+        mask &= np.all((self._indices >= -index_max) &
+                       (self._indices < index_max), axis=1)
+        return self._g2[mask]
+
+
 def closestsites(struct_blk, struct_def, pos):
     """
     Returns closest site to the input position
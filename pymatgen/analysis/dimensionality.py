@@ -25,10 +25,11 @@ import copy
 import numpy as np
 
 from collections import defaultdict
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
 
-from networkx.readwrite import json_graph
-
-from pymatgen.analysis.graphs import MoleculeGraph, StructureGraph
+from pymatgen.analysis.graphs import MoleculeGraph, StructureGraph, \
+    EdgeArrays
 from pymatgen.core.lattice import get_integer_index
 from pymatgen.core.structure import Structure, Molecule
 from pymatgen.core.periodic_table import Specie
@@ -114,21 +115,26 @@ def get_structure_components(bonded_structure, inc_orientation=False,
         - "molecule_graph": If inc_molecule_graph is `True`, the site a
             MoleculeGraph object for zero-dimensional components.
     """
-    import networkx as nx  # optional dependency therefore not top level import
-
-    comp_graphs = (bonded_structure.graph.subgraph(c) for c in
-                   nx.weakly_connected_components(bonded_structure.graph))
+    # components and their periodic translations from the sparse bond
+    # graph, equivalent to the breadth-first search of
+    # calculate_dimensionality_of_site() for every component
+    labels, images, translations = bonded_structure.get_connected_components()
+    graph_attributes, node_attributes, edges, edge_properties = \
+        bonded_structure._get_edges()
+    edge_labels = labels[edges.from_index]
 
     components = []
-    for graph in comp_graphs:
-        dimensionality, vertices = calculate_dimensionality_of_site(
-            bonded_structure, list(graph.nodes())[0], inc_vertices=True)
+    for n, component_translations in enumerate(translations):
+        site_ids = np.nonzero(labels == n)[0]
+        dimensionality = (np.linalg.matrix_rank(component_translations)
+                          if len(component_translations) else 0)
 
         component = {'dimensionality': dimensionality}
 
         if inc_orientation:
             if dimensionality in [1, 2]:
-                vertices = np.array(vertices)
+                vertices = np.concatenate(([[0, 0, 0]],
+                                           component_translations))
 
                 g = vertices.sum(axis=0) / vertices.shape[0]
 
@@ -145,20 +151,29 @@ def get_structure_components(bonded_structure, inc_orientation=False,
             component['orientation'] = orientation
 
         if inc_site_ids:
-            component['site_ids'] = tuple(graph.nodes())
+            component['site_ids'] = tuple(site_ids.tolist())
 
         if inc_molecule_graph and dimensionality == 0:
             component['molecule_graph'] = zero_d_graph_to_molecule_graph(
-                bonded_structure, graph)
+                bonded_structure, bonded_structure.graph.subgraph(site_ids.tolist()))
 
         component_structure = Structure.from_sites(
-            [bonded_structure.structure[n] for n in sorted(graph.nodes())])
-
-        sorted_graph = nx.convert_node_labels_to_integers(
-            graph, ordering="sorted")
-        component_graph = StructureGraph(
-            component_structure,
-            graph_data=json_graph.adjacency_data(sorted_graph))
+            [bonded_structure.structure[i] for i in site_ids])
+
+        # edges of the component, with the sites renumbered
+        index_map = np.zeros(len(labels), dtype=int)
+        index_map[site_ids] = np.arange(len(site_ids))
+        in_component = np.nonzero(edge_labels == n)[0]
+        component_edges = EdgeArrays(
+            index_map[edges.from_index[in_component]],
+            index_map[edges.to_index[in_component]],
+            edges.to_jimage[in_component], edges.weight[in_component])
+        component_graph = StructureGraph._with_edge_arrays(
+            component_structure, dict(graph_attributes), component_edges,
+            node_attributes=None if node_attributes is None else
+            [node_attributes[i] for i in site_ids],
+            edge_properties=None if edge_properties is None else
+            [edge_properties[i] for i in in_component])
         component['structure_graph'] = component_graph
 
         components.append(component)
@@ -399,22 +414,18 @@ def find_connected_atoms(struct, tolerance=0.45, ldict=JmolNN().el_radius):
     for i, item in enumerate(species):
         if item not in ldict.keys():
             species[i] = str(Specie.from_string(item).element)
+    radii = np.array([ldict[sp] for sp in species])
     latmat = struct.lattice.matrix
+    move_cells = np.array(list(itertools.product([0, 1, -1], repeat=3)))
     connected_list = []
 
-    for i in range(n_atoms):
-        for j in range(i + 1, n_atoms):
-            max_bond_length = ldict[species[i]] + ldict[species[j]] + tolerance
-            add_ij = False
-            for move_cell in itertools.product(
-                    [0, 1, -1], [0, 1, -1], [0, 1, -1]):
-                if not add_ij:
-                    frac_diff = fc[j] + move_cell - fc[i]
-                    distance_ij = np.dot(latmat.T, frac_diff)
-                    if np.linalg.norm(distance_ij) < max_bond_length:
-                        add_ij = True
-            if add_ij:
-                connected_list.append([i, j])
+    for i in range(n_atoms - 1):
+        # distances from atom i to the 27 closest images of each later atom
+        frac_diff = fc[i + 1:, None, :] + move_cells - fc[i]
+        distance_ij = np.linalg.norm(np.dot(frac_diff, latmat), axis=2)
+        max_bond_length = radii[i] + radii[i + 1:] + tolerance
+        bonded = np.any(distance_ij < max_bond_length[:, None], axis=1)
+        connected_list.extend([i, j] for j in np.nonzero(bonded)[0] + i + 1)
     return np.array(connected_list)
 
 
@@ -446,36 +457,14 @@ def find_clusters(struct, connected_list):
         return [0, 1, 0]
     if n_atoms == 0:
         return [0, 0, 0]
-    cluster_sizes = []
-    clusters = []
-    for atom in range(n_atoms):
-        connected_inds = np.where(connected_list == atom)[0]
-        atom_cluster = np.unique(connected_list[connected_inds])
-        atom_cluster = set(atom_cluster)
-        if len(clusters) == 0:
-            new_clusters = [atom_cluster]
-            new_cluster_sizes = [len(atom_cluster)]
-        else:
-            clusters_w_atom = [atom_cluster]
-            clusters_noatom = []
-            clusters_noatom_sizes = []
-            for cluster in clusters:
-                if len(cluster.intersection(atom_cluster)) > 0:
-                    clusters_w_atom.append(cluster)
-                else:
-                    clusters_noatom.append(cluster)
-                    clusters_noatom_sizes.append(len(cluster))
-            if len(clusters_w_atom) > 1:
-                clusters_w_atom = [set.union(*clusters_w_atom)]
-            new_clusters = clusters_noatom + clusters_w_atom
-            new_cluster_sizes = (clusters_noatom_sizes +
-                                 [len(clusters_w_atom[0])])
-        clusters = list(new_clusters)
-        cluster_sizes = list(new_cluster_sizes)
-        if n_atoms in cluster_sizes:
-            break
-    max_cluster = max(cluster_sizes)
-    min_cluster = min(cluster_sizes)
+    n_clusters, labels = connected_components(
+        csr_matrix((np.ones(len(connected_list)),
+                    (connected_list[:, 0], connected_list[:, 1])),
+                   shape=(n_atoms, n_atoms)), directed=False)
+    cluster_sizes = np.bincount(labels)
+    clusters = [set(np.nonzero(labels == n)[0]) for n in range(n_clusters)]
+    max_cluster = int(max(cluster_sizes))
+    min_cluster = int(min(cluster_sizes))
     return [max_cluster, min_cluster, clusters]
 
 
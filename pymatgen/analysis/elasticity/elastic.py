@@ -12,6 +12,7 @@ from scipy.special import factorial
 from scipy.integrate import quad
 from scipy.optimize import root
 from collections import OrderedDict
+from functools import lru_cache
 from monty.dev import deprecated
 import numpy as np
 import warnings
@@ -574,10 +575,20 @@ class ElasticTensorExpansion(TensorCollection):
         Args:
             n (3x1 array-like): normal mode direction
             u (3x1 array-like): polarization direction
-        """
-        gk = self[0].einsum_sequence([n, u, n, u])
-        result = -(2*gk*np.outer(u, u) + self[0].einsum_sequence([n, n])
-                   + self[1].einsum_sequence([n, u, n, u])) / (2*gk)
+
+        Both n and u may also be arrays of directions with the
+        vector in the last axis, in which case the GGTs for all
+        (broadcast) pairs are returned.
+        """
+        # Contract the directions before the polarizations, since
+        # the former are typically shared by several of the latter
+        c2_nn = np.einsum('ijkl,...i,...k->...jl', self[0], n, n)
+        gk = np.einsum('...jl,...j,...l->...', c2_nn, u, u)[..., None, None]
+        c3_nn = np.einsum('ijklmn,...k,...m->...ijln', self[1], n, n)
+        result = -(2*gk*np.einsum('...i,...j->...ij', u, u)
+                   + np.einsum('ijkl,...k,...l->...ij', self[0], n, n)
+                   + np.einsum('...ijln,...l,...n->...ij', c3_nn, u, u)
+                   ) / (2*gk)
         return result
 
     def get_tgt(self, temperature=None, structure=None, quad=None):
@@ -605,19 +616,20 @@ class ElasticTensorExpansion(TensorCollection):
                              "include structure")
 
         quad = quad if quad else DEFAULT_QUAD
-        points = quad['points']
-        weights = quad['weights']
-        num, denom, c = np.zeros((3, 3)), 0, 1
-        for p, w in zip(points, weights):
-            gk = ElasticTensor(self[0]).green_kristoffel(p)
-            rho_wsquareds, us = np.linalg.eigh(gk)
-            us = [u / np.linalg.norm(u) for u in np.transpose(us)]
-            for u in us:
-                # TODO: this should be benchmarked
-                if temperature:
-                    c = self.get_heat_capacity(temperature, structure, p, u)
-                num += c*self.get_ggt(p, u) * w
-                denom += c * w
+        points = np.array(quad['points'])
+        weights = np.array(quad['weights'])
+        # Polarizations of all quadrature directions from the stacked
+        # Green-Kristoffel tensors
+        gk = np.einsum('ijkl,pi,pl->pjk', self[0], points, points)
+        us = np.transpose(np.linalg.eigh(gk)[1], (0, 2, 1))
+        us = us / np.linalg.norm(us, axis=-1, keepdims=True)
+        ns = points[:, None, :]
+        if temperature:
+            c = self.get_heat_capacity(temperature, structure, ns, us)
+        else:
+            c = np.ones(us.shape[:-1])
+        num = np.einsum('p,pm,pmij->ij', weights, c, self.get_ggt(ns, us))
+        denom = np.einsum('p,pm->', weights, c)
         return SquareTensor(num / denom)
 
     def get_gruneisen_parameter(self, temperature=None, structure=None,
@@ -651,15 +663,19 @@ class ElasticTensorExpansion(TensorCollection):
                 no attempt for verification of eigenvectors is made
             cutoff (float): cutoff for scale of kt / (hbar * omega)
                 if lower than this value, returns 0
+
+        Both n and u may also be arrays of directions with the
+        vector in the last axis, in which case an array of heat
+        capacities is returned.
         """
         k = 1.38065e-23
         kt = k*temperature
         hbar_w = 1.05457e-34*self.omega(structure, n, u)
-        if hbar_w > kt * cutoff:
-            return 0.0
-        c = k * (hbar_w / kt) ** 2
-        c *= np.exp(hbar_w / kt) / (np.exp(hbar_w / kt) - 1)**2
-        return c * 6.022e23
+        with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+            c = k * (hbar_w / kt) ** 2
+            c *= np.exp(hbar_w / kt) / (np.exp(hbar_w / kt) - 1)**2
+        c = np.where(hbar_w > kt * cutoff, 0.0, c * 6.022e23)
+        return c if c.ndim else float(c)
 
     def omega(self, structure, n, u):
         """
@@ -673,11 +689,12 @@ class ElasticTensorExpansion(TensorCollection):
             u (3x1 array-like): polarization direction, note that
                 no attempt for verification of eigenvectors is made
         """
-        l0 = np.dot(np.sum(structure.lattice.matrix, axis=0), n)
+        l0 = np.dot(n, np.sum(structure.lattice.matrix, axis=0))
         l0 *= 1e-10 # in A
         weight = float(structure.composition.weight) * 1.66054e-27 # in kg
         vol = structure.volume * 1e-30 # in m^3
-        vel = (1e9 * self[0].einsum_sequence([n, u, n, u])
+        vel = (1e9 * np.einsum('ijkl,...i,...j,...k,...l->...',
+                               self[0], n, u, n, u)
                / (weight / vol)) ** 0.5
         return vel / l0
 
@@ -880,10 +897,10 @@ def diff_fit(strains, stresses, eq_stress=None, order=2, tol=1e-10):
 
     m, absent = generate_pseudo(list(strain_state_dict.keys()), order)
     for i in range(1, order):
-        cvec, carr = get_symbol_list(i+1)
+        cinds, carr = get_symmetric_indices(i+1)
         svec = np.ravel(dei_dsi[i-1].T)
-        cmap = dict(zip(cvec, np.dot(m[i-1], svec)))
-        c_list.append(v_subs(carr, cmap))
+        cvec = np.dot(m[i-1], svec)
+        c_list.append(cvec[carr])
     return [Tensor.from_voigt(c) for c in c_list]
 
 
@@ -978,7 +995,10 @@ def get_strain_state_dict(strains, stresses, eq_stress=None,
 
 def generate_pseudo(strain_states, order=3):
     """
-    Generates the pseudoinverse for a given set of strains.
+    Generates the pseudoinverse for a given set of strains.  The
+    pseudoinverses are constructed numerically and cached by strain
+    states and order, so repeated fits with the same set of strain
+    states don't regenerate them.
 
     Args:
         strain_states (6xN array like): a list of voigt-notation
@@ -990,31 +1010,69 @@ def generate_pseudo(strain_states, order=3):
         mis: pseudo inverses for each order tensor, these can
             be multiplied by the central difference derivative
             of the stress with respect to the strain state
-        absent_syms: symbols of the tensor absent from the PI
-            expression
+        absent_inds: list with one set per order of the voigt index
+            tuples of the distinct tensor entries absent from the PI
+            expression, e. g. (0, 0, 1) for c_001.  Note that these
+            were sympy symbols (e. g. c_001) in earlier versions.
     """
-    s = sp.Symbol('s')
+    strain_states = tuple(tuple(float(e) for e in state)
+                          for state in strain_states)
+    mis, absent_inds = _generate_pseudo(strain_states, order)
+    return [mi.copy() for mi in mis], [set(a) for a in absent_inds]
+
+
+@lru_cache(maxsize=32)
+def _generate_pseudo(strain_states, order):
+    """
+    Cached implementation of generate_pseudo for strain states given
+    as a tuple of tuples, the returned arrays should not be modified.
+    """
+    strain_states = np.array(strain_states, dtype=float)
     nstates = len(strain_states)
-    ni = np.array(strain_states)*s
-    mis, absent_syms = [], []
+    mis, absent_inds = [], []
     for degree in range(2, order + 1):
-        cvec, carr = get_symbol_list(degree)
-        sarr = np.zeros((nstates, 6), dtype=object)
-        for n, strain_v in enumerate(ni):
-            # Get expressions
-            exps = carr.copy()
-            for i in range(degree - 1):
-                exps = np.dot(exps, strain_v)
-            exps /= np.math.factorial(degree - 1)
-            sarr[n] = [sp.diff(exp, s, degree - 1) for exp in exps]
-        svec = sarr.ravel()
-        present_syms = set.union(*[exp.atoms(sp.Symbol) for exp in svec])
-        absent_syms += [set(cvec) - present_syms]
-        m = np.zeros((6*nstates, len(cvec)))
-        for n, c in enumerate(cvec):
-            m[:, n] = v_diff(svec, c)
+        cinds, carr = get_symmetric_indices(degree)
+        # The (degree - 1)th derivative of the stress with respect
+        # to the strain magnitude is the tensor contracted with the
+        # strain state over all but its first index
+        sprod = np.ones((nstates, 1))
+        for i in range(degree - 1):
+            sprod = np.einsum('ni,nj->nij', sprod, strain_states)
+            sprod = sprod.reshape(nstates, -1)
+        # Coefficient of each distinct entry, i. e. one-hot over carr
+        onehot = np.eye(len(cinds))[carr].reshape(6, -1, len(cinds))
+        m = np.einsum('nj,ijk->nik', sprod, onehot)
+        m = m.reshape(6 * nstates, len(cinds))
+        absent_inds.append(frozenset(cinds[n] for n in
+                                     np.nonzero(~m.any(axis=0))[0]))
         mis.append(np.linalg.pinv(m))
-    return mis, absent_syms
+    return mis, absent_inds
+
+
+def get_symmetric_indices(rank, dim=6):
+    """
+    Returns a numeric representation of the voigt-notation tensor
+    that places identical indices for entries related by index
+    transposition, i. e. C_1121 = C_1211 etc.  This is the numeric
+    counterpart of get_symbol_list.
+
+    Args:
+        rank (int): rank of tensor, e. g. 3 for third-order ECs
+        dim (int): dimension of matrix/tensor, e. g. 6 for
+            voigt notation and 3 for standard
+
+    Returns:
+        c_inds (list): distinct voigt indices of the tensor
+        c_arr (array): integer array with the position in c_inds
+            of each entry of the tensor
+    """
+    c_inds = list(
+        itertools.combinations_with_replacement(range(dim), r=rank))
+    c_arr = np.zeros([dim]*rank, dtype=int)
+    for n, idx in enumerate(c_inds):
+        for perm in itertools.permutations(idx):
+            c_arr[perm] = n
+    return c_inds, c_arr
 
 
 def get_symbol_list(rank, dim=6):
@@ -5,6 +5,7 @@ import warnings
 import numpy as np
 import json
 import random
+import itertools
 
 from scipy.misc import central_diff_weights
 from copy import deepcopy
@@ -12,7 +13,7 @@ from copy import deepcopy
 from pymatgen.analysis.elasticity.elastic import ElasticTensor,\
     ElasticTensorExpansion, NthOrderElasticTensor, ComplianceTensor,\
     find_eq_stress, generate_pseudo, diff_fit, get_diff_coeff,\
-    get_strain_state_dict
+    get_strain_state_dict, get_symmetric_indices
 from pymatgen.analysis.elasticity.strain import Strain, Deformation
 from pymatgen.analysis.elasticity.stress import Stress
 from pymatgen.core.tensors import Tensor
@@ -300,6 +301,20 @@ class ElasticTensorExpansionTest(PymatgenTest):
         self.assertAlmostEqual(gp, 2.59631832)
         gpt = self.exp_cu.get_gruneisen_parameter(temperature=200, structure=self.cu)
 
+        # Stacked directions and polarizations
+        ns = np.array([[1, 0, 0], [0, 0, 1]])[:, None]
+        us = np.array([[[0, 1, 0], [0, 0, 1]], [[1, 0, 0], [0, 1, 0]]])
+        ggts = self.exp_cu.get_ggt(ns, us)
+        cs = self.exp_cu.get_heat_capacity(300, self.cu, ns, us)
+        self.assertEqual(ggts.shape, (2, 2, 3, 3))
+        self.assertEqual(cs.shape, (2, 2))
+        for n, u_set, ggt_set, c_set in zip(ns, us, ggts, cs):
+            for u, ggt, c in zip(u_set, ggt_set, c_set):
+                self.assertArrayAlmostEqual(
+                    ggt, self.exp_cu.get_ggt(n[0], u))
+                self.assertAlmostEqual(c, self.exp_cu.get_heat_capacity(
+                    300, self.cu, n[0], u))
+
     def test_thermal_expansion_coeff(self):
         #TODO get rid of duplicates
         alpha_dp = self.exp_cu.thermal_expansion_coeff(self.cu, 300,
@@ -445,6 +460,37 @@ class DiffFitTest(PymatgenTest):
         m2, abs = generate_pseudo(strain_states, order=2)
         m3, abs = generate_pseudo(strain_states, order=3)
         m4, abs = generate_pseudo(strain_states, order=4)
+        self.assertEqual([m.shape for m in m4], [(21, 36), (56, 36),
+                                                 (126, 36)])
+        self.assertArrayAlmostEqual(m2[0], m4[0])
+        # Uniaxial strain states give only the c_ij and c_iij entries
+        m2_inv = np.linalg.pinv(m2[0])
+        self.assertArrayAlmostEqual(m2_inv[:6, :6], np.eye(6))
+        self.assertEqual(len(abs[0]), 0)
+        self.assertIn((0, 1, 2), abs[1])
+        self.assertNotIn((0, 0, 1), abs[1])
+        # Absent entries are given as sets of sorted voigt index tuples,
+        # for third order those with three distinct indices
+        self.assertIsInstance(abs[1], set)
+        self.assertEqual(abs[1], set(itertools.combinations(range(6), 3)))
+        self.assertTrue(all(isinstance(i, int) for ind in abs[2]
+                            for i in ind))
+        # Results are cached, but returned as copies
+        m4[0][:] = 0
+        m4_new, abs_new = generate_pseudo(strain_states, order=4)
+        self.assertArrayAlmostEqual(m2[0], m4_new[0])
+        self.assertEqual(abs, abs_new)
+
+    def test_get_symmetric_indices(self):
+        c_inds, c_arr = get_symmetric_indices(3)
+        self.assertEqual(len(c_inds), 56)
+        self.assertEqual(c_arr.shape, (6, 6, 6))
+        self.assertEqual(c_inds[c_arr[2, 0, 1]], (0, 1, 2))
+        self.assertEqual(c_arr[3, 4, 4], c_arr[4, 3, 4])
+        c_inds, c_arr = get_symmetric_indices(2, dim=3)
+        self.assertArrayEqual(c_arr, c_arr.T)
+        self.assertEqual(c_inds, [(0, 0), (0, 1), (0, 2), (1, 1), (1, 2),
+                                  (2, 2)])
 
     def test_fit(self):
         cdf = diff_fit(self.strains, self.pk_stresses,
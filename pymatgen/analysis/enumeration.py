@@ -0,0 +1,383 @@
+# coding: utf-8
+# Copyright (c) Pymatgen Development Team.
+# Distributed under the terms of the MIT License.
+
+
+import itertools
+import logging
+
+import numpy as np
+
+from pymatgen.core.lattice import Lattice
+from pymatgen.core.structure import Structure
+from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+from pymatgen.util.parallel import SharedArgsPool
+
+"""
+This module implements a pure python (numpy) enumerator of derivative
+structures, i.e., the symmetrically distinct orderings of a disordered
+structure in supercells of a given size. It follows the approach of the
+enumlib code (see pymatgen.command_line.enumlib_caller) and can be used as an
+in-process alternative to it, e.g., when the enumlib executables are not
+available or when the cells are small enough that the file and subprocess
+overhead of enumlib dominates.
+
+The algorithm is that of:
+
+Gus L. W. Hart and Rodney W. Forcade, "Algorithm for generating derivative
+structures," Phys. Rev. B 77 224115 (26 June 2008)
+
+Supercells are generated as Hermite normal form (HNF) matrices of the parent
+lattice and reduced under the point group of the parent. The colorings of each
+supercell are then reduced under the symmetry group of the supercell, and
+colorings with a smaller period than the supercell are discarded, since they
+are found at a smaller cell size. Unlike enumlib, all colorings are generated
+explicitly, so this is suited to small cells only.
+"""
+
+
+logger = logging.getLogger(__name__)
+
+
+class DerivativeStructureEnumerator:
+    """
+    In-process enumerator of derivative structures. It has the same interface
+    as the EnumlibAdaptor, but does not require the enumlib executables.
+
+    .. attribute:: structures
+
+        List of all enumerated structures (after run() is called).
+    """
+
+    amount_tol = 1e-2
+
+    def __init__(self, structure, min_cell_size=1, max_cell_size=1,
+                 symm_prec=0.1, refine_structure=False, ncores=None):
+        """
+        Args:
+            structure: An input structure. Disordered sites whose total
+                occupancy is less than 1 are filled with vacancies.
+            min_cell_size (int): The minimum cell size wanted. Defaults to 1.
+            max_cell_size (int): The maximum cell size wanted. Defaults to 1.
+            symm_prec (float): Symmetry precision. Defaults to 0.1.
+            refine_structure (bool): Whether to refine the structure with
+                SpacegroupAnalyzer before the enumeration. See EnumlibAdaptor.
+            ncores (int): Number of processes over which the cell sizes are
+                distributed. Default is None, which enumerates serially.
+        """
+        if refine_structure:
+            finder = SpacegroupAnalyzer(structure, symm_prec)
+            self.structure = finder.get_refined_structure()
+        else:
+            self.structure = structure
+        self.min_cell_size = min_cell_size
+        self.max_cell_size = max_cell_size
+        self.symm_prec = symm_prec
+        self.ncores = ncores
+        self.structures = None
+
+    def run(self):
+        """
+        Run the enumeration. Unlike the EnumlibAdaptor, no error is raised if
+        there are no structures of the requested cell sizes, e.g., because
+        the occupancies are not compatible with them, and structures is then
+        an empty list.
+        """
+        self.structures = list(self.iter_structures())
+
+    def iter_structures(self):
+        """
+        Generator over the enumerated structures, in order of increasing cell
+        size. Structures are built lazily in serial mode. With ncores, each
+        cell size is enumerated in a separate process and its structures are
+        yielded as soon as that size is complete.
+        """
+        parent = _get_parent_data(self.structure, self.symm_prec)
+        sizes = range(self.min_cell_size, self.max_cell_size + 1)
+        if self.ncores and len(sizes) > 1:
+            with SharedArgsPool(self.ncores, _enumerate_cell_size,
+                                (parent,)) as p:
+                for structures in p.imap(sizes):
+                    for s in structures:
+                        yield s
+        else:
+            for n in sizes:
+                for s in _iter_cell_size(parent, n):
+                    yield s
+
+
+def get_hnf_matrices(n):
+    """
+    All lower triangular Hermite normal form matrices with determinant n.
+
+    Args:
+        n (int): Determinant, i.e., the size of the supercell.
+
+    Returns:
+        (k, 3, 3) int array of HNF matrices. The rows are the supercell
+        vectors in terms of the parent lattice vectors.
+    """
+    hnfs = []
+    for a in range(1, n + 1):
+        if n % a:
+            continue
+        for c in range(1, n // a + 1):
+            if (n // a) % c:
+                continue
+            f = n // (a * c)
+            # off-diagonal elements are reduced modulo the diagonal element
+            # of their column, since the rows are the supercell vectors
+            for b, d, e in itertools.product(range(a), range(a), range(c)):
+                hnfs.append([[a, 0, 0], [b, c, 0], [d, e, f]])
+    return np.array(hnfs, dtype=int).reshape(-1, 3, 3)
+
+
+def get_unique_hnf_matrices(n, rotations):
+    """
+    HNF matrices of determinant n that are distinct under a set of rotations.
+
+    Args:
+        n (int): Determinant, i.e., the size of the supercell.
+        rotations: (g, 3, 3) array of rotations in fractional coordinates of
+            the parent lattice.
+
+    Returns:
+        (k, 3, 3) int array of symmetrically distinct HNF matrices.
+    """
+    hnfs = get_hnf_matrices(n)
+    inv_hnfs = np.linalg.inv(hnfs)
+    remaining = np.ones(len(hnfs), dtype=bool)
+    unique = []
+    for i, h in enumerate(hnfs):
+        if not remaining[i]:
+            continue
+        unique.append(h)
+        # rotated supercell vectors are the rows of h R^T. They span the same
+        # lattice as hnf j if (h R^T) hnf_j^-1 is an integer matrix.
+        rotated = np.einsum("ij,gkj->gik", h, rotations)
+        m = np.einsum("gij,hjk->ghik", rotated, inv_hnfs)
+        equiv = np.all(np.abs(m - np.round(m)) < 1e-8, axis=(2, 3))
+        remaining &= ~np.any(equiv, axis=0)
+    return np.array(unique, dtype=int).reshape(-1, 3, 3)
+
+
+def _get_parent_data(structure, symm_prec):
+    """
+    Collects everything needed to enumerate a parent structure into a
+    picklable dict: the symmetry operations, the site permutations they
+    induce and the species to distribute over each disordered orbit.
+    """
+    sga = SpacegroupAnalyzer(structure, symm_prec)
+    ops = sga.get_symmetry_operations()
+    equivalent = sga.get_symmetry_dataset()["equivalent_atoms"]
+    frac_coords = structure.frac_coords
+
+    rotations = np.array([np.round(op.rotation_matrix) for op in ops],
+                         dtype=int)
+    # the parent site each site is mapped to by each operation, and the
+    # parent lattice translation that goes with it
+    perms = np.zeros((len(ops), len(structure)), dtype=int)
+    shifts = np.zeros((len(ops), len(structure), 3), dtype=int)
+    for i, op in enumerate(ops):
+        new_coords = op.operate_multi(frac_coords)
+        diff = new_coords[:, None, :] - frac_coords[None, :, :]
+        dist = np.abs(diff - np.round(diff)).max(axis=2)
+        perms[i] = np.argmin(dist, axis=1)
+        shifts[i] = np.round(diff[np.arange(len(structure)), perms[i]])
+
+    colors = []
+    orbits = []
+    for orbit in sorted(set(equivalent[[i for i, site in enumerate(structure)
+                                        if not site.is_ordered]])):
+        sites = np.where(equivalent == orbit)[0]
+        occu = dict(structure[sites[0]].species_and_occu.items())
+        total = sum(occu.values())
+        if total < 1 - DerivativeStructureEnumerator.amount_tol:
+            occu[None] = 1 - total
+        amounts = []
+        for sp, amt in occu.items():
+            if sp not in colors:
+                colors.append(sp)
+            amounts.append((colors.index(sp), amt))
+        orbits.append((sites, amounts))
+
+    return {"structure": structure, "rotations": rotations,
+            "perms": perms, "shifts": shifts, "colors": colors,
+            "orbits": orbits}
+
+
+def _enumerate_cell_size(n, parent):
+    """
+    Module level wrapper of _iter_cell_size for multiprocessing.
+    """
+    return list(_iter_cell_size(parent, n))
+
+
+def _iter_cell_size(parent, n, chunk_size=2000000):
+    """
+    Generator over the symmetrically distinct structures of a given cell
+    size.
+
+    Args:
+        parent (dict): Output of _get_parent_data.
+        n (int): Cell size.
+        chunk_size (int): Approximate number of integer keys evaluated at a
+            time. Controls the memory used for large enumerations.
+    """
+    structure = parent["structure"]
+    orbits = parent["orbits"]
+    ncolors = len(parent["colors"])
+
+    # number of each color in each disordered orbit of the supercell
+    counts = []
+    for sites, amounts in orbits:
+        nsites = len(sites) * n
+        c = [0] * ncolors
+        for color, amt in amounts:
+            c[color] = int(round(amt * nsites))
+            if abs(amt * nsites - c[color]) > \
+                    DerivativeStructureEnumerator.amount_tol * nsites:
+                logger.debug("Occupancies not consistent with cell size "
+                             "{}".format(n))
+                return
+        if sum(c) != nsites:
+            return
+        counts.append(c)
+
+    for hnf in get_unique_hnf_matrices(n, parent["rotations"]):
+        a, c, f = np.diag(hnf)
+        # coset representatives of the parent lattice in the supercell,
+        # indexed as (x * c + y) * f + z
+        reps = np.array(list(itertools.product(range(a), range(c),
+                                               range(f))), dtype=int)
+        if not orbits:
+            # nothing to order, the supercell is the only structure
+            yield _get_structure(parent, hnf, reps, [], [])
+            continue
+
+        def get_index(t):
+            t = t.copy()
+            t -= np.floor_divide(t[..., 2], f)[..., None] * hnf[2]
+            t -= np.floor_divide(t[..., 1], c)[..., None] * hnf[1]
+            t -= np.floor_divide(t[..., 0], a)[..., None] * hnf[0]
+            return (t[..., 0] * c + t[..., 1]) * f + t[..., 2]
+
+        # operations that leave the supercell invariant
+        inv_hnf = np.linalg.inv(hnf)
+        m = np.einsum("ij,gkj,kl->gil", hnf, parent["rotations"], inv_hnf)
+        valid = np.where(np.all(np.abs(m - np.round(m)) < 1e-8,
+                                axis=(1, 2)))[0]
+
+        # supercell site (i, t) has index i * n + index(t). Each operation
+        # g combined with a translation tau maps it to
+        # (perm_g[i], R_g t + shift_g[i] + tau).
+        nsites = len(structure)
+        perms = []
+        is_translation = []
+        for g in valid:
+            rot = parent["rotations"][g]
+            is_identity = np.all(rot == np.eye(3, dtype=int)) and \
+                np.all(parent["perms"][g] == np.arange(nsites))
+            new_t = np.einsum("ij,tj->ti", rot, reps)
+            new_t = new_t[None, :, :] + parent["shifts"][g][:, None, :]
+            for tau in reps:
+                new_index = parent["perms"][g][:, None] * n + \
+                    get_index(new_t + tau)
+                perms.append(new_index.ravel())
+                is_translation.append(is_identity and np.any(tau != 0))
+        perms = np.array(perms, dtype=int)
+        is_translation = np.array(is_translation, dtype=bool)
+
+        # restrict the permutations to the disordered sites, in orbit order
+        disordered = np.concatenate([
+            (sites[:, None] * n + np.arange(n)[None, :]).ravel()
+            for sites, amounts in orbits])
+        position = np.full(nsites * n, -1, dtype=int)
+        position[disordered] = np.arange(len(disordered))
+        perms = position[perms[:, disordered]]
+
+        # colorings are identified by the integer key sum_s c_s k^s, and the
+        # key of a permuted coloring is sum_s c_s k^perm(s)
+        dtype = int if ncolors ** len(disordered) < 2 ** 62 else object
+        powers = np.array([ncolors ** i for i in range(len(disordered))],
+                          dtype=dtype)
+        perm_powers = powers[perms].T
+        transl_powers = perm_powers[:, is_translation]
+
+        orbit_colorings = [_get_orbit_colorings(orbit_counts)
+                           for orbit_counts in counts]
+        chunk = max(1, chunk_size // len(perms))
+        colorings = itertools.product(*orbit_colorings)
+        while True:
+            batch = list(itertools.islice(colorings, chunk))
+            if not batch:
+                break
+            batch = np.array([np.concatenate(b) for b in batch], dtype=int)
+            batch = batch.astype(dtype)
+            keys = batch.dot(powers)
+            perm_keys = batch.dot(perm_powers)
+            # keep the coloring with the smallest key in each orbit, unless
+            # it is invariant under a pure translation of the parent lattice
+            keep = keys == np.min(perm_keys, axis=1)
+            if transl_powers.shape[1]:
+                keep &= ~np.any(batch.dot(transl_powers) == keys[:, None],
+                                axis=1)
+            for coloring in batch[keep]:
+                yield _get_structure(parent, hnf, reps, disordered,
+                                     coloring.astype(int))
+
+
+def _get_orbit_colorings(counts):
+    """
+    All distinct arrangements of colors over the sites of an orbit.
+
+    Args:
+        counts ([int]): Number of sites of each color.
+
+    Returns:
+        List of int arrays of colors.
+    """
+    nsites = sum(counts)
+    colorings = []
+
+    def fill(coloring, free, color):
+        if color == len(counts) - 1:
+            coloring = coloring.copy()
+            coloring[free] = color
+            colorings.append(coloring)
+            return
+        for chosen in itertools.combinations(free, counts[color]):
+            new = coloring.copy()
+            new[list(chosen)] = color
+            fill(new, [i for i in free if i not in chosen], color + 1)
+
+    fill(np.zeros(nsites, dtype=int), list(range(nsites)), 0)
+    return colorings
+
+
+def _get_structure(parent, hnf, reps, disordered, coloring):
+    """
+    Builds the ordered supercell structure for a coloring of the disordered
+    sites.
+    """
+    structure = parent["structure"]
+    n = len(reps)
+    inv_hnf = np.linalg.inv(hnf)
+    lattice = Lattice(np.dot(hnf, structure.lattice.matrix))
+
+    species = [site.species_and_occu for site in structure
+               for i in range(n)]
+    for i, color in zip(disordered, coloring):
+        species[i] = parent["colors"][color]
+    frac_coords = (structure.frac_coords[:, None, :] +
+                   reps[None, :, :]).reshape(-1, 3)
+    frac_coords = np.mod(np.dot(frac_coords, inv_hnf), 1)
+    site_properties = {k: [v for v in vals for i in range(n)]
+                       for k, vals in structure.site_properties.items()}
+
+    keep = [i for i, sp in enumerate(species) if sp is not None]
+    return Structure(
+        lattice, [species[i] for i in keep], frac_coords[keep],
+        site_properties={k: [v[i] for i in keep]
+                         for k, v in site_properties.items()}
+    ).get_sorted_structure()
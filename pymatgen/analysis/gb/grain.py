@@ -5,7 +5,8 @@
 import numpy as np
 from fractions import Fraction
 from math import gcd, floor, cos
-from functools import reduce
+from functools import reduce, lru_cache, wraps
+import inspect
 from pymatgen import Structure, Lattice
 from pymatgen.core.sites import PeriodicSite
 from monty.fractions import lcm
@@ -28,6 +29,35 @@ __date__ = "7/30/18"
 logger = logging.getLogger(__name__)
 
 
+def _cache_sigmas(func):
+    """
+    Decorator caching the sigma tables computed by the enum_sigma_* methods
+    of GrainBoundaryGenerator, keyed by (cutoff, rotation axis, lattice ratio).
+    Every call returns a new copy of the cached table. The cache can be emptied
+    with the cache_clear method of the decorated function.
+    """
+    signature = inspect.signature(func)
+
+    @lru_cache(maxsize=1024)
+    def cached(*args):
+        return func(*args)
+
+    @wraps(func)
+    def wrapped(*args, **kwargs):
+        key = tuple(_to_hashable(arg) for arg in signature.bind(*args, **kwargs).args)
+        return {sigma: list(angles) for sigma, angles in cached(*key).items()}
+
+    wrapped.cache_clear = cached.cache_clear
+    wrapped.cache_info = cached.cache_info
+    return wrapped
+
+
+def _to_hashable(arg):
+    if arg is None or np.isscalar(arg):
+        return arg
+    return tuple(_to_hashable(x) for x in arg)
+
+
 class GrainBoundary(Structure):
     """
     Subclass of Structure representing a GrainBoundary (gb) object.
@@ -1169,6 +1199,7 @@ class GrainBoundaryGenerator:
         return t1_final, t2_final
 
     @staticmethod
+    @_cache_sigmas
     def enum_sigma_cubic(cutoff, r_axis):
         """
         Find all possible sigma values and corresponding rotation angles
@@ -1192,7 +1223,6 @@ class GrainBoundaryGenerator:
                     result in equivalent microstructures.
 
         """
-        sigmas = {}
         # make sure gcd(r_axis)==1
         if reduce(gcd, r_axis) != 1:
             r_axis = [int(round(x / reduce(gcd, r_axis))) for x in r_axis]
@@ -1206,47 +1236,25 @@ class GrainBoundaryGenerator:
             a_max = 1
         else:
             a_max = 2
-        n_max = int(np.sqrt(cutoff * a_max / sum(np.array(r_axis) ** 2)))
+        r_norm2 = sum(np.array(r_axis) ** 2)
+        n_max = int(np.sqrt(cutoff * a_max / r_norm2))
         # enumerate all possible n, m to give possible sigmas within the cutoff.
-        for n_loop in range(1, n_max + 1):
-            n = n_loop
-            m_max = int(np.sqrt(cutoff * a_max - n ** 2 * sum(np.array(r_axis) ** 2)))
-            for m in range(0, m_max + 1):
-                if gcd(m, n) == 1 or m == 0:
-                    if m == 0:
-                        n = 1
-                    else:
-                        n = n_loop
-                    # construct the quadruple [m, U,V,W], count the number of odds in
-                    # quadruple to determine the parameter a, refer to the reference
-                    quadruple = [m] + [x * n for x in r_axis]
-                    odd_qua = len(list(filter(lambda x: x % 2 == 1, quadruple)))
-                    if odd_qua == 4:
-                        a = 4
-                    elif odd_qua == 2:
-                        a = 2
-                    else:
-                        a = 1
-                    sigma = int(round((m ** 2 + n ** 2 * sum(np.array(r_axis) ** 2)) / a))
-                    if (sigma <= cutoff) and (sigma > 1):
-                        if sigma not in list(sigmas.keys()):
-                            if m == 0:
-                                angle = 180.0
-                            else:
-                                angle = 2 * np.arctan(n * np.sqrt(sum(np.array(r_axis) ** 2)) / m) \
-                                        / np.pi * 180
-                            sigmas[sigma] = [angle]
-                        else:
-                            if m == 0:
-                                angle = 180.0
-                            else:
-                                angle = 2 * np.arctan(n * np.sqrt(sum(np.array(r_axis) ** 2)) / m) \
-                                        / np.pi * 180
-                            if angle not in sigmas[sigma]:
-                                sigmas[sigma].append(angle)
-        return sigmas
+        n, m = _enum_coprime_n_m(
+            n_max, lambda n: int(np.sqrt(cutoff * a_max - n ** 2 * r_norm2)))
+        # m = 0 always corresponds to n = 1
+        n[m == 0] = 1
+        # construct the quadruple [m, U,V,W], count the number of odds in
+        # quadruple to determine the parameter a, refer to the reference
+        odd_qua = m % 2 + sum((n * x) % 2 for x in r_axis)
+        a = np.where(odd_qua == 4, 4, np.where(odd_qua == 2, 2, 1))
+        sigma = np.rint((m ** 2 + n ** 2 * r_norm2) / a).astype(int)
+        with np.errstate(divide="ignore"):
+            angle = np.where(m == 0, 180.0,
+                             2 * np.arctan(n * np.sqrt(r_norm2) / m) / np.pi * 180)
+        return _get_sigma_dict(sigma, angle, cutoff)
 
     @staticmethod
+    @_cache_sigmas
     def enum_sigma_hex(cutoff, r_axis, c2_a2_ratio):
         """
         Find all possible sigma values and corresponding rotation angles
@@ -1275,7 +1283,6 @@ class GrainBoundaryGenerator:
                     angles may result in equivalent microstructures.
 
         """
-        sigmas = {}
         # make sure gcd(r_axis)==1
         if reduce(gcd, r_axis) != 1:
             r_axis = [int(round(x / reduce(gcd, r_axis))) for x in r_axis]
@@ -1311,68 +1318,41 @@ class GrainBoundaryGenerator:
         n_max = int(np.sqrt((cutoff * 12 * mu * mv) / abs(d)))
 
         # Enumerate all possible n, m to give possible sigmas within the cutoff.
-        for n in range(1, n_max + 1):
+        def get_m_max(n):
             if (c2_a2_ratio is None) and w == 0:
-                m_max = 0
-            else:
-                m_max = int(np.sqrt((cutoff * 12 * mu * mv - n ** 2 * d) / (3 * mu)))
-            for m in range(0, m_max + 1):
-                if gcd(m, n) == 1 or m == 0:
-                    # construct the rotation matrix, refer to the reference
-                    R_list = [(u ** 2 * mv - v ** 2 * mv - w ** 2 * mu) * n ** 2 +
-                              2 * w * mu * m * n + 3 * mu * m ** 2,
-                              (2 * v - u) * u * mv * n ** 2 - 4 * w * mu * m * n,
-                              2 * u * w * mu * n ** 2 + 2 * (2 * v - u) * mu * m * n,
-                              (2 * u - v) * v * mv * n ** 2 + 4 * w * mu * m * n,
-                              (v ** 2 * mv - u ** 2 * mv - w ** 2 * mu) * n ** 2 -
-                              2 * w * mu * m * n + 3 * mu * m ** 2,
-                              2 * v * w * mu * n ** 2 - 2 * (2 * u - v) * mu * m * n,
-                              (2 * u - v) * w * mv * n ** 2 - 3 * v * mv * m * n,
-                              (2 * v - u) * w * mv * n ** 2 + 3 * u * mv * m * n,
-                              (w ** 2 * mu - u ** 2 * mv - v ** 2 * mv + u * v * mv) *
-                              n ** 2 + 3 * mu * m ** 2]
-                    m = -1 * m
-                    # inverse of the rotation matrix
-                    R_list_inv = [(u ** 2 * mv - v ** 2 * mv - w ** 2 * mu) * n ** 2 +
-                                  2 * w * mu * m * n + 3 * mu * m ** 2,
-                                  (2 * v - u) * u * mv * n ** 2 - 4 * w * mu * m * n,
-                                  2 * u * w * mu * n ** 2 + 2 * (2 * v - u) * mu * m * n,
-                                  (2 * u - v) * v * mv * n ** 2 + 4 * w * mu * m * n,
-                                  (v ** 2 * mv - u ** 2 * mv - w ** 2 * mu) * n ** 2 -
-                                  2 * w * mu * m * n + 3 * mu * m ** 2,
-                                  2 * v * w * mu * n ** 2 - 2 * (2 * u - v) * mu * m * n,
-                                  (2 * u - v) * w * mv * n ** 2 - 3 * v * mv * m * n,
-                                  (2 * v - u) * w * mv * n ** 2 + 3 * u * mv * m * n,
-                                  (w ** 2 * mu - u ** 2 * mv - v ** 2 * mv + u * v * mv) *
-                                  n ** 2 + 3 * mu * m ** 2]
-                    m = -1 * m
-                    F = 3 * mu * m ** 2 + d * n ** 2
-                    all_list = R_list_inv + R_list + [F]
-                    # Compute the max common factors for the elements of the rotation matrix
-                    # and its inverse.
-                    com_fac = reduce(gcd, all_list)
-                    sigma = int(round((3 * mu * m ** 2 + d * n ** 2) / com_fac))
-                    if (sigma <= cutoff) and (sigma > 1):
-                        if sigma not in list(sigmas.keys()):
-                            if m == 0:
-                                angle = 180.0
-                            else:
-                                angle = 2 * np.arctan(n / m * np.sqrt(d / 3.0 / mu)) \
-                                        / np.pi * 180
-                            sigmas[sigma] = [angle]
-                        else:
-                            if m == 0:
-                                angle = 180.0
-                            else:
-                                angle = 2 * np.arctan(n / m * np.sqrt(d / 3.0 / mu)) \
-                                        / np.pi * 180
-                            if angle not in sigmas[sigma]:
-                                sigmas[sigma].append(angle)
-            if m_max == 0:
-                break
-        return sigmas
+                return 0
+            return int(np.sqrt((cutoff * 12 * mu * mv - n ** 2 * d) / (3 * mu)))
+
+        n, m = _enum_coprime_n_m(n_max, get_m_max)
+
+        def get_r_list(m):
+            # construct the rotation matrix, refer to the reference
+            R_list = [(u ** 2 * mv - v ** 2 * mv - w ** 2 * mu) * n ** 2 +
+                      2 * w * mu * m * n + 3 * mu * m ** 2,
+                      (2 * v - u) * u * mv * n ** 2 - 4 * w * mu * m * n,
+                      2 * u * w * mu * n ** 2 + 2 * (2 * v - u) * mu * m * n,
+                      (2 * u - v) * v * mv * n ** 2 + 4 * w * mu * m * n,
+                      (v ** 2 * mv - u ** 2 * mv - w ** 2 * mu) * n ** 2 -
+                      2 * w * mu * m * n + 3 * mu * m ** 2,
+                      2 * v * w * mu * n ** 2 - 2 * (2 * u - v) * mu * m * n,
+                      (2 * u - v) * w * mv * n ** 2 - 3 * v * mv * m * n,
+                      (2 * v - u) * w * mv * n ** 2 + 3 * u * mv * m * n,
+                      (w ** 2 * mu - u ** 2 * mv - v ** 2 * mv + u * v * mv) *
+                      n ** 2 + 3 * mu * m ** 2]
+            return R_list
+
+        F = 3 * mu * m ** 2 + d * n ** 2
+        # Compute the max common factors for the elements of the rotation matrix
+        # and its inverse (the rotation matrix with m replaced by -m).
+        com_fac = np.gcd.reduce(get_r_list(-m) + get_r_list(m) + [F], axis=0)
+        sigma = np.rint(F / com_fac).astype(int)
+        with np.errstate(divide="ignore"):
+            angle = np.where(m == 0, 180.0,
+                             2 * np.arctan(n / m * np.sqrt(d / 3.0 / mu)) / np.pi * 180)
+        return _get_sigma_dict(sigma, angle, cutoff)
 
     @staticmethod
+    @_cache_sigmas
     def enum_sigma_rho(cutoff, r_axis, ratio_alpha):
         """
         Find all possible sigma values and corresponding rotation angles
@@ -1402,7 +1382,6 @@ class GrainBoundaryGenerator:
                     angles may result in equivalent microstructures.
 
         """
-        sigmas = {}
         # transform four index notation to three index notation
         if len(r_axis) == 4:
             u1 = r_axis[0]
@@ -1437,86 +1416,50 @@ class GrainBoundaryGenerator:
         n_max = int(np.sqrt((cutoff * abs(4 * mu * (mu - 3 * mv))) / abs(d)))
 
         # Enumerate all possible n, m to give possible sigmas within the cutoff.
-        for n in range(1, n_max + 1):
+        def get_m_max(n):
             if ratio_alpha is None and u + v + w == 0:
-                m_max = 0
-            else:
-                m_max = int(np.sqrt((cutoff * abs(4 * mu * (mu - 3 * mv)) - n ** 2 * d) / (mu)))
-            for m in range(0, m_max + 1):
-                if gcd(m, n) == 1 or m == 0:
-                    # construct the rotation matrix, refer to the reference
-                    R_list = [(mu - 2 * mv) * (u ** 2 - v ** 2 - w ** 2) * n ** 2 +
-                              2 * mv * (v - w) * m * n - 2 * mv * v * w * n ** 2 +
-                              mu * m ** 2,
-                              2 * (mv * u * n * (w * n + u * n - m) - (mu - mv) *
-                                   m * w * n + (mu - 2 * mv) * u * v * n ** 2),
-                              2 * (mv * u * n * (v * n + u * n + m) + (mu - mv) *
-                                   m * v * n + (mu - 2 * mv) * w * u * n ** 2),
-                              2 * (mv * v * n * (w * n + v * n + m) + (mu - mv) *
-                                   m * w * n + (mu - 2 * mv) * u * v * n ** 2),
-                              (mu - 2 * mv) * (v ** 2 - w ** 2 - u ** 2) * n ** 2 +
-                              2 * mv * (w - u) * m * n - 2 * mv * u * w * n ** 2 +
-                              mu * m ** 2,
-                              2 * (mv * v * n * (v * n + u * n - m) - (mu - mv) *
-                                   m * u * n + (mu - 2 * mv) * w * v * n ** 2),
-                              2 * (mv * w * n * (w * n + v * n - m) - (mu - mv) *
-                                   m * v * n + (mu - 2 * mv) * w * u * n ** 2),
-                              2 * (mv * w * n * (w * n + u * n + m) + (mu - mv) *
-                                   m * u * n + (mu - 2 * mv) * w * v * n ** 2),
-                              (mu - 2 * mv) * (w ** 2 - u ** 2 - v ** 2) * n ** 2 +
-                              2 * mv * (u - v) * m * n - 2 * mv * u * v * n ** 2 +
-                              mu * m ** 2]
-                    m = -1 * m
-                    # inverse of the rotation matrix
-                    R_list_inv = [(mu - 2 * mv) * (u ** 2 - v ** 2 - w ** 2) * n ** 2 +
-                                  2 * mv * (v - w) * m * n - 2 * mv * v * w * n ** 2 +
-                                  mu * m ** 2,
-                                  2 * (mv * u * n * (w * n + u * n - m) - (mu - mv) *
-                                       m * w * n + (mu - 2 * mv) * u * v * n ** 2),
-                                  2 * (mv * u * n * (v * n + u * n + m) + (mu - mv) *
-                                       m * v * n + (mu - 2 * mv) * w * u * n ** 2),
-                                  2 * (mv * v * n * (w * n + v * n + m) + (mu - mv) *
-                                       m * w * n + (mu - 2 * mv) * u * v * n ** 2),
-                                  (mu - 2 * mv) * (v ** 2 - w ** 2 - u ** 2) * n ** 2 +
-                                  2 * mv * (w - u) * m * n - 2 * mv * u * w * n ** 2 +
-                                  mu * m ** 2,
-                                  2 * (mv * v * n * (v * n + u * n - m) - (mu - mv) *
-                                       m * u * n + (mu - 2 * mv) * w * v * n ** 2),
-                                  2 * (mv * w * n * (w * n + v * n - m) - (mu - mv) *
-                                       m * v * n + (mu - 2 * mv) * w * u * n ** 2),
-                                  2 * (mv * w * n * (w * n + u * n + m) + (mu - mv) *
-                                       m * u * n + (mu - 2 * mv) * w * v * n ** 2),
-                                  (mu - 2 * mv) * (w ** 2 - u ** 2 - v ** 2) * n ** 2 +
-                                  2 * mv * (u - v) * m * n - 2 * mv * u * v * n ** 2 +
-                                  mu * m ** 2]
-                    m = -1 * m
-                    F = mu * m ** 2 + d * n ** 2
-                    all_list = R_list_inv + R_list + [F]
-                    # Compute the max common factors for the elements of the rotation matrix
-                    #  and its inverse.
-                    com_fac = reduce(gcd, all_list)
-                    sigma = int(round(abs(F / com_fac)))
-                    if (sigma <= cutoff) and (sigma > 1):
-                        if sigma not in list(sigmas.keys()):
-                            if m == 0:
-                                angle = 180.0
-                            else:
-                                angle = 2 * np.arctan(n / m * np.sqrt(d / mu)) \
-                                        / np.pi * 180
-                            sigmas[sigma] = [angle]
-                        else:
-                            if m == 0:
-                                angle = 180
-                            else:
-                                angle = 2 * np.arctan(n / m * np.sqrt(d / mu)) \
-                                        / np.pi * 180.0
-                            if angle not in sigmas[sigma]:
-                                sigmas[sigma].append(angle)
-            if m_max == 0:
-                break
-        return sigmas
+                return 0
+            return int(np.sqrt((cutoff * abs(4 * mu * (mu - 3 * mv)) - n ** 2 * d) / (mu)))
+
+        n, m = _enum_coprime_n_m(n_max, get_m_max)
+
+        def get_r_list(m):
+            # construct the rotation matrix, refer to the reference
+            R_list = [(mu - 2 * mv) * (u ** 2 - v ** 2 - w ** 2) * n ** 2 +
+                      2 * mv * (v - w) * m * n - 2 * mv * v * w * n ** 2 +
+                      mu * m ** 2,
+                      2 * (mv * u * n * (w * n + u * n - m) - (mu - mv) *
+                           m * w * n + (mu - 2 * mv) * u * v * n ** 2),
+                      2 * (mv * u * n * (v * n + u * n + m) + (mu - mv) *
+                           m * v * n + (mu - 2 * mv) * w * u * n ** 2),
+                      2 * (mv * v * n * (w * n + v * n + m) + (mu - mv) *
+                           m * w * n + (mu - 2 * mv) * u * v * n ** 2),
+                      (mu - 2 * mv) * (v ** 2 - w ** 2 - u ** 2) * n ** 2 +
+                      2 * mv * (w - u) * m * n - 2 * mv * u * w * n ** 2 +
+                      mu * m ** 2,
+                      2 * (mv * v * n * (v * n + u * n - m) - (mu - mv) *
+                           m * u * n + (mu - 2 * mv) * w * v * n ** 2),
+                      2 * (mv * w * n * (w * n + v * n - m) - (mu - mv) *
+                           m * v * n + (mu - 2 * mv) * w * u * n ** 2),
+                      2 * (mv * w * n * (w * n + u * n + m) + (mu - mv) *
+                           m * u * n + (mu - 2 * mv) * w * v * n ** 2),
+                      (mu - 2 * mv) * (w ** 2 - u ** 2 - v ** 2) * n ** 2 +
+                      2 * mv * (u - v) * m * n - 2 * mv * u * v * n ** 2 +
+                      mu * m ** 2]
+            return R_list
+
+        F = mu * m ** 2 + d * n ** 2
+        # Compute the max common factors for the elements of the rotation matrix
+        # and its inverse (the rotation matrix with m replaced by -m).
+        com_fac = np.gcd.reduce(get_r_list(-m) + get_r_list(m) + [F], axis=0)
+        sigma = np.rint(np.abs(F / com_fac)).astype(int)
+        with np.errstate(divide="ignore"):
+            angle = np.where(m == 0, 180.0,
+                             2 * np.arctan(n / m * np.sqrt(d / mu)) / np.pi * 180)
+        return _get_sigma_dict(sigma, angle, cutoff)
 
     @staticmethod
+    @_cache_sigmas
     def enum_sigma_tet(cutoff, r_axis, c2_a2_ratio):
         """
         Find all possible sigma values and corresponding rotation angles
@@ -1544,7 +1487,6 @@ class GrainBoundaryGenerator:
                     angles may result in equivalent microstructures.
 
         """
-        sigmas = {}
         # make sure gcd(r_axis)==1
         if reduce(gcd, r_axis) != 1:
             r_axis = [int(round(x / reduce(gcd, r_axis))) for x in r_axis]
@@ -1572,69 +1514,41 @@ class GrainBoundaryGenerator:
         n_max = int(np.sqrt((cutoff * 4 * mu * mv) / d))
 
         # Enumerate all possible n, m to give possible sigmas within the cutoff.
-        for n in range(1, n_max + 1):
+        def get_m_max(n):
             if c2_a2_ratio is None and w == 0:
-                m_max = 0
-            else:
-                m_max = int(np.sqrt((cutoff * 4 * mu * mv - n ** 2 * d) / mu))
-            for m in range(0, m_max + 1):
-                if gcd(m, n) == 1 or m == 0:
-                    # construct the rotation matrix, refer to the reference
-                    R_list = [(u ** 2 * mv - v ** 2 * mv - w ** 2 * mu) * n ** 2 +
-                              mu * m ** 2,
-                              2 * v * u * mv * n ** 2 - 2 * w * mu * m * n,
-                              2 * u * w * mu * n ** 2 + 2 * v * mu * m * n,
-                              2 * u * v * mv * n ** 2 + 2 * w * mu * m * n,
-                              (v ** 2 * mv - u ** 2 * mv - w ** 2 * mu) * n ** 2 +
-                              mu * m ** 2,
-                              2 * v * w * mu * n ** 2 - 2 * u * mu * m * n,
-                              2 * u * w * mv * n ** 2 - 2 * v * mv * m * n,
-                              2 * v * w * mv * n ** 2 + 2 * u * mv * m * n,
-                              (w ** 2 * mu - u ** 2 * mv - v ** 2 * mv) * n ** 2 +
-                              mu * m ** 2]
-                    m = -1 * m
-                    # inverse of rotation matrix
-                    R_list_inv = [(u ** 2 * mv - v ** 2 * mv - w ** 2 * mu) * n ** 2 +
-                                  mu * m ** 2,
-                                  2 * v * u * mv * n ** 2 - 2 * w * mu * m * n,
-                                  2 * u * w * mu * n ** 2 + 2 * v * mu * m * n,
-                                  2 * u * v * mv * n ** 2 + 2 * w * mu * m * n,
-                                  (v ** 2 * mv - u ** 2 * mv - w ** 2 * mu) * n ** 2 +
-                                  mu * m ** 2,
-                                  2 * v * w * mu * n ** 2 - 2 * u * mu * m * n,
-                                  2 * u * w * mv * n ** 2 - 2 * v * mv * m * n,
-                                  2 * v * w * mv * n ** 2 + 2 * u * mv * m * n,
-                                  (w ** 2 * mu - u ** 2 * mv - v ** 2 * mv) * n ** 2 +
-                                  mu * m ** 2]
-                    m = -1 * m
-                    F = mu * m ** 2 + d * n ** 2
-                    all_list = R_list + R_list_inv + [F]
-                    # Compute the max common factors for the elements of the rotation matrix
-                    #  and its inverse.
-                    com_fac = reduce(gcd, all_list)
-                    sigma = int(round((mu * m ** 2 + d * n ** 2) / com_fac))
-                    if (sigma <= cutoff) and (sigma > 1):
-                        if sigma not in list(sigmas.keys()):
-                            if m == 0:
-                                angle = 180.0
-                            else:
-                                angle = 2 * np.arctan(n / m * np.sqrt(d / mu)) \
-                                        / np.pi * 180
-                            sigmas[sigma] = [angle]
-                        else:
-                            if m == 0:
-                                angle = 180.0
-                            else:
-                                angle = 2 * np.arctan(n / m * np.sqrt(d / mu)) \
-                                        / np.pi * 180
-                            if angle not in sigmas[sigma]:
-                                sigmas[sigma].append(angle)
-            if m_max == 0:
-                break
+                return 0
+            return int(np.sqrt((cutoff * 4 * mu * mv - n ** 2 * d) / mu))
 
-        return sigmas
+        n, m = _enum_coprime_n_m(n_max, get_m_max)
+
+        def get_r_list(m):
+            # construct the rotation matrix, refer to the reference
+            R_list = [(u ** 2 * mv - v ** 2 * mv - w ** 2 * mu) * n ** 2 +
+                      mu * m ** 2,
+                      2 * v * u * mv * n ** 2 - 2 * w * mu * m * n,
+                      2 * u * w * mu * n ** 2 + 2 * v * mu * m * n,
+                      2 * u * v * mv * n ** 2 + 2 * w * mu * m * n,
+                      (v ** 2 * mv - u ** 2 * mv - w ** 2 * mu) * n ** 2 +
+                      mu * m ** 2,
+                      2 * v * w * mu * n ** 2 - 2 * u * mu * m * n,
+                      2 * u * w * mv * n ** 2 - 2 * v * mv * m * n,
+                      2 * v * w * mv * n ** 2 + 2 * u * mv * m * n,
+                      (w ** 2 * mu - u ** 2 * mv - v ** 2 * mv) * n ** 2 +
+                      mu * m ** 2]
+            return R_list
+
+        F = mu * m ** 2 + d * n ** 2
+        # Compute the max common factors for the elements of the rotation matrix
+        # and its inverse (the rotation matrix with m replaced by -m).
+        com_fac = np.gcd.reduce(get_r_list(m) + get_r_list(-m) + [F], axis=0)
+        sigma = np.rint(F / com_fac).astype(int)
+        with np.errstate(divide="ignore"):
+            angle = np.where(m == 0, 180.0,
+                             2 * np.arctan(n / m * np.sqrt(d / mu)) / np.pi * 180)
+        return _get_sigma_dict(sigma, angle, cutoff)
 
     @staticmethod
+    @_cache_sigmas
     def enum_sigma_ort(cutoff, r_axis, c2_b2_a2_ratio):
         """
         Find all possible sigma values and corresponding rotation angles
@@ -1663,7 +1577,6 @@ class GrainBoundaryGenerator:
                     angles may result in equivalent microstructures.
 
         """
-        sigmas = {}
         # make sure gcd(r_axis)==1
         if reduce(gcd, r_axis) != 1:
             r_axis = [int(round(x / reduce(gcd, r_axis))) for x in r_axis]
@@ -1723,71 +1636,41 @@ class GrainBoundaryGenerator:
         # Compute the max n we need to enumerate.
         n_max = int(np.sqrt((cutoff * 4 * mu * mv * mv * lam) / d))
         # Enumerate all possible n, m to give possible sigmas within the cutoff.
-        for n in range(1, n_max + 1):
+        def get_m_max(n):
             mu_temp, lam_temp, mv_temp = c2_b2_a2_ratio
             if (mu_temp is None and w == 0) or (lam_temp is None and v == 0) \
                     or (mv_temp is None and u == 0):
-                m_max = 0
-            else:
-                m_max = int(np.sqrt((cutoff * 4 * mu * mv * lam * mv -
-                                     n ** 2 * d) / mu / lam))
-            for m in range(0, m_max + 1):
-
-                if gcd(m, n) == 1 or m == 0:
-                    # construct the rotation matrix, refer to the reference
-                    R_list = [(u ** 2 * mv * mv - lam * v ** 2 * mv -
-                               w ** 2 * mu * mv) * n ** 2 + lam * mu * m ** 2,
-                              2 * lam * (v * u * mv * n ** 2 - w * mu * m * n),
-                              2 * mu * (u * w * mv * n ** 2 + v * lam * m * n),
-                              2 * mv * (u * v * mv * n ** 2 + w * mu * m * n),
-                              (v ** 2 * mv * lam - u ** 2 * mv * mv -
-                               w ** 2 * mu * mv) * n ** 2 + lam * mu * m ** 2,
-                              2 * mv * mu * (v * w * n ** 2 - u * m * n),
-                              2 * mv * (u * w * mv * n ** 2 - v * lam * m * n),
-                              2 * lam * mv * (v * w * n ** 2 + u * m * n),
-                              (w ** 2 * mu * mv - u ** 2 * mv * mv -
-                               v ** 2 * mv * lam) * n ** 2 + lam * mu * m ** 2]
-                    m = -1 * m
-                    # inverse of rotation matrix
-                    R_list_inv = [(u ** 2 * mv * mv - lam * v ** 2 * mv -
-                                   w ** 2 * mu * mv) * n ** 2 + lam * mu * m ** 2,
-                                  2 * lam * (v * u * mv * n ** 2 - w * mu * m * n),
-                                  2 * mu * (u * w * mv * n ** 2 + v * lam * m * n),
-                                  2 * mv * (u * v * mv * n ** 2 + w * mu * m * n),
-                                  (v ** 2 * mv * lam - u ** 2 * mv * mv -
-                                   w ** 2 * mu * mv) * n ** 2 + lam * mu * m ** 2,
-                                  2 * mv * mu * (v * w * n ** 2 - u * m * n),
-                                  2 * mv * (u * w * mv * n ** 2 - v * lam * m * n),
-                                  2 * lam * mv * (v * w * n ** 2 + u * m * n),
-                                  (w ** 2 * mu * mv - u ** 2 * mv * mv -
-                                   v ** 2 * mv * lam) * n ** 2 + lam * mu * m ** 2]
-                    m = -1 * m
-                    F = mu * lam * m ** 2 + d * n ** 2
-                    all_list = R_list + R_list_inv + [F]
-                    # Compute the max common factors for the elements of the rotation matrix
-                    #  and its inverse.
-                    com_fac = reduce(gcd, all_list)
-                    sigma = int(round((mu * lam * m ** 2 + d * n ** 2) / com_fac))
-                    if (sigma <= cutoff) and (sigma > 1):
-                        if sigma not in list(sigmas.keys()):
-                            if m == 0:
-                                angle = 180.0
-                            else:
-                                angle = 2 * np.arctan(n / m * np.sqrt(d / mu / lam)) \
-                                        / np.pi * 180
-                            sigmas[sigma] = [angle]
-                        else:
-                            if m == 0:
-                                angle = 180.0
-                            else:
-                                angle = 2 * np.arctan(n / m * np.sqrt(d / mu / lam)) \
-                                        / np.pi * 180
-                            if angle not in sigmas[sigma]:
-                                sigmas[sigma].append(angle)
-            if m_max == 0:
-                break
+                return 0
+            return int(np.sqrt((cutoff * 4 * mu * mv * lam * mv -
+                                n ** 2 * d) / mu / lam))
 
-        return sigmas
+        n, m = _enum_coprime_n_m(n_max, get_m_max)
+
+        def get_r_list(m):
+            # construct the rotation matrix, refer to the reference
+            R_list = [(u ** 2 * mv * mv - lam * v ** 2 * mv -
+                       w ** 2 * mu * mv) * n ** 2 + lam * mu * m ** 2,
+                      2 * lam * (v * u * mv * n ** 2 - w * mu * m * n),
+                      2 * mu * (u * w * mv * n ** 2 + v * lam * m * n),
+                      2 * mv * (u * v * mv * n ** 2 + w * mu * m * n),
+                      (v ** 2 * mv * lam - u ** 2 * mv * mv -
+                       w ** 2 * mu * mv) * n ** 2 + lam * mu * m ** 2,
+                      2 * mv * mu * (v * w * n ** 2 - u * m * n),
+                      2 * mv * (u * w * mv * n ** 2 - v * lam * m * n),
+                      2 * lam * mv * (v * w * n ** 2 + u * m * n),
+                      (w ** 2 * mu * mv - u ** 2 * mv * mv -
+                       v ** 2 * mv * lam) * n ** 2 + lam * mu * m ** 2]
+            return R_list
+
+        F = mu * lam * m ** 2 + d * n ** 2
+        # Compute the max common factors for the elements of the rotation matrix
+        # and its inverse (the rotation matrix with m replaced by -m).
+        com_fac = np.gcd.reduce(get_r_list(m) + get_r_list(-m) + [F], axis=0)
+        sigma = np.rint(F / com_fac).astype(int)
+        with np.errstate(divide="ignore"):
+            angle = np.where(m == 0, 180.0,
+                             2 * np.arctan(n / m * np.sqrt(d / mu / lam)) / np.pi * 180)
+        return _get_sigma_dict(sigma, angle, cutoff)
 
     @staticmethod
     def enum_possible_plane_cubic(plane_cutoff, r_axis, r_angle):
@@ -2038,8 +1921,6 @@ class GrainBoundaryGenerator:
                 max_j = abs(miller_nonzero[0])
         if max_j > max_search:
             max_j = max_search
-        # area of a, b vectors
-        area = None
         # length of c vector
         c_norm = np.linalg.norm(np.matmul(t_matrix[2], trans))
         # c vector length along the direction perpendicular to surface
@@ -2052,47 +1933,28 @@ class GrainBoundaryGenerator:
             else:
                 normal_init = False
 
-        j = np.arange(0, max_j + 1)
-        combination = []
-        for i in itertools.product(j, repeat=3):
-            if sum(abs(np.array(i))) != 0:
-                combination.append(list(i))
-            if len(np.nonzero(i)[0]) == 3:
-                for i1 in range(3):
-                    new_i = list(i).copy()
-                    new_i[i1] = -1 * new_i[i1]
-                    combination.append(new_i)
-            elif len(np.nonzero(i)[0]) == 2:
-                new_i = list(i).copy()
-                new_i[np.nonzero(i)[0][0]] = -1 * new_i[np.nonzero(i)[0][0]]
-                combination.append(new_i)
-        for i in combination:
-            if reduce(gcd, i) == 1:
-                temp = np.dot(np.array(i), csl)
-                if abs(np.dot(temp, surface) - 0) < 1.e-8:
-                    ab_vector.append(temp)
-                else:
-                    # c vector length along the direction perpendicular to surface
-                    c_len_temp = np.abs(np.dot(temp, surface))
-                    # c vector length itself
-                    c_norm_temp = np.linalg.norm(np.matmul(temp, trans))
-                    if normal:
-                        c_cross = np.cross(np.matmul(temp, trans), np.matmul(surface, ctrans))
-                        if np.linalg.norm(c_cross) < 1.e-8:
-                            if normal_init:
-                                if c_norm_temp < c_norm:
-                                    t_matrix[2] = temp
-                                    c_norm = c_norm_temp
-                            else:
-                                c_norm = c_norm_temp
-                                normal_init = True
-                                t_matrix[2] = temp
-                    else:
-                        if c_len_temp < c_length or \
-                                (abs(c_len_temp - c_length) < 1.e-8 and c_norm_temp < c_norm):
-                            t_matrix[2] = temp
-                            c_norm = c_norm_temp
-                            c_length = c_len_temp
+        # all the csl lattice vectors within the search range
+        combination = np.dot(_get_csl_combinations(max_j), csl)
+        in_plane = np.abs(np.dot(combination, surface) - 0) < 1.e-8
+        ab_vector = np.concatenate([np.reshape(ab_vector, (-1, 3)), combination[in_plane]])
+        c_vector = combination[~in_plane]
+        # c vector length itself
+        c_norm_temp = np.linalg.norm(np.matmul(c_vector, trans), axis=1)
+        if normal:
+            c_cross = np.cross(np.matmul(c_vector, trans), np.matmul(surface, ctrans))
+            normal_ind = np.where(np.linalg.norm(c_cross, axis=1) < 1.e-8)[0]
+            if len(normal_ind) > 0:
+                ind = normal_ind[np.argmin(c_norm_temp[normal_ind])]
+                if not normal_init or c_norm_temp[ind] < c_norm:
+                    t_matrix[2] = c_vector[ind]
+                    c_norm = c_norm_temp[ind]
+                    normal_init = True
+        else:
+            # c vector length along the direction perpendicular to surface
+            c_len_temp = np.abs(np.dot(c_vector, surface))
+            ind = _get_first_minimum(c_len_temp, c_norm_temp, c_length, c_norm)
+            if ind is not None:
+                t_matrix[2] = c_vector[ind]
 
         if normal and (not normal_init):
             logger.info('Did not find the perpendicular c vector, increase max_j')
@@ -2103,61 +1965,29 @@ class GrainBoundaryGenerator:
                 max_j = 3 * max_j
                 if max_j > max_search:
                     max_j = max_search
-                j = np.arange(0, max_j + 1)
-                combination = []
-                for i in itertools.product(j, repeat=3):
-                    if sum(abs(np.array(i))) != 0:
-                        combination.append(list(i))
-                    if len(np.nonzero(i)[0]) == 3:
-                        for i1 in range(3):
-                            new_i = list(i).copy()
-                            new_i[i1] = -1 * new_i[i1]
-                            combination.append(new_i)
-                    elif len(np.nonzero(i)[0]) == 2:
-                        new_i = list(i).copy()
-                        new_i[np.nonzero(i)[0][0]] = -1 * new_i[np.nonzero(i)[0][0]]
-                        combination.append(new_i)
-                for i in combination:
-                    if reduce(gcd, i) == 1:
-                        temp = np.dot(np.array(i), csl)
-                        if abs(np.dot(temp, surface) - 0) > 1.e-8:
-                            c_cross = np.cross(np.matmul(temp, trans), np.matmul(surface, ctrans))
-                            if np.linalg.norm(c_cross) < 1.e-8:
-                                # c vetor length itself
-                                c_norm_temp = np.linalg.norm(np.matmul(temp, trans))
-                                if normal_init:
-                                    if c_norm_temp < c_norm:
-                                        t_matrix[2] = temp
-                                        c_norm = c_norm_temp
-                                else:
-                                    c_norm = c_norm_temp
-                                    normal_init = True
-                                    t_matrix[2] = temp
+                c_vector = np.dot(_get_csl_combinations(max_j), csl)
+                c_vector = c_vector[np.abs(np.dot(c_vector, surface) - 0) > 1.e-8]
+                c_cross = np.cross(np.matmul(c_vector, trans), np.matmul(surface, ctrans))
+                normal_ind = np.where(np.linalg.norm(c_cross, axis=1) < 1.e-8)[0]
+                if len(normal_ind) > 0:
+                    # c vetor length itself
+                    c_norm_temp = np.linalg.norm(np.matmul(c_vector[normal_ind], trans), axis=1)
+                    t_matrix[2] = c_vector[normal_ind[np.argmin(c_norm_temp)]]
+                    normal_init = True
                 if normal_init:
                     logger.info('Found perpendicular c vector')
 
         # find the best a, b vectors with their formed area smallest and average norm of a,b smallest.
-        for i in itertools.combinations(ab_vector, 2):
-            area_temp = np.linalg.norm(np.cross(np.matmul(i[0], trans),
-                                                np.matmul(i[1], trans)))
-            if abs(area_temp - 0) > 1.e-8:
-                ab_norm_temp = np.linalg.norm(np.matmul(i[0], trans)) + \
-                               np.linalg.norm(np.matmul(i[1], trans))
-                if area is None:
-                    area = area_temp
-                    ab_norm = ab_norm_temp
-                    t_matrix[0] = i[0]
-                    t_matrix[1] = i[1]
-                elif area_temp < area:
-                    t_matrix[0] = i[0]
-                    t_matrix[1] = i[1]
-                    area = area_temp
-                    ab_norm = ab_norm_temp
-                elif abs(area - area_temp) < 1.e-8 and ab_norm_temp < ab_norm:
-                    t_matrix[0] = i[0]
-                    t_matrix[1] = i[1]
-                    area = area_temp
-                    ab_norm = ab_norm_temp
+        ab_cart = np.matmul(ab_vector, trans)
+        ab_norm = np.linalg.norm(ab_cart, axis=1)
+        ind1, ind2 = np.triu_indices(len(ab_vector), 1)
+        area_temp = np.linalg.norm(np.cross(ab_cart[ind1], ab_cart[ind2]), axis=1)
+        nonzero = np.abs(area_temp - 0) > 1.e-8
+        ind1, ind2, area_temp = ind1[nonzero], ind2[nonzero], area_temp[nonzero]
+        ind = _get_first_minimum(area_temp, ab_norm[ind1] + ab_norm[ind2])
+        if ind is not None:
+            t_matrix[0] = ab_vector[ind1[ind]]
+            t_matrix[1] = ab_vector[ind2[ind]]
 
         # make sure we have a left-handed crystallographic system
         if np.linalg.det(np.matmul(t_matrix, trans)) < 0:
@@ -2254,6 +2084,110 @@ def factors(n):
                       ([i, n // i] for i in range(1, int(np.sqrt(n)) + 1) if n % i == 0)))
 
 
+def _enum_coprime_n_m(n_max, get_m_max):
+    """
+    Enumerate the integer pairs (n, m) used to construct the CSL rotations,
+    with n from 1 to n_max and m from 0 to get_m_max(n). Only coprime pairs and
+    pairs with m = 0 are kept. The enumeration stops after the first n with
+    get_m_max(n) = 0.
+
+    Args:
+        n_max (int): the max n to enumerate.
+        get_m_max (function): returns the max m to enumerate for a given n.
+
+    Returns:
+        n, m (integer arrays) in enumeration order.
+    """
+    n_list, m_list = [np.zeros(0, dtype=int)], [np.zeros(0, dtype=int)]
+    for n in range(1, n_max + 1):
+        m_max = get_m_max(n)
+        m_list.append(np.arange(m_max + 1))
+        n_list.append(np.full(m_max + 1, n))
+        if m_max == 0:
+            break
+    n = np.concatenate(n_list)
+    m = np.concatenate(m_list)
+    keep = (np.gcd(m, n) == 1) | (m == 0)
+    return n[keep], m[keep]
+
+
+def _get_sigma_dict(sigma, angle, cutoff):
+    """
+    Collect the sigma values within the cutoff and their distinct rotation
+    angles, in enumeration order.
+
+    Args:
+        sigma (integer array): the sigma value of each enumerated rotation.
+        angle (array): the rotation angle of each enumerated rotation.
+        cutoff (integer): the cutoff of sigma values.
+
+    Returns:
+        sigmas (dict): {sigma1: [angle11,angle12,...], sigma2: [angle21, angle22,...],...}
+    """
+    sigmas = {}
+    keep = (sigma <= cutoff) & (sigma > 1)
+    for s, a in zip(sigma[keep].tolist(), angle[keep].tolist()):
+        if s not in sigmas:
+            sigmas[s] = [a]
+        elif a not in sigmas[s]:
+            sigmas[s].append(a)
+    return sigmas
+
+
+def _get_csl_combinations(max_j):
+    """
+    Integer combinations of the csl lattice vectors searched by
+    GrainBoundaryGenerator.slab_from_csl, i.e. [i, j, k] with
+    -max_j <= i, j, k <= max_j and gcd(i, j, k) = 1, keeping only one
+    of each pair of opposite vectors.
+
+    Args:
+        max_j (int): the max absolute coefficient.
+
+    Returns:
+        combinations (n by 3 integer array) in search order.
+    """
+    j = np.arange(0, max_j + 1)
+    base = np.array(np.meshgrid(j, j, j, indexing="ij")).reshape(3, -1).T
+    nonzero = base != 0
+    n_nonzero = nonzero.sum(axis=1)
+    # each base vector is followed by its sign-flipped variants: all three
+    # single flips if no index is zero, and a flip of the first nonzero index
+    # if one index is zero.
+    flips = np.repeat(base[:, None, :], 4, axis=1)
+    valid = np.zeros((len(base), 4), dtype=bool)
+    valid[:, 0] = n_nonzero > 0
+    first_nonzero = np.argmax(nonzero, axis=1)
+    for i in range(3):
+        flips[:, i + 1, i] *= -1
+        valid[:, i + 1] = (n_nonzero == 3) | ((n_nonzero == 2) & (first_nonzero == i))
+    combinations = flips[valid]
+    return combinations[np.gcd.reduce(combinations, axis=1) == 1]
+
+
+def _get_first_minimum(values, norms, value=None, norm=None, tol=1.e-8):
+    """
+    Scan the candidates in order and select one if its value is smaller than
+    the current one, or equal within tol with a smaller norm.
+
+    Args:
+        values (array): the values of the candidates.
+        norms (array): the norms of the candidates, used to break ties.
+        value (float): the value of the initial selection. None if there is no
+            initial selection.
+        norm (float): the norm of the initial selection.
+        tol (float): tolerance to consider two values as equal.
+
+    Returns:
+        index of the selected candidate, None if the initial selection is kept.
+    """
+    selected = None
+    for i, (v, n) in enumerate(zip(values.tolist(), norms.tolist())):
+        if value is None or v < value or (abs(v - value) < tol and n < norm):
+            selected, value, norm = i, v, n
+    return selected
+
+
 def fix_pbc(structure, matrix=None):
     """
     Set all frac_coords of the input structure within [0,1].
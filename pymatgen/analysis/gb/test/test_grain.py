@@ -298,6 +298,19 @@ class GrainBoundaryGeneratorTest(PymatgenTest):
 
         self.assertListEqual(sorted(true_100), sorted(sigma_100))
 
+    def test_enum_sigma_cache(self):
+        GrainBoundaryGenerator.enum_sigma_hex.cache_clear()
+        sigmas = GrainBoundaryGenerator.enum_sigma_hex(50, [1, 0, 0], [8, 3])
+        sigmas[17].append(0.0)
+        del sigmas[18]
+        # the cached table is not affected by changes to the returned copy
+        sigmas2 = GrainBoundaryGenerator.enum_sigma_hex(
+            cutoff=50, r_axis=(1, 0, 0), c2_a2_ratio=np.array([8, 3]))
+        self.assertEqual(GrainBoundaryGenerator.enum_sigma_hex.cache_info().hits, 1)
+        self.assertIn(18, sigmas2)
+        self.assertNotIn(0.0, sigmas2[17])
+        self.assertEqual(sorted(sigmas2.keys()), [17, 18, 22, 27, 38, 41])
+
     def test_enum_possible_plane_cubic(self):
         all_plane = GrainBoundaryGenerator.enum_possible_plane_cubic(4, [1, 1, 1], 60)
         self.assertEqual(len(all_plane['Twist']), 1)
@@ -9,6 +9,8 @@ import numpy as np
 import os.path
 import copy
 from itertools import combinations
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, breadth_first_order
 
 from pymatgen.core import Structure, Lattice, PeriodicSite, Molecule
 from pymatgen.core.structure import FunctionalGroups
@@ -19,7 +21,6 @@ from monty.json import MSONable
 from monty.os.path import which
 from operator import itemgetter
 from collections import namedtuple, defaultdict
-from scipy.spatial import KDTree
 from scipy.stats import describe
 
 import networkx as nx
@@ -40,6 +41,7 @@ __status__ = "Beta"
 __date__ = "August 2017"
 
 ConnectedSite = namedtuple('ConnectedSite', 'site, jimage, index, weight, dist')
+EdgeArrays = namedtuple('EdgeArrays', 'from_index, to_index, to_jimage, weight')
 
 
 class StructureGraph(MSONable):
@@ -203,46 +205,233 @@ class StructureGraph(MSONable):
         :return:
         """
 
-        sg = StructureGraph.with_empty_graph(structure, name="bonds",
-                                             edge_weight_name="weight",
-                                             edge_weight_units="")
-
+        from_index, to_index, to_jimage, weights = [], [], [], []
         for n, neighbors in enumerate(strategy.get_all_nn_info(structure)):
             for neighbor in neighbors:
+                from_index.append(n)
+                to_index.append(neighbor['site_index'])
+                to_jimage.append(neighbor['image'])
+                weights.append(neighbor['weight'])
+
+        # local_env will always try to add two edges
+        # for any one bond, one from site u to site v
+        # and another form site v to site u: the duplicate
+        # is dropped when building the edge arrays
+        return StructureGraph.with_edge_arrays(structure, from_index,
+                                               to_index, to_jimage,
+                                               weights=weights, name="bonds",
+                                               edge_weight_name="weight",
+                                               edge_weight_units="")
 
-                # local_env will always try to add two edges
-                # for any one bond, one from site u to site v
-                # and another form site v to site u: this is
-                # harmless, so warn_duplicates=False
-                sg.add_edge(from_index=n,
-                            from_jimage=(0, 0, 0),
-                            to_index=neighbor['site_index'],
-                            to_jimage=neighbor['image'],
-                            weight=neighbor['weight'],
-                            warn_duplicates=False)
+    @classmethod
+    def with_edge_arrays(cls, structure, from_index, to_index, to_jimage,
+                         weights=None, name="bonds", edge_weight_name=None,
+                         edge_weight_units=None):
+        """
+        Constructor for StructureGraph from arrays of edges in
+        coordinate (COO) format, e.g. from a neighbor search over the
+        whole structure. Edge directions and images are normalized as
+        in add_edge and duplicate edges are dropped, with array
+        operations. The NetworkX graph is only built when it is first
+        needed; the edges stay available as arrays (see edge_arrays).
+
+        :param structure (Structure):
+        :param from_index: array of indices of the sites connecting from
+        :param to_index: array of indices of the sites connecting to
+        :param to_jimage: (number of edges, 3) array of the lattice vectors
+        of the images of the sites connecting to, the sites connecting from
+        being in the (0, 0, 0) image
+        :param weights: array of edge weights, None (or NaN) for no weight
+        :param name (str): name of graph, e.g. "bonds"
+        :param edge_weight_name (str): name of edge weights,
+        e.g. "bond_length" or "exchange_constant"
+        :param edge_weight_units (str): name of edge weight units
+        e.g. "Å" or "eV"
+        :return (StructureGraph):
+        """
+
+        if edge_weight_name and (edge_weight_units is None):
+            raise ValueError("Please specify units associated "
+                             "with your edge weights. Can be "
+                             "empty string if arbitrary or "
+                             "dimensionless.")
+
+        from_index = np.array(from_index, dtype=int).reshape(-1)
+        to_index = np.array(to_index, dtype=int).reshape(-1)
+        to_jimage = np.array(to_jimage).reshape(-1, 3).astype(int)
+        if weights is None:
+            weights = np.full(len(from_index), np.nan)
+        else:
+            weights = np.array(weights, dtype=float).reshape(-1)
+
+        # normalize direction so that from_index <= to_index
+        swap = to_index < from_index
+        from_index, to_index = np.where(swap, to_index, from_index), \
+            np.where(swap, from_index, to_index)
+        to_jimage = np.where(swap[:, None], -to_jimage, to_jimage)
+
+        keep = cls._get_unique_edges(from_index, to_index, to_jimage)
+        edges = EdgeArrays(from_index[keep], to_index[keep], to_jimage[keep],
+                           weights[keep])
 
+        return cls._with_edge_arrays(structure,
+                                     {"edge_weight_name": edge_weight_name,
+                                      "edge_weight_units": edge_weight_units,
+                                      "name": name}, edges)
+
+    @classmethod
+    def _with_edge_arrays(cls, structure, graph_attributes, edges,
+                          node_attributes=None, edge_properties=None):
+        """
+        Returns a StructureGraph holding normalized, unique edges as
+        arrays, whose NetworkX graph is built on first access.
+
+        :param structure (Structure):
+        :param graph_attributes (dict): attributes of the graph
+        :param edges (EdgeArrays):
+        :param node_attributes ([dict]): attributes of each node, or None
+        :param edge_properties ([dict]): additional properties of each
+        edge, or None
+        :return (StructureGraph):
+        """
+
+        sg = cls.__new__(cls)
+        sg.structure = structure
+        sg._graph = None
+        sg._edges = (graph_attributes, node_attributes, edges,
+                     edge_properties)
         return sg
 
+    @staticmethod
+    def _get_unique_edges(from_index, to_index, to_jimage):
+        """
+        Indices of the first occurrence of each (from_index, to_index,
+        to_jimage) edge, in their original order.
+        """
+
+        if len(from_index) == 0:
+            return np.zeros(0, dtype=int)
+        _, first = np.unique(np.column_stack((from_index, to_index,
+                                              to_jimage)),
+                             axis=0, return_index=True)
+        return np.sort(first)
+
+    @property
+    def graph(self):
+        """
+        :return: NetworkX MultiDiGraph storing the edges, built from the
+        edge arrays on first access for graphs constructed from arrays
+        """
+        if self._graph is None:
+            self._graph = self._build_graph(*self._edges)
+            self._edges = None
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph):
+        self._graph = graph
+        self._edges = None
+
+    def _build_graph(self, graph_attributes, node_attributes, edges,
+                     edge_properties):
+        """
+        Builds the NetworkX graph from edge arrays (see _with_edge_arrays).
+        """
+
+        graph = nx.MultiDiGraph(**graph_attributes)
+        if node_attributes is None:
+            graph.add_nodes_from(range(len(self.structure)))
+        else:
+            graph.add_nodes_from(enumerate(node_attributes))
+
+        for i, (u, v, to_jimage, weight) in enumerate(zip(
+                edges.from_index.tolist(), edges.to_index.tolist(),
+                edges.to_jimage.tolist(), edges.weight.tolist())):
+            d = {"to_jimage": tuple(to_jimage)}
+            # as in add_edge, only non-zero weights are stored
+            if weight and not np.isnan(weight):
+                d["weight"] = weight
+            if edge_properties is not None:
+                d.update(edge_properties[i])
+            graph.add_edge(u, v, **d)
+
+        return graph
+
+    @property
+    def edge_arrays(self):
+        """
+        :return: edges of the graph in coordinate (COO) format, as an
+        EdgeArrays namedtuple of from_index and to_index arrays, an array
+        of the to_jimage vectors and an array of the weights (NaN for edges
+        without weight); does not require the NetworkX graph to be built
+        """
+        return self._get_edges()[2]
+
+    def _get_edges(self):
+        """
+        :return: the attributes of the graph and of its nodes (None if
+        no node has attributes), the EdgeArrays and the additional
+        properties of each edge (None if no edge has any)
+        """
+
+        if self._graph is None:
+            return self._edges
+
+        graph = self._graph
+        node_attributes = [graph.nodes[n] for n in range(len(self.structure))]
+        if not any(node_attributes):
+            node_attributes = None
+
+        from_index, to_index, to_jimage, weights, edge_properties = \
+            [], [], [], [], []
+        for u, v, d in graph.edges(data=True):
+            from_index.append(u)
+            to_index.append(v)
+            to_jimage.append(d["to_jimage"])
+            props = {k: val for k, val in d.items() if k != "to_jimage"}
+            weight = props.get("weight")
+            if isinstance(weight, (int, float)) and weight and \
+                    not np.isnan(weight):
+                weights.append(props.pop("weight"))
+            else:
+                weights.append(np.nan)
+            edge_properties.append(props)
+        if not any(edge_properties):
+            edge_properties = None
+
+        edges = EdgeArrays(np.array(from_index, dtype=int),
+                           np.array(to_index, dtype=int),
+                           np.array(to_jimage, dtype=int).reshape(-1, 3),
+                           np.array(weights, dtype=float))
+        return dict(graph.graph), node_attributes, edges, edge_properties
+
+    def _get_graph_attributes(self):
+        """
+        :return: attributes of the graph, without building the NetworkX
+        graph if it has not been built yet
+        """
+        return self._graph.graph if self._graph is not None else self._edges[0]
+
     @property
     def name(self):
         """
         :return: Name of graph
         """
-        return self.graph.graph['name']
+        return self._get_graph_attributes()['name']
 
     @property
     def edge_weight_name(self):
         """
         :return: Name of the edge weight property of graph
         """
-        return self.graph.graph['edge_weight_name']
+        return self._get_graph_attributes()['edge_weight_name']
 
     @property
     def edge_weight_unit(self):
         """
         :return: Units of the edge weight property of graph
         """
-        return self.graph.graph['edge_weight_units']
+        return self._get_graph_attributes()['edge_weight_units']
 
     def add_edge(self, from_index, to_index,
                  from_jimage=(0, 0, 0), to_jimage=None,
@@ -994,12 +1183,14 @@ class StructureGraph(MSONable):
         # possible when generating the graph using critic2 from
         # charge density.
 
-        # Multiplication works by looking for the expected position
-        # of an image node, and seeing if that node exists in the
-        # supercell. If it does, the edge is updated. This is more
-        # computationally expensive than just keeping track of the
-        # which new lattice images present, but should hopefully be
-        # easier to extend to a general 3x3 scaling matrix.
+        # Multiplication works on the edge arrays: the supercell is made
+        # of copies of the original cell, each translated by a lattice
+        # vector of the original lattice. An edge to image j of site v
+        # from site u in the copy translated by t connects to site v in
+        # the copy translated by t + j, reduced into the supercell, and
+        # the image of the supercell is whatever was reduced away.
+        # This only needs integer arithmetic, so it assumes a diagonal
+        # scaling matrix.
 
         # code adapted from Structure.__mul__
         scale_matrix = np.array(scaling_matrix, np.int16)
@@ -1014,13 +1205,8 @@ class StructureGraph(MSONable):
         c_lat = new_lattice.get_cartesian_coords(f_lat)
 
         new_sites = []
-        new_graphs = []
 
         for v in c_lat:
-
-            # create a map of nodes from original graph to its image
-            mapping = {n: n + len(new_sites) for n in range(len(self.structure))}
-
             for idx, site in enumerate(self.structure):
 
                 s = PeriodicSite(site.species_and_occu, site.coords + v,
@@ -1029,152 +1215,58 @@ class StructureGraph(MSONable):
 
                 new_sites.append(s)
 
-            new_graphs.append(nx.relabel_nodes(self.graph, mapping, copy=True))
-
         new_structure = Structure.from_sites(new_sites)
 
-        # merge all graphs into one big graph
-        new_g = nx.MultiDiGraph()
-        for new_graph in new_graphs:
-            new_g = nx.union(new_g, new_graph)
-
-        edges_to_remove = []  # tuple of (u, v, k)
-        edges_to_add = []  # tuple of (u, v, attr_dict)
-
-        # list of new edges inside supercell
-        # for duplicate checking
-        edges_inside_supercell = [{u, v} for u, v, d in new_g.edges(data=True)
-                                  if d['to_jimage'] == (0, 0, 0)]
-        new_periodic_images = []
-
-        orig_lattice = self.structure.lattice
-
-        # use k-d tree to match given position to an
-        # existing Site in Structure
-        kd_tree = KDTree(new_structure.cart_coords)
-
-        # tolerance in Å for sites to be considered equal
-        # this could probably be a lot smaller
-        tol = 0.05
-
-        for u, v, k, d in new_g.edges(keys=True, data=True):
-
-            to_jimage = d['to_jimage']  # for node v
-
-            # reduce unnecessary checking
-            if to_jimage != (0, 0, 0):
-
-                # get index in original site
-                n_u = u % len(self.structure)
-                n_v = v % len(self.structure)
-
-                # get fractional co-ordinates of where atoms defined
-                # by edge are expected to be, relative to original
-                # lattice (keeping original lattice has
-                # significant benefits)
-                v_image_frac = np.add(self.structure[n_v].frac_coords, to_jimage)
-                u_frac = self.structure[n_u].frac_coords
-
-                # using the position of node u as a reference,
-                # get relative Cartesian co-ordinates of where
-                # atoms defined by edge are expected to be
-                v_image_cart = orig_lattice.get_cartesian_coords(v_image_frac)
-                u_cart = orig_lattice.get_cartesian_coords(u_frac)
-                v_rel = np.subtract(v_image_cart, u_cart)
-
-                # now retrieve position of node v in
-                # new supercell, and get asgolute Cartesian
-                # co-ordinates of where atoms defined by edge
-                # are expected to be
-                v_expec = new_structure[u].coords + v_rel
-
-                # now search in new structure for these atoms
-                # query returns (distance, index)
-                v_present = kd_tree.query(v_expec)
-                v_present = v_present[1] if v_present[0] <= tol else None
-
-                # check if image sites now present in supercell
-                # and if so, delete old edge that went through
-                # periodic boundary
-                if v_present is not None:
-
-                    new_u = u
-                    new_v = v_present
-                    new_d = d.copy()
-
-                    # node now inside supercell
-                    new_d['to_jimage'] = (0, 0, 0)
-
-                    edges_to_remove.append((u, v, k))
-
-                    # make sure we don't try to add duplicate edges
-                    # will remove two edges for everyone one we add
-                    if {new_u, new_v} not in edges_inside_supercell:
-
-                        # normalize direction
-                        if new_v < new_u:
-                            new_u, new_v = new_v, new_u
-
-                        edges_inside_supercell.append({new_u, new_v})
-                        edges_to_add.append((new_u, new_v, new_d))
-
-                else:
-
-                    # want to find new_v such that we have
-                    # full periodic boundary conditions
-                    # so that nodes on one side of supercell
-                    # are connected to nodes on opposite side
-
-                    v_expec_frac = new_structure.lattice.get_fractional_coords(v_expec)
-
-                    # find new to_jimage
-                    # use np.around to fix issues with finite precision leading to incorrect image
-                    v_expec_image = np.around(v_expec_frac, decimals=3)
-                    v_expec_image = v_expec_image - v_expec_image%1
-
-                    v_expec_frac = np.subtract(v_expec_frac, v_expec_image)
-                    v_expec = new_structure.lattice.get_cartesian_coords(v_expec_frac)
-                    v_present = kd_tree.query(v_expec)
-                    v_present = v_present[1] if v_present[0] <= tol else None
-
-                    if v_present is not None:
-
-                        new_u = u
-                        new_v = v_present
-                        new_d = d.copy()
-                        new_to_jimage = tuple(map(int, v_expec_image))
-
-                        # normalize direction
-                        if new_v < new_u:
-                            new_u, new_v = new_v, new_u
-                            new_to_jimage = tuple(np.multiply(-1, d['to_jimage']).astype(int))
-
-                        new_d['to_jimage'] = new_to_jimage
-
-                        edges_to_remove.append((u, v, k))
-
-                        if (new_u, new_v, new_to_jimage) not in new_periodic_images:
-                            edges_to_add.append((new_u, new_v, new_d))
-                            new_periodic_images.append((new_u, new_v, new_to_jimage))
-
-        logger.debug("Removing {} edges, adding {} new edges.".format(len(edges_to_remove),
-                                                                      len(edges_to_add)))
-
-        # add/delete marked edges
-        for edges_to_remove in edges_to_remove:
-            new_g.remove_edge(*edges_to_remove)
-        for (u, v, d) in edges_to_add:
-            new_g.add_edge(u, v, **d)
+        graph_attributes, node_attributes, edges, edge_properties = \
+            self._get_edges()
+
+        nsites = len(self.structure)
+        scale = np.diag(scale_matrix).astype(int)
+
+        # translations of the copies, in units of the original lattice,
+        # and a map from translation back to copy
+        cells = np.around(f_lat * scale).astype(int)
+        cell_index = np.zeros(scale, dtype=int)
+        cell_index[tuple(cells.T)] = np.arange(len(cells))
+
+        # every edge of every copy, copy by copy
+        ncells, nedges = len(cells), len(edges.from_index)
+        copy = np.repeat(np.arange(ncells), nedges)
+        orig = np.tile(np.arange(nedges), ncells)
+
+        to_cell = cells[copy] + edges.to_jimage[orig]
+        new_to_jimage = np.floor_divide(to_cell, scale)
+        to_cell = cell_index[tuple((to_cell - new_to_jimage * scale).T)]
+        new_u = edges.from_index[orig] + copy * nsites
+        new_v = edges.to_index[orig] + to_cell * nsites
+
+        # normalize direction
+        swap = new_v < new_u
+        new_u, new_v = np.where(swap, new_v, new_u), np.where(swap, new_u, new_v)
+        new_to_jimage = np.where(swap[:, None], -new_to_jimage, new_to_jimage)
+
+        # edges inside the original cell come first, so that they are
+        # the ones kept over any duplicate joined across the copies
+        inside = ~np.any(edges.to_jimage[orig], axis=1)
+        order = np.concatenate((np.nonzero(inside)[0], np.nonzero(~inside)[0]))
+        keep = order[self._get_unique_edges(new_u[order], new_v[order],
+                                            new_to_jimage[order])]
+
+        logger.debug("Replicated {} edges into {} edges.".format(nedges,
+                                                                 len(keep)))
+
+        new_edges = EdgeArrays(new_u[keep], new_v[keep], new_to_jimage[keep],
+                               edges.weight[orig[keep]])
+        if node_attributes is not None:
+            node_attributes = node_attributes * ncells
+        if edge_properties is not None:
+            edge_properties = [edge_properties[i] for i in orig[keep]]
 
         # return new instance of StructureGraph with supercell
-        d = {"@module": self.__class__.__module__,
-             "@class": self.__class__.__name__,
-             "structure": new_structure.as_dict(),
-             "graphs": json_graph.adjacency_data(new_g)}
-
-        sg = StructureGraph.from_dict(d)
-
-        return sg
+        return StructureGraph._with_edge_arrays(new_structure,
+                                                graph_attributes, new_edges,
+                                                node_attributes=node_attributes,
+                                                edge_properties=edge_properties)
 
     def __rmul__(self, other):
         return self.__mul__(other)
@@ -1245,6 +1337,7 @@ class StructureGraph(MSONable):
 
         # sort Structure
         self.structure._sites = sorted(self.structure._sites, key=key, reverse=reverse)
+        self.structure._clear_neighbor_cache()
 
         # apply Structure ordering to graph
         mapping = {idx:self.structure.index(site) for idx, site in enumerate(old_structure)}
@@ -1364,6 +1457,84 @@ class StructureGraph(MSONable):
             'dist': jaccard_dist
         }
 
+    def get_connected_components(self):
+        """
+        Finds the connected components of the graph, following edges
+        through periodic boundaries, with scipy.sparse.csgraph on the
+        edge arrays; neither supercells nor the NetworkX graph are
+        needed.
+
+        A spanning tree of each component places every site in the
+        image in which it is connected to the first site of the
+        component, taken in the (0, 0, 0) image. Every remaining edge
+        then either closes a ring within these images or connects them
+        to a copy of themselves translated by a lattice vector. Those
+        translations span the lattice along which the component is
+        periodic, so that their rank is the dimensionality of the
+        component: 0 for molecules, 1 for chains, 2 for layers and 3
+        for frameworks.
+
+        :return: tuple of (labels, images, translations), where labels
+        is an array of the index of the component of each site, images
+        is a (number of sites, 3) array of the images of the sites in a
+        connected copy of their component and translations is a list of
+        (n, 3) arrays, one per component, of the distinct non-zero
+        lattice translations found (n is 0 for molecules)
+        """
+
+        nsites = len(self.structure)
+        edges = self.edge_arrays
+        u, v, to_jimage = edges.from_index, edges.to_index, edges.to_jimage
+
+        # one edge per pair of sites is enough to connect them; the
+        # stored data is the index of the edge, shifted by one as zeros
+        # are not stored, and signed by the direction it is followed in
+        pairs = np.nonzero(u != v)[0]
+        pairs = pairs[np.unique(u[pairs] * nsites + v[pairs],
+                                return_index=True)[1]]
+        ncomponents, labels = connected_components(
+            csr_matrix((np.ones(len(pairs)), (u[pairs], v[pairs])),
+                       shape=(nsites, nsites)), directed=False)
+
+        # a virtual site, connected to the first site of every component
+        # through a zero step, gives a spanning forest with a single
+        # breadth-first search
+        roots = np.unique(labels, return_index=True)[1]
+        steps = np.concatenate((to_jimage, np.zeros((1, 3), dtype=int)))
+        data = np.concatenate((pairs + 1, -pairs - 1,
+                               np.full(ncomponents, len(steps))))
+        matrix = csr_matrix((data, (np.concatenate((u[pairs], v[pairs],
+                                                    np.full(ncomponents,
+                                                            nsites))),
+                                    np.concatenate((v[pairs], u[pairs],
+                                                    roots)))),
+                            shape=(nsites + 1, nsites + 1))
+        order, predecessors = breadth_first_order(matrix, nsites,
+                                                  directed=True,
+                                                  return_predecessors=True)
+        order = order[1:]
+        predecessors = predecessors[order]
+        edge = np.asarray(matrix[predecessors, order]).ravel()
+        step = np.sign(edge)[:, None] * steps[np.abs(edge) - 1]
+
+        # breadth-first order visits every predecessor before its
+        # successors, so a single pass places each site from its parent
+        images = np.zeros((nsites + 1, 3), dtype=int)
+        for node, parent, d in zip(order, predecessors, step):
+            images[node] = images[parent] + d
+        images = images[:nsites]
+
+        shifts = images[u] + to_jimage - images[v]
+        periodic = np.any(shifts, axis=1)
+        translations = []
+        for n in range(ncomponents):
+            shifts_n = shifts[periodic & (labels[u] == n)]
+            if len(shifts_n):
+                shifts_n = np.unique(shifts_n, axis=0)
+            translations.append(shifts_n)
+
+        return labels, images, translations
+
     def get_subgraphs_as_molecules(self, use_weights=False):
         """
         Retrieve subgraphs as molecules, useful for extracting
@@ -1383,61 +1554,55 @@ class StructureGraph(MSONable):
         :return: list of unique Molecules in Structure
         """
 
-        # creating a supercell is an easy way to extract
-        # molecules (and not, e.g., layers of a 2D crystal)
-        # without adding extra logic
-        if getattr(self, '_supercell_sg', None) is None:
-            self._supercell_sg = supercell_sg = self*(3,3,3)
-
-        # make undirected to find connected subgraphs
-        supercell_sg.graph = nx.Graph(supercell_sg.graph)
-
-        # find subgraphs
-        all_subgraphs = list(nx.connected_component_subgraphs(supercell_sg.graph))
-
-        # discount subgraphs that lie across *supercell* boundaries
-        # these will subgraphs representing crystals
-        molecule_subgraphs = []
-        for subgraph in all_subgraphs:
-            intersects_boundary = any([d['to_jimage'] != (0, 0, 0)
-                                      for u, v, d in subgraph.edges(data=True)])
-            if not intersects_boundary:
-                molecule_subgraphs.append(subgraph)
-
-        # add specie names to graph to be able to test for isomorphism
-        for subgraph in molecule_subgraphs:
-            for n in subgraph:
-                subgraph.add_node(n, specie=str(supercell_sg.structure[n].specie))
+        # molecules are the components that are not periodic,
+        # (and not, e.g., layers of a 2D crystal)
+        labels, images, translations = self.get_connected_components()
+        edges = self.edge_arrays
+        edge_labels = labels[edges.from_index]
 
         # now define how we test for isomorphism
         def node_match(n1, n2):
             return n1['specie'] == n2['specie']
         def edge_match(e1, e2):
             if use_weights:
-                return e1['weight'] == e2['weight']
+                return e1.get('weight') == e2.get('weight')
             else:
                 return True
 
-        # prune duplicate subgraphs
-        unique_subgraphs = []
-        for subgraph in molecule_subgraphs:
-
-            already_present = [nx.is_isomorphic(subgraph, g,
-                                                node_match=node_match,
-                                                edge_match=edge_match)
-                               for g in unique_subgraphs]
-
-            if not any(already_present):
-                unique_subgraphs.append(subgraph)
-
-        # get Molecule objects for each subgraph
+        # prune duplicate subgraphs, only testing for isomorphism
+        # between subgraphs with the same species and number of bonds
+        unique_subgraphs = defaultdict(list)
         molecules = []
-        for subgraph in unique_subgraphs:
-
-            coords = [supercell_sg.structure[n].coords for n
-                      in subgraph.nodes()]
-            species = [supercell_sg.structure[n].specie for n
-                      in subgraph.nodes()]
+        for n, component_translations in enumerate(translations):
+
+            if len(component_translations):
+                continue
+
+            indices = np.nonzero(labels == n)[0]
+            subgraph = nx.Graph()
+            for i in indices:
+                subgraph.add_node(i, specie=str(self.structure[i].specie))
+            for i in np.nonzero(edge_labels == n)[0]:
+                weight = edges.weight[i]
+                subgraph.add_edge(edges.from_index[i], edges.to_index[i],
+                                  **({} if np.isnan(weight)
+                                     else {'weight': weight}))
+
+            key = (tuple(sorted(d['specie'] for _, d in subgraph.nodes(data=True))),
+                   subgraph.number_of_edges())
+            already_present = any(nx.is_isomorphic(subgraph, g,
+                                                   node_match=node_match,
+                                                   edge_match=edge_match)
+                                  for g in unique_subgraphs[key])
+            if already_present:
+                continue
+            unique_subgraphs[key].append(subgraph)
+
+            # get Molecule object for the subgraph, with
+            # its sites in the images that connect them
+            coords = self.structure.cart_coords[indices] + \
+                self.structure.lattice.get_cartesian_coords(images[indices])
+            species = [self.structure[i].specie for i in indices]
 
             molecule = Molecule(species, coords)
 
@@ -1631,8 +1796,7 @@ class MoleculeGraph(MSONable):
 
             molecule = molecule.get_boxed_structure(a, b, c, no_cross=True)
 
-        for n in range(len(molecule)):
-            neighbors = strategy.get_nn_info(molecule, n)
+        for n, neighbors in enumerate(strategy.get_all_nn_info(molecule)):
             for neighbor in neighbors:
 
                 # all bonds in molecules should not cross
@@ -4,6 +4,7 @@
 
 
 import math
+import itertools
 import warnings
 from collections import namedtuple, defaultdict
 
@@ -45,10 +46,12 @@ except:
 from monty.dev import requires
 
 from bisect import bisect_left
-from scipy.spatial import Voronoi
+from scipy.spatial import Voronoi, cKDTree
+from scipy.special import sph_harm
 
 from pymatgen import Element
 from pymatgen.analysis.bond_valence import BV_PARAMS, BVAnalyzer
+from pymatgen.core.bonds import CovalentBond
 
 default_op_params = {}
 with open(os.path.join(os.path.dirname(
@@ -365,6 +368,44 @@ class NearNeighbors:
 
         return [self.get_nn_info(structure, n) for n in range(len(structure))]
 
+    def _get_all_nn_info_from_neighbors(self, structure, cutoff):
+        """Private convenience method for get_all_nn_info of the strategies
+        that only rely on the neighbors within a cutoff radius. The neighbors
+        of all the sites are found in a single pass with get_all_neighbors and
+        the neighbors of each site are then processed with the
+        _get_nn_info_from_neighbors method of the strategy.
+
+        Args:
+            structure (Structure): Input structure
+            cutoff (float): Radius of the neighbor search
+        Return:
+            List of NN site information for each site in the structure.
+        """
+        all_neighbors = structure.get_all_neighbors(cutoff, include_index=True,
+                                                    include_image=True)
+        return [self._get_nn_info_from_neighbors(structure, n, neighbors)
+                for n, neighbors in enumerate(all_neighbors)]
+
+    @staticmethod
+    def _get_nn_dict(neighbor, weight):
+        """Private convenience method for get_nn_info, builds the
+        near-neighbor information of a neighbor given as a (site, distance,
+        index, image) tuple. The image is the one found by the neighbor
+        search, which is more stable than the one obtained from the
+        fractional coordinates of the site.
+
+        Args:
+            neighbor (tuple): (site, distance, index, image) of the neighbor
+            weight (float): Weight of the neighbor
+        Returns:
+            (dict) near-neighbor information (see get_nn_info)
+        """
+        site, _, index, image = neighbor
+        return {'site': site,
+                'image': tuple(int(i) for i in image),
+                'weight': weight,
+                'site_index': int(index)}
+
     def get_nn_shell_info(self, structure, site_idx, shell):
         """Get a certain nearest neighbor shell for a certain site.
 
@@ -578,6 +619,199 @@ class NearNeighbors:
             return None
 
 
+class VoronoiTessellation(object):
+    """
+    Voronoi tessellation of all the sites of a periodic structure, which
+    can be queried repeatedly, e.g. by VoronoiNN with different weights,
+    tolerances or targets, by CrystalNN or by the DetailedVoronoiContainer
+    of ChemEnv, instead of tessellating the structure again.
+
+    The tessellation includes the sites of the structure, translated to the
+    unit cell, and their periodic images within cutoff of any of them. The
+    faces of the Voronoi cells of the sites are stored as arrays in
+    compressed sparse row (CSR) layout: the faces of the cell of site n are
+    the entries face_ptr[n]:face_ptr[n + 1] of the face arrays, and the
+    vertices of face f are face_vertices[vertex_ptr[f]:vertex_ptr[f + 1]].
+
+    Args:
+        structure (Structure): structure to tessellate.
+        cutoff (float): cutoff radius in Angstrom of the periodic images
+            included around each site.
+
+    Attributes:
+        structure (Structure): the structure, with its sites translated
+            to the unit cell.
+        site_indices (np.array): index in the structure and image of the
+            points of the tessellation, as [index, a, b, c] rows, sorted.
+        coords (np.array): Cartesian coordinates of the points.
+        root_points (np.array): point of each site, in the (0, 0, 0) image.
+        vertices (np.array): coordinates of the Voronoi vertices.
+        face_ptr (np.array): start of the faces of each site.
+        face_points (np.array): point on the other side of each face.
+        vertex_ptr (np.array): start of the vertices of each face.
+        face_vertices (np.array): indices of the vertices of the faces, in
+            qhull order. -1 stands for a vertex at infinity.
+        infinite (np.array): whether each face has a vertex at infinity.
+        solid_angle, volume, face_dist, area, normal, n_verts (np.array):
+            statistics of each face (see VoronoiNN.get_voronoi_polyhedra),
+            zero for faces with a vertex at infinity.
+    """
+
+    def __init__(self, structure, cutoff=13.0):
+        if np.any(np.mod(structure.frac_coords, 1) != structure.frac_coords):
+            structure = structure.__class__.from_sites(
+                [site.to_unit_cell for site in structure])
+        self.structure = structure
+        self.cutoff = cutoff
+        lattice = structure.lattice
+        nsites = len(structure)
+        root_coords = structure.cart_coords
+
+        # sites and their images within cutoff of any site in the unit cell
+        pad = np.ceil(cutoff * np.linalg.norm(lattice.inv_matrix, axis=0))
+        images = np.array(list(itertools.product(
+            *[range(-n, n + 1) for n in pad.astype(int)])))
+        site_indices = np.column_stack((
+            np.tile(np.arange(nsites), len(images)),
+            np.repeat(images, nsites, axis=0)))
+        coords = lattice.get_cartesian_coords(
+            structure.frac_coords[site_indices[:, 0]] + site_indices[:, 1:])
+        dists, _ = cKDTree(root_coords).query(
+            coords, distance_upper_bound=cutoff)
+        within = np.isfinite(dists)
+        order = np.lexsort(site_indices[within].T[::-1])
+        self.site_indices = site_indices[within][order]
+        self.coords = coords[within][order]
+        self.root_points, = np.nonzero(~np.any(self.site_indices[:, 1:],
+                                               axis=1))
+
+        voro = Voronoi(self.coords)
+        self.vertices = voro.vertices
+
+        # faces of the cells of the sites, in the order of the ridges
+        is_root = np.zeros(len(self.coords), dtype=bool)
+        is_root[self.root_points] = True
+        ridge_points = voro.ridge_points
+        ridges, sides = np.nonzero(is_root[ridge_points])
+        face_sites = self.site_indices[ridge_points[ridges, sides], 0]
+        order = np.argsort(face_sites, kind="mergesort")
+        ridges, sides = ridges[order], sides[order]
+        self.face_ptr = np.concatenate(
+            ([0], np.cumsum(np.bincount(face_sites, minlength=nsites))))
+        self.face_points = ridge_points[ridges, 1 - sides]
+
+        ridge_vertices = [voro.ridge_vertices[r] for r in ridges.tolist()]
+        self.n_verts = np.array([len(v) for v in ridge_vertices], dtype=int)
+        self.vertex_ptr = np.concatenate(([0], np.cumsum(self.n_verts)))
+        self.face_vertices = np.fromiter(
+            itertools.chain.from_iterable(ridge_vertices), dtype=int,
+            count=self.vertex_ptr[-1])
+        self.infinite = np.zeros(len(ridges), dtype=bool)
+        np.logical_or.at(self.infinite,
+                         np.repeat(np.arange(len(ridges)), self.n_verts),
+                         self.face_vertices == -1)
+
+        self._set_face_statistics(
+            self.coords[self.root_points][np.repeat(np.arange(nsites),
+                                                    np.diff(self.face_ptr))])
+        self._sites = {}
+
+    def _set_face_statistics(self, centers):
+        """
+        Computes the statistics of the faces, as in
+        VoronoiNN._extract_cell_info, for all the faces at once.
+
+        Args:
+            centers (np.array): coordinates of the site of each face
+        """
+        nfaces = len(self.face_points)
+        finite = ~self.infinite
+        max_verts = self.n_verts.max() if nfaces else 0
+
+        # vertices of the faces, padded to the largest face
+        verts = np.zeros((nfaces, max(max_verts, 3)), dtype=int)
+        column = np.arange(len(self.face_vertices)) - \
+            np.repeat(self.vertex_ptr[:-1], self.n_verts)
+        verts[np.repeat(np.arange(nfaces), self.n_verts), column] = \
+            np.where(self.face_vertices < 0, 0, self.face_vertices)
+
+        # solid angles and volumes of the triangles (0, j, j + 1)
+        # of the faces, summed in the same order as solid_angle
+        r = self.vertices[verts] - centers[:, None, :]
+        r_norm = np.linalg.norm(r, axis=2)
+        angle = np.zeros(nfaces)
+        volume = np.zeros(nfaces)
+        for j in range(1, max_verts - 1):
+            tri = finite & (self.n_verts > j + 1)
+            r0, ri, rj = r[tri, 0], r[tri, j], r[tri, j + 1]
+            n0, ni, nj = r_norm[tri, 0], r_norm[tri, j], r_norm[tri, j + 1]
+            tp = np.abs(np.einsum('ij,ij->i', r0, np.cross(ri, rj)))
+            de = n0 * ni * nj + nj * np.einsum('ij,ij->i', r0, ri) + \
+                ni * np.einsum('ij,ij->i', r0, rj) + \
+                n0 * np.einsum('ij,ij->i', ri, rj)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                tri_angle = np.where(de == 0, np.where(tp > 0, 0.5 * pi,
+                                                       -0.5 * pi),
+                                     np.arctan(tp / de))
+            angle[tri] += np.where(tri_angle > 0, tri_angle,
+                                   tri_angle + np.pi) * 2
+
+            # vol_tetra(center, vertex 0, vertex j, vertex j + 1)
+            vt4 = rj
+            volume[tri] += np.abs(np.einsum(
+                'ij,ij->i', -vt4, np.cross(r0 - vt4, ri - vt4))) / 6
+
+        other = self.coords[self.face_points] - centers
+        dist = np.linalg.norm(other, axis=1)
+        self.solid_angle = angle
+        self.volume = volume
+        self.face_dist = np.where(finite, dist / 2, 0)
+        self.area = np.zeros(nfaces)
+        self.area[finite] = 3 * volume[finite] / self.face_dist[finite]
+        self.normal = other / dist[:, None]
+
+    def get_site(self, point):
+        """
+        Get the site of a point of the tessellation.
+
+        Args:
+            point (int): index of the point
+        Returns:
+            (PeriodicSite) the site, in its periodic image
+        """
+        if point not in self._sites:
+            index = self.site_indices[point, 0]
+            site = self.structure[index]
+            self._sites[point] = PeriodicSite(
+                site.species_and_occu,
+                site.frac_coords + self.site_indices[point, 1:],
+                site.lattice, properties=site.properties)
+        return self._sites[point]
+
+    def get_faces(self, n):
+        """
+        Get the faces of the Voronoi cell of a site.
+
+        Args:
+            n (int): index of the site in the structure
+        Returns:
+            (slice) the entries of the face arrays for the site
+        """
+        return slice(self.face_ptr[n], self.face_ptr[n + 1])
+
+    def get_face_vertices(self, face):
+        """
+        Get the vertices of a face, in qhull order.
+
+        Args:
+            face (int): index of the face
+        Returns:
+            ([int]) indices of the vertices, -1 for a vertex at infinity
+        """
+        return self.face_vertices[
+            self.vertex_ptr[face]:self.vertex_ptr[face + 1]].tolist()
+
+
 class VoronoiNN(NearNeighbors):
     """
     Uses a Voronoi algorithm to determine near neighbors for each site in a
@@ -682,11 +916,28 @@ class VoronoiNN(NearNeighbors):
         return cell_info
 
 
-    def get_all_voronoi_polyhedra(self, structure):
+    def get_voronoi_tessellation(self, structure):
+        """Tessellate all the sites of a structure at once, with the cutoff
+        of this VoronoiNN. The tessellation can then be queried with
+        get_all_voronoi_polyhedra or get_all_nn_info, including by
+        VoronoiNN objects with another weight, tol or targets, and by
+        CrystalNN.get_all_nn_data.
+
+        Args:
+            structure (Structure): Structure to be evaluated
+        Returns:
+            (VoronoiTessellation) the tessellation of the structure
+        """
+        return VoronoiTessellation(structure, self.cutoff)
+
+    def get_all_voronoi_polyhedra(self, structure, tessellation=None):
         """Get the Voronoi polyhedra for all site in a simulation cell
 
         Args:
             structure (Structure): Structure to be evaluated
+            tessellation (VoronoiTessellation): tessellation of the structure
+                to use, e.g. from get_voronoi_tessellation. The structure is
+                tessellated if not provided
         Returns:
             A dict of sites sharing a common Voronoi facet with the site
             n mapped to a directory containing statistics about the facet:
@@ -704,51 +955,77 @@ class VoronoiNN(NearNeighbors):
         #   to the neighbor list, which requires detecting whether it will be translated
         #   to reside within the unit cell before neighbor detection, it is less complex
         #   to just call the one-by-one operation
-        if len(structure) == 1:
+        if len(structure) == 1 and tessellation is None:
             return [self.get_voronoi_polyhedra(structure, 0)]
+        return self._get_all_voronoi_polyhedra(structure, tessellation)[0]
+
+    def _get_all_voronoi_polyhedra(self, structure, tessellation=None):
+        """Get the Voronoi polyhedra of all the sites of a structure from a
+        single tessellation (see get_all_voronoi_polyhedra).
+
+        Args:
+            structure (Structure): Structure to be evaluated
+            tessellation (VoronoiTessellation): tessellation of the structure,
+                computed if not provided
+        Returns:
+            The Voronoi polyhedra of all the sites and an array with the index
+            in the structure and the image of each site of the tessellation
+            (i.e. of each key of the polyhedra), as [index, a, b, c] rows.
+        """
+
+        if tessellation is None:
+            tessellation = VoronoiTessellation(structure, self.cutoff)
+        elif len(tessellation.structure) != len(structure):
+            raise ValueError("The tessellation is not one of this structure")
 
-        # Assemble the list of neighbors used in the tessellation
         if self.targets is None:
             targets = structure.composition.elements
         else:
             targets = self.targets
 
-        # Initialize the list of sites with the atoms in the origin unit cell
-        #  The `get_all_neighbors` function returns neighbors for each site's image in the
-        #   original unit cell. We start off with these central atoms to ensure they are
-        #   included in the tessellation
-        sites = [x.to_unit_cell for x in structure]
-        indices = [(i, 0, 0, 0) for i, _ in enumerate(structure)]
-
-        # Get all neighbors within a certain cutoff
-        #   Record both the list of these neighbors, and the site indices
-        all_neighs = structure.get_all_neighbors(self.cutoff,
-                                                 include_index=True,
-                                                 include_image=True)
-        for neighs in all_neighs:
-            sites.extend([x[0] for x in neighs])
-            indices.extend([(x[2],) + x[3] for x in neighs])
-
-        # Get the non-duplicates (using the site indices for performance/numerical stability)
-        indices = np.array(indices, dtype=np.int)
-        indices, uniq_inds = np.unique(indices, return_index=True, axis=0)
-        sites = np.array(sites)[uniq_inds]
-
-        # Sort array such that atoms in the root image are first
-        #   Exploit the fact that the array is sorted by the unique operation such that
-        #   the images associated with atom 0 are first, followed by atom 1, etc.
-        root_images, = np.nonzero(np.abs(indices[:, 1:]).max(axis=1) == 0)
-
-        del indices  # Save memory (tessellations can be costly)
+        return [self._get_cell_info_from_tessellation(tessellation, n, targets)
+                for n in range(len(structure))], tessellation.site_indices
 
-        # Run the tessellation
-        qvoronoi_input = [s.coords for s in sites]
-        voro = Voronoi(qvoronoi_input)
+    def _get_cell_info_from_tessellation(self, tessellation, n, targets):
+        """Get the information about a site from a tessellation of all the
+        sites (see _extract_cell_info)
 
-        # Get the information for each neighbor
-        return [self._extract_cell_info(structure, i, sites, targets,
-                                        voro, self.compute_adj_neighbors)
-                for i in root_images.tolist()]
+        Args:
+            tessellation (VoronoiTessellation) - Tessellation of the structure
+            n (int) - Index of the site in the structure
+            targets ([Element]) - Target elements
+        Returns:
+            A dict of sites sharing a common Voronoi facet, keyed by the
+            index of the site in the tessellation (see _extract_cell_info)
+        """
+        results = {}
+        for face in range(tessellation.face_ptr[n], tessellation.face_ptr[n + 1]):
+            if tessellation.infinite[face]:
+                # the Voronoi cell is missing a face
+                if self.allow_pathological:
+                    continue
+                else:
+                    raise RuntimeError("This structure is pathological,"
+                                       " infinite vertex in the voronoi "
+                                       "construction")
+
+            other_site = int(tessellation.face_points[face])
+            results[other_site] = {
+                'site': tessellation.get_site(other_site),
+                'normal': tessellation.normal[face].copy(),
+                'solid_angle': tessellation.solid_angle[face],
+                'volume': tessellation.volume[face],
+                'face_dist': tessellation.face_dist[face],
+                'area': tessellation.area[face],
+                'n_verts': int(tessellation.n_verts[face])
+            }
+
+            if self.compute_adj_neighbors:
+                results[other_site]['verts'] = \
+                    tessellation.get_face_vertices(face)
+
+        return self._get_target_adj_cell_info(results, targets,
+                                              self.compute_adj_neighbors)
 
     def _get_elements(self, site):
         """
@@ -782,7 +1059,8 @@ class VoronoiNN(NearNeighbors):
                 return False
         return True
 
-    def _extract_cell_info(self, structure, site_idx, sites, targets, voro, compute_adj_neighbors=False):
+    def _extract_cell_info(self, structure, site_idx, sites, targets, voro, compute_adj_neighbors=False,
+                           ridges=None):
         """Get the information about a certain atom from the results of a tessellation
 
         Args:
@@ -792,6 +1070,9 @@ class VoronoiNN(NearNeighbors):
             targets ([Element]) - Target elements
             voro - Output of qvoronoi
             compute_adj_neighbors (boolean) - Whether to compute which neighbors are adjacent
+            ridges ([((int, int), [int])]) - Faces of the tessellation that include the atom, as
+                (pair of site indices, vertex indices). All the faces of the tessellation are
+                searched if not provided
         Returns:
             A dict of sites sharing a common Voronoi facet. Key is facet id
              (not useful) and values are dictionaries containing statistics
@@ -813,8 +1094,10 @@ class VoronoiNN(NearNeighbors):
         center_coords = sites[site_idx].coords
 
         # Iterate through all the faces in the tessellation
+        if ridges is None:
+            ridges = voro.ridge_dict.items()
         results = {}
-        for nn, vind in voro.ridge_dict.items():
+        for nn, vind in ridges:
             # Get only those that include the cite in question
             if site_idx in nn:
                 other_site = nn[0] if nn[1] == site_idx else nn[1]
@@ -869,18 +1152,23 @@ class VoronoiNN(NearNeighbors):
                 if compute_adj_neighbors:
                     results[other_site]['verts'] = vind
 
+        return self._get_target_adj_cell_info(results, targets,
+                                              compute_adj_neighbors)
+
+    def _get_target_adj_cell_info(self, results, targets,
+                                  compute_adj_neighbors=False):
+        """Get the faces of a Voronoi cell whose neighbor contains a target
+        element, and which neighbors are adjacent if desired
+
+        Args:
+            results (dict) - Faces of the Voronoi cell (see _extract_cell_info)
+            targets ([Element]) - Target elements
+            compute_adj_neighbors (boolean) - Whether to compute which neighbors are adjacent
+        Returns:
+            A dict with the faces of the target neighbors
+        """
         # Get only target elements
-        resultweighted = {}
-        for nn_index, nstats in results.items():
-            # Check if this is a target site
-            nn = nstats['site']
-            if nn.is_ordered:
-                if nn.specie in targets:
-                    resultweighted[nn_index] = nstats
-            else:  # is nn site is disordered
-                for disordered_sp in nn.species_and_occu.keys():
-                    if disordered_sp in targets:
-                        resultweighted[nn_index] = nstats
+        resultweighted = self._get_target_cell_info(results, targets)
 
         # If desired, determine which neighbors are adjacent
         if compute_adj_neighbors:
@@ -909,6 +1197,29 @@ class VoronoiNN(NearNeighbors):
 
         return resultweighted
 
+    @staticmethod
+    def _get_target_cell_info(cell_info, targets):
+        """Get the faces of a Voronoi cell whose neighbor contains a target element
+
+        Args:
+            cell_info (dict) - Faces of the Voronoi cell (see _extract_cell_info)
+            targets ([Element]) - Target elements
+        Returns:
+            A dict with the faces of the target neighbors
+        """
+        resultweighted = {}
+        for nn_index, nstats in cell_info.items():
+            # Check if this is a target site
+            nn = nstats['site']
+            if nn.is_ordered:
+                if nn.specie in targets:
+                    resultweighted[nn_index] = nstats
+            else:  # is nn site is disordered
+                for disordered_sp in nn.species_and_occu.keys():
+                    if disordered_sp in targets:
+                        resultweighted[nn_index] = nstats
+        return resultweighted
+
     def get_nn_info(self, structure, n):
         """"
         Get all near-neighbor sites as well as the associated image locations
@@ -932,16 +1243,38 @@ class VoronoiNN(NearNeighbors):
         # Extract the NN info
         return self._extract_nn_info(structure, nns)
 
-    def get_all_nn_info(self, structure):
-        all_voro_cells = self.get_all_voronoi_polyhedra(structure)
-        return [self._extract_nn_info(structure, cell) for cell in all_voro_cells]
+    def get_all_nn_info(self, structure, tessellation=None):
+        """
+        Get the near-neighbor information of all the sites of a structure,
+        from a single Voronoi tessellation (see get_nn_info).
 
-    def _extract_nn_info(self, structure, nns):
+        Args:
+            structure (Structure): input structure.
+            tessellation (VoronoiTessellation): tessellation of the structure
+                to use, e.g. from get_voronoi_tessellation. The structure is
+                tessellated if not provided
+
+        Returns:
+            List of NN site information for each site in the structure. Each
+                entry has the same format as `get_nn_info`
+        """
+        if len(structure) == 1 and tessellation is None:
+            return [self.get_nn_info(structure, 0)]
+        all_voro_cells, site_indices = self._get_all_voronoi_polyhedra(
+            structure, tessellation)
+        return [self._extract_nn_info(structure, cell, site_indices)
+                for cell in all_voro_cells]
+
+    def _extract_nn_info(self, structure, nns, site_indices=None):
         """Given Voronoi NNs, extract the NN info in the form needed by NearestNeighbors
 
         Args:
             structure (Structure): Structure being evaluated
             nns ([dicts]): Nearest neighbor information for a structure
+            site_indices (np.array): Index in the structure and image of the
+                sites of the tessellation, as [index, a, b, c] rows. Used
+                instead of searching the original site and computing the image
+                of each neighbor if provided
         Returns:
             (list of tuples (Site, array, float)): See nn_info
         """
@@ -955,15 +1288,20 @@ class VoronoiNN(NearNeighbors):
         # Extract the NN info
         siw = []
         max_weight = max(nn[self.weight] for nn in nns.values())
-        for nstats in nns.values():
+        for nn_index, nstats in nns.items():
             site = nstats['site']
             if nstats[self.weight] > self.tol * max_weight \
                     and self._is_in_targets(site, targets):
+                if site_indices is None:
+                    site_index = self._get_original_site(structure, site)
+                    image = self._get_image(site.frac_coords)
+                else:
+                    site_index = int(site_indices[nn_index, 0])
+                    image = tuple(int(i) for i in site_indices[nn_index, 1:])
                 nn_info = {'site': site,
-                           'image': self._get_image(site.frac_coords),
+                           'image': image,
                            'weight': nstats[self.weight] / max_weight,
-                           'site_index': self._get_original_site(
-                               structure, site)}
+                           'site_index': site_index}
 
                 if self.extra_nn_info:
                     # Add all the information about the site
@@ -1041,6 +1379,28 @@ class JmolNN(NearNeighbors):
             (self.el_radius[el1_sym] + self.el_radius[el2_sym] + self.tol) ** 2)
 
 
+    def get_max_bond_distances(self, structure):
+        """
+        Tabulate the max bond lengths between all the elements of a
+        structure (see get_max_bond_distance), so that the neighbors of many
+        sites can be confirmed at once.
+
+        Args:
+            structure (Structure): input structure.
+
+        Returns:
+            species (np.array): index of the element of each site in
+                structure.composition.elements.
+            max_dists (np.array): max bond lengths between the elements.
+        """
+        elements = structure.composition.elements
+        el_index = {el: i for i, el in enumerate(elements)}
+        species = np.array([el_index[site.specie] for site in structure],
+                           dtype=int)
+        radii = np.array([self.el_radius[el.symbol] for el in elements])
+        max_dists = np.sqrt((radii[:, None] + radii[None, :] + self.tol) ** 2)
+        return species, max_dists
+
     def get_nn_info(self, structure, n):
         """
         Get all near-neighbor sites as well as the associated image locations
@@ -1059,28 +1419,63 @@ class JmolNN(NearNeighbors):
         """
 
         site = structure[n]
-
-        # Determine relevant bond lengths based on atomic radii table
-        bonds = {}
-        for el in structure.composition.elements:
-            bonds[site.specie, el] = self.get_max_bond_distance(
-                site.specie.symbol, el.symbol)
+        bonds = self._get_site_bonds(structure, n)
 
         # Search for neighbors up to max bond length + tolerance
         max_rad = max(bonds.values()) + self.tol
-        min_rad = min(bonds.values())
+        return self._get_nn_info_from_neighbors(
+            structure, n, structure.get_neighbors(site, max_rad,
+                                                  include_index=True,
+                                                  include_image=True),
+            bonds=bonds)
 
-        siw = []
-        for neighb, dist in structure.get_neighbors(site, max_rad):
-            # Confirm neighbor based on bond length specific to atom pair
-            if dist <= (bonds[(site.specie, neighb.specie)]) and (dist > self.min_bond_distance):
-                weight = min_rad / dist
-                siw.append({'site': neighb,
-                            'image': self._get_image(neighb.frac_coords),
-                            'weight': weight,
-                            'site_index': self._get_original_site(structure, neighb)})
+    def get_all_nn_info(self, structure):
+        species, max_dists = self.get_max_bond_distances(structure)
+        all_neighbors = structure.get_all_neighbors(
+            max_dists.max() + self.tol, include_index=True, include_image=True)
+
+        # Confirm the neighbors of all the sites at once, based on the bond
+        # length specific to each atom pair
+        neighbors = list(itertools.chain.from_iterable(all_neighbors))
+        centers = np.repeat(np.arange(len(structure)),
+                            [len(nns) for nns in all_neighbors])
+        dists = np.array([dist for _, dist, _, _ in neighbors], dtype=float)
+        indices = np.array([index for _, _, index, _ in neighbors], dtype=int)
+        min_rads = max_dists.min(axis=1)[species[centers]]
+        selected = np.nonzero(
+            (dists <= max_dists[species[centers], species[indices]]) &
+            (dists > self.min_bond_distance))[0]
+
+        siw = [[] for _ in range(len(structure))]
+        for i in selected:
+            siw[centers[i]].append(
+                self._get_nn_dict(neighbors[i], min_rads[i] / dists[i]))
         return siw
 
+    def _get_site_bonds(self, structure, n):
+        """
+        Max bond lengths between the element of site n and each element of
+        the structure, as a dict keyed by element.
+        """
+        symbol = structure[n].specie.symbol
+        return {el: self.get_max_bond_distance(symbol, el.symbol)
+                for el in structure.composition.elements}
+
+    def _get_nn_info_from_neighbors(self, structure, n, neighbors,
+                                    bonds=None):
+        """
+        Get the near-neighbor information of site n from its neighbors, given
+        as (site, distance, index, image) tuples. bonds is the output of
+        _get_site_bonds, computed if not given.
+        """
+        if bonds is None:
+            bonds = self._get_site_bonds(structure, n)
+        min_rad = min(bonds.values())
+
+        # Confirm neighbors based on bond length specific to atom pair
+        return [self._get_nn_dict(nn, min_rad / nn[1]) for nn in neighbors
+                if self.min_bond_distance < nn[1] <= bonds[nn[0].specie]]
+
 
 class MinimumDistanceNN(NearNeighbors):
     """
@@ -1118,18 +1513,23 @@ class MinimumDistanceNN(NearNeighbors):
         """
 
         site = structure[n]
-        neighs_dists = structure.get_neighbors(site, self.cutoff)
-        min_dist = min([dist for neigh, dist in neighs_dists])
+        return self._get_nn_info_from_neighbors(
+            structure, n, structure.get_neighbors(site, self.cutoff,
+                                                  include_index=True,
+                                                  include_image=True))
 
-        siw = []
-        for s, dist in neighs_dists:
-            if dist < (1.0 + self.tol) * min_dist:
-                w = min_dist / dist
-                siw.append({'site': s,
-                            'image': self._get_image(s.frac_coords),
-                            'weight': w,
-                            'site_index': self._get_original_site(structure, s)})
-        return siw
+    def get_all_nn_info(self, structure):
+        return self._get_all_nn_info_from_neighbors(structure, self.cutoff)
+
+    def _get_nn_info_from_neighbors(self, structure, n, neighbors):
+        """
+        Get the near-neighbor information of site n from its neighbors, given
+        as (site, distance, index, image) tuples.
+        """
+        dists = np.array([dist for _, dist, _, _ in neighbors])
+        min_dist = dists.min()
+        selected = np.nonzero(dists < (1.0 + self.tol) * min_dist)[0]
+        return [self._get_nn_dict(neighbors[i], min_dist / dists[i]) for i in selected]
 
 
 class OpenBabelNN(NearNeighbors):
@@ -1298,31 +1698,37 @@ class CovalentBondNN(NearNeighbors):
 
         # This is unfortunately inefficient, but is the best way to fit the
         # current NearNeighbors scheme
-        self.bonds = structure.get_covalent_bonds(tol=self.tol)
-
-        siw = []
+        return self.get_all_nn_info(structure)[n]
 
-        for bond in self.bonds:
-            capture_bond = False
-            if bond.site1 == structure[n]:
-                site = bond.site2
-                capture_bond = True
-            elif bond.site2 == structure[n]:
-                site = bond.site1
-                capture_bond = True
-
-            if capture_bond:
-                index = structure.index(site)
-                if self.order:
-                    weight = bond.get_bond_order()
-                else:
-                    weight = bond.length
-
-                siw.append({"site": site,
-                            "image": (0, 0, 0),
-                            "weight": weight,
-                            "site_index": index})
+    def get_all_nn_info(self, structure):
+        """
+        Get the near-neighbor sites and weights (orders) of the bonds of all
+        the atoms of a molecule, from a single bond search.
 
+        :param structure: input Molecule.
+        :return: list of the near-neighbor information of each site (see
+        get_nn_info).
+        """
+        bond_indices = structure._get_covalent_bond_indices(tol=self.tol)
+        self.bonds = [CovalentBond(structure[i], structure[j])
+                      for i, j in bond_indices.tolist()]
+        if self.order:
+            weights = [bond.get_bond_order() for bond in self.bonds]
+        else:
+            weights = [bond.length for bond in self.bonds]
+
+        # The bonds are sorted, so the neighbors of each site are listed in
+        # the order of their indices
+        siw = [[] for _ in range(len(structure))]
+        for (i, j), weight in zip(bond_indices.tolist(), weights):
+            siw[i].append({"site": structure[j],
+                           "image": (0, 0, 0),
+                           "weight": weight,
+                           "site_index": j})
+            siw[j].append({"site": structure[i],
+                           "image": (0, 0, 0),
+                           "weight": weight,
+                           "site_index": i})
         return siw
 
     def get_bonded_structure(self, structure, decorate=False):
@@ -1351,7 +1757,8 @@ class CovalentBondNN(NearNeighbors):
                                 for n in range(len(structure))]
             structure.add_site_property('order_parameters', order_parameters)
 
-        mg = MoleculeGraph.with_local_env_strategy(structure, self)
+        mg = MoleculeGraph.with_local_env_strategy(structure, self,
+                                                   extend_structure=False)
 
         return mg
 
@@ -1768,6 +2175,12 @@ class LocalStructOrderParams:
         "T", "cuboct", "cuboct_max", "see_saw_rect", "bcc", "q2", "q4", "q6", "oct_max", \
         "hex_plan_max", "sq_face_cap_trig_pris")
 
+    # Types that get_order_parameters_all evaluates with array operations.
+    __vectorized_types = frozenset([
+        "cn", "sgl_bd", "bent", "tri_plan", "tri_plan_max", "tet", "tet_max",
+        "T", "tri_pyr", "sq_pyr", "pent_pyr", "hex_pyr", "sq_plan", "oct",
+        "bcc", "reg_tri", "sq", "q2", "q4", "q6"])
+
     def __init__(self, types, parameters=None, cutoff=-10.0):
         """
         Args:
@@ -2449,11 +2862,6 @@ class LocalStructOrderParams:
         if tol < 0.0:
             raise ValueError("Negative tolerance for weighted solid angle!")
 
-        left_of_unity = 1.0 - 1.0e-12
-        # The following threshold has to be adapted to non-Angstrom units.
-        very_small = 1.0e-12
-        fac_bcc = 1.0 / exp(-0.5)
-
         # Find central site and its neighbors.
         # Note that we adopt the same way of accessing sites here as in
         # VoronoiNN; that is, not via the sites iterator.
@@ -2477,7 +2885,30 @@ class LocalStructOrderParams:
             else:
                 neighsites[:] = [site for site in neighsitestmp \
                                  if site.specie.symbol == target_spec]
-        nneigh = len(neighsites)
+        return self._get_order_parameters_from_neighbors(
+            centsite.coords, [neigh.coords for neigh in neighsites])
+
+    def _get_order_parameters_from_neighbors(self, centvec, neighcoords):
+
+        """
+        Compute all order parameters of a site from the Cartesian
+        coordinates of the site and of its neighbors (see
+        get_order_parameters).
+
+        Args:
+            centvec (numpy array): coordinates of the central site.
+            neighcoords ([numpy array]): coordinates of the neighbors.
+
+        Returns:
+            [floats]: representing order parameters.
+        """
+
+        left_of_unity = 1.0 - 1.0e-12
+        # The following threshold has to be adapted to non-Angstrom units.
+        very_small = 1.0e-12
+        fac_bcc = 1.0 / exp(-0.5)
+
+        nneigh = len(neighcoords)
         self._last_nneigh = nneigh
 
         # Prepare angle calculations, if applicable.
@@ -2488,21 +2919,20 @@ class LocalStructOrderParams:
         dist = []
         distjk_unique = []
         distjk = []
-        centvec = centsite.coords
         if self._computerijs:
-            for j, neigh in enumerate(neighsites):
-                rij.append((neigh.coords - centvec))
+            for j, neigh in enumerate(neighcoords):
+                rij.append((neigh - centvec))
                 dist.append(np.linalg.norm(rij[j]))
                 rijnorm.append((rij[j] / dist[j]))
         if self._computerjks:
-            for j, neigh in enumerate(neighsites):
+            for j, neigh in enumerate(neighcoords):
                 rjk.append([])
                 rjknorm.append([])
                 distjk.append([])
                 kk = 0
-                for k in range(len(neighsites)):
+                for k in range(len(neighcoords)):
                     if j != k:
-                        rjk[j].append(neighsites[k].coords - neigh.coords)
+                        rjk[j].append(neighcoords[k] - neigh)
                         distjk[j].append(np.linalg.norm(rjk[j][kk]))
                         if k > j:
                             distjk_unique.append(distjk[j][kk])
@@ -2875,8 +3305,8 @@ class LocalStructOrderParams:
 
             # Compute height, side and diagonal length estimates.
             neighscent = np.array([0.0, 0.0, 0.0])
-            for j, neigh in enumerate(neighsites):
-                neighscent = neighscent + neigh.coords
+            for j, neigh in enumerate(neighcoords):
+                neighscent = neighscent + neigh
             if nneigh > 0:
                 neighscent = (neighscent / float(nneigh))
             h = np.linalg.norm(neighscent - centvec)
@@ -2905,6 +3335,333 @@ class LocalStructOrderParams:
 
         return ops
 
+    def get_order_parameters_all(self, structure, indices=None,
+                                 neighbor_vectors=None, tol=0.0,
+                                 target_spec=None):
+
+        """
+        Compute all order parameters of many sites at once, e.g., of all
+        the atoms of a snapshot of a molecular dynamics trajectory.
+        The neighbors of all the sites are determined in a single pass
+        (one neighbor search or one Voronoi tessellation), and the sites
+        are then grouped by number of neighbors so that the order
+        parameters of each group are evaluated with array operations on
+        the bond vectors, and on the pairs and triplets of bonds.
+        The latter applies if all the requested types are among cn,
+        sgl_bd, bent, tri_plan(_max), tet(_max), T, tri_pyr, sq_pyr,
+        pent_pyr, hex_pyr, sq_plan, oct, bcc, reg_tri, sq, q2, q4 and q6;
+        otherwise, the order parameters of each site are evaluated as in
+        get_order_parameters.
+        The neighbors of each site are ordered by site index and image,
+        as in get_order_parameters with a positive cutoff radius. Note
+        that "bcc" depends on the order of the neighbors, which, with
+        Voronoi neighbors, follows the faces of the polyhedron in
+        get_order_parameters; its values can thus differ between the two
+        methods in that case.
+
+        Args:
+            structure (Structure): input structure. Can be None if
+                neighbor_vectors is provided.
+            indices ([int]): indices of the sites for which OPs are to be
+                calculated. Defaults to None for all the sites of the
+                structure.
+            neighbor_vectors ([numpy array]): precomputed neighbors, given
+                for each site as an array of the Cartesian vectors
+                from the site to each of its neighbors. Overwrites the way
+                neighbors are determined as defined in the constructor,
+                and indices, tol and target_spec are then ignored.
+            tol (float): threshold of weight to determine if a particular
+                pair is considered neighbors when Voronoi polyhedra are used
+                (see get_order_parameters).
+            target_spec (Specie): target species to be considered when
+                calculating the order parameters; None includes all species
+                of input structure.
+
+        Returns:
+            [[floats]]: order parameters of each site, in the same order as
+                the sites (or the neighbor_vectors) and in the same format
+                as returned by get_order_parameters.
+        """
+
+        if neighbor_vectors is None:
+            if indices is None:
+                indices = range(len(structure))
+            neighbor_vectors = self._get_all_neighbor_vectors(
+                structure, indices, tol, target_spec)
+        neighbor_vectors = [np.reshape(np.array(v, dtype=float), (-1, 3))
+                            for v in neighbor_vectors]
+
+        if not set(self._types) <= LocalStructOrderParams.__vectorized_types:
+            return [self._get_order_parameters_from_neighbors(
+                np.zeros(3), list(v)) for v in neighbor_vectors]
+
+        # Group the sites by number of neighbors and limit the size of the
+        # triplet arrays.
+        groups = defaultdict(list)
+        for isite, v in enumerate(neighbor_vectors):
+            groups[len(v)].append(isite)
+        all_ops = [None] * len(neighbor_vectors)
+        for nneigh, isites in groups.items():
+            chunk = max(1, 2 ** 20 // max(1, nneigh ** 3))
+            for i0 in range(0, len(isites), chunk):
+                batch = isites[i0:i0 + chunk]
+                rij = np.array([neighbor_vectors[isite] for isite in batch])
+                for isite, ops in zip(batch,
+                                      self._get_order_parameters_batch(rij)):
+                    all_ops[isite] = ops
+        return all_ops
+
+    def _get_all_neighbor_vectors(self, structure, indices, tol, target_spec):
+
+        """
+        Determine the neighbors of several sites, as defined in the
+        constructor, in a single pass.
+
+        Args:
+            structure (Structure): input structure.
+            indices ([int]): indices of the sites.
+            tol (float): threshold of weight for Voronoi neighbors.
+            target_spec (Specie): target species; None includes all species.
+
+        Returns:
+            [numpy array]: vectors from each site to its neighbors.
+        """
+
+        for n in indices:
+            if n < 0:
+                raise ValueError("Site index smaller zero!")
+            if n >= len(structure):
+                raise ValueError("Site index beyond maximum!")
+        if tol < 0.0:
+            raise ValueError("Negative tolerance for weighted solid angle!")
+
+        if self._voroneigh:
+            # Neighbors of the whole-structure tessellation surround the
+            # sites translated into the unit cell.
+            if np.any(np.mod(structure.frac_coords, 1) !=
+                      structure.frac_coords):
+                structure = structure.__class__.from_sites(
+                    [site.to_unit_cell for site in structure])
+            vnn = VoronoiNN(tol=tol, targets=target_spec)
+            all_nns = vnn.get_all_nn_info(structure)
+            all_coords = [[nn['site'].coords for nn in sorted(
+                all_nns[n], key=lambda nn: (nn['site_index'], nn['image']))]
+                          for n in indices]
+        else:
+            # Same order of the neighbors as get_sites_in_sphere.
+            all_neighbors = structure.get_all_neighbors(
+                self._cutoff, include_index=True, include_image=True)
+            all_coords = [[nn[0].coords for nn in sorted(
+                all_neighbors[n], key=lambda nn: (nn[2], tuple(nn[3])))
+                           if target_spec is None or
+                           nn[0].specie.symbol == target_spec]
+                          for n in indices]
+        return [np.reshape(np.array(coords, dtype=float), (-1, 3)) -
+                structure[n].coords for n, coords in zip(indices, all_coords)]
+
+    def _get_order_parameters_batch(self, rij):
+
+        """
+        Compute all order parameters of several sites with the same
+        number of neighbors with array operations.
+
+        Args:
+            rij (numpy array): (number of sites, number of neighbors, 3)
+                array of the vectors from each site to its neighbors.
+
+        Returns:
+            [[floats]]: order parameters of each site (see
+                get_order_parameters).
+        """
+
+        nsites, nneigh = rij.shape[:2]
+        left_of_unity = 1.0 - 1.0e-12
+        very_small = 1.0e-12
+        fac_bcc = 1.0 / exp(-0.5)
+        ipi = 1.0 / pi
+
+        def gauss(x):
+            return np.exp(-0.5 * x * x)
+
+        ops = [[0.0] * nsites for t in self._types]
+        dist = np.linalg.norm(rij, axis=2)
+        rijnorm = rij / dist[:, :, np.newaxis]
+
+        # First, coordination number and distance-based OPs.
+        for i, t in enumerate(self._types):
+            if t == "cn":
+                ops[i] = [nneigh / self._params[i]['norm']] * nsites
+            elif t == "sgl_bd":
+                if nneigh == 1:
+                    ops[i] = [1.0] * nsites
+                elif nneigh > 1:
+                    dist_sorted = np.sort(dist, axis=1)
+                    ops[i] = 1.0 - dist_sorted[:, 0] / dist_sorted[:, 1]
+
+        # Bond orientational OPs from the spherical harmonics of all the
+        # bonds (Steinhardt et al., Phys. Rev. B, 28, 784-805, 1983).
+        if self._boops:
+            thetas = np.arccos(np.clip(rijnorm[:, :, 2], -1.0, 1.0))
+            phis = np.where(np.abs(rijnorm[:, :, 2]) < left_of_unity,
+                            np.arctan2(rijnorm[:, :, 1], rijnorm[:, :, 0]),
+                            0.0)
+            for i, t in enumerate(self._types):
+                if t in ["q2", "q4", "q6"]:
+                    if nneigh == 0:
+                        ops[i] = [None] * nsites
+                        continue
+                    l = int(t[1])
+                    m = np.arange(-l, l + 1)[:, np.newaxis, np.newaxis]
+                    ylm = sph_harm(m, l, phis, thetas).sum(axis=2)
+                    acc = (ylm.real ** 2 + ylm.imag ** 2).sum(axis=0)
+                    ops[i] = np.sqrt(4.0 * pi * acc / (
+                        (2 * l + 1) * float(nneigh * nneigh)))
+
+        if (self._geomops or self._geomops2) and nneigh > 1:
+            inner = np.einsum('sjc,skc->sjk', rijnorm, rijnorm)
+            thetajk = np.arccos(np.clip(inner, -1.0, 1.0))
+            pairs = ~np.eye(nneigh, dtype=bool)[np.newaxis]
+
+        # Peters-style OPs, from the angles between bonds j and k (neighbor
+        # j at the North pole) and, for each third bond m, the azimuth
+        # angle between the planes j-i-k and j-i-m.
+        if self._geomops and nneigh > 1:
+            # Part of bond k orthogonal to bond j (see gramschmidt).
+            uu = np.einsum('sjc,sjc->sj', rijnorm, rijnorm)
+            xaxis = rijnorm[:, np.newaxis, :, :] - (
+                inner / uu[:, :, np.newaxis])[..., np.newaxis] * \
+                rijnorm[:, :, np.newaxis, :]
+            xnorm = np.linalg.norm(xaxis, axis=3)
+            flag_xaxis = xnorm < very_small
+            xaxis = xaxis / np.where(flag_xaxis, 1.0, xnorm)[..., np.newaxis]
+            phi = np.arccos(np.clip(np.einsum(
+                'sjkc,sjmc->sjkm', xaxis, xaxis), -1.0, 1.0))
+            triplets = pairs[:, :, :, np.newaxis] & \
+                pairs[:, :, np.newaxis, :] & \
+                ~np.eye(nneigh, dtype=bool)[np.newaxis, np.newaxis] & \
+                ~flag_xaxis[:, :, :, np.newaxis] & \
+                ~flag_xaxis[:, :, np.newaxis, :]
+            thetak = thetajk[:, :, :, np.newaxis]
+            thetam = thetajk[:, :, np.newaxis, :]
+
+            for i, t in enumerate(self._types):
+                p = self._params[i]
+                if t == "bent":
+                    qsptheta = gauss(p['IGW_TA'] * (thetajk * ipi - p['TA']))
+                    ops[i] = np.where(pairs, qsptheta, 0.0).sum(
+                        axis=(1, 2)) / float(nneigh * (nneigh - 1))
+                elif t in ["tri_plan", "tri_plan_max", "tet", "tet_max"]:
+                    gaussthetak = gauss(
+                        p['IGW_TA'] * (thetajk * ipi - p['TA']))
+                    qm = gauss(p['IGW_TA'] * (thetam * ipi - p['TA'])) * \
+                        np.cos(p['fac_AA'] * phi) ** p['exp_cos_AA']
+                    if t in ["tri_plan_max", "tet_max"]:
+                        ops[i] = self._get_max_op(
+                            gaussthetak, 1, qm, triplets, pairs)
+                    else:
+                        ops[i] = self._get_mean_op(
+                            gaussthetak[:, :, :, np.newaxis] * qm, triplets)
+                elif t in ["T", "tri_pyr", "sq_pyr", "pent_pyr", "hex_pyr"]:
+                    qk = gauss(p['IGW_EP'] * (thetajk * ipi - 0.5))
+                    qm = np.cos(p['fac_AA'] * phi) ** p['exp_cos_AA'] * \
+                        gauss(p['IGW_EP'] * (thetam * ipi - 0.5))
+                    ops[i] = self._get_max_op(qk, 1, qm, triplets, pairs)
+                elif t in ["sq_plan", "oct"]:
+                    south = pairs & (thetajk >= p['min_SPP'])
+                    qk = p['w_SPP'] * gauss(
+                        p['IGW_SPP'] * (thetajk * ipi - 1.0))
+                    equat = triplets & (thetak < p['min_SPP']) & \
+                        (thetam < p['min_SPP'])
+                    qm = np.cos(p['fac_AA'] * phi) ** p['exp_cos_AA'] * \
+                        gauss(p['IGW_EP'] * (thetam * ipi - 0.5))
+                    acc = np.where(south, qk, 0.0).sum(axis=(1, 2)) + \
+                        np.where(equat, qm, 0.0).sum(axis=(1, 2, 3))
+                    norm = p['w_SPP'] * south.sum(axis=(1, 2)) + \
+                        equat.sum(axis=(1, 2, 3))
+                    ops[i] = [a / n if n > 1.0e-12 else None
+                              for a, n in zip(acc, norm)]
+                elif t == "bcc":
+                    if nneigh <= 3:
+                        ops[i] = [None] * nsites
+                        continue
+                    upper = np.triu(pairs[0])[np.newaxis]
+                    south = upper & (thetajk >= p['min_SPP'])
+                    qk = p['w_SPP'] * gauss(
+                        p['IGW_SPP'] * (thetajk * ipi - 1.0))
+                    equat = triplets & upper[:, :, :, np.newaxis] & \
+                        (thetak < p['min_SPP'])
+                    fac = np.where(thetak > pi / 2.0, 1.0, -1.0)
+                    tmp = (thetam - pi / 2.0) / asin(1.0 / 3.0)
+                    qm = fac * np.cos(3.0 * phi) * fac_bcc * tmp * gauss(tmp)
+                    acc = np.where(south, qk, 0.0).sum(axis=(1, 2)) + \
+                        np.where(equat, qm, 0.0).sum(axis=(1, 2, 3))
+                    ops[i] = acc / float(0.5 * float(
+                        nneigh * (6 + (nneigh - 2) * (nneigh - 3))))
+        elif self._geomops:
+            for i, t in enumerate(self._types):
+                if t in LocalStructOrderParams.__vectorized_types and t not in \
+                        ["cn", "sgl_bd", "q2", "q4", "q6", "reg_tri", "sq"]:
+                    ops[i] = [None] * nsites
+
+        # OPs that depend on the sorted angles between bonds and on the
+        # distances between neighbors.
+        if self._geomops2:
+            if nneigh < 3:
+                for i, t in enumerate(self._types):
+                    if t in ["reg_tri", "sq"]:
+                        ops[i] = [None] * nsites
+            else:
+                upper = np.triu(pairs[0])
+                aijs = np.sort(thetajk[:, upper], axis=1)
+                h = np.linalg.norm(rij.mean(axis=1), axis=1)
+                distjk = np.linalg.norm(rij[:, np.newaxis, :, :] -
+                                        rij[:, :, np.newaxis, :], axis=3)
+                b = distjk[:, upper].min(axis=1)
+                dhalf = distjk[:, upper].max(axis=1) / 2.0
+                for i, t in enumerate(self._types):
+                    if t == "reg_tri":
+                        a = 2.0 * np.arcsin(b / (2.0 * np.sqrt(h * h + (b / (
+                            2.0 * cos(3.0 * pi / 18.0))) ** 2.0)))
+                        nmax = 3
+                    elif t == "sq":
+                        a = 2.0 * np.arcsin(
+                            b / (2.0 * np.sqrt(h * h + dhalf * dhalf)))
+                        nmax = 4
+                    else:
+                        continue
+                    ops[i] = np.prod(gauss(
+                        (aijs[:, :nmax] - a[:, np.newaxis]) *
+                        self._params[i][0]), axis=1)
+
+        self._last_nneigh = nneigh
+        return [[float(op) if op is not None else None for op in site_ops]
+                for site_ops in zip(*ops)]
+
+    @staticmethod
+    def _get_max_op(qk, normk, qm, triplets, pairs):
+
+        """
+        Maximum over the bond pairs j-k of the normalized sum of a pair
+        contribution qk (of weight normk) and of the contributions qm of
+        all valid third bonds m.
+        """
+
+        acc = qk + np.where(triplets, qm, 0.0).sum(axis=3)
+        norm = normk + triplets.sum(axis=3)
+        return np.where(pairs, acc / norm, -np.inf).max(axis=(1, 2))
+
+    @staticmethod
+    def _get_mean_op(qm, triplets):
+
+        """
+        Average of the contributions qm of all valid bond triplets, None
+        where there are no such triplets.
+        """
+
+        acc = np.where(triplets, qm, 0.0).sum(axis=(1, 2, 3))
+        norm = triplets.sum(axis=(1, 2, 3))
+        return [a / n if n > 0 else None for a, n in zip(acc, norm)]
+
 class BrunnerNN_reciprocal(NearNeighbors):
 
     """
@@ -2927,22 +3684,23 @@ class BrunnerNN_reciprocal(NearNeighbors):
     def get_nn_info(self, structure, n):
 
         site = structure[n]
-        neighs_dists = structure.get_neighbors(site, self.cutoff)
-        ds = [i[-1] for i in neighs_dists]
-        ds.sort()
+        return self._get_nn_info_from_neighbors(
+            structure, n, structure.get_neighbors(site, self.cutoff,
+                                                  include_index=True,
+                                                  include_image=True))
 
-        ns = [1.0 / ds[i] - 1.0 / ds[i + 1] for i in range(len(ds) - 1)]
+    def get_all_nn_info(self, structure):
+        return self._get_all_nn_info_from_neighbors(structure, self.cutoff)
 
-        d_max = ds[ns.index(max(ns))]
-        siw = []
-        for s, dist in neighs_dists:
-            if dist < d_max + self.tol:
-                w = ds[0] / dist
-                siw.append({'site': s,
-                            'image': self._get_image(s.frac_coords),
-                            'weight': w,
-                            'site_index': self._get_original_site(structure, s)})
-        return siw
+    def _get_nn_info_from_neighbors(self, structure, n, neighbors):
+        dists = np.array([dist for _, dist, _, _ in neighbors])
+        ds = np.sort(dists)
+
+        ns = 1.0 / ds[:-1] - 1.0 / ds[1:]
+
+        d_max = ds[np.argmax(ns)]
+        selected = np.nonzero(dists < d_max + self.tol)[0]
+        return [self._get_nn_dict(neighbors[i], ds[0] / dists[i]) for i in selected]
 
 class BrunnerNN_relative(NearNeighbors):
 
@@ -2966,22 +3724,23 @@ class BrunnerNN_relative(NearNeighbors):
     def get_nn_info(self, structure, n):
 
         site = structure[n]
-        neighs_dists = structure.get_neighbors(site, self.cutoff)
-        ds = [i[-1] for i in neighs_dists]
-        ds.sort()
+        return self._get_nn_info_from_neighbors(
+            structure, n, structure.get_neighbors(site, self.cutoff,
+                                                  include_index=True,
+                                                  include_image=True))
 
-        ns = [ds[i] / ds[i + 1] for i in range(len(ds) - 1)]
+    def get_all_nn_info(self, structure):
+        return self._get_all_nn_info_from_neighbors(structure, self.cutoff)
 
-        d_max = ds[ns.index(max(ns))]
-        siw = []
-        for s, dist in neighs_dists:
-            if dist < d_max + self.tol:
-                w = ds[0] / dist
-                siw.append({'site': s,
-                            'image': self._get_image(s.frac_coords),
-                            'weight': w,
-                            'site_index': self._get_original_site(structure, s)})
-        return siw
+    def _get_nn_info_from_neighbors(self, structure, n, neighbors):
+        dists = np.array([dist for _, dist, _, _ in neighbors])
+        ds = np.sort(dists)
+
+        ns = ds[:-1] / ds[1:]
+
+        d_max = ds[np.argmax(ns)]
+        selected = np.nonzero(dists < d_max + self.tol)[0]
+        return [self._get_nn_dict(neighbors[i], ds[0] / dists[i]) for i in selected]
 
 class BrunnerNN_real(NearNeighbors):
 
@@ -3005,22 +3764,23 @@ class BrunnerNN_real(NearNeighbors):
     def get_nn_info(self, structure, n):
 
         site = structure[n]
-        neighs_dists = structure.get_neighbors(site, self.cutoff)
-        ds = [i[-1] for i in neighs_dists]
-        ds.sort()
+        return self._get_nn_info_from_neighbors(
+            structure, n, structure.get_neighbors(site, self.cutoff,
+                                                  include_index=True,
+                                                  include_image=True))
 
-        ns = [ds[i] - ds[i + 1] for i in range(len(ds) - 1)]
+    def get_all_nn_info(self, structure):
+        return self._get_all_nn_info_from_neighbors(structure, self.cutoff)
 
-        d_max = ds[ns.index(max(ns))]
-        siw = []
-        for s, dist in neighs_dists:
-            if dist < d_max + self.tol:
-                w = ds[0] / dist
-                siw.append({'site': s,
-                            'image': self._get_image(s.frac_coords),
-                            'weight': w,
-                            'site_index': self._get_original_site(structure, s)})
-        return siw
+    def _get_nn_info_from_neighbors(self, structure, n, neighbors):
+        dists = np.array([dist for _, dist, _, _ in neighbors])
+        ds = np.sort(dists)
+
+        ns = ds[:-1] - ds[1:]
+
+        d_max = ds[np.argmax(ns)]
+        selected = np.nonzero(dists < d_max + self.tol)[0]
+        return [self._get_nn_dict(neighbors[i], ds[0] / dists[i]) for i in selected]
 
 class EconNN(NearNeighbors):
 
@@ -3136,6 +3896,31 @@ class CrystalNN(NearNeighbors):
         """
 
         nndata = self.get_nn_data(structure, n)
+        return self._get_nn_info_from_nn_data(nndata)
+
+    def get_all_nn_info(self, structure, tessellation=None):
+        """
+        Get all near-neighbor information for all the sites of a structure.
+        A single Voronoi tessellation is used for all the sites.
+
+        Args:
+            structure: (Structure) pymatgen Structure
+            tessellation: (VoronoiTessellation) tessellation of the structure
+                to use (see get_all_nn_data)
+
+        Returns:
+            List of NN site information for each site in the structure. Each
+                entry has the same format as `get_nn_info`
+        """
+
+        return [self._get_nn_info_from_nn_data(nndata)
+                for nndata in self.get_all_nn_data(
+                    structure, tessellation=tessellation)]
+
+    def _get_nn_info_from_nn_data(self, nndata):
+        """
+        Get the near-neighbor information of a site from its NNData.
+        """
 
         if not self.weighted_cn:
             max_key = max(nndata.cn_weights, key=lambda k: nndata.cn_weights[k])
@@ -3175,22 +3960,86 @@ class CrystalNN(NearNeighbors):
         length = length or self.fingerprint_length
 
         # determine possible bond targets
-        target = None
-        if self.cation_anion:
-            target = []
-            m_oxi = structure[n].specie.oxi_state
-            for site in structure:
-                if site.specie.oxi_state * m_oxi <= 0:  # opposite charge
-                    target.append(site.specie)
-            if not target:
-                raise ValueError(
-                    "No valid targets for site within cation_anion constraint!")
+        target = self._get_bond_targets(structure, n)
 
         # get base VoronoiNN targets
         cutoff = self.search_cutoff
         vnn = VoronoiNN(weight="solid_angle", targets=target, cutoff=cutoff)
         nn = vnn.get_nn_info(structure, n)
 
+        return self._get_nn_data_from_voronoi_nn(structure, n, nn, length)
+
+    def get_all_nn_data(self, structure, length=None, tessellation=None):
+        """
+        Compute the near neighbor data of all the sites of a structure, using
+        a single Voronoi tessellation for all the sites.
+
+        Args:
+            structure: (Structure) enclosing structure object
+            length: (int) if set, will return a fixed range of CN numbers
+            tessellation: (VoronoiTessellation) tessellation of the structure
+                to use (see VoronoiNN.get_voronoi_tessellation), computed
+                with search_cutoff if not provided
+
+        Returns:
+            a list with the NNData of each site (see get_nn_data)
+        """
+
+        length = length or self.fingerprint_length
+        if len(structure) == 1 and tessellation is None:
+            return [self.get_nn_data(structure, 0, length)]
+
+        # the tessellation is centered on the sites translated to the unit cell
+        if tessellation is not None:
+            structure = tessellation.structure
+        elif np.any(np.mod(structure.frac_coords, 1) != structure.frac_coords):
+            structure = structure.__class__.from_sites(
+                [site.to_unit_cell for site in structure])
+
+        vnn = VoronoiNN(weight="solid_angle", cutoff=self.search_cutoff,
+                        compute_adj_neighbors=False)
+        try:
+            all_voro_cells, site_indices = \
+                vnn._get_all_voronoi_polyhedra(structure, tessellation)
+        except RuntimeError:
+            # the per-site tessellations can increase the cutoff if needed
+            return [self.get_nn_data(structure, n, length)
+                    for n in range(len(structure))]
+
+        all_nndata = []
+        for n, cell in enumerate(all_voro_cells):
+            vnn.targets = self._get_bond_targets(structure, n)
+            if vnn.targets is not None:
+                cell = vnn._get_target_cell_info(cell, vnn.targets)
+            nn = vnn._extract_nn_info(structure, cell, site_indices)
+            all_nndata.append(
+                self._get_nn_data_from_voronoi_nn(structure, n, nn, length))
+        return all_nndata
+
+    def _get_bond_targets(self, structure, n):
+        """
+        Get the possible bond targets of site n, i.e. None if all the sites
+        are possible targets or the list of species with opposite or zero
+        charge if cation_anion is set.
+        """
+        if not self.cation_anion:
+            return None
+        target = []
+        m_oxi = structure[n].specie.oxi_state
+        for site in structure:
+            if site.specie.oxi_state * m_oxi <= 0:  # opposite charge
+                target.append(site.specie)
+        if not target:
+            raise ValueError(
+                "No valid targets for site within cation_anion constraint!")
+        return target
+
+    def _get_nn_data_from_voronoi_nn(self, structure, n, nn, length):
+        """
+        Compute the near neighbor data of site n from the near-neighbor
+        information obtained with VoronoiNN (see get_nn_data).
+        """
+
         # solid angle weights can be misleading in open / porous structures
         # adjust weights to correct for this behavior
         if self.porous_adjustment:
@@ -3500,25 +4349,24 @@ class CutOffDictNN(NearNeighbors):
 
         site = structure[n]
 
-        neighs_dists = structure.get_neighbors(site, self._max_dist)
-
-        nn_info = []
-        for n_site, dist in neighs_dists:
+        neighs_dists = structure.get_neighbors(site, self._max_dist,
+                                               include_index=True,
+                                               include_image=True)
+        return self._get_nn_info_from_neighbors(structure, n, neighs_dists)
 
-            neigh_cut_off_dist = self._lookup_dict\
-                .get(site.species_string, {})\
-                .get(n_site.species_string, 0.0)
-
-            if dist < neigh_cut_off_dist:
-
-                nn_info.append({
-                    'site': n_site,
-                    'image': self._get_image(n_site.frac_coords),
-                    'weight': dist,
-                    'site_index': self._get_original_site(structure, n_site)
-                })
-
-        return nn_info
+    def get_all_nn_info(self, structure):
+        return self._get_all_nn_info_from_neighbors(structure, self._max_dist)
+
+    def _get_nn_info_from_neighbors(self, structure, n, neighbors):
+        if not neighbors:
+            return []
+        cut_off_dists = self._lookup_dict.get(structure[n].species_string, {})
+        dists = np.array([dist for _, dist, _, _ in neighbors])
+        neigh_cut_off_dists = np.array(
+            [cut_off_dists.get(n_site.species_string, 0.0)
+             for n_site, _, _, _ in neighbors])
+        selected = np.nonzero(dists < neigh_cut_off_dists)[0]
+        return [self._get_nn_dict(neighbors[i], dists[i]) for i in selected]
 
 
 class Critic2NN(NearNeighbors):
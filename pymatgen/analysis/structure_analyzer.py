@@ -32,6 +32,7 @@ from scipy.spatial import Voronoi
 from pymatgen import PeriodicSite
 from pymatgen import Element, Specie, Composition
 from pymatgen.util.num import abs_cap
+from pymatgen.util.parallel import SharedArgsPool
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 from pymatgen.core.surface import SlabGenerator
 from pymatgen.analysis.local_env import VoronoiNN, JmolNN
@@ -123,40 +124,82 @@ class VoronoiAnalyzer:
                         pass
         return vor_index
 
+    def analyze_all(self, structure):
+        """
+        Performs Voronoi analysis of all sites in a structure at once, and
+        returns their polyhedra in Schlaefli notation. A single tessellation
+        of the sites and of their periodic images up to cutoff away from
+        the unit cell is used, instead of one tessellation per site. As
+        for analyze, the cutoff should be larger than the distance to the
+        farthest Voronoi neighbor. With a shorter cutoff, no error is
+        raised, but the cells of the sites are truncated and may be
+        truncated differently than by analyze.
+
+        Args:
+            structure (Structure): structure to analyze
+
+        Returns:
+            (number of sites, 8) array of the voronoi indices of the sites,
+            as given by analyze.
+        """
+        lattice = structure.lattice
+        nsites = len(structure)
+
+        # sites and their images up to cutoff away from the faces of the
+        # unit cell, in fractional coordinates
+        pad = self.cutoff * np.linalg.norm(lattice.inv_matrix, axis=0)
+        images = np.array(list(itertools.product(
+            *[range(-n, n + 1) for n in np.ceil(pad).astype(int)])))
+        fcoords = (structure.frac_coords % 1 + images[:, None, :]).reshape(-1, 3)
+        within = np.all((fcoords >= -pad) & (fcoords <= 1 + pad), axis=1)
+        voro = Voronoi(lattice.get_cartesian_coords(fcoords[within]),
+                       qhull_options=self.qhull_options)
+
+        # facets are counted for the points of the sites in the unit cell
+        sites = np.where(np.any(images, axis=1)[:, None], -1,
+                         np.arange(nsites)).ravel()[within]
+        ridge_sites = sites[voro.ridge_points].ravel()
+        # number of vertices of each facet, where as in analyze a vertex
+        # at infinity is counted like any other
+        nvertices = np.repeat([len(v) for v in voro.ridge_vertices], 2)
+        in_cell = ridge_sites >= 0
+
+        # facets with more than 10 edges are skipped, as in analyze
+        counted = in_cell & (nvertices <= 10)
+        vor_index = np.zeros((nsites, 8), dtype=int)
+        np.add.at(vor_index, (ridge_sites[counted], nvertices[counted] - 3), 1)
+        return vor_index
+
     def analyze_structures(self, structures, step_freq=10,
-                           most_frequent_polyhedra=15):
+                           most_frequent_polyhedra=15, ncores=None):
         """
         Perform Voronoi analysis on a list of Structures.
-        Note that this might take a significant amount of time depending on the
-        size and number of structures.
+        Each structure is tessellated once for all its sites (see
+        analyze_all).
 
         Args:
             structures (list): list of Structures
-            cutoff (float: cutoff distance around an atom to search for
-                neighbors
             step_freq (int): perform analysis every step_freq steps
-            qhull_options (str): options to pass to qhull
             most_frequent_polyhedra (int): this many unique polyhedra with
                 highest frequences is stored.
+            ncores (int): if set, the structures are analyzed over a pool
+                of ncores processes, and the counts of polyhedra are summed
+                as they are returned.
 
         Returns:
             A list of tuples in the form (voronoi_index,frequency)
         """
-        voro_dict = {}
-        step = 0
-        for structure in structures:
-            step += 1
-            if step % step_freq != 0:
-                continue
-
-            v = []
-            for n in range(len(structure)):
-                v.append(str(self.analyze(structure, n=n).view()))
-            for voro in v:
-                if voro in voro_dict:
-                    voro_dict[voro] += 1
-                else:
-                    voro_dict[voro] = 1
+        structures = itertools.islice(structures, step_freq - 1, None,
+                                      step_freq)
+        voro_dict = collections.Counter()
+        if ncores:
+            with SharedArgsPool(ncores, _count_voronoi_polyhedra,
+                                (self,)) as p:
+                for counts in p.imap(structures):
+                    voro_dict.update(counts)
+        else:
+            for structure in structures:
+                voro_dict.update(_count_voronoi_polyhedra(structure, self))
         return sorted(voro_dict.items(),
                       key=lambda x: (x[1], x[0]),
                       reverse=True)[:most_frequent_polyhedra]
@@ -179,6 +222,16 @@ class VoronoiAnalyzer:
         return plt
 
 
+def _count_voronoi_polyhedra(structure, analyzer):
+    """
+    Counts the Voronoi polyhedra of the sites of a structure, keyed by
+    the string of their voronoi index.
+    """
+    indices, counts = np.unique(analyzer.analyze_all(structure), axis=0,
+                                return_counts=True)
+    return {str(index): int(count) for index, count in zip(indices, counts)}
+
+
 class RelaxationAnalyzer:
     """
     This class analyzes the relaxation in a calculation.
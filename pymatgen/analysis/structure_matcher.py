@@ -614,18 +614,31 @@ class StructureMatcher(MSONable):
         and finds fu, the supercell size to make struct1 comparable to
         s2
         """
-        struct1 = struct1.copy()
-        struct2 = struct2.copy()
+        struct1 = self._get_reduced_structure(struct1, niggli)
+        struct2 = self._get_reduced_structure(struct2, niggli)
+        return self._preprocess_reduced(struct1, struct2)
 
+    def _get_reduced_structure(self, struct, niggli=True):
+        """
+        Finds the reduced structure (niggli and primitive) used by
+        _preprocess. It only depends on the structure, so it can be computed
+        once for a structure compared many times.
+        """
+        struct = struct.copy()
         if niggli:
-            struct1 = struct1.get_reduced_structure(reduction_algo="niggli")
-            struct2 = struct2.get_reduced_structure(reduction_algo="niggli")
+            struct = struct.get_reduced_structure(reduction_algo="niggli")
 
         # primitive cell transformation
         if self._primitive_cell:
-            struct1 = struct1.get_primitive_structure()
-            struct2 = struct2.get_primitive_structure()
+            struct = struct.get_primitive_structure()
+        return struct
 
+    def _preprocess_reduced(self, struct1, struct2):
+        """
+        Rescales reduced structures and finds fu, the supercell size to make
+        struct1 comparable to s2 (see _preprocess). The reduced structures
+        are not modified.
+        """
         if self._supercell:
             fu, s1_supercell = self._get_supercell_size(struct1, struct2)
         else:
@@ -634,6 +647,8 @@ class StructureMatcher(MSONable):
 
         # rescale lattice to same volume
         if self._scale:
+            struct1 = struct1.copy()
+            struct2 = struct2.copy()
             ratio = (struct2.volume / (struct1.volume * mult)) ** (1 / 6)
             nl1 = Lattice(struct1.lattice.matrix * ratio)
             struct1.modify_lattice(nl1)
@@ -750,6 +765,23 @@ class StructureMatcher(MSONable):
         sorted_s_list = sorted(enumerate(s_list), key=s_hash)
         all_groups = []
 
+        if not anonymous:
+            # Each structure is reduced once rather than in every fit. Without
+            # supercells, structures can only match if their reduced
+            # structures have the same number of sites, which is checked
+            # before the actual matching.
+            reduced = [self._get_reduced_structure(s) for s in s_list]
+            fingerprints = [0 if self._supercell else len(s) for s in reduced]
+
+            def fit(i, j):
+                if fingerprints[i] != fingerprints[j]:
+                    return False
+                struct1, struct2, fu, s1_supercell = self._preprocess_reduced(
+                    reduced[i], reduced[j])
+                match = self._match(struct1, struct2, fu, s1_supercell,
+                                    break_on_match=True)
+                return match is not None and match[0] <= self.stol
+
         # For each pre-grouped list of structures, perform actual matching.
         for k, g in itertools.groupby(sorted_s_list, key=s_hash):
             unmatched = list(g)
@@ -760,7 +792,7 @@ class StructureMatcher(MSONable):
                     inds = filter(lambda i: self.fit_anonymous(refs,
                             unmatched[i][1]), list(range(len(unmatched))))
                 else:
-                    inds = filter(lambda i: self.fit(refs, unmatched[i][1]),
+                    inds = filter(lambda j: fit(i, unmatched[j][0]),
                                   list(range(len(unmatched))))
                 inds = list(inds)
                 matches.extend([unmatched[i][0] for i in inds])
@@ -2,12 +2,13 @@
 # Copyright (c) Pymatgen Development Team.
 # Distributed under the terms of the MIT License.
 
-from itertools import product
+from functools import lru_cache
 import numpy as np
 
 from pymatgen.analysis.elasticity.strain import Deformation
 from pymatgen.core.surface import (SlabGenerator,
                                    get_symmetrically_distinct_miller_indices)
+from pymatgen.util.parallel import SharedArgsPool
 
 from math import gcd
 
@@ -104,16 +105,31 @@ class ZSLGenerator:
                 2.) the tranformation matricies for the substrate to create
                 a super lattice of area j*film area
         """
-        transformation_indicies = [(i, j)
-                                   for i in range(1, int(self.max_area / film_area))
-                                   for j in range(1, int(self.max_area / substrate_area))
-                                   if np.absolute(film_area / substrate_area - float(j) / i) < self.max_area_ratio_tol]
+        for i, j in self.get_transformation_indices(film_area, substrate_area):
+            yield (gen_sl_transform_matricies(i),
+                   gen_sl_transform_matricies(j))
 
-        # Sort sets by the square of the matching area and yield in order
-        # from smallest to largest
-        for x in sorted(transformation_indicies, key=lambda x: x[0] * x[1]):
-            yield (gen_sl_transform_matricies(x[0]),
-                   gen_sl_transform_matricies(x[1]))
+    def get_transformation_indices(self, film_area, substrate_area):
+        """
+        Gets the area multiples (i, j) of the film and substrate unit cells
+        that give nearly equal super lattice areas within the maximum area
+
+        Args:
+            film_area(int): the unit cell area for the film
+            substrate_area(int): the unit cell area for the substrate
+
+        Returns:
+            list of (i, j) sorted by the square of the matching area
+        """
+        i = np.arange(1, int(self.max_area / film_area))
+        j = np.arange(1, int(self.max_area / substrate_area))
+        ratio_diff = np.absolute(film_area / substrate_area -
+                                 j[None, :].astype(float) / i[:, None])
+        transformation_indicies = [(int(i[m]), int(j[n])) for m, n in
+                                   zip(*np.nonzero(ratio_diff < self.max_area_ratio_tol))]
+
+        # Sort sets by the square of the matching area from smallest to largest
+        return sorted(transformation_indicies, key=lambda x: x[0] * x[1])
 
     def get_equiv_transformations(self, transformation_sets, film_vectors,
                                   substrate_vectors):
@@ -138,14 +154,32 @@ class ZSLGenerator:
         for (film_transformations, substrate_transformations) in \
                 transformation_sets:
             # Apply transformations and reduce using Zur reduce methodology
-            films = [reduce_vectors(*np.dot(f, film_vectors)) for f in film_transformations]
+            films = reduce_vectors_array(np.dot(film_transformations, film_vectors))
 
-            substrates = [reduce_vectors(*np.dot(s, substrate_vectors)) for s in substrate_transformations]
+            substrates = reduce_vectors_array(np.dot(substrate_transformations, substrate_vectors))
 
             # Check if equivelant super lattices
-            for f, s in product(films, substrates):
-                if self.is_same_vectors(f, s):
-                    yield [f, s]
+            for f, s in zip(*np.nonzero(self.get_same_vectors_matrix(films, substrates))):
+                yield [list(films[f]), list(substrates[s])]
+
+    def get_same_vectors_matrix(self, films, substrates):
+        """
+        Array version of is_same_vectors, comparing every film vector set
+        to every substrate vector set
+
+        Args:
+            films(array): an n x 2 x 3 array of film vector sets
+            substrates(array): an m x 2 x 3 array of substrate vector sets
+
+        Returns:
+            n x m boolean array, True where the vector sets are the same
+        """
+        films_norm = np.sqrt(np.sum(films * films, axis=-1))
+        substrates_norm = np.sqrt(np.sum(substrates * substrates, axis=-1))
+        strain = substrates_norm[None, :] / films_norm[:, None] - 1
+        angle = vec_angle_array(substrates)[None, :] / vec_angle_array(films)[:, None] - 1
+        return np.all(np.absolute(strain) <= self.max_length_tol, axis=-1) & \
+            (np.absolute(angle) <= self.max_angle_tol)
 
     def __call__(self, film_vectors, substrate_vectors, lowest=False):
         """
@@ -156,20 +190,25 @@ class ZSLGenerator:
         film_area = vec_area(*film_vectors)
         substrate_area = vec_area(*substrate_vectors)
 
-        # Generate all super lattice comnbinations for a given set of miller
-        # indicies
-        transformation_sets = self.generate_sl_transformation_sets(film_area, substrate_area)
-
-        # Check each super-lattice pair to see if they match
-        for match in self.get_equiv_transformations(transformation_sets,
-                                                    film_vectors,
-                                                    substrate_vectors):
-            # Yield the match area, the miller indicies,
-            yield self.match_as_dict(match[0], match[1], film_vectors, substrate_vectors, vec_area(*match[0]))
-
-            # Just want lowest match per direction
-            if (lowest):
-                break
+        # Reduced super lattices of the film and substrate for each area
+        # multiple, shared by all the super lattice combinations
+        film_key = tuple(map(tuple, np.asarray(film_vectors, dtype=float)))
+        substrate_key = tuple(map(tuple, np.asarray(substrate_vectors, dtype=float)))
+
+        # Check each super-lattice pair for all the super lattice
+        # combinations to see if they match
+        for i, j in self.get_transformation_indices(film_area, substrate_area):
+            films = get_reduced_sl_vectors(film_key, i)
+            substrates = get_reduced_sl_vectors(substrate_key, j)
+            for f, s in zip(*np.nonzero(self.get_same_vectors_matrix(films, substrates))):
+                # Yield the match area, the miller indicies,
+                yield self.match_as_dict(list(films[f]), list(substrates[s]),
+                                         film_vectors, substrate_vectors,
+                                         vec_area(*films[f]))
+
+                # Just want lowest match per direction
+                if (lowest):
+                    return
 
     def match_as_dict(self, film_sl_vectors, substrate_sl_vectors, film_vectors, substrate_vectors, match_area):
         """
@@ -227,19 +266,23 @@ class SubstrateAnalyzer:
         """
         vector_sets = []
 
+        # The substrate surfaces do not depend on the film surface
+        all_substrate_vectors = []
+        for s in substrate_millers:
+            substrate_slab = SlabGenerator(self.substrate, s, 20, 15,
+                                           primitive=False).get_slab()
+            all_substrate_vectors.append(reduce_vectors(
+                substrate_slab.lattice.matrix[0],
+                substrate_slab.lattice.matrix[1]))
+
         for f in film_millers:
             film_slab = SlabGenerator(self.film, f, 20, 15,
                                       primitive=False).get_slab()
             film_vectors = reduce_vectors(film_slab.lattice.matrix[0],
                                           film_slab.lattice.matrix[1])
 
-            for s in substrate_millers:
-                substrate_slab = SlabGenerator(self.substrate, s, 20, 15,
-                                               primitive=False).get_slab()
-                substrate_vectors = reduce_vectors(
-                    substrate_slab.lattice.matrix[0],
-                    substrate_slab.lattice.matrix[1])
-
+            for s, substrate_vectors in zip(substrate_millers,
+                                            all_substrate_vectors):
                 vector_sets.append((film_vectors, substrate_vectors, f, s))
 
         return vector_sets
@@ -295,6 +338,40 @@ class SubstrateAnalyzer:
 
                 yield match
 
+    def calculate_substrates(self, film, substrates, elasticity_tensor=None,
+                             film_millers=None, substrate_millers=None,
+                             ground_state_energy=0, lowest=False,
+                             ncores=None):
+        """
+        Finds all topological matches of a film on each of a list of
+        substrates, as calculate does for a single substrate.
+
+        Args:
+            film(Structure): conventional standard structure for the film
+            substrates([Structure]): conventional standard structures for
+                the substrates
+            elasticity_tensor(ElasticTensor): elasticity tensor for the film
+                in the IEEE orientation
+            film_millers(array): film facets to consider in search as defined by
+                miller indicies
+            substrate_millers(array): substrate facets to consider in search as
+                defined by miller indicies, for all substrates
+            ground_state_energy(float): ground state energy for the film
+            lowest(bool): only consider lowest matching area for each surface
+            ncores(int): if set, the substrates are analyzed over a pool of
+                ncores processes
+
+        Returns:
+            list with the list of matches for each substrate
+        """
+        args = (self, film, elasticity_tensor, film_millers,
+                substrate_millers, ground_state_energy, lowest)
+        if ncores:
+            with SharedArgsPool(ncores, _calculate_substrate, args) as p:
+                return p.map(substrates)
+        return [_calculate_substrate(substrate, *args)
+                for substrate in substrates]
+
     def calculate_3D_elastic_energy(self, film, match, elasticity_tensor=None,
                                     include_strain=False):
         """
@@ -345,6 +422,18 @@ class SubstrateAnalyzer:
             return film.volume * energy_density / len(film.sites)
 
 
+def _calculate_substrate(substrate, analyzer, film, elasticity_tensor,
+                         film_millers, substrate_millers,
+                         ground_state_energy, lowest):
+    """
+    Gets the list of matches of a film on a substrate for
+    SubstrateAnalyzer.calculate_substrates.
+    """
+    return list(analyzer.calculate(film, substrate, elasticity_tensor,
+                                   film_millers, substrate_millers,
+                                   ground_state_energy, lowest))
+
+
 def gen_sl_transform_matricies(area_multiple):
     """
     Generates the transformation matricies that convert a set of 2D
@@ -367,6 +456,27 @@ def gen_sl_transform_matricies(area_multiple):
             for j in range(area_multiple // i)]
 
 
+@lru_cache(maxsize=4096)
+def get_reduced_sl_vectors(vectors, area_multiple):
+    """
+    Gets the reduced super lattice vectors for all the transformations
+    of a given area multiple, cached for repeated use.
+
+    Args:
+        vectors(tuple): the two unit cell vectors, as a tuple of tuples
+        area_multiple(int): integer multiple of unit cell area for super
+            lattice area
+
+    Returns:
+        read-only n x 2 x 3 array of reduced super lattice vector sets, in
+        the order of gen_sl_transform_matricies
+    """
+    sl_vectors = np.dot(gen_sl_transform_matricies(area_multiple), vectors)
+    sl_vectors = reduce_vectors_array(sl_vectors)
+    sl_vectors.flags.writeable = False
+    return sl_vectors
+
+
 def rel_strain(vec1, vec2):
     """
     Calculate relative strain between two vectors
@@ -402,6 +512,17 @@ def vec_angle(a, b):
     return np.arctan2(sinang, cosang)
 
 
+def vec_angle_array(vec_sets):
+    """
+    Calculate the angles between the two vectors of an array of vector sets
+    """
+    vec_sets = np.asarray(vec_sets)
+    cosang = np.sum(vec_sets[:, 0] * vec_sets[:, 1], axis=-1)
+    cross = np.cross(vec_sets[:, 0], vec_sets[:, 1])
+    sinang = np.sqrt(np.sum(cross * cross, axis=-1))
+    return np.arctan2(sinang, cosang)
+
+
 def vec_area(a, b):
     """
     Area of lattice plane defined by two vectors
@@ -429,6 +550,41 @@ def reduce_vectors(a, b):
     return [a, b]
 
 
+def reduce_vectors_array(vec_sets):
+    """
+    Array version of reduce_vectors, reducing an array of vector sets
+    with the methodology of Zur and McGill
+
+    Args:
+        vec_sets(array): an n x 2 x 3 array of vector sets
+
+    Returns:
+        n x 2 x 3 array of the reduced vector sets
+    """
+    vec_sets = np.array(vec_sets, dtype=float).reshape(-1, 2, 3)
+    active = np.arange(len(vec_sets))
+    while len(active) > 0:
+        a, b = vec_sets[active, 0], vec_sets[active, 1]
+        norm_a = np.sqrt(np.sum(a * a, axis=-1))
+        norm_b = np.sqrt(np.sum(b * b, axis=-1))
+        b_plus, b_minus = b + a, b - a
+        # Apply the first reduction step that holds to each vector set, as
+        # in reduce_vectors
+        flip = np.sum(a * b, axis=-1) < 0
+        swap = ~flip & (norm_a > norm_b)
+        add = ~flip & ~swap & (norm_b > np.sqrt(np.sum(b_plus * b_plus, axis=-1)))
+        subtract = ~flip & ~swap & ~add & \
+            (norm_b > np.sqrt(np.sum(b_minus * b_minus, axis=-1)))
+        new_a, new_b = a.copy(), b.copy()
+        new_b[flip] = -b[flip]
+        new_a[swap], new_b[swap] = b[swap], a[swap]
+        new_b[add] = b_plus[add]
+        new_b[subtract] = b_minus[subtract]
+        vec_sets[active, 0], vec_sets[active, 1] = new_a, new_b
+        active = active[flip | swap | add | subtract]
+    return vec_sets
+
+
 def get_factors(n):
     """
     Generate all factors of n
@@ -96,6 +96,30 @@ class AdsorbateSiteFinderTest(PymatgenTest):
         for n, structure in enumerate(structures_hollow):
             self.assertTrue(in_coord_list(sites['hollow'], structure[-2].coords))
 
+    def test_iter_adsorption_structures(self):
+        co = Molecule("CO", [[0, 0, 0], [0, 0, 1.23]])
+        o = Molecule("O", [[0, 0, 0]])
+        repeats = [[2, 2, 1], [1, 1, 1]]
+        sites = self.asf_111.find_adsorption_sites()['all']
+        results = list(self.asf_111.iter_adsorption_structures(
+            [co, o], repeats=repeats))
+        self.assertEqual(len(results), 2 * 2 * len(sites))
+        # The input molecules are left untouched
+        self.assertArrayAlmostEqual(co.cart_coords, [[0, 0, 0], [0, 0, 1.23]])
+        for n, repeat, coords, structure in results[:len(sites)]:
+            self.assertEqual(n, 0)
+            self.assertEqual(repeat, [2, 2, 1])
+            self.assertEqual(len(structure), 4 * len(self.asf_111.slab) + 2)
+        for n, repeat, coords, structure in results[-len(sites):]:
+            self.assertEqual(n, 1)
+            self.assertEqual(len(structure), len(self.asf_111.slab) + 1)
+            self.assertEqual(structure[-1].properties['surface_properties'],
+                             'adsorbate')
+        structures = self.asf_111.generate_adsorption_structures(
+            co, repeat=[2, 2, 1])
+        for (n, repeat, coords, structure), ref in zip(results, structures):
+            self.assertEqual(structure, ref)
+
     def test_adsorb_both_surfaces(self):
 
         # Test out for monatomic adsorption
@@ -0,0 +1,80 @@
+# coding: utf-8
+# Copyright (c) Pymatgen Development Team.
+# Distributed under the terms of the MIT License.
+
+
+import unittest
+
+import numpy as np
+
+from pymatgen.core.structure import Structure
+from pymatgen.core.lattice import Lattice
+from pymatgen.analysis.enumeration import DerivativeStructureEnumerator, \
+    get_hnf_matrices, get_unique_hnf_matrices
+from pymatgen.analysis.structure_matcher import StructureMatcher
+from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+from pymatgen.util.testing import PymatgenTest
+
+
+class DerivativeStructureEnumeratorTest(PymatgenTest):
+
+    def setUp(self):
+        self.fcc = Structure(Lattice([[0, 2, 2], [2, 0, 2], [2, 2, 0]]),
+                             [{"Cu": 0.5, "Au": 0.5}], [[0, 0, 0]])
+
+    def test_hnf_matrices(self):
+        # number of sublattices of index n of a 3D lattice
+        self.assertEqual([len(get_hnf_matrices(n)) for n in range(1, 5)],
+                         [1, 7, 13, 35])
+        for h in get_hnf_matrices(4):
+            self.assertEqual(int(round(np.linalg.det(h))), 4)
+        # symmetrically distinct superlattices of fcc (Hart & Forcade)
+        ops = SpacegroupAnalyzer(self.fcc).get_symmetry_operations()
+        rotations = np.array([np.round(op.rotation_matrix) for op in ops])
+        self.assertEqual([len(get_unique_hnf_matrices(n, rotations))
+                          for n in range(1, 5)], [1, 2, 3, 7])
+
+    def test_run(self):
+        enum = DerivativeStructureEnumerator(self.fcc, 2, 4)
+        enum.run()
+        self.assertEqual(len(enum.structures), 7)
+        for s in enum.structures:
+            self.assertTrue(s.is_ordered)
+            self.assertEqual(s.composition.reduced_formula, "CuAu")
+        # no duplicates
+        self.assertEqual(len(StructureMatcher().group_structures(
+            enum.structures)), 7)
+
+        # occupancies not consistent with a cell size of 3
+        enum = DerivativeStructureEnumerator(self.fcc, 3, 3)
+        enum.run()
+        self.assertEqual(enum.structures, [])
+
+    def test_ordered_sites_and_vacancies(self):
+        s = Structure(Lattice([[0, 2, 2], [2, 0, 2], [2, 2, 0]]),
+                      [{"Li+": 0.5}, "O2-"], [[0, 0, 0], [0.5, 0.5, 0.5]])
+        s.add_site_property("magmom", [0, 1])
+        enum = DerivativeStructureEnumerator(s, 2, 2)
+        enum.run()
+        self.assertEqual(len(enum.structures), 2)
+        for ss in enum.structures:
+            self.assertEqual(ss.composition.reduced_formula, "LiO2")
+            self.assertEqual(sorted(ss.site_properties["magmom"]),
+                             [0, 1, 1])
+
+    def test_ordered(self):
+        s = Structure(self.fcc.lattice, ["Cu"], [[0, 0, 0]])
+        enum = DerivativeStructureEnumerator(s, 1, 2)
+        enum.run()
+        self.assertEqual([len(ss) for ss in enum.structures], [1, 2, 2])
+
+    def test_ncores(self):
+        enum = DerivativeStructureEnumerator(self.fcc, 1, 4, ncores=2)
+        structures = list(enum.iter_structures())
+        self.assertEqual(len(structures), 7)
+        self.assertEqual(len(structures[0]), 2)
+        self.assertEqual(len(structures[-1]), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -322,6 +322,13 @@ from    to  to_image
         for n in range(len(nio_sg)):
             self.assertEqual(nio_sg.get_coordination_of_site(n), 6)
 
+        # edges to images across the supercell boundary
+        nio_sg = StructureGraph.with_local_env_strategy(self.NiO, MinimumDistanceNN())
+        nio_sg_mul = nio_sg*(2, 1, 3)
+        nio_sg_premul = StructureGraph.with_local_env_strategy(self.NiO*(2, 1, 3),
+                                                               MinimumDistanceNN())
+        self.assertTrue(nio_sg_mul == nio_sg_premul)
+
 
     @unittest.skipIf(not (which('neato') and which('fdp')), "graphviz executables not present")
     def test_draw(self):
@@ -401,6 +408,62 @@ from    to  to_image
 
         self.assertEqual(sg, self.square_sg)
 
+    def test_from_edge_arrays(self):
+        # same edges as bc_square_sg_r, with duplicates
+        sg = StructureGraph.with_edge_arrays(self.bc_square_sg.structure,
+                                             [0, 0, 0, 0, 0, 1, 1, 1, 0, 1],
+                                             [0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+                                             [(1, 0, 0), (-1, 0, 0), (0, 1, 0),
+                                              (0, -1, 0), (0, 0, 0), (1, 0, 0),
+                                              (1, 1, 0), (0, 1, 0), (1, 0, 0),
+                                              (0, 0, 0)],
+                                             edge_weight_name="",
+                                             edge_weight_units="")
+
+        # graph is only built when needed
+        self.assertIsNone(sg._graph)
+        self.assertEqual(sg.edge_arrays.from_index.tolist(), [0] * 8)
+        self.assertEqual(sg.edge_arrays.to_index.tolist(), [0] * 4 + [1] * 4)
+        self.assertEqual(sg.edge_arrays.to_jimage[5].tolist(), [-1, 0, 0])
+        self.assertTrue(np.all(np.isnan(sg.edge_arrays.weight)))
+        sg_mul = sg*(2, 2, 1)
+        self.assertIsNone(sg_mul._graph)
+        self.assertEqual(sg_mul.name, "bonds")
+
+        self.assertEqual(sg, self.bc_square_sg)
+        self.assertIsNotNone(sg._graph)
+        self.assertEqual(sg_mul, self.bc_square_sg*(2, 2, 1))
+        self.assertEqual(sg.edge_arrays.to_index.tolist(), [0] * 4 + [1] * 4)
+
+    def test_get_connected_components(self):
+        labels, images, translations = self.bc_square_sg.get_connected_components()
+        self.assertEqual(labels.tolist(), [0, 0])
+        self.assertEqual(len(translations), 1)
+        self.assertEqual(np.linalg.matrix_rank(translations[0]), 2)
+        # site 1 is in the image it is connected to site 0 through
+        self.assertIn(images[1].tolist(), [[0, 0, 0], [-1, 0, 0],
+                                           [-1, -1, 0], [0, -1, 0]])
+
+        # single layer of MoS2
+        labels, images, translations = self.mos2_sg.get_connected_components()
+        self.assertEqual(len(translations), 1)
+        self.assertEqual(np.linalg.matrix_rank(translations[0]), 2)
+
+        # molecules in a supercell, without edges through boundaries
+        structure_file = os.path.join(os.path.dirname(__file__), "..", "..", "..",
+                                      'test_files/H6PbCI3N_mp-977013_symmetrized.cif')
+        sg = StructureGraph.with_local_env_strategy(Structure.from_file(structure_file),
+                                                    MinimumDistanceNN())
+        labels, images, translations = sg.get_connected_components()
+        self.assertEqual(sorted(len(t) for t in translations)[0], 0)
+        for n, t in enumerate(translations):
+            if len(t) == 0:
+                edges = sg.edge_arrays
+                in_component = labels[edges.from_index] == n
+                # all bonds of the molecule join sites in the images found
+                shifts = images[edges.from_index] + edges.to_jimage - images[edges.to_index]
+                self.assertFalse(np.any(shifts[in_component]))
+
     def test_extract_molecules(self):
 
         structure_file = os.path.join(os.path.dirname(__file__), "..", "..", "..",
@@ -6,6 +6,7 @@ import warnings
 import numpy as np
 from math import pi
 import unittest
+from unittest.mock import patch
 import os
 
 from monty.os.path import which
@@ -16,7 +17,7 @@ from pymatgen.analysis.local_env import ValenceIonicRadiusEvaluator, \
     get_neighbors_of_site_with_index, site_is_of_motif_type, \
     NearNeighbors, LocalStructOrderParams, BrunnerNN_reciprocal, \
     BrunnerNN_real, BrunnerNN_relative, EconNN, CrystalNN, CutOffDictNN, \
-    Critic2NN, solid_angle
+    Critic2NN, VoronoiTessellation, solid_angle
 from pymatgen import Element, Molecule, Structure, Lattice
 from pymatgen.util.testing import PymatgenTest
 
@@ -183,6 +184,60 @@ class VoronoiNNTest(PymatgenTest):
 
             self.assertArrayAlmostEqual(all_weights, by_one_weights)
 
+    def test_tessellation(self):
+        tess = self.nn.get_voronoi_tessellation(self.s)
+        self.assertEqual(len(tess.face_ptr), len(self.s) + 1)
+        self.assertFalse(np.any(tess.infinite))
+        faces = tess.get_faces(0)
+        self.assertArrayEqual(tess.site_indices[tess.root_points],
+                              [[i, 0, 0, 0] for i in range(len(self.s))])
+        self.assertAlmostEqual(tess.volume.sum(), self.s.volume)
+        self.assertAlmostEqual(tess.solid_angle[faces].sum(), 4 * pi)
+
+        # Reusing the tessellation with other settings is the same as
+        # tessellating the structure again
+        for nn in [self.nn, VoronoiNN(weight='area', tol=0.1),
+                   VoronoiNN(targets=[Element("P"), Element("O")], weight="volume",
+                             extra_nn_info=False)]:
+            for info, ref in zip(nn.get_all_nn_info(self.s, tessellation=tess),
+                                 nn.get_all_nn_info(self.s)):
+                self.assertEqual(
+                    sorted((x['site_index'], x['image']) for x in info),
+                    sorted((x['site_index'], x['image']) for x in ref))
+                self.assertArrayAlmostEqual(sorted(x['weight'] for x in info),
+                                            sorted(x['weight'] for x in ref))
+
+        cnn = CrystalNN()
+        for info, ref in zip(cnn.get_all_nn_info(self.s, tessellation=tess),
+                             cnn.get_all_nn_info(self.s)):
+            self.assertEqual(
+                sorted((x['site_index'], x['image']) for x in info),
+                sorted((x['site_index'], x['image']) for x in ref))
+
+        self.assertRaises(ValueError, self.nn.get_all_nn_info,
+                          self.s_sic, tessellation=tess)
+
+    def test_voronoi_tessellation(self):
+        # The CSR face arrays give the same neighbors and facet areas as
+        # tessellating around each site separately
+        nn = VoronoiNN()
+        tess = VoronoiTessellation(self.s, nn.cutoff)
+        self.assertEqual(tess.face_ptr[-1], len(tess.face_points))
+        self.assertEqual(tess.vertex_ptr[-1], len(tess.face_vertices))
+        for n in range(len(self.s)):
+            faces = tess.get_faces(n)
+            coords = [tess.get_site(p).coords
+                      for p in tess.face_points[faces]]
+            order = np.lexsort(np.round(coords, 4).T)
+            polyhedra = list(nn.get_voronoi_polyhedra(self.s, n).values())
+            ref_coords = [x['site'].coords for x in polyhedra]
+            ref_order = np.lexsort(np.round(ref_coords, 4).T)
+            self.assertArrayAlmostEqual(np.array(coords)[order],
+                                        np.array(ref_coords)[ref_order])
+            self.assertArrayAlmostEqual(
+                tess.area[faces][order],
+                np.array([x['area'] for x in polyhedra])[ref_order])
+
     def test_Cs2O(self):
         """A problematic structure in the Materials Project"""
         strc = Structure([[4.358219, 0.192833, 6.406960], [2.114414, 3.815824, 6.406960],
@@ -256,6 +311,26 @@ class JmolNNTest(PymatgenTest):
         # Verify get_nn function works
         self.assertEqual(len(self.jmol_update.get_nn(s, 0)), 6)
 
+    def test_all_nn_info(self):
+        s = self.get_structure('LiFePO4')
+        for jmol in [self.jmol, self.jmol_update]:
+            all_nn_info = jmol.get_all_nn_info(s)
+            self.assertEqual([len(nn_info) for nn_info in all_nn_info],
+                             [jmol.get_cn(s, n) for n in range(len(s))])
+            for n, nn_info in enumerate(all_nn_info):
+                self.assertEqual(
+                    sorted((x['site_index'], x['weight']) for x in nn_info),
+                    sorted((x['site_index'], x['weight'])
+                           for x in jmol.get_nn_info(s, n)))
+
+        # get_nn_info only needs the bonds involving site n
+        with patch.object(JmolNN, "get_max_bond_distances") as table:
+            self.assertEqual(self.jmol.get_cn(s, 4), 6)
+            table.assert_not_called()
+        s_oxi = s.copy()
+        s_oxi.add_oxidation_state_by_guess()
+        self.assertEqual(self.jmol.get_cn(s_oxi, 4), 6)
+
     def tearDown(self):
         del self.jmol
         del self.jmol_update
@@ -300,6 +375,24 @@ class OpenBabelNNTest(PymatgenTest):
                                1.19,
                                2)
 
+    def test_all_nn_info(self):
+        for strat in [CovalentBondNN(), CovalentBondNN(order=False)]:
+            all_nn_info = strat.get_all_nn_info(self.benzene)
+            self.assertEqual(len(strat.bonds), 12)
+            for n, nn_info in enumerate(all_nn_info):
+                self.assertEqual(
+                    [(x['site_index'], x['weight']) for x in nn_info],
+                    [(x['site_index'], x['weight'])
+                     for x in strat.get_nn_info(self.benzene, n)])
+            self.assertEqual([len(nn_info) for nn_info in all_nn_info],
+                             [3] * 6 + [1] * 6)
+
+    def test_bonded_structure(self):
+        mg = CovalentBondNN().get_bonded_structure(self.benzene)
+        self.assertEqual(len(mg.graph.edges()), 12)
+        weights = sorted(d['weight'] for _, _, d in mg.graph.edges(data=True))
+        self.assertArrayAlmostEqual(weights, [1] * 6 + [1.6596] * 6, 4)
+
     def tearDown(self):
         del self.benzene
         del self.acetylene
@@ -429,6 +522,25 @@ class MiniDistNNTest(PymatgenTest):
         self.assertAlmostEqual(VoronoiNN(tol=0.5).get_cn(
             self.cscl, 0), 8)
 
+    def test_all_nn_info(self):
+        for nn in [MinimumDistanceNN(tol=0.1), BrunnerNN_reciprocal(tol=0.01),
+                   BrunnerNN_relative(tol=0.01), BrunnerNN_real(tol=0.01)]:
+            for struct in [self.diamond, self.nacl, self.cscl, self.mos2]:
+                all_nn_info = nn.get_all_nn_info(struct)
+                self.assertEqual(len(all_nn_info), len(struct))
+                for n, nn_info in enumerate(all_nn_info):
+                    by_one = nn.get_nn_info(struct, n)
+                    self.assertEqual(
+                        sorted((x['site_index'], x['image']) for x in nn_info),
+                        sorted((x['site_index'], x['image']) for x in by_one))
+                    self.assertArrayAlmostEqual(
+                        sorted(x['weight'] for x in nn_info),
+                        sorted(x['weight'] for x in by_one))
+                    for x in nn_info:
+                        self.assertArrayAlmostEqual(
+                            x['site'].frac_coords - x['image'],
+                            struct[x['site_index']].frac_coords % 1)
+
     def test_get_local_order_params(self):
 
         nn = MinimumDistanceNN()
@@ -979,6 +1091,43 @@ class LocalStructOrderParamsTest(PymatgenTest):
         with self.assertRaises(ValueError):
             ops_101.get_order_parameters(self.bcc, 0, indices_neighs=[2])
 
+    def test_get_order_parameters_all(self):
+        types = ["cn", "sgl_bd", "bent", "tri_plan", "tri_plan_max", "tet",
+                 "tet_max", "T", "tri_pyr", "sq_pyr", "pent_pyr", "hex_pyr",
+                 "sq_plan", "oct", "bcc", "reg_tri", "sq", "q2", "q4", "q6"]
+        # Angles of exactly 90 degrees make "bcc" sensitive to rounding.
+        bcc = self.bcc * (2, 2, 2)
+        bcc.perturb(0.01)
+        for cutoff, structures in [(1.1, [bcc]), (2.5, [self.get_structure(
+                "LiFePO4")]), (3.2, [self.get_structure("LiFePO4")])]:
+            ops = LocalStructOrderParams(types, cutoff=cutoff)
+            for s in structures:
+                all_vals = ops.get_order_parameters_all(s)
+                for i in range(len(s)):
+                    vals = ops.get_order_parameters(s, i)
+                    for v1, v2 in zip(vals, all_vals[i]):
+                        if v1 is None:
+                            self.assertIsNone(v2)
+                        else:
+                            self.assertAlmostEqual(v1, v2)
+
+        # Voronoi neighbors; "bcc" depends on the order of the neighbors.
+        ops = LocalStructOrderParams(types[:14] + types[15:])
+        s = self.get_structure("LiFePO4")
+        all_vals = ops.get_order_parameters_all(s, indices=[0, 4, 8, 12])
+        for i, n in enumerate([0, 4, 8, 12]):
+            self.assertArrayAlmostEqual(ops.get_order_parameters(s, n),
+                                        all_vals[i])
+
+        # Precomputed neighbors, with types that are not vectorized.
+        ops = LocalStructOrderParams(["oct", "oct_max", "sq_bipyr"])
+        vectors = [self.square_pyramid[i].coords - self.square_pyramid[0].coords
+                   for i in range(1, 6)]
+        self.assertArrayAlmostEqual(
+            ops.get_order_parameters_all(None, neighbor_vectors=[vectors])[0],
+            ops.get_order_parameters(self.square_pyramid, 0,
+                                     indices_neighs=range(1, 6)))
+
 
     def tearDown(self):
         del self.single_bond
@@ -1026,6 +1175,24 @@ class CrystalNNTest(PymatgenTest):
             cnn = CrystalNN(weighted_cn=True)
             cnn.get_cn(self.lifepo4, 0, use_weights=False)
 
+    def test_all_nn_info(self):
+        for cnn in [CrystalNN(), CrystalNN(weighted_cn=True),
+                    CrystalNN(cation_anion=True)]:
+            all_nn_info = cnn.get_all_nn_info(self.lifepo4)
+            for n, nn_info in enumerate(all_nn_info):
+                by_one = cnn.get_nn_info(self.lifepo4, n)
+                self.assertEqual(
+                    sorted((x['site_index'], x['image']) for x in nn_info),
+                    sorted((x['site_index'], x['image']) for x in by_one))
+                self.assertArrayAlmostEqual(
+                    sorted(x['weight'] for x in nn_info),
+                    sorted(x['weight'] for x in by_one))
+
+        cnn = CrystalNN()
+        all_nn_data = cnn.get_all_nn_data(self.he_bcc, length=10)
+        nn_data = cnn.get_nn_data(self.he_bcc, 0, length=10)
+        self.assertEqual(all_nn_data[0].cn_weights, nn_data.cn_weights)
+
     def test_discrete_cn(self):
         cnn = CrystalNN()
         cn_array = []
@@ -1107,6 +1274,17 @@ class CutOffDictNNTest(PymatgenTest):
         nn_null = CutOffDictNN()
         self.assertEqual(nn_null.get_cn(self.diamond, 0), 0)
 
+    def test_all_nn_info(self):
+
+        nn = CutOffDictNN({('C', 'C'): 2})
+        all_nn_info = nn.get_all_nn_info(self.diamond)
+        self.assertEqual([len(nn_info) for nn_info in all_nn_info], [4, 4])
+        self.assertEqual(sorted(x['image'] for x in all_nn_info[0]),
+                         sorted(nn.get_nn_images(self.diamond, 0)))
+
+        nn_null = CutOffDictNN()
+        self.assertEqual(nn_null.get_all_nn_info(self.diamond), [[], []])
+
 
 @unittest.skipIf(not which('critic2'), "critic2 executable not present")
 class Critic2NNTest(PymatgenTest):
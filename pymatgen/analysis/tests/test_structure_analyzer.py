@@ -41,6 +41,34 @@ class VoronoiAnalyzerTest(PymatgenTest):
         self.assertIn(('[1 3 4 7 1 0 0 0]', 3),
                       ensemble, "Cannot find the right polyhedron in ensemble.")
 
+    def test_analyze_all(self):
+        # same polyhedra as site by site, once the cutoff includes
+        # all the Voronoi neighbors
+        va = VoronoiAnalyzer(cutoff=5.0)
+        vor_indices = va.analyze_all(self.s)
+        self.assertEqual(vor_indices.shape, (len(self.s), 8))
+        for n in range(len(self.s)):
+            self.assertArrayEqual(vor_indices[n], va.analyze(self.s, n=n))
+
+        # bcc gives the truncated octahedron
+        cscl = self.get_structure("CsCl")
+        self.assertArrayEqual(va.analyze_all(cscl * 2),
+                              [[0, 6, 0, 8, 0, 0, 0, 0]] * 16)
+
+        # a short cutoff truncates the cells rather than raising
+        va = VoronoiAnalyzer(cutoff=1.0)
+        vor_indices = va.analyze_all(cscl)
+        self.assertEqual(vor_indices.shape, (len(cscl), 8))
+        self.assertTrue(np.all(vor_indices.sum(axis=1) > 0))
+        self.assertEqual(len(va.analyze_structures([cscl] * 4, step_freq=2)),
+                         len(np.unique(vor_indices, axis=0)))
+
+        ensemble = self.va.analyze_structures(self.ss, step_freq=2,
+                                              most_frequent_polyhedra=10)
+        self.assertEqual(self.va.analyze_structures(
+            self.ss, step_freq=2, most_frequent_polyhedra=10, ncores=2),
+            ensemble)
+
 
 class RelaxationAnalyzerTest(unittest.TestCase):
     def setUp(self):
@@ -4,6 +4,7 @@
 
 
 import unittest
+import itertools
 import os
 import json
 import numpy as np
@@ -296,6 +297,29 @@ class StructureMatcherTest(PymatgenTest):
         out = sm.group_structures(self.struct_list, anonymous=True)
         self.assertEqual(list(map(len, out)), [4, 1, 1, 1, 1, 1, 1, 1, 2, 2, 1])
 
+    def test_group_structures(self):
+        # Structures with different numbers of sites are never compared
+        # when supercells are not attempted
+        structures = [self.get_structure("Li2O"), self.get_structure("TiO2"),
+                      self.get_structure("Li2O") * (1, 1, 2),
+                      self.get_structure("TiO2"), self.get_structure("Li2O")]
+        structures[3].perturb(0.05)
+        structures[4].make_supercell([[1, 1, 0], [0, 1, 0], [0, 0, 1]])
+        for sm in [StructureMatcher(), StructureMatcher(primitive_cell=False),
+                   StructureMatcher(primitive_cell=False,
+                                    attempt_supercell=True),
+                   StructureMatcher(scale=False, stol=0.01)]:
+            groups = sm.group_structures(structures)
+            self.assertEqual(sum(map(len, groups)), len(structures))
+            for group in groups:
+                for s in group[1:]:
+                    self.assertTrue(sm.fit(group[0], s))
+            for g1, g2 in itertools.combinations(groups, 2):
+                self.assertFalse(sm.fit(g1[0], g2[0]))
+        groups = StructureMatcher(primitive_cell=False).group_structures(
+            structures)
+        self.assertEqual(sorted(map(len, groups)), [1, 2, 2])
+
     def test_mix(self):
         structures = [self.get_structure("Li2O"),
                       self.get_structure("Li2O2"),
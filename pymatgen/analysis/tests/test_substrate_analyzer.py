@@ -15,8 +15,10 @@ __email__ = "shyamd@lbl.gov"
 __date__ = "2/5/16"
 
 import unittest
+import numpy as np
 from pymatgen.analysis.substrate_analyzer import SubstrateAnalyzer, \
-    ZSLGenerator, fast_norm, reduce_vectors, vec_area, get_factors
+    ZSLGenerator, fast_norm, reduce_vectors, vec_area, get_factors, \
+    reduce_vectors_array, gen_sl_transform_matricies
 from pymatgen.util.testing import PymatgenTest
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 from pymatgen.analysis.elasticity.elastic import ElasticTensor
@@ -51,6 +53,22 @@ class ZSLGenTest(PymatgenTest):
 
         self.assertEqual(len(matches), 8)
 
+    def test_array_functions(self):
+        vec_sets = np.dot(gen_sl_transform_matricies(6), [[1, 0, 0], [0.3, 1.2, 0]])
+        reduced = reduce_vectors_array(vec_sets)
+        for vec_set, reduced_set in zip(vec_sets, reduced):
+            self.assertArrayAlmostEqual(reduce_vectors(*vec_set), reduced_set)
+        self.assertArrayEqual(reduce_vectors_array([[[1, 0, 0], [2, 2, 0]]]),
+                              [[[1, 0, 0], [0, 2, 0]]])
+
+        z = ZSLGenerator()
+        films = [[[1.01, 0, 0], [0, 2, 0]], [[1.01, 2, 0], [0, 2, 0]]]
+        substrates = [[[1, 0, 0], [0, 2.01, 0]], [[1, 0, 0], [0, 3, 0]]]
+        same = z.get_same_vectors_matrix(np.array(films), np.array(substrates))
+        self.assertArrayEqual(same, [[z.is_same_vectors(f, s) for s in substrates]
+                                     for f in films])
+        self.assertArrayEqual(same, [[True, False], [False, False]])
+
 
 class SubstrateAnalyzerTest(PymatgenTest):
     # Clean up test to be based on test structures
@@ -77,6 +95,16 @@ class SubstrateAnalyzerTest(PymatgenTest):
         matches = list(s.calculate(film,substrate,film_elac))
         self.assertEqual(len(matches), 192)
 
+        all_matches = s.calculate_substrates(film, [substrate, film], lowest=True,
+                                             ncores=2)
+        self.assertEqual(len(all_matches), 2)
+        self.assertEqual(len(all_matches[0]),
+                         len(list(s.calculate(film, substrate, lowest=True))))
+        self.assertEqual(len(all_matches[1]),
+                         len(list(s.calculate(film, film, lowest=True))))
+        for match in all_matches[0]:
+            self.assertNotIn("elastic_energy", match)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -7,6 +7,8 @@ import json
 import collections
 import warnings
 
+import numpy as np
+
 from pymatgen.core.periodic_table import Element
 
 """
@@ -151,6 +153,39 @@ def obtain_all_bond_lengths(sp1, sp2, default_bl=None):
         raise ValueError("No bond data for elements {} - {}".format(*syms))
 
 
+def get_max_bond_length_matrix(species, tol=0.2, default_bl=None):
+    """
+    Tabulate the bonding cutoffs of CovalentBond.is_bonded between a set of
+    species, so that the bonds between many sites can be tested at once by
+    indexing the matrix with the species of the sites.
+
+    Args:
+        species ([Specie]): Species (or element symbols) to tabulate.
+        tol (float): Relative tolerance. Two sites are bonded if their
+            distance is less than (1 + tol) * the longest bond length
+            between their species. Defaults to 0.2.
+        default_bl: If a particular type of bond does not exist, use this
+            bond length. If None, a ValueError will be thrown.
+
+    Returns:
+        (len(species), len(species)) array of bonding cutoffs in angstrom.
+    """
+    symbols = [sp.symbol if hasattr(sp, "symbol") else sp for sp in species]
+    cutoffs = np.zeros((len(symbols), len(symbols)))
+    for i, sym1 in enumerate(symbols):
+        for j in range(i, len(symbols)):
+            syms = tuple(sorted([sym1, symbols[j]]))
+            if syms in bond_lengths:
+                cutoff = max(bond_lengths[syms].values())
+            elif default_bl:
+                cutoff = default_bl
+            else:
+                raise ValueError("No bond data for elements {} - {}".format(
+                    *syms))
+            cutoffs[i, j] = cutoffs[j, i] = (1 + tol) * cutoff
+    return cutoffs
+
+
 def get_bond_order(sp1, sp2, dist, tol=0.2, default_bl=None):
     """
     Calculate the bond order given the distance of 2 species
@@ -24,7 +24,8 @@ from pymatgen.core.lattice import Lattice
 from pymatgen.core.periodic_table import Element, Specie, get_el_sp, DummySpecie
 from monty.json import MSONable
 from pymatgen.core.sites import Site, PeriodicSite
-from pymatgen.core.bonds import CovalentBond, get_bond_length
+from pymatgen.core.bonds import CovalentBond, get_bond_length, \
+    get_max_bond_length_matrix
 from pymatgen.core.composition import Composition
 from pymatgen.util.coord import get_angle, all_distances, \
     lattice_points_in_supercell
@@ -399,6 +400,7 @@ class IStructure(SiteCollection, MSONable):
             raise StructureError(("Structure contains sites that are ",
                                   "less than 0.01 Angstrom apart!"))
         self._charge = charge
+        self._neighbor_cache = None
 
     @classmethod
     def from_sites(cls, sites, charge=None, validate_proximity=False,
@@ -894,6 +896,16 @@ class IStructure(SiteCollection, MSONable):
             If include_supercell == True, the tuple for each neighbor also includes
             the index of supercell.
         """
+        if self._neighbor_cache is not None:
+            cache = self._neighbor_cache
+            if "index" not in cache:
+                cache["index"] = {id(s): i for i, s in enumerate(self._sites)}
+            i = cache["index"].get(id(site))
+            if i is not None:
+                neighbors, distances = self._get_neighbor_list(r)
+                return self._filter_neighbors(
+                    neighbors[i], distances[i], r, include_index,
+                    include_image)
         nn = self.get_sites_in_sphere(site.coords, r,
                                       include_index=include_index,
                                       include_image=include_image)
@@ -933,6 +945,14 @@ class IStructure(SiteCollection, MSONable):
             sites contribute to the ewald sum.
             Image only supplied if include_image = True
         """
+        if self._neighbor_cache is not None:
+            neighbors, distances = self._get_neighbor_list(r)
+            return [self._filter_neighbors(nns, dists, r, include_index,
+                                           include_image)
+                    for nns, dists in zip(neighbors, distances)]
+        return self._get_all_neighbors(r, include_index, include_image)
+
+    def _get_all_neighbors(self, r, include_index, include_image):
         # Use same algorithm as get_sites_in_sphere to determine supercell but
         # loop over all atoms in crystal
         recp_len = np.array(self.lattice.reciprocal_lattice.abc)
@@ -968,6 +988,71 @@ class IStructure(SiteCollection, MSONable):
                     neighbors[i].append(item)
         return neighbors
 
+    def enable_neighbor_cache(self):
+        """
+        Caches the neighbor lists computed by get_all_neighbors and
+        get_neighbors, so that analyses run one after the other on the same
+        structure share a single neighbor search. The cache holds the
+        neighbor list for the largest cutoff requested so far and serves any
+        smaller cutoff by filtering on distance. It is emptied by the
+        mutating methods of Structure, so the sites and the lattice of the
+        structure must not be changed by other means while it is enabled.
+
+        Cached results contain the same neighbors as uncached ones, but
+        get_neighbors returns them in the order of get_all_neighbors. Only
+        sites of the structure itself (e.g., s[0]) are looked up in the
+        cache; other sites are searched for as usual.
+        """
+        if self._neighbor_cache is None:
+            self._neighbor_cache = {}
+
+    def disable_neighbor_cache(self):
+        """
+        Disables and empties the neighbor-list cache.
+        """
+        self._neighbor_cache = None
+
+    def _clear_neighbor_cache(self):
+        """
+        Empties the neighbor-list cache, if enabled. Must be called by all
+        the methods that change the sites or the lattice.
+        """
+        if self._neighbor_cache is not None:
+            self._neighbor_cache = {}
+
+    def _get_neighbor_list(self, r):
+        """
+        Returns the cached neighbor lists of all sites, with indices and
+        images, together with the corresponding arrays of distances, for a
+        cutoff of at least r. The lists are recomputed if the cache is empty
+        or has a smaller cutoff.
+        """
+        cache = self._neighbor_cache
+        if "cutoff" in cache and r <= cache["cutoff"]:
+            return cache["neighbors"], cache["distances"]
+        neighbors = self._get_all_neighbors(r, True, True)
+        distances = [np.array([nn[1] for nn in nns], dtype=float)
+                     for nns in neighbors]
+        cache.update({"cutoff": r, "neighbors": neighbors,
+                      "distances": distances})
+        return neighbors, distances
+
+    @staticmethod
+    def _filter_neighbors(neighbors, distances, r, include_index,
+                          include_image):
+        """
+        Selects the (site, dist, index, image) neighbors within r and strips
+        the index and image if they are not requested.
+        """
+        nns = [neighbors[k] for k in np.nonzero(distances <= r)[0]]
+        if include_index and include_image:
+            return nns
+        if include_index:
+            return [nn[:3] for nn in nns]
+        if include_image:
+            return [nn[:2] + nn[3:] for nn in nns]
+        return [nn[:2] for nn in nns]
+
     def get_neighbors_in_shell(self, origin, r, dr, include_index=False, include_image=False):
         """
         Returns all sites in a shell centered on origin (coords) between radii
@@ -1923,11 +2008,53 @@ class IMolecule(SiteCollection, MSONable):
         Returns:
             List of bonds
         """
-        bonds = []
-        for site1, site2 in itertools.combinations(self._sites, 2):
-            if CovalentBond.is_bonded(site1, site2, tol):
-                bonds.append(CovalentBond(site1, site2))
-        return bonds
+        return [CovalentBond(self._sites[i], self._sites[j])
+                for i, j in self._get_covalent_bond_indices(tol)]
+
+    def _get_covalent_bond_indices(self, tol=0.2):
+        """
+        Determines the covalent bonds in a molecule as pairs of site indices,
+        with the same criterion as CovalentBond.is_bonded. The bonding
+        cutoffs are tabulated once per pair of species and all the candidate
+        pairs of sites are tested at once.
+
+        Args:
+            tol (float): The tol to determine bonds in a structure. See
+                CovalentBond.is_bonded.
+
+        Returns:
+            (n, 2) array of the indices (i, j), i < j, of the bonded sites,
+            in the order of itertools.combinations.
+        """
+        from scipy.spatial import cKDTree
+
+        if len(self._sites) < 2:
+            return np.zeros((0, 2), dtype=int)
+        symbols = [list(site.species_and_occu.keys())[0].symbol
+                   for site in self._sites]
+        unique_symbols, species, counts = np.unique(
+            symbols, return_inverse=True, return_counts=True)
+        # Missing bond data only matters for pairs of species that are
+        # actually present, e.g., not for Cl-Cl with a single Cl site.
+        cutoffs = get_max_bond_length_matrix(unique_symbols, tol,
+                                             default_bl=float("nan"))
+        present = np.ones(cutoffs.shape, dtype=bool)
+        np.fill_diagonal(present, counts > 1)
+        if np.any(np.isnan(cutoffs) & present):
+            for i, j in itertools.combinations(range(len(species)), 2):
+                if np.isnan(cutoffs[species[i], species[j]]):
+                    raise ValueError(
+                        "No bond data for elements {} - {}".format(
+                            *sorted([symbols[i], symbols[j]])))
+        coords = self.cart_coords
+        pairs = cKDTree(coords).query_pairs(np.nanmax(cutoffs))
+        pairs = np.array(sorted(pairs), dtype=int).reshape(-1, 2)
+        if len(pairs) == 0:
+            return pairs
+        dists = np.linalg.norm(coords[pairs[:, 0]] - coords[pairs[:, 1]],
+                               axis=1)
+        bonded = dists < cutoffs[species[pairs[:, 0]], species[pairs[:, 1]]]
+        return pairs[bonded]
 
     def __eq__(self, other):
         if other is None:
@@ -2436,6 +2563,7 @@ class Structure(IStructure, collections.MutableSequence):
                 Replaces all Mn in the structure with Fe: 0.5, Co: 0.5, i.e.,
                 creates a disordered structure!
         """
+        self._clear_neighbor_cache()
 
         if isinstance(i, int):
             indices = [i]
@@ -2478,6 +2606,7 @@ class Structure(IStructure, collections.MutableSequence):
         """
         Deletes a site from the Structure.
         """
+        self._clear_neighbor_cache()
         self._sites.__delitem__(i)
 
     def append(self, species, coords, coords_are_cartesian=False,
@@ -2520,6 +2649,7 @@ class Structure(IStructure, collections.MutableSequence):
         Returns:
             New structure with inserted site.
         """
+        self._clear_neighbor_cache()
         if not coords_are_cartesian:
             new_site = PeriodicSite(species, coords, self._lattice,
                                     properties=properties)
@@ -2545,6 +2675,7 @@ class Structure(IStructure, collections.MutableSequence):
             values: A sequence of values. Must be same length as number of
                 sites.
         """
+        self._clear_neighbor_cache()
         if len(values) != len(self._sites):
             raise ValueError("Values must be same length as sites.")
         for i in range(len(self._sites)):
@@ -2566,6 +2697,7 @@ class Structure(IStructure, collections.MutableSequence):
             values (list): A sequence of values. Must be same length as
                 number of sites.
         """
+        self._clear_neighbor_cache()
         for i in range(len(self._sites)):
             site = self._sites[i]
             props = {k: v
@@ -2591,6 +2723,7 @@ class Structure(IStructure, collections.MutableSequence):
                 {"C": "C0.5Si0.5"} will replace all C with 0.5 C and 0.5 Si,
                 i.e., a disordered site.
         """
+        self._clear_neighbor_cache()
         latt = self._lattice
         species_mapping = {get_el_sp(k): v
                            for k, v in species_mapping.items()}
@@ -2632,6 +2765,7 @@ class Structure(IStructure, collections.MutableSequence):
                 Defaults to False.
             properties (dict): Properties associated with the site.
         """
+        self._clear_neighbor_cache()
         if coords is None:
             frac_coords = self[i].frac_coords
         elif coords_are_cartesian:
@@ -2745,6 +2879,7 @@ class Structure(IStructure, collections.MutableSequence):
             s_new = PeriodicSite(site.species_and_occu, site.coords,
                                  self.lattice, coords_are_cartesian=True)
             self._sites.append(s_new)
+        self._clear_neighbor_cache()
 
     def remove_species(self, species):
         """
@@ -2753,6 +2888,7 @@ class Structure(IStructure, collections.MutableSequence):
         Args:
             species: Sequence of species to remove, e.g., ["Li", "Na"].
         """
+        self._clear_neighbor_cache()
         new_sites = []
         species = [get_el_sp(s) for s in species]
 
@@ -2772,6 +2908,7 @@ class Structure(IStructure, collections.MutableSequence):
         Args:
             indices: Sequence of indices of sites to delete.
         """
+        self._clear_neighbor_cache()
         self._sites = [s for i, s in enumerate(self._sites)
                        if i not in indices]
 
@@ -2787,6 +2924,7 @@ class Structure(IStructure, collections.MutableSequence):
                 fractional space. Defaults to False, i.e., symmetry operation
                 is applied in cartesian coordinates.
         """
+        self._clear_neighbor_cache()
         if not fractional:
             self._lattice = Lattice([symmop.apply_rotation_only(row)
                                      for row in self._lattice.matrix])
@@ -2818,6 +2956,7 @@ class Structure(IStructure, collections.MutableSequence):
         Args:
             new_lattice (Lattice): New lattice
         """
+        self._clear_neighbor_cache()
         self._lattice = new_lattice
         new_sites = []
         for site in self._sites:
@@ -2857,6 +2996,7 @@ class Structure(IStructure, collections.MutableSequence):
             reverse (bool): If set to True, then the list elements are sorted
                 as if each comparison were reversed.
         """
+        self._clear_neighbor_cache()
         self._sites = sorted(self._sites, key=key, reverse=reverse)
 
     def translate_sites(self, indices, vector, frac_coords=True,
@@ -2874,6 +3014,7 @@ class Structure(IStructure, collections.MutableSequence):
             to_unit_cell (bool): Whether new sites are transformed to unit
                 cell
         """
+        self._clear_neighbor_cache()
         if not isinstance(indices, collections.Iterable):
             indices = [indices]
 
@@ -2904,6 +3045,7 @@ class Structure(IStructure, collections.MutableSequence):
             to_unit_cell (bool): Whether new sites are transformed to unit
                 cell
         """
+        self._clear_neighbor_cache()
 
         from numpy.linalg import norm
         from numpy import cross, eye
@@ -2961,6 +3103,7 @@ class Structure(IStructure, collections.MutableSequence):
             oxidation_states (dict): Dict of oxidation states.
                 E.g., {"Li":1, "Fe":2, "P":5, "O":-2}
         """
+        self._clear_neighbor_cache()
         try:
             for i, site in enumerate(self._sites):
                 new_sp = {}
@@ -2985,6 +3128,7 @@ class Structure(IStructure, collections.MutableSequence):
             oxidation_states (list): List of oxidation states.
                 E.g., [1, 1, 1, 1, 2, 2, 2, 2, 5, 5, 5, 5, -2, -2, -2, -2]
         """
+        self._clear_neighbor_cache()
         try:
             for i, site in enumerate(self._sites):
                 new_sp = {}
@@ -3005,6 +3149,7 @@ class Structure(IStructure, collections.MutableSequence):
         """
         Removes oxidation states from a structure.
         """
+        self._clear_neighbor_cache()
         for i, site in enumerate(self._sites):
             new_sp = collections.defaultdict(float)
             for el, occu in site.species_and_occu.items():
@@ -3037,6 +3182,7 @@ class Structure(IStructure, collections.MutableSequence):
             spisn (dict): Dict of spins associated with
             elements or species, e.g. {"Ni":+5} or {"Ni2+":5}
         """
+        self._clear_neighbor_cache()
         for i, site in enumerate(self._sites):
             new_sp = {}
             for sp, occu in site.species_and_occu.items():
@@ -3058,6 +3204,7 @@ class Structure(IStructure, collections.MutableSequence):
             spins (list): List of spins
                 E.g., [+5, -5, 0, 0]
         """
+        self._clear_neighbor_cache()
         try:
             for i, site in enumerate(self._sites):
                 new_sp = {}
@@ -3080,6 +3227,7 @@ class Structure(IStructure, collections.MutableSequence):
         """
         Removes spin states from a structure.
         """
+        self._clear_neighbor_cache()
         for i, site in enumerate(self._sites):
             new_sp = collections.defaultdict(float)
             for sp, occu in site.species_and_occu.items():
@@ -3111,6 +3259,7 @@ class Structure(IStructure, collections.MutableSequence):
                    same factor.
             to_unit_cell: Whether or not to fall back sites into the unit cell
         """
+        self._clear_neighbor_cache()
         s = self * scaling_matrix
         if to_unit_cell:
             for isite, site in enumerate(s):
@@ -3140,6 +3289,7 @@ class Structure(IStructure, collections.MutableSequence):
                 Only first letter is considered.
 
         """
+        self._clear_neighbor_cache()
         mode = mode.lower()[0]
         from scipy.spatial.distance import squareform
         from scipy.cluster.hierarchy import fcluster, linkage
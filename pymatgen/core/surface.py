@@ -22,9 +22,9 @@ from pymatgen.core.periodic_table import get_el_sp
 from pymatgen.core.structure import Structure
 from pymatgen.core.lattice import Lattice
 from pymatgen.core.sites import PeriodicSite
+from pymatgen.util.parallel import SharedArgsPool
 
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
-from pymatgen.util.coord import in_coord_list
 from pymatgen.analysis.structure_matcher import StructureMatcher
 
 """
@@ -1090,9 +1090,12 @@ class SlabGenerator:
             else:
                 new_slabs.append(g[0])
 
-        match = StructureMatcher(ltol=tol, stol=tol, primitive_cell=False,
-                                 scale=False)
-        new_slabs = [g[0] for g in match.group_structures(new_slabs)]
+        # The unique terminations have already been compared to one another,
+        # only the symmetrized slabs need to be grouped again.
+        if symmetrize:
+            match = StructureMatcher(ltol=tol, stol=tol, primitive_cell=False,
+                                     scale=False)
+            new_slabs = [g[0] for g in match.group_structures(new_slabs)]
 
         return sorted(new_slabs, key=lambda s: s.energy)
 
@@ -1552,7 +1555,8 @@ def get_recp_symmetry_operation(structure, symprec=0.01):
     return recp_symmops
 
 
-def get_symmetrically_distinct_miller_indices(structure, max_index):
+def get_symmetrically_distinct_miller_indices(structure, max_index,
+                                              spacegroup_analyzer=None):
     """
     Returns all symmetrically distinct indices below a certain max-index for
     a given structure. Analysis is based on the symmetry of the reciprocal
@@ -1562,50 +1566,75 @@ def get_symmetrically_distinct_miller_indices(structure, max_index):
         max_index (int): The maximum index. For example, a max_index of 1
             means that (100), (110), and (111) are returned for the cubic
             structure. All other indices are equivalent to one of these.
+        spacegroup_analyzer (SpacegroupAnalyzer): analyzer of the structure
+            to reuse, e.g., from generate_all_slabs. Default is None, which
+            creates one.
     """
 
-    r = list(range(-max_index, max_index + 1))
-    r.reverse()
+    r = np.arange(max_index, -max_index - 1, -1)
 
-    # First we get a list of all hkls for conventional (including equivalent)
-    conv_hkl_list = [miller for miller in itertools.product(r, r, r) if any([i != 0 for i in miller])]
+    # First we get an array of all hkls for conventional (including
+    # equivalent), in the same order as itertools.product(r, r, r)
+    conv_hkl_list = np.array(np.meshgrid(r, r, r, indexing="ij")).reshape(3, -1).T
+    conv_hkl_list = conv_hkl_list[np.any(conv_hkl_list != 0, axis=1)]
 
-    sg = SpacegroupAnalyzer(structure)
+    sg = spacegroup_analyzer or SpacegroupAnalyzer(structure)
     # Get distinct hkl planes from the rhombohedral setting if trigonal
     if sg.get_crystal_system() == "trigonal":
         transf = sg.get_conventional_to_primitive_transformation_matrix()
-        miller_list = [hkl_transformation(transf, hkl) for hkl in conv_hkl_list]
-        prim_structure = SpacegroupAnalyzer(structure).get_primitive_standard_structure()
+        miller_list = _hkl_transformation_array(transf, conv_hkl_list)
+        prim_structure = sg.get_primitive_standard_structure()
         symm_ops = get_recp_symmetry_operation(prim_structure)
     else:
         miller_list = conv_hkl_list
         symm_ops = get_recp_symmetry_operation(structure)
 
-    unique_millers, unique_millers_conv = [], []
-
-    def is_already_analyzed(miller_index):
-        for op in symm_ops:
-            if in_coord_list(unique_millers, op.operate(miller_index)):
-                return True
-        return False
-
-    for i, miller in enumerate(miller_list):
-        d = abs(reduce(gcd, miller))
-        miller = tuple([int(i / d) for i in miller])
-        if not is_already_analyzed(miller):
-            if sg.get_crystal_system() == "trigonal":
-                # Now we find the distinct primitive hkls using
-                # the primitive symmetry operations and their
-                # corresponding hkls in the conventional setting
-                unique_millers.append(miller)
-                d = abs(reduce(gcd, conv_hkl_list[i]))
-                cmiller = tuple([int(i / d) for i in conv_hkl_list[i]])
-                unique_millers_conv.append(cmiller)
-            else:
-                unique_millers.append(miller)
-                unique_millers_conv.append(miller)
+    miller_list = _reduce_miller_array(miller_list)
+
+    # Apply every symmetry operation to every hkl at once. Since the
+    # operations form a group, an hkl is equivalent to an earlier one if and
+    # only if their orbits share the same smallest hash, so the distinct
+    # indices are the first occurrences of each orbit hash.
+    rotations = np.array([op.rotation_matrix for op in symm_ops])
+    translations = np.array([op.translation_vector for op in symm_ops])
+    images = np.einsum("oij,nj->noi", rotations, miller_list) + translations
+    int_images = np.rint(images).astype(np.int64)
+    # Non-integer images can never coincide with a Miller index
+    valid = np.all(np.abs(images - int_images) < 1e-8, axis=2)
+    offset = np.abs(int_images).max()
+    base = 2 * offset + 1
+    hashes = np.dot(int_images + offset, [base ** 2, base, 1])
+    hashes[~valid] = np.iinfo(np.int64).max
+    orbit_keys = hashes.min(axis=1)
+    _, first = np.unique(orbit_keys, return_index=True)
+    first.sort()
+
+    unique_millers_conv = _reduce_miller_array(conv_hkl_list[first])
+    return [tuple(int(i) for i in miller) for miller in unique_millers_conv]
+
+
+def _reduce_miller_array(millers):
+    """
+    Divides each row of an integer (N, 3) array by its greatest common
+    divisor.
+    """
+    millers = np.asarray(millers, dtype=np.int64)
+    d = np.gcd.reduce(millers, axis=1)
+    return millers // d[:, None]
 
-    return unique_millers_conv
+
+def _hkl_transformation_array(transf, millers):
+    """
+    Array version of hkl_transformation for an (N, 3) array of Miller indices.
+    """
+    lcm = lambda a, b: a * b // math.gcd(a, b)
+    reduced_transf = reduce(lcm, [int(1 / i) for i in itertools.chain(*transf) if i != 0]) * transf
+    reduced_transf = reduced_transf.astype(int)
+
+    t_hkl = _reduce_miller_array(np.dot(millers, reduced_transf.T))
+    # get mostly positive oriented Miller indices
+    t_hkl[np.sum(t_hkl < 0, axis=1) > 1] *= -1
+    return t_hkl
 
 
 def hkl_transformation(transf, miller_index):
@@ -1638,7 +1667,8 @@ def generate_all_slabs(structure, max_index, min_slab_size, min_vacuum_size,
                        bonds=None, tol=1e-3, max_broken_bonds=0,
                        lll_reduce=False, center_slab=False, primitive=True,
                        max_normal_search=None, symmetrize=False, repair=False,
-                       include_reconstructions=False, in_unit_planes=False):
+                       include_reconstructions=False, in_unit_planes=False,
+                       ncores=None):
     """
     A function that finds all different slabs up to a certain miller index.
     Slabs oriented under certain Miller indices that are equivalent to other
@@ -1692,25 +1722,38 @@ def generate_all_slabs(structure, max_index, min_slab_size, min_vacuum_size,
             or just omit them
         include_reconstructions (bool): Whether to include reconstructed
             slabs available in the reconstructions_archive.json file.
+        in_unit_planes (bool): Whether to set min_slab_size and
+            min_vac_size in units of hkl planes (see SlabGenerator).
+        ncores (int): if set, the slabs of the different Miller indices
+            are generated over a pool of ncores processes. The slabs are
+            returned in the same order as in serial.
     """
     all_slabs = []
 
-    for miller in get_symmetrically_distinct_miller_indices(structure,
-                                                            max_index):
-        gen = SlabGenerator(structure, miller, min_slab_size,
-                            min_vacuum_size, lll_reduce=lll_reduce,
-                            center_slab=center_slab, primitive=primitive,
-                            max_normal_search=max_normal_search,
-                            in_unit_planes=in_unit_planes)
-        slabs = gen.get_slabs(bonds=bonds, tol=tol, symmetrize=symmetrize,
-                              max_broken_bonds=max_broken_bonds, repair=repair)
+    # the symmetry of the bulk structure is analyzed once for all the Miller
+    # indices and the reconstructions
+    sg = SpacegroupAnalyzer(structure)
+    millers = get_symmetrically_distinct_miller_indices(
+        structure, max_index, spacegroup_analyzer=sg)
+    gen_kwargs = dict(lll_reduce=lll_reduce, center_slab=center_slab,
+                      primitive=primitive, max_normal_search=max_normal_search,
+                      in_unit_planes=in_unit_planes)
+    slab_kwargs = dict(bonds=bonds, tol=tol, symmetrize=symmetrize,
+                       max_broken_bonds=max_broken_bonds, repair=repair)
+    args = (structure, min_slab_size, min_vacuum_size, gen_kwargs,
+            slab_kwargs)
+    if ncores:
+        with SharedArgsPool(ncores, _get_slabs, args) as p:
+            all_miller_slabs = p.map(millers)
+    else:
+        all_miller_slabs = (_get_slabs(miller, *args) for miller in millers)
 
+    for miller, slabs in zip(millers, all_miller_slabs):
         if len(slabs) > 0:
             logger.debug("%s has %d slabs... " % (miller, len(slabs)))
             all_slabs.extend(slabs)
 
     if include_reconstructions:
-        sg = SpacegroupAnalyzer(structure)
         symbol = sg.get_space_group_symbol()
         # enumerate through all posisble reconstructions in the
         # archive available for this particular structure (spacegroup)
@@ -1729,6 +1772,16 @@ def generate_all_slabs(structure, max_index, min_slab_size, min_vacuum_size,
     return all_slabs
 
 
+def _get_slabs(miller, structure, min_slab_size, min_vacuum_size,
+               gen_kwargs, slab_kwargs):
+    """
+    Generates the slabs of a Miller index for generate_all_slabs.
+    """
+    gen = SlabGenerator(structure, miller, min_slab_size, min_vacuum_size,
+                        **gen_kwargs)
+    return gen.get_slabs(**slab_kwargs)
+
+
 def miller_index_from_sites(lattice, coords, coords_are_cartesian=True,
                             round_dp=4, verbose=True):
     """
@@ -12,7 +12,7 @@ from monty.json import MSONable
 from monty.serialization import loadfn
 from monty.dev import deprecated
 
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+from pymatgen.symmetry.analyzer import SpacegroupAnalyzer, SYMMETRY_CACHE
 from pymatgen.core.operations import SymmOp
 from pymatgen.core.lattice import Lattice
 from pymatgen.analysis.structure_matcher import StructureMatcher
@@ -346,10 +346,8 @@ class Tensor(np.ndarray, MSONable):
             symprec (float): symmetry tolerance for the Spacegroup Analyzer
                 used to generate the symmetry operations
         """
-        sga = SpacegroupAnalyzer(structure, symprec)
-        symm_ops = sga.get_symmetry_operations(cartesian=True)
-        return sum([self.transform(symm_op)
-                    for symm_op in symm_ops]) / len(symm_ops)
+        rotations = get_symmetry_rotations(structure, symprec)
+        return self.__class__(average_transform(self, rotations))
 
     def is_fit_to_structure(self, structure, tol=1e-2):
         """
@@ -631,12 +629,13 @@ class Tensor(np.ndarray, MSONable):
             vsym (bool): whether to enforce voigt symmetry, defaults
                 to True
         """
+        # Generate the guess from populated
+        guess = Tensor(np.zeros(self.shape))
+        mask = abs(self) > prec
+        guess[mask] = self[mask]
         if precond:
-            # Generate the guess from populated
-            sops = SpacegroupAnalyzer(structure).get_symmetry_operations()
-            guess = Tensor(np.zeros(self.shape))
-            mask = abs(self) > prec
-            guess[mask] = self[mask]
+            rotations = get_symmetry_rotations(structure, symprec=0.01,
+                                               cartesian=False)
 
             def merge(old, new):
                 gmask = np.abs(old) > prec
@@ -646,14 +645,16 @@ class Tensor(np.ndarray, MSONable):
                 old[avg_mask] = (old[avg_mask] + new[avg_mask]) / 2.
                 old[new_mask] = new[new_mask]
             if verbose:
-                print("Preconditioning for {} symmops".format(len(sops)))
-            for sop in sops:
-                rot = guess.transform(sop)
+                print("Preconditioning for {} symmops".format(len(rotations)))
+            # Each symmop acts on the guess updated by the previous ones,
+            # so these can't be stacked into a single transformation
+            for rotation in rotations:
+                rot = average_transform(guess, rotation[None])
                 # Store non-zero entries of new that weren't previously
                 # in the guess in the guess
                 merge(guess, rot)
             if verbose:
-                print("Preconditioning for voigt symmetry".format(len(sops)))
+                print("Preconditioning for voigt symmetry")
             if vsym:
                 v = guess.voigt
                 perms = list(itertools.permutations(range(len(v.shape))))
@@ -661,14 +662,13 @@ class Tensor(np.ndarray, MSONable):
                     vtrans = np.transpose(v, perm)
                     merge(v, vtrans)
                 guess = Tensor.from_voigt(v)
-        else:
-            guess = np.zeros(self.shape)
 
         assert guess.shape == self.shape, "Guess must have same shape"
+        rotations = get_symmetry_rotations(structure)
         converged = False
         test_new, test_old = [guess.copy()]*2
         for i in range(maxiter):
-            test_new = test_old.fit_to_structure(structure)
+            test_new = Tensor(average_transform(test_old, rotations))
             if vsym:
                 test_new = test_new.voigt_symmetrized
             diff = np.abs(test_old - test_new)
@@ -736,11 +736,32 @@ class TensorCollection(collections.Sequence, MSONable):
     def zeroed(self, tol=1e-3):
         return self.__class__([t.zeroed(tol) for t in self])
 
+    def _average_transform(self, rotations):
+        """
+        Transforms all tensors by the average over a set of rotations,
+        stacking tensors of equal rank into a single array operation
+
+        Args:
+            rotations ((N, 3, 3) array-like): rotation matrices
+        """
+        new_tensors = list(self.tensors)
+        ranks = self.ranks
+        for rank in set(ranks):
+            inds = [n for n, r in enumerate(ranks) if r == rank]
+            stack = np.array([self.tensors[n] for n in inds])
+            new_stack = average_transform(stack, rotations, rank=rank)
+            for n, new in zip(inds, new_stack):
+                new_tensors[n] = self.tensors[n].__class__(new)
+        return self.__class__(new_tensors)
+
     def transform(self, symm_op):
-        return self.__class__([t.transform(symm_op) for t in self])
+        return self._average_transform([symm_op.rotation_matrix])
 
     def rotate(self, matrix, tol=1e-3):
-        return self.__class__([t.rotate(matrix, tol) for t in self])
+        matrix = SquareTensor(matrix)
+        if not matrix.is_rotation(tol):
+            raise ValueError("Rotation matrix is not valid.")
+        return self._average_transform([matrix])
 
     @property
     def symmetrized(self):
@@ -750,8 +771,8 @@ class TensorCollection(collections.Sequence, MSONable):
         return all([t.is_symmetric(tol) for t in self])
 
     def fit_to_structure(self, structure, symprec=0.1):
-        return self.__class__([t.fit_to_structure(structure, symprec)
-                               for t in self])
+        return self._average_transform(
+            get_symmetry_rotations(structure, symprec))
 
     def is_fit_to_structure(self, structure, tol=1e-2):
         return all([t.is_fit_to_structure(structure, tol) for t in self])
@@ -922,6 +943,64 @@ def get_uvec(vec):
     return vec / l
 
 
+def get_symmetry_rotations(structure, symprec=0.1, cartesian=True):
+    """
+    Gets the rotation matrices of the symmetry operations of a structure
+    as a single array.  These are stored in the SYMMETRY_CACHE of the
+    SpacegroupAnalyzer, so repeated calls for the same structure don't
+    regenerate the symmetry operations.
+
+    Args:
+        structure (Structure): structure from which to get symmetry
+        symprec (float): symmetry tolerance for the SpacegroupAnalyzer
+        cartesian (bool): whether to get cartesian rather than
+            fractional rotation matrices, defaults to True
+
+    Returns:
+        (N, 3, 3) array of rotation matrices
+    """
+    sga = SpacegroupAnalyzer(structure, symprec)
+    return SYMMETRY_CACHE.get(
+        sga._cache_key, ("symmetry_rotations", cartesian),
+        lambda: np.array([op.rotation_matrix for op in
+                          sga.get_symmetry_operations(cartesian=cartesian)]))
+
+
+def average_transform(tensors, rotations, rank=None):
+    """
+    Transforms a tensor (or a stack of tensors) by each of a set of
+    rotations and averages the results.  The rotations are applied
+    to all tensors at once, one index at a time, as a batched matrix
+    product over the stacked rotation matrices.  With a single rotation,
+    this is equivalent to Tensor.transform.
+
+    Args:
+        tensors (array-like): tensor or array of tensors to transform,
+            with the tensor indices in the trailing axes
+        rotations ((N, 3, 3) array-like): rotation matrices
+        rank (int): rank of the tensors, defaults to the number of
+            dimensions of the input, i. e. a single tensor
+
+    Returns:
+        (np.ndarray) average of the transformed tensors, with the
+            same shape as the input
+    """
+    tensors = np.asarray(tensors)
+    rotations = np.asarray(rotations)
+    rank = tensors.ndim if rank is None else rank
+    n_ops = len(rotations)
+    axis = tensors.ndim - rank + 1
+    result = np.broadcast_to(tensors, (n_ops,) + tensors.shape)
+    # Contract the leading tensor index and append the rotated one,
+    # which restores the original index order after rank steps
+    for i in range(rank):
+        result = np.moveaxis(result, axis, -1)
+        shape = result.shape
+        result = np.matmul(result.reshape(n_ops, -1, 3),
+                           rotations.transpose(0, 2, 1)).reshape(shape)
+    return result.mean(axis=0)
+
+
 def symmetry_reduce(tensors, structure, tol=1e-8, **kwargs):
     """
     Function that converts a list of tensors corresponding to a structure
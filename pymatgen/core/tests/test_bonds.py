@@ -6,7 +6,7 @@
 import unittest
 import warnings
 from pymatgen.core.bonds import CovalentBond, get_bond_length, \
-    obtain_all_bond_lengths, get_bond_order
+    obtain_all_bond_lengths, get_bond_order, get_max_bond_length_matrix
 from pymatgen.core.sites import Site
 from pymatgen.core.periodic_table import Element
 
@@ -79,6 +79,24 @@ class FuncTest(unittest.TestCase):
         self.assertDictEqual(obtain_all_bond_lengths('C', 'N'),
                              {1.0: 1.47, 2.0: 1.3, 3.0: 1.16})
 
+    def test_get_max_bond_length_matrix(self):
+        cutoffs = get_max_bond_length_matrix(['C', Element('H')])
+        self.assertAlmostEqual(cutoffs[0, 0], 1.2 * 1.54)
+        self.assertAlmostEqual(cutoffs[0, 1], 1.2 * 1.08)
+        self.assertAlmostEqual(cutoffs[1, 0], 1.2 * 1.08)
+        cutoffs = get_max_bond_length_matrix(['C', 'Br'], tol=0.5,
+                                             default_bl=1.9)
+        self.assertAlmostEqual(cutoffs[0, 1], 1.5 * 1.9)
+        self.assertRaises(ValueError, get_max_bond_length_matrix, ['C', 'Br'])
+
+        # Same criterion as CovalentBond.is_bonded
+        for dist in [1.0, 1.2, 1.3, 1.5]:
+            site1 = Site("C", [0, 0, 0])
+            site2 = Site("H", [0, 0, dist])
+            self.assertEqual(
+                CovalentBond.is_bonded(site1, site2),
+                dist < get_max_bond_length_matrix(['C', 'H'])[0, 1])
+
     def test_get_bond_order(self):
         self.assertAlmostEqual(get_bond_order(
             'C', 'C', 1), 3)
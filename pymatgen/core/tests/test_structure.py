@@ -11,9 +11,11 @@ from pymatgen.core.operations import SymmOp
 from pymatgen.core.structure import IStructure, Structure, IMolecule, \
     StructureError, Molecule
 from pymatgen.core.lattice import Lattice
+from pymatgen.core.bonds import CovalentBond
 from pymatgen.electronic_structure.core import Magmom
 import random
 import os
+import itertools
 import numpy as np
 
 test_dir = os.path.join(os.path.dirname(__file__), "..", "..", "..",
@@ -735,6 +737,29 @@ class StructureTest(PymatgenTest):
         self.assertArrayAlmostEqual(self.structure.lattice.abc,
                                     [15.360792, 35.195996, 7.680396], 5)
 
+    def test_neighbor_cache(self):
+        s = self.get_structure("LiFePO4")
+        ref = s.get_all_neighbors(3.5, include_index=True, include_image=True)
+        ref_small = s.get_all_neighbors(2.5, include_index=True)
+        s.enable_neighbor_cache()
+        self.assertEqual(s.get_all_neighbors(3.5, True, True), ref)
+        self.assertEqual(s.get_all_neighbors(2.5, include_index=True),
+                         ref_small)
+        self.assertEqual(s._neighbor_cache["cutoff"], 3.5)
+        for i, site in enumerate(s):
+            nn = s.get_neighbors(site, 2.5, include_index=True)
+            self.assertEqual(sorted(n[1:] for n in nn),
+                             sorted(n[1:] for n in ref_small[i]))
+
+        # Any modification of the sites discards the cache.
+        s.translate_sites([0], [0.1, 0, 0])
+        self.assertEqual(s._neighbor_cache, {})
+        moved = s.get_all_neighbors(2.5, include_index=True)
+        s.disable_neighbor_cache()
+        self.assertIsNone(s._neighbor_cache)
+        self.assertEqual(moved, s.get_all_neighbors(2.5, include_index=True))
+        self.assertNotEqual(moved, ref_small)
+
     def test_disordered_supercell_primitive_cell(self):
         l = Lattice.cubic(2)
         f = [[0.5, 0.5, 0.5]]
@@ -1021,6 +1046,18 @@ class IMoleculeTest(PymatgenTest):
 
     def test_get_covalent_bonds(self):
         self.assertEqual(len(self.mol.get_covalent_bonds()), 4)
+        mol = Molecule.from_file(os.path.join(test_dir, "benzene.xyz"))
+        for tol in [0.0, 0.2, 0.5]:
+            bonds = [(mol.index(b.site1), mol.index(b.site2))
+                     for b in mol.get_covalent_bonds(tol=tol)]
+            ref = [(i, j) for i, j in itertools.combinations(range(len(mol)), 2)
+                   if CovalentBond.is_bonded(mol[i], mol[j], tol=tol)]
+            self.assertEqual(bonds, ref)
+        # Missing bond data raises only for pairs of sites present
+        mol = Molecule(["Cl", "H"], [[0, 0, 0], [0, 0, 1.3]])
+        self.assertEqual(len(mol.get_covalent_bonds()), 1)
+        mol.append("Cl", [0, 0, 6])
+        self.assertRaises(ValueError, mol.get_covalent_bonds)
 
     def test_properties(self):
         self.assertEqual(len(self.mol), 5)
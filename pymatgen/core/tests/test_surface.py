@@ -599,8 +599,14 @@ class MillerIndexFinderTests(PymatgenTest):
 
         indices = get_symmetrically_distinct_miller_indices(self.cscl, 1)
         self.assertEqual(len(indices), 3)
+        self.assertEqual(indices, [(1, 1, 1), (1, 1, 0), (1, 0, 0)])
+        sg = SpacegroupAnalyzer(self.cscl)
+        self.assertEqual(get_symmetrically_distinct_miller_indices(
+            self.cscl, 1, spacegroup_analyzer=sg), indices)
         indices = get_symmetrically_distinct_miller_indices(self.cscl, 2)
         self.assertEqual(len(indices), 6)
+        indices = get_symmetrically_distinct_miller_indices(self.cscl, 5)
+        self.assertEqual(len(indices), 40)
 
         self.assertEqual(len(get_symmetrically_distinct_miller_indices(self.lifepo4, 1)), 7)
 
@@ -620,6 +626,8 @@ class MillerIndexFinderTests(PymatgenTest):
         # Now try a trigonal system.
         indices = get_symmetrically_distinct_miller_indices(self.trigBi, 2)
         self.assertEqual(len(indices), 17)
+        indices = get_symmetrically_distinct_miller_indices(self.trigBi, 5)
+        self.assertEqual(len(indices), 165)
 
     def test_generate_all_slabs(self):
 
@@ -661,6 +669,14 @@ class MillerIndexFinderTests(PymatgenTest):
                                     bonds={("P", "O"): 3})
         self.assertEqual(len(slabs1), 4)
 
+        # Same slabs, in the same order, over a pool of processes
+        slabs1_par = generate_all_slabs(self.lifepo4, 1, 10, 10, tol=0.1,
+                                        bonds={("P", "O"): 3}, ncores=2)
+        self.assertEqual([(s.miller_index, s.shift) for s in slabs1_par],
+                         [(s.miller_index, s.shift) for s in slabs1])
+        for s, s_par in zip(slabs1, slabs1_par):
+            self.assertArrayAlmostEqual(s.frac_coords, s_par.frac_coords)
+
         # Now we test this out for repair_broken_bonds()
         slabs1_repair = generate_all_slabs(self.lifepo4, 1, 10, 10, tol=0.1,
                                     bonds={("P", "O"): 3}, repair=True)
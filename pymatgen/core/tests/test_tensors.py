@@ -226,6 +226,35 @@ class TensorTest(PymatgenTest):
         self.assertTrue(self.fit_r3.is_fit_to_structure(self.structure))
         self.assertTrue(self.fit_r4.is_fit_to_structure(self.structure))
 
+    def test_get_symmetry_rotations(self):
+        sga = SpacegroupAnalyzer(self.structure, 0.1)
+        symm_ops = sga.get_symmetry_operations(cartesian=True)
+        rotations = get_symmetry_rotations(self.structure)
+        self.assertEqual(rotations.shape, (len(symm_ops), 3, 3))
+        for op, rotation in zip(symm_ops, rotations):
+            self.assertArrayAlmostEqual(op.rotation_matrix, rotation)
+        frac = get_symmetry_rotations(self.structure, cartesian=False)
+        self.assertArrayAlmostEqual(
+            frac, [op.rotation_matrix for op in
+                   sga.get_symmetry_operations(cartesian=False)])
+
+    def test_average_transform(self):
+        symm_op = SymmOp.from_axis_angle_and_translation([0, 0, 1], 30)
+        for tensor in [self.vec, self.rand_rank2, self.rand_rank4]:
+            self.assertArrayAlmostEqual(
+                average_transform(tensor, [symm_op.rotation_matrix]),
+                tensor.transform(symm_op))
+        rotations = get_symmetry_rotations(self.structure)
+        stack = [self.unfit4, self.rand_rank4]
+        averaged = average_transform(stack, rotations, rank=4)
+        symm_ops = SpacegroupAnalyzer(self.structure, 0.1)\
+            .get_symmetry_operations(cartesian=True)
+        for tensor, avg in zip(stack, averaged):
+            expected = np.mean([op.transform_tensor(tensor)
+                                for op in symm_ops], axis=0)
+            self.assertArrayAlmostEqual(avg, expected)
+        self.assertArrayAlmostEqual(averaged[0], self.fit_r4, 1)
+
     def test_convert_to_ieee(self):
         for entry in self.ieee_data:
             xtal = entry['xtal']
@@ -358,6 +387,17 @@ class TensorTest(PymatgenTest):
         new = Tensor.from_voigt(new).populate(sn)
         self.assertArrayAlmostEqual(new, et, decimal=2)
 
+        # test without preconditioning
+        vtens = np.zeros((6, 6))
+        vtens[0, 0] = 259.31
+        vtens[0, 1] = 160.71
+        vtens[3, 3] = 73.48
+        et = Tensor.from_voigt(vtens)
+        populated = et.populate(sn, prec=1e-3, precond=False).voigt
+        self.assertAlmostEqual(populated[0, 0], 259.31)
+        self.assertAlmostEqual(populated[3, 3], 73.48)
+        self.assertArrayAlmostEqual(populated, populated.T)
+
     def test_from_values_indices(self):
         sn = self.get_structure("Sn")
         indices = [(0, 0), (0, 1), (3, 3)]
@@ -469,18 +469,23 @@ class FermiDos(Dos):
         the density of states over energy & equilibrium Fermi-Dirac distribution
 
         Args:
-            fermi (float): the fermi level in eV
-            T (float): the temperature in Kelvin
-
-        Returns (float): in units 1/cm3. If negative it means that the majority
-            carriers are electrons (n-type doping) and if positive holes/p-type
-        """
-        cb_integral = np.sum(self.tdos[self.idx_cbm:]
-                             * f0(self.energies[self.idx_cbm:], fermi, T)
-                             * self.de[self.idx_cbm:], axis=0)
-        vb_integral = np.sum(self.tdos[:self.idx_vbm + 1]
-                             * (1 - f0(self.energies[:self.idx_vbm + 1], fermi, T))
-                             * self.de[:self.idx_vbm + 1], axis=0)
+            fermi (float or array): the fermi level in eV
+            T (float or array): the temperature in Kelvin. Arrays of fermi
+                levels and temperatures are broadcast against each other.
+
+        Returns (float or array): in units 1/cm3. If negative it means that
+            the majority carriers are electrons (n-type doping) and if
+            positive holes/p-type
+        """
+        fermi, T = np.broadcast_arrays(fermi, T)
+        # energy axis first, broadcast against the fermi levels and T
+        idx = (slice(None),) + (None,) * fermi.ndim
+        cb_integral = np.sum(self.tdos[self.idx_cbm:][idx]
+                             * f0(self.energies[self.idx_cbm:][idx], fermi, T)
+                             * self.de[self.idx_cbm:][idx], axis=0)
+        vb_integral = np.sum(self.tdos[:self.idx_vbm + 1][idx]
+                             * (1 - f0(self.energies[:self.idx_vbm + 1][idx], fermi, T))
+                             * self.de[:self.idx_vbm + 1][idx], axis=0)
         return (vb_integral - cb_integral) / (self.volume * self.A_to_cm ** 3)
 
     def get_fermi_interextrapolated(self, c, T, warn=True, c_ref=1e10, **kwargs):
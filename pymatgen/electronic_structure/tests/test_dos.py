@@ -85,6 +85,16 @@ class FermiDosTest(unittest.TestCase):
         self.assertAlmostEqual(sci_dos.get_fermi_interextrapolated(0.0, 300),
                                3.2382, 4)
 
+    def test_doping_array(self):
+        fermi0 = self.dos.efermi
+        frange = np.array([fermi0 - 0.5, fermi0, fermi0 + 2.0])
+        temps = np.array([300, 600])
+        dopings = self.dos.get_doping(fermi=frange[:, None], T=temps)
+        self.assertEqual(dopings.shape, (3, 2))
+        for i, f in enumerate(frange):
+            for j, T in enumerate(temps):
+                self.assertAlmostEqual(dopings[i, j] / self.dos.get_doping(f, T), 1.0, 10)
+
 
 class CompleteDosTest(unittest.TestCase):
 
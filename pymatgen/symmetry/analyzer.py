@@ -4,8 +4,10 @@
 
 import itertools
 import logging
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import copy
+import functools
+import hashlib
 
 import math
 from math import cos
@@ -45,10 +47,166 @@ __date__ = "May 14, 2016"
 logger = logging.getLogger(__name__)
 
 
+class SymmetryCache:
+    """
+    Process-wide LRU cache of the spglib results and derived structures
+    computed by SpacegroupAnalyzer. Entries are keyed by a hash of the spglib
+    cell (lattice, fractional coordinates, species and magnetic moments) and
+    of the tolerances, so that analyzers repeatedly created for the same
+    structure, e.g., by HighSymmKpath, CifWriter or SlabGenerator, only call
+    spglib once. Cached values are copied on retrieval, so callers are free
+    to modify what they get.
+
+    The cache used by all SpacegroupAnalyzers is the module level
+    SYMMETRY_CACHE. Setting its maxsize to 0 disables caching.
+
+    Args:
+        maxsize (int): Maximum number of structures for which results are
+            kept.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key, name, func):
+        """
+        Get a cached value, computing and storing it if necessary.
+
+        Args:
+            key (str): Key of the structure, see get_key.
+            name: Hashable name of the value, e.g., the method and its
+                arguments.
+            func: Function computing the value on a cache miss.
+
+        Returns:
+            Copy of the cached value.
+        """
+        entry = self._entries.get(key, {})
+        if name in entry:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return _copy_result(entry[name])
+        self.misses += 1
+        value = func()
+        if self.maxsize > 0:
+            entry[name] = value
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return _copy_result(value)
+
+    def clear(self):
+        """
+        Remove all entries and reset the statistics.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        Returns:
+            Dict of the hits, misses, current size and maxsize of the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._entries), "maxsize": self.maxsize}
+
+    @staticmethod
+    def get_key(cell, unique_species, symprec, angle_tolerance):
+        """
+        Canonical hash of a spglib cell and the symmetry tolerances.
+
+        Args:
+            cell: (lattice, positions, numbers, magmoms) tuple.
+            unique_species: Compositions the numbers refer to.
+            symprec (float): Symmetry precision.
+            angle_tolerance (float): Angle tolerance.
+
+        Returns:
+            (str) Hex digest.
+        """
+        latt, positions, numbers, magmoms = cell
+        h = hashlib.sha1()
+        h.update(np.ascontiguousarray(latt, dtype=float).tobytes())
+        h.update(np.ascontiguousarray(positions, dtype=float).tobytes())
+        species = [sorted((str(sp), amt) for sp, amt in comp.items())
+                   for comp in unique_species]
+        h.update(repr((list(numbers), [str(m) for m in magmoms], species,
+                       symprec, angle_tolerance)).encode())
+        return h.hexdigest()
+
+
+SYMMETRY_CACHE = SymmetryCache()
+
+
+def _copy_result(value):
+    if isinstance(value, Structure):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+def _symmetry_cached(method):
+    """
+    Decorator caching the result of a SpacegroupAnalyzer method in
+    SYMMETRY_CACHE, keyed by the analyzed cell and the method arguments.
+    """
+    @functools.wraps(method)
+    def wrapped(self, *args, **kwargs):
+        name = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return SYMMETRY_CACHE.get(self._cache_key, name,
+                                  lambda: method(self, *args, **kwargs))
+    return wrapped
+
+
+def get_spglib_cell(structure):
+    """
+    Converts a Structure to a spglib cell. Sites with the same species and
+    occupancies are given the same number.
+
+    Args:
+        structure (Structure/IStructure): Structure to convert.
+
+    Returns:
+        ((lattice, positions, numbers, magmoms), unique_species), where
+        unique_species are the compositions the numbers (starting from 1)
+        refer to.
+    """
+    latt = structure.lattice.matrix
+    positions = structure.frac_coords
+    unique_species = []
+    zs = []
+    magmoms = []
+
+    for species, g in itertools.groupby(structure,
+                                        key=lambda s: s.species_and_occu):
+        if species in unique_species:
+            ind = unique_species.index(species)
+            zs.extend([ind + 1] * len(tuple(g)))
+        else:
+            unique_species.append(species)
+            zs.extend([len(unique_species)] * len(tuple(g)))
+
+    for site in structure:
+        if hasattr(site, 'magmom'):
+            magmoms.append(site.magmom)
+        elif site.is_ordered and hasattr(site.specie, 'spin'):
+            magmoms.append(site.specie.spin)
+        else:
+            magmoms.append(0)
+
+    return (latt, positions, zs, magmoms), unique_species
+
+
 class SpacegroupAnalyzer:
     """
     Takes a pymatgen.core.structure.Structure object and a symprec.
-    Uses pyspglib to perform various symmetry finding operations.
+    Uses pyspglib to perform various symmetry finding operations. The spglib
+    results and the refined, primitive and standard structures are cached in
+    SYMMETRY_CACHE, so analyzing the same structure again is cheap.
 
     Args:
         structure (Structure/IStructure): Structure to find symmetry
@@ -66,36 +224,19 @@ class SpacegroupAnalyzer:
         self._symprec = symprec
         self._angle_tol = angle_tolerance
         self._structure = structure
-        latt = structure.lattice.matrix
-        positions = structure.frac_coords
-        unique_species = []
-        zs = []
-        magmoms = []
-
-        for species, g in itertools.groupby(structure,
-                                            key=lambda s: s.species_and_occu):
-            if species in unique_species:
-                ind = unique_species.index(species)
-                zs.extend([ind + 1] * len(tuple(g)))
-            else:
-                unique_species.append(species)
-                zs.extend([len(unique_species)] * len(tuple(g)))
-
-        for site in structure:
-            if hasattr(site, 'magmom'):
-                magmoms.append(site.magmom)
-            elif site.is_ordered and hasattr(site.specie, 'spin'):
-                magmoms.append(site.specie.spin)
-            else:
-                magmoms.append(0)
+        cell, unique_species = get_spglib_cell(structure)
 
         self._unique_species = unique_species
-        self._numbers = zs
-        # For now, we are setting magmom to zero.
-        self._cell = latt, positions, zs, magmoms
+        self._numbers = cell[2]
+        self._cell = cell
 
-        self._space_group_data = spglib.get_symmetry_dataset(
-            self._cell, symprec=self._symprec, angle_tolerance=angle_tolerance)
+        self._cache_key = SymmetryCache.get_key(
+            self._cell, unique_species, symprec, angle_tolerance)
+        self._space_group_data = SYMMETRY_CACHE.get(
+            self._cache_key, "dataset",
+            lambda: spglib.get_symmetry_dataset(
+                self._cell, symprec=self._symprec,
+                angle_tolerance=angle_tolerance))
 
     def get_space_group_symbol(self):
         """
@@ -228,6 +369,7 @@ class SpacegroupAnalyzer:
         """
         return self._space_group_data
 
+    @_symmetry_cached
     def _get_symmetry(self):
         """
         Get the symmetry operations associated with the structure.
@@ -316,6 +458,7 @@ class SpacegroupAnalyzer:
                                     ds["equivalent_atoms"],
                                     ds["wyckoffs"])
 
+    @_symmetry_cached
     def get_refined_structure(self):
         """
         Get the refined structure based on detected symmetry. The refined
@@ -333,6 +476,7 @@ class SpacegroupAnalyzer:
         s = Structure(lattice, species, scaled_positions)
         return s.get_sorted_structure()
 
+    @_symmetry_cached
     def find_primitive(self):
         """
         Find a primitive version of the unit cell.
@@ -425,6 +569,7 @@ class SpacegroupAnalyzer:
 
         return transf
 
+    @_symmetry_cached
     def get_primitive_standard_structure(self, international_monoclinic=True):
         """
         Gives a structure with a primitive cell according to certain standards
@@ -478,6 +623,7 @@ class SpacegroupAnalyzer:
 
         return Structure.from_sites(new_sites)
 
+    @_symmetry_cached
     def get_conventional_standard_structure(
             self, international_monoclinic=True):
         """
@@ -820,6 +966,87 @@ class SpacegroupAnalyzer:
         return str(self.get_point_group_symbol()) in laue
 
 
+def get_symmetry_datasets(structures, symprec=0.01, angle_tolerance=5,
+                          refine=False, ncores=None, chunksize=100):
+    """
+    Symmetry analysis of many structures at once. The structures are
+    converted to spglib cells and packed into flat arrays, which are sent in
+    chunks to a multiprocessing pool, avoiding the creation of a
+    SpacegroupAnalyzer and the pickling of Structures for each of them.
+
+    Args:
+        structures ([Structure]): Structures to analyze.
+        symprec (float): Tolerance for symmetry finding. See
+            SpacegroupAnalyzer.
+        angle_tolerance (float): Angle tolerance for symmetry finding.
+        refine (bool): Whether to include the refined (standardized) cell
+            found by spglib in the results.
+        ncores (int): Number of processes to use. Default is None, which
+            analyzes the structures serially.
+        chunksize (int): Number of structures sent to a process at a time.
+
+    Returns:
+        List with a dict for each structure, with keys "number" (space group
+        number), "international" (space group symbol), "wyckoffs" and
+        "equivalent_atoms". If refine is True, "std_lattice",
+        "std_positions" and "std_species" give the refined cell. None is
+        returned for structures where spglib fails.
+    """
+    packed = []
+    all_species = []
+    for i in range(0, len(structures), chunksize):
+        cells = []
+        for s in structures[i:i + chunksize]:
+            cell, unique_species = get_spglib_cell(s)
+            cells.append(cell)
+            all_species.append(unique_species)
+        packed.append((
+            np.array([c[0] for c in cells]).reshape(-1, 3, 3),
+            np.concatenate([c[1] for c in cells]).reshape(-1, 3),
+            np.concatenate([c[2] for c in cells]).astype(int),
+            [m for c in cells for m in c[3]],
+            np.cumsum([0] + [len(c[2]) for c in cells]),
+            symprec, angle_tolerance, refine))
+
+    if ncores and len(packed) > 1:
+        from multiprocessing import Pool
+        with Pool(ncores) as p:
+            results = p.map(_get_packed_symmetry_datasets, packed)
+    else:
+        results = [_get_packed_symmetry_datasets(c) for c in packed]
+
+    results = list(itertools.chain.from_iterable(results))
+    for d, unique_species in zip(results, all_species):
+        if d is not None and refine:
+            d["std_species"] = [unique_species[t - 1]
+                                for t in d.pop("std_types")]
+    return results
+
+
+def _get_packed_symmetry_datasets(packed):
+    """
+    Helper method for get_symmetry_datasets. Must be at module level so
+    that it can be pickled.
+    """
+    lattices, positions, numbers, magmoms, offsets, symprec, \
+        angle_tolerance, refine = packed
+    keys = ["number", "international", "wyckoffs", "equivalent_atoms"]
+    if refine:
+        keys += ["std_lattice", "std_positions", "std_types"]
+    results = []
+    for i, latt in enumerate(lattices):
+        start, end = offsets[i], offsets[i + 1]
+        cell = (latt, positions[start:end], numbers[start:end],
+                magmoms[start:end])
+        dataset = spglib.get_symmetry_dataset(
+            cell, symprec=symprec, angle_tolerance=angle_tolerance)
+        if dataset is None:
+            results.append(None)
+        else:
+            results.append({k: dataset[k] for k in keys})
+    return results
+
+
 class PointGroupAnalyzer:
     """
     A class to analyze the point group of a molecule. The general outline of
@@ -13,7 +13,8 @@ from pymatgen.core.operations import SymmOp
 from pymatgen.io.vasp.inputs import Poscar
 from pymatgen.io.vasp.outputs import Vasprun
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer, \
-    PointGroupAnalyzer, cluster_sites, iterative_symmetrize
+    PointGroupAnalyzer, cluster_sites, iterative_symmetrize, SymmetryCache, \
+    SYMMETRY_CACHE, get_symmetry_datasets
 from pymatgen.io.cif import CifParser
 from pymatgen.util.testing import PymatgenTest
 from pymatgen.core.structure import Molecule, Structure
@@ -382,6 +383,96 @@ class SpacegroupAnalyzerTest(PymatgenTest):
 
 
 
+class GetSymmetryDatasetsTest(PymatgenTest):
+
+    def test_get_symmetry_datasets(self):
+        structures = [self.get_structure(n) for n in
+                      ["LiFePO4", "Si", "Li2O", "Graphite", "Li10GeP2S12"]]
+        results = get_symmetry_datasets(structures, 0.1, refine=True,
+                                        chunksize=2)
+        self.assertEqual(len(results), 5)
+        for s, d in zip(structures, results):
+            sga = SpacegroupAnalyzer(s, 0.1)
+            self.assertEqual(d["number"], sga.get_space_group_number())
+            self.assertEqual(list(d["wyckoffs"]),
+                             list(sga.get_symmetry_dataset()["wyckoffs"]))
+            self.assertEqual(len(d["equivalent_atoms"]), len(s))
+            refined = Structure(d["std_lattice"], d["std_species"],
+                                d["std_positions"])
+            self.assertEqual(refined.composition.reduced_formula,
+                             s.composition.reduced_formula)
+
+        results2 = get_symmetry_datasets(structures * 2, 0.1, ncores=2,
+                                         chunksize=3)
+        self.assertEqual([d["number"] for d in results2],
+                         [d["number"] for d in results] * 2)
+        self.assertNotIn("std_lattice", results2[0])
+
+
+class SymmetryCacheTest(PymatgenTest):
+
+    def setUp(self):
+        SYMMETRY_CACHE.clear()
+
+    def tearDown(self):
+        SYMMETRY_CACHE.clear()
+        SYMMETRY_CACHE.maxsize = 256
+
+    def test_cache(self):
+        s = self.get_structure("LiFePO4")
+        sga = SpacegroupAnalyzer(s, 0.1)
+        self.assertEqual(SYMMETRY_CACHE.info()["misses"], 1)
+        conv = sga.get_conventional_standard_structure()
+        self.assertEqual(SpacegroupAnalyzer(s.copy(), 0.1)
+                         .get_space_group_number(), 62)
+        conv2 = SpacegroupAnalyzer(s, 0.1).get_conventional_standard_structure()
+        self.assertEqual(conv, conv2)
+        self.assertIsNot(conv, conv2)
+        info = SYMMETRY_CACHE.info()
+        self.assertEqual(info["size"], 1)
+        self.assertEqual(info["hits"], 3)
+
+        # modifying results does not affect the cache
+        conv2.remove_species(["Li"])
+        sga.get_symmetry_dataset()["number"] = 1
+        sga = SpacegroupAnalyzer(s, 0.1)
+        self.assertEqual(sga.get_space_group_number(), 62)
+        self.assertEqual(sga.get_conventional_standard_structure(), conv)
+
+        # different tolerances, species or positions are different entries
+        SpacegroupAnalyzer(s, 0.01)
+        s2 = s.copy()
+        s2.replace_species({"Li": "Na"})
+        SpacegroupAnalyzer(s2, 0.1)
+        s2.perturb(0.01)
+        SpacegroupAnalyzer(s2, 0.1)
+        self.assertEqual(SYMMETRY_CACHE.info()["size"], 4)
+
+    def test_maxsize(self):
+        s = self.get_structure("Si")
+        SYMMETRY_CACHE.maxsize = 2
+        for symprec in [0.1, 0.01, 0.001]:
+            SpacegroupAnalyzer(s, symprec)
+        self.assertEqual(SYMMETRY_CACHE.info()["size"], 2)
+        SpacegroupAnalyzer(s, 0.1)
+        self.assertEqual(SYMMETRY_CACHE.info()["misses"], 4)
+
+        SYMMETRY_CACHE.maxsize = 0
+        SYMMETRY_CACHE.clear()
+        SpacegroupAnalyzer(s, 0.1)
+        SpacegroupAnalyzer(s, 0.1)
+        self.assertEqual(SYMMETRY_CACHE.info(),
+                         {"hits": 0, "misses": 2, "size": 0, "maxsize": 0})
+
+    def test_get_key(self):
+        cell = (np.eye(3), [[0, 0, 0]], [1], [0])
+        species = [Structure(np.eye(3), ["Si"], [[0, 0, 0]]).composition]
+        self.assertEqual(SymmetryCache.get_key(cell, species, 0.1, 5),
+                         SymmetryCache.get_key(cell, species, 0.1, 5))
+        self.assertNotEqual(SymmetryCache.get_key(cell, species, 0.1, 5),
+                            SymmetryCache.get_key(cell, species, 0.1, -1))
+
+
 class SpacegroupTest(unittest.TestCase):
 
     def setUp(self):
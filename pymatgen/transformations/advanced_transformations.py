@@ -21,6 +21,7 @@ from pymatgen.transformations.transformation_abc import AbstractTransformation
 from pymatgen.transformations.standard_transformations import \
     SubstitutionTransformation, OrderDisorderedStructureTransformation
 from pymatgen.command_line.enumlib_caller import EnumlibAdaptor, EnumError
+from pymatgen.analysis.enumeration import DerivativeStructureEnumerator
 from pymatgen.analysis.ewald import EwaldSummation
 from pymatgen.core.structure import Structure
 from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
@@ -281,12 +282,22 @@ class EnumerateStructureTransformation(AbstractTransformation):
         sort_criteria (str): Sort by Ewald energy ("ewald", must have oxidation
             states and slow) or by number of sites ("nsites", much faster).
         timeout (float): timeout in minutes to pass to EnumlibAdaptor
+        enumerator (str): Enumeration engine. "enumlib" (default) runs the
+            enumlib executables through the EnumlibAdaptor. "native" uses the
+            in-process DerivativeStructureEnumerator, which does not require
+            enumlib and avoids its file and process overhead for small
+            cells. enum_precision_parameter, check_ordered_symmetry and
+            timeout do not apply to the native enumerator, which always uses
+            the full symmetry of the structure.
+        ncores (int): Number of processes over which the native enumerator
+            distributes the cell sizes. Default is None (serial).
     """
 
     def __init__(self, min_cell_size=1, max_cell_size=1, symm_prec=0.1,
                  refine_structure=False, enum_precision_parameter=0.001,
                  check_ordered_symmetry=True, max_disordered_sites=None,
-                 sort_criteria="ewald", timeout=None):
+                 sort_criteria="ewald", timeout=None, enumerator="enumlib",
+                 ncores=None):
         self.symm_prec = symm_prec
         self.min_cell_size = min_cell_size
         self.max_cell_size = max_cell_size
@@ -296,10 +307,14 @@ class EnumerateStructureTransformation(AbstractTransformation):
         self.max_disordered_sites = max_disordered_sites
         self.sort_criteria = sort_criteria
         self.timeout = timeout
+        self.enumerator = enumerator
+        self.ncores = ncores
 
         if max_cell_size and max_disordered_sites:
             raise ValueError("Cannot set both max_cell_size and "
                              "max_disordered_sites!")
+        if enumerator not in ("enumlib", "native"):
+            raise ValueError("Unknown enumerator {}".format(enumerator))
 
     def apply_transformation(self, structure, return_ranked_list=False):
         """
@@ -343,7 +358,9 @@ class EnumerateStructureTransformation(AbstractTransformation):
                  "because it is ordered".format(structure.composition))
             structures = [structure.copy()]
 
-        if self.max_disordered_sites:
+        if structure.is_ordered and self.enumerator == "native":
+            max_cell_sizes = []
+        elif self.max_disordered_sites:
             ndisordered = sum([1 for site in structure if not site.is_ordered])
             if ndisordered > self.max_disordered_sites:
                 raise ValueError(
@@ -355,13 +372,19 @@ class EnumerateStructureTransformation(AbstractTransformation):
             max_cell_sizes = [self.max_cell_size]
 
         for max_cell_size in max_cell_sizes:
-            adaptor = EnumlibAdaptor(
-                structure, min_cell_size=self.min_cell_size,
-                max_cell_size=max_cell_size,
-                symm_prec=self.symm_prec, refine_structure=False,
-                enum_precision_parameter=self.enum_precision_parameter,
-                check_ordered_symmetry=self.check_ordered_symmetry,
-                timeout=self.timeout)
+            if self.enumerator == "native":
+                adaptor = DerivativeStructureEnumerator(
+                    structure, min_cell_size=self.min_cell_size,
+                    max_cell_size=max_cell_size, symm_prec=self.symm_prec,
+                    refine_structure=False, ncores=self.ncores)
+            else:
+                adaptor = EnumlibAdaptor(
+                    structure, min_cell_size=self.min_cell_size,
+                    max_cell_size=max_cell_size,
+                    symm_prec=self.symm_prec, refine_structure=False,
+                    enum_precision_parameter=self.enum_precision_parameter,
+                    check_ordered_symmetry=self.check_ordered_symmetry,
+                    timeout=self.timeout)
             try:
                 adaptor.run()
             except EnumError:
@@ -371,7 +394,8 @@ class EnumerateStructureTransformation(AbstractTransformation):
             if structures:
                 break
 
-        if structures is None:
+        if structures is None or \
+                (not structures and self.enumerator == "native"):
             raise ValueError("Unable to enumerate")
 
         original_latt = structure.lattice
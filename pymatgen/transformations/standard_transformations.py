@@ -6,6 +6,8 @@
 import logging
 
 from fractions import Fraction
+
+import numpy as np
 from numpy import around, array
 
 from pymatgen.analysis.bond_valence import BVAnalyzer
@@ -19,6 +21,7 @@ from pymatgen.core.structure import Structure, Lattice
 from pymatgen.transformations.site_transformations import \
     PartialRemoveSitesTransformation
 from pymatgen.transformations.transformation_abc import AbstractTransformation
+from pymatgen.util.parallel import SharedArgsPool
 
 """
 This module defines standard transformations which transforms a structure into
@@ -422,6 +425,14 @@ class OrderDisorderedStructureTransformation(AbstractTransformation):
             should be used for the grouping of sites.
         no_oxi_states (bool): Whether to remove oxidation states prior to
             ordering.
+        remove_duplicates (bool): Whether to remove symmetrically equivalent
+            orderings. Candidates are grouped by a site energy fingerprint
+            (see iter_orderings) and only candidates sharing a fingerprint
+            are compared with StructureMatcher. Fewer structures than
+            requested by return_ranked_list may be returned.
+        ncores (int): Number of processes used for the StructureMatcher
+            grouping when remove_duplicates is True. Default is None, which
+            groups the structures serially.
     """
 
     ALGO_FAST = 0
@@ -429,11 +440,13 @@ class OrderDisorderedStructureTransformation(AbstractTransformation):
     ALGO_BEST_FIRST = 2
 
     def __init__(self, algo=ALGO_FAST, symmetrized_structures=False,
-                 no_oxi_states=False):
+                 no_oxi_states=False, remove_duplicates=False, ncores=None):
         self.algo = algo
         self._all_structures = []
         self.no_oxi_states = no_oxi_states
         self.symmetrized_structures = symmetrized_structures
+        self.remove_duplicates = remove_duplicates
+        self.ncores = ncores
         
     def apply_transformation(self, structure, return_ranked_list=False):
         """
@@ -468,6 +481,43 @@ class OrderDisorderedStructureTransformation(AbstractTransformation):
 
         num_to_return = max(1, num_to_return)
 
+        self._all_structures = list(self.iter_orderings(structure,
+                                                        num_to_return))
+
+        if return_ranked_list:
+            return self._all_structures
+        else:
+            return self._all_structures[0]["structure"]
+
+    def iter_orderings(self, structure, num_to_return=1):
+        """
+        Generator over the lowest Ewald energy orderings of a disordered
+        structure, in order of increasing energy. Ordered structures are only
+        built as they are requested, so consumers can stop early without
+        paying for the remaining ones. If remove_duplicates is True, orderings
+        that StructureMatcher finds equivalent to a lower energy ordering are
+        skipped.
+
+        Duplicates are screened before any ordered structure is built. The
+        orderings found by the EwaldMinimizer are grouped by a fingerprint,
+        the sorted list of (species, site Ewald energy) pairs. It is
+        invariant to permutations of the sites and hence identical for
+        symmetrically equivalent orderings, so an ordering with a unique
+        fingerprint is kept without any comparison. Only the groups of
+        orderings sharing a fingerprint are built and grouped with
+        StructureMatcher, over ncores processes if ncores is set.
+
+        Args:
+            structure: Oxidation state decorated disordered structure to order
+            num_to_return (int): Number of orderings requested from the
+                EwaldMinimizer. Fewer may be yielded if duplicates are
+                removed.
+
+        Yields:
+            Dicts of the form {"energy": ..., "energy_above_minimum": ...,
+            "structure": ...}, as returned by apply_transformation with
+            return_ranked_list.
+        """
         if self.no_oxi_states:
             structure = Structure.from_sites(structure)
             for i, site in enumerate(structure):
@@ -529,39 +579,33 @@ class OrderDisorderedStructureTransformation(AbstractTransformation):
             if empty > 0.5:
                 m_list.append([0, empty, list(g), None])
 
+        # the minimizer consumes the index lists of m_list, so the fraction
+        # applied by each (index, species) manipulation is recorded first
+        fractions = {(i, m[3]): m[0] for m in m_list for i in m[2]}
+
         matrix = EwaldSummation(s).total_energy_matrix
         ewald_m = EwaldMinimizer(matrix, m_list, num_to_return, self.algo)
 
-        self._all_structures = []
-
-        lowest_energy = ewald_m.output_lists[0][0]
+        outputs = ewald_m.output_lists
+        lowest_energy = outputs[0][0]
         num_atoms = sum(structure.composition.values())
 
-        for output in ewald_m.output_lists:
-            s_copy = s.copy()
-            # do deletions afterwards because they screw up the indices of the
-            # structure
-            del_indices = []
-            for manipulation in output[1]:
-                if manipulation[1] is None:
-                    del_indices.append(manipulation[0])
-                else:
-                    s_copy[manipulation[0]] = manipulation[1]
-            s_copy.remove_sites(del_indices)
-
-            if self.no_oxi_states:
-                s_copy.remove_oxidation_states()
-
-            self._all_structures.append(
-                {"energy": output[0],
-                 "energy_above_minimum":
-                 (output[0] - lowest_energy) / num_atoms,
-                 "structure": s_copy.get_sorted_structure()})
-
-        if return_ranked_list:
-            return self._all_structures
-        else:
-            return self._all_structures[0]["structure"]
+        if self.remove_duplicates:
+            sym_matrix = (matrix + matrix.T) / 2
+            species = [str(site.specie) for site in s]
+            fingerprints = [_get_ordering_fingerprint(sym_matrix, species,
+                                                      output[1], fractions)
+                            for output in outputs]
+            outputs = _remove_equivalent_orderings(
+                s, outputs, fingerprints, self.no_oxi_states,
+                ncores=self.ncores)
+
+        for output in outputs:
+            yield {"energy": output[0],
+                   "energy_above_minimum":
+                   (output[0] - lowest_energy) / num_atoms,
+                   "structure": _get_ordered_structure(s, output[1],
+                                                       self.no_oxi_states)}
 
     def __str__(self):
         return "Order disordered structure transformation"
@@ -582,6 +626,96 @@ class OrderDisorderedStructureTransformation(AbstractTransformation):
         return self._all_structures[0]["structure"]
 
 
+def _get_ordering_fingerprint(matrix, species, manipulations, fractions,
+                              decimals=5):
+    """
+    Permutation invariant fingerprint of an ordering found by the
+    EwaldMinimizer, i.e., the sorted (species, site energy) pairs of the
+    sites remaining after the manipulations are applied.
+
+    Args:
+        matrix: Symmetric Ewald energy matrix of the starting structure.
+        species ([str]): Species strings of the starting structure.
+        manipulations: [index, species] manipulations of the ordering.
+        fractions (dict): Charge fraction applied by each (index, species)
+            manipulation.
+        decimals (int): Number of decimals site energies are rounded to.
+
+    Returns:
+        Hashable fingerprint.
+    """
+    f = np.ones(len(species))
+    species = list(species)
+    for i, sp in manipulations:
+        f[i] = fractions[(i, sp)]
+        species[i] = sp if sp is None else str(sp)
+    site_energies = np.around(f * matrix.dot(f), decimals)
+    return tuple(sorted((sp, e) for sp, e in zip(species, site_energies)
+                        if sp is not None))
+
+
+def _get_ordered_structure(structure, manipulations, no_oxi_states):
+    """
+    Builds the sorted ordered structure for the [index, species]
+    manipulations of an ordering found by the EwaldMinimizer.
+    """
+    s_copy = structure.copy()
+    # do deletions afterwards because they screw up the indices of the
+    # structure
+    del_indices = []
+    for manipulation in manipulations:
+        if manipulation[1] is None:
+            del_indices.append(manipulation[0])
+        else:
+            s_copy[manipulation[0]] = manipulation[1]
+    s_copy.remove_sites(del_indices)
+
+    if no_oxi_states:
+        s_copy.remove_oxidation_states()
+    return s_copy.get_sorted_structure()
+
+
+def _get_unique_indices(manipulations, structure, no_oxi_states):
+    """
+    Indices of the first ordering of each StructureMatcher group, for a list
+    of manipulations of the same starting structure. Module level so that it
+    can be dispatched to a process pool.
+    """
+    structures = [_get_ordered_structure(structure, m, no_oxi_states)
+                  for m in manipulations]
+    ids = [id(s) for s in structures]
+    groups = StructureMatcher().group_structures(structures)
+    return sorted(min(ids.index(id(s)) for s in g) for g in groups)
+
+
+def _remove_equivalent_orderings(structure, outputs, fingerprints,
+                                 no_oxi_states, ncores=None):
+    """
+    Removes equivalent orderings from the outputs of the EwaldMinimizer.
+    Equivalent orderings share a fingerprint, so only orderings with the
+    same fingerprint are built and compared with StructureMatcher,
+    optionally in parallel. The order of the outputs is preserved.
+    """
+    groups = {}
+    for i, fp in enumerate(fingerprints):
+        groups.setdefault(fp, []).append(i)
+
+    to_group = [g for g in groups.values() if len(g) > 1]
+    inputs = [[outputs[i][1] for i in g] for g in to_group]
+    if ncores and len(inputs) > 1:
+        with SharedArgsPool(ncores, _get_unique_indices,
+                            (structure, no_oxi_states)) as p:
+            results = p.map(inputs)
+    else:
+        results = [_get_unique_indices(i, structure, no_oxi_states)
+                   for i in inputs]
+
+    keep = set(g[0] for g in groups.values() if len(g) == 1)
+    for g, unique in zip(to_group, results):
+        keep.update(g[i] for i in unique)
+    return [outputs[i] for i in sorted(keep)]
+
+
 class PrimitiveCellTransformation(AbstractTransformation):
     """
     This class finds the primitive cell of the input structure.
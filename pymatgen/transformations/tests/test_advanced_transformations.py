@@ -224,6 +224,55 @@ class EnumerateStructureTransformationTest(unittest.TestCase):
         self.assertEqual(trans.symm_prec, 0.1)
 
 
+class NativeEnumerateStructureTransformationTest(unittest.TestCase):
+
+    def test_apply_transformation(self):
+        enum_trans = EnumerateStructureTransformation(refine_structure=True,
+                                                      enumerator="native")
+        p = Poscar.from_file(os.path.join(test_dir, 'POSCAR.LiFePO4'),
+                             check_for_POTCAR=False)
+        struct = p.structure
+        expected_ans = [1, 3, 1]
+        for i, frac in enumerate([0.25, 0.5, 0.75]):
+            trans = SubstitutionTransformation({'Fe': {'Fe': frac}})
+            s = trans.apply_transformation(struct)
+            oxitrans = OxidationStateDecorationTransformation(
+                {'Li': 1, 'Fe': 2, 'P': 5, 'O': -2})
+            s = oxitrans.apply_transformation(s)
+            alls = enum_trans.apply_transformation(s, 100)
+            self.assertEqual(len(alls), expected_ans[i])
+            for ss in alls:
+                self.assertIn("energy", ss)
+
+    def test_max_disordered_sites(self):
+        l = Lattice.cubic(4)
+        s_orig = Structure(l, [{"Li": 0.2, "Na": 0.2, "K": 0.6}, {"O": 1}],
+                           [[0, 0, 0], [0.5, 0.5, 0.5]])
+        est = EnumerateStructureTransformation(max_cell_size=None,
+                                               max_disordered_sites=5,
+                                               enumerator="native")
+        dd = est.apply_transformation(s_orig, return_ranked_list=100)
+        self.assertEqual(len(dd), 9)
+        for d in dd:
+            self.assertEqual(len(d["structure"]), 10)
+
+        self.assertRaises(ValueError, EnumerateStructureTransformation,
+                          enumerator="foo")
+
+    def test_native_ordered_and_empty(self):
+        l = Lattice([[0, 2, 2], [2, 0, 2], [2, 2, 0]])
+        est = EnumerateStructureTransformation(enumerator="native")
+        s = Structure(l, ["Cu"], [[0, 0, 0]])
+        self.assertEqual(len(est.apply_transformation(s)), 1)
+
+        # occupancies not consistent with a cell size of 3
+        est = EnumerateStructureTransformation(min_cell_size=3,
+                                               max_cell_size=3,
+                                               enumerator="native")
+        s = Structure(l, [{"Cu": 0.5, "Au": 0.5}], [[0, 0, 0]])
+        self.assertRaises(ValueError, est.apply_transformation, s)
+
+
 class SubstitutionPredictorTransformationTest(unittest.TestCase):
     def test_apply_transformation(self):
         t = SubstitutionPredictorTransformation(threshold=1e-3, alpha=-5,
@@ -5,6 +5,7 @@
 import os
 import random
 import unittest
+from unittest.mock import patch
 import json
 import warnings
 import functools
@@ -305,6 +306,34 @@ class OrderDisorderedStructureTransformationTest(unittest.TestCase):
             type(OrderDisorderedStructureTransformation.from_dict(d)),
             OrderDisorderedStructureTransformation)
 
+    def test_remove_duplicates(self):
+        coords = [[0, 0, 0], [0.75, 0.75, 0.75], [0.5, 0.5, 0.5],
+                  [0.25, 0.25, 0.25]]
+        lattice = Lattice([[3.8401979337, 0.00, 0.00],
+                           [1.9200989668, 3.3257101909, 0.00],
+                           [0.00, -2.2171384943, 3.1355090603]])
+        struct = Structure(lattice, [{"Si4+": 0.5, "O2-": 0.25, "P5+": 0.25}]
+                           * 4, coords)
+        t = OrderDisorderedStructureTransformation(remove_duplicates=True)
+        output = t.apply_transformation(struct, return_ranked_list=50)
+        self.assertEqual(len(output), 2)
+        self.assertLess(output[0]["energy"], output[1]["energy"])
+        t = OrderDisorderedStructureTransformation(remove_duplicates=True,
+                                                   ncores=2)
+        self.assertEqual(len(t.apply_transformation(struct, 50)), 2)
+
+        # orderings sharing a fingerprint are only removed if they match
+        unique = list(t.iter_orderings(struct, 50))
+        with patch("pymatgen.transformations.standard_transformations."
+                   "_get_ordering_fingerprint", return_value=()):
+            self.assertEqual(len(list(t.iter_orderings(struct, 50))),
+                             len(unique))
+
+        # orderings are generated lazily, lowest energy first
+        t = OrderDisorderedStructureTransformation()
+        gen = t.iter_orderings(struct, 50)
+        self.assertAlmostEqual(next(gen)["energy_above_minimum"], 0)
+
     def test_no_oxidation(self):
         specie = {"Cu1+": 0.5, "Au2+": 0.5}
         cuau = Structure.from_spacegroup("Fm-3m", Lattice.cubic(3.677),
@@ -0,0 +1,65 @@
+# coding: utf-8
+# Copyright (c) Pymatgen Development Team.
+# Distributed under the terms of the MIT License.
+
+
+"""
+This module provides a process pool for mapping a function over many items
+with a large read-only payload, which is sent once to each process instead
+of once per item.
+"""
+
+from multiprocessing import Pool
+
+_SHARED_DATA = {}
+
+
+def _init_worker(func, args):
+    _SHARED_DATA["func"] = func
+    _SHARED_DATA["args"] = args
+
+
+def _call_worker(item):
+    return _SHARED_DATA["func"](item, *_SHARED_DATA["args"])
+
+
+class SharedArgsPool:
+    """
+    Pool of processes that call func(item, *args) on the items given to
+    map or imap. The shared args are pickled once per process, when it is
+    started, and each process works on its own copy of them, so changes
+    made by func are not sent back. Like multiprocessing.Pool, it is meant
+    to be used as a context manager, e.g.
+
+        with SharedArgsPool(4, func, (structure,)) as p:
+            results = p.map(items)
+    """
+
+    def __init__(self, processes, func, args=()):
+        """
+        Args:
+            processes (int): number of processes.
+            func: picklable (i.e. module level) function of an item
+                followed by the shared args.
+            args (tuple): read-only arguments shared by all the calls.
+        """
+        self._pool = Pool(processes, initializer=_init_worker,
+                          initargs=(func, tuple(args)))
+
+    def map(self, items, chunksize=None):
+        """
+        Returns the list of func(item, *args) for the items.
+        """
+        return self._pool.map(_call_worker, items, chunksize)
+
+    def imap(self, items, chunksize=1):
+        """
+        Iterates lazily over func(item, *args) for the items, in order.
+        """
+        return self._pool.imap(_call_worker, items, chunksize)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._pool.terminate()
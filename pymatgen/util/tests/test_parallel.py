@@ -0,0 +1,23 @@
+# coding: utf-8
+# Copyright (c) Pymatgen Development Team.
+# Distributed under the terms of the MIT License.
+
+
+from unittest import TestCase
+
+from pymatgen.util.parallel import SharedArgsPool
+
+
+def _scale(item, factor, offset):
+    return item * factor + offset
+
+
+class SharedArgsPoolTest(TestCase):
+    def test_map(self):
+        with SharedArgsPool(2, _scale, (3, 1)) as p:
+            self.assertEqual(p.map(range(10)),
+                             [3 * i + 1 for i in range(10)])
+
+    def test_imap(self):
+        with SharedArgsPool(2, _scale, (2, 0)) as p:
+            self.assertEqual(list(p.imap(iter(range(5)))), [0, 2, 4, 6, 8])